@@ -1,4 +1,4 @@
-# Copyright 2019-2023 the openage authors. See copying.md for legal info.
+# Copyright 2019-2026 the openage authors. See copying.md for legal info.
 
 # pylint: disable=too-many-instance-attributes,too-many-branches,too-few-public-methods
 
@@ -16,7 +16,7 @@ from openage.convert.value_object.read.dynamic_loader import DynamicLoader
 
 from ....nyan.nyan_structs import NyanObject, NyanPatch, NyanPatchMember, MemberOperator
 from ...value_object.conversion.forward_ref import ForwardRef
-from ...value_object.read.value_members import NoDiffMember, ValueMember
+from ...value_object.read.value_members import DiffDict, ValueMember, diff_member
 from .combined_sound import CombinedSound
 from .combined_sprite import CombinedSprite
 from .combined_terrain import CombinedTerrain
@@ -48,6 +48,10 @@ class ConverterObject:
 
         if members:
             if isinstance(members, DynamicLoader):
+                # changes of the object must not change the struct it was read from
+                self.members = members.copy()
+
+            elif isinstance(members, DiffDict):
                 self.members = members
 
             elif all(isinstance(member, ValueMember) for member in members.values()):
@@ -103,32 +107,34 @@ class ConverterObject:
         The object created by short_diff() only contains members
         that are different. It does not contain NoDiffMembers.
         """
-        if type(self) is not type(other):
-            raise TypeError(f"type {type(self)} cannot be diffed with type {type(other)}")
-
-        obj_diff = {}
-
-        for member_id, member in self.members.items():
-            member_diff = member.diff(other.get_member(member_id))
-
-            if not isinstance(member_diff, NoDiffMember):
-                obj_diff.update({member_id: member_diff})
-
-        return ConverterObject(f"{self.obj_id}-{other.get_id()}-sdiff", members=obj_diff)
+        return ConverterObject(f"{self.obj_id}-{other.get_id()}-sdiff",
+                               members=dict(self._get_changes(other)))
 
     def diff(self, other: ConverterObject) -> ConverterObject:
         """
         Returns the obj_diff between two objects as another ConverterObject.
+
+        Only the changed members are stored in the diff. Unchanged
+        members are returned as NoDiffMembers on access.
+        """
+        return ConverterObject(f"{self.obj_id}-{other.get_id()}-diff",
+                               members=DiffDict(self.members, self._get_changes(other)))
+
+    def _get_changes(self, other: ConverterObject) -> dict[str, ValueMember]:
+        """
+        Get the diffs of the members that are different in other.
         """
         if type(self) is not type(other):
             raise TypeError(f"type {type(self)} cannot be diffed with type {type(other)}")
 
-        obj_diff = {}
-
+        changes = {}
         for member_id, member in self.members.items():
-            obj_diff.update({member_id: member.diff(other.get_member(member_id))})
+            member_diff = diff_member(member, other.get_member(member_id))
+
+            if member_diff is not None:
+                changes[member_id] = member_diff
 
-        return ConverterObject(f"{self.obj_id}-{other.get_id()}-diff", members=obj_diff)
+        return changes
 
     def __getitem__(self, key):
         """
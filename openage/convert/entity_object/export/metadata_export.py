@@ -1,4 +1,4 @@
-# Copyright 2020-2023 the openage authors. See copying.md for legal info.
+# Copyright 2020-2026 the openage authors. See copying.md for legal info.
 #
 # pylint: disable=too-many-arguments,too-many-locals
 """
@@ -212,6 +212,12 @@ class TextureMetadataExport(MetadataExport):
             self.size = texture_metadata["size"]
             self.subtex_metadata = texture_metadata["subtex_metadata"]
 
+            if "pxformat" in texture_metadata:
+                # the image was exported as a block compressed DDS texture
+                self.imagefile = f"{self.imagefile.rsplit('.', 1)[0]}.dds"
+                self.pxformat = texture_metadata["pxformat"]
+                self.cbits = False
+
 
 class TerrainMetadataExport(MetadataExport):
     """
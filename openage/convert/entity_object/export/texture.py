@@ -1,4 +1,4 @@
-# Copyright 2014-2024 the openage authors. See copying.md for legal info.
+# Copyright 2014-2026 the openage authors. See copying.md for legal info.
 
 """ Routines for texture generation etc """
 
@@ -7,6 +7,8 @@
 from __future__ import annotations
 import typing
 
+from concurrent.futures import ThreadPoolExecutor
+
 from PIL import Image
 
 import numpy
@@ -77,7 +79,8 @@ class Texture:
         input_data: typing.Union[SLP, SMP, SMX, SLD, BlendingMode],
         palettes: dict[int, ColorTable] = None,
         custom_cutter: InterfaceCutter = None,
-        layer: int = 0
+        layer: int = 0,
+        thread_count: int = 1
     ):
         super().__init__()
 
@@ -100,30 +103,34 @@ class Texture:
         self.frames = []
         if isinstance(input_data, (SLP, SMP, SMX)):
             input_frames = input_data.get_frames(layer)
+            main_palettes = []
             for frame in input_frames:
                 # Palette can be different for every frame
                 palette_number = frame.get_palette_number()
 
                 if palette_number is None:
-                    main_palette = None
+                    main_palettes.append(None)
 
                 else:
-                    main_palette = palettes[palette_number].array
+                    main_palettes.append(palettes[palette_number].array)
 
+            picture_data = _decode_frames(input_frames, main_palettes, thread_count)
+            for frame, frame_data in zip(input_frames, picture_data):
                 for subtex in self._to_subtextures(frame,
-                                                   main_palette,
+                                                   frame_data,
                                                    custom_cutter):
                     self.frames.append(subtex)
 
         elif isinstance(input_data, SLD):
-            input_frames = input_data.get_frames(layer)
+            input_frames = input_data.get_frames(layer, thread_count)
             if layer == 0 and len(input_frames) == 0:
                 # Use shadows if no main graphics are inside
-                input_frames = input_data.get_frames(layer=1)
+                input_frames = input_data.get_frames(1, thread_count)
 
-            for frame in input_frames:
+            picture_data = _decode_frames(input_frames, None, thread_count)
+            for frame, frame_data in zip(input_frames, picture_data):
                 subtex = TextureImage(
-                    frame.get_picture_data(),
+                    frame_data,
                     hotspot=frame.get_hotspot()
                 )
                 self.frames.append(subtex)
@@ -144,14 +151,14 @@ class Texture:
     def _to_subtextures(
         self,
         frame: typing.Union[SLPFrame, SMPLayer, SMXLayer],
-        main_palette: ColorTable,
+        picture_data: numpy.ndarray,
         custom_cutter: InterfaceCutter = None
     ):
         """
-        convert slp to subtexture or subtextures, using a palette.
+        convert the decoded slp frame to subtexture or subtextures.
         """
         subtex = TextureImage(
-            frame.get_picture_data(main_palette),
+            picture_data,
             hotspot=frame.get_hotspot()
         )
 
@@ -175,3 +182,33 @@ class Texture:
             - PNG compression parameters (compression level + deflate params)
         """
         return self.best_packer_hints, self.best_compr
+
+
+def _decode_frames(
+    frames: list[typing.Union[SLPFrame, SMPLayer, SMXLayer, SLDLayer]],
+    palettes: typing.Optional[list[numpy.ndarray]],
+    thread_count: int = 1
+) -> list[numpy.ndarray]:
+    """
+    Decode the RGBA pixel data of frames.
+
+    SLP, SMX and SLD frames release the GIL while they are decoded,
+    so they are decoded in parallel if more than one thread is used.
+
+    :param frames: Frames of a graphics file.
+    :param palettes: Palette of every frame, or None for SLD frames
+                     that don't use palettes.
+    :param thread_count: Number of threads used for decoding.
+    :returns: Pixel data of the frames in the same order as the frames.
+    """
+    def decode(index: int) -> numpy.ndarray:
+        if palettes is None:
+            return frames[index].get_picture_data()
+
+        return frames[index].get_picture_data(palettes[index])
+
+    if thread_count > 1 and len(frames) > 1:
+        with ThreadPoolExecutor(min(thread_count, len(frames))) as executor:
+            return list(executor.map(decode, range(len(frames))))
+
+    return [decode(index) for index in range(len(frames))]
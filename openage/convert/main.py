@@ -1,6 +1,6 @@
-# Copyright 2015-2024 the openage authors. See copying.md for legal info.
+# Copyright 2015-2026 the openage authors. See copying.md for legal info.
 #
-# pylint: disable=too-many-branches
+# pylint: disable=too-many-branches,too-many-statements
 """
 Entry point for all of the asset conversion.
 """
@@ -59,6 +59,10 @@ def convert_assets(
     if "jobs" not in vars(args):
         args.jobs = None
 
+    # Read the .dat file sequentially if the process count was not set
+    if "dat_jobs" not in vars(args):
+        args.dat_jobs = None
+
     # Set verbosity for debug output
     if "debug_info" not in vars(args) or not args.debug_info:
         if args.devmode:
@@ -211,10 +215,40 @@ def init_subparser(cli: ArgumentParser):
 
     cli.add_argument(
         "--no-pickle-cache", action='store_true',
-        help="don't use a pickle file to skip the dat file reading.")
+        help="don't use a cache file to skip the dat file reading.")
+
+    cli.add_argument(
+        "--no-media-index", action='store_true',
+        help="export all media files, even if they are unchanged since the last conversion")
+
+    cli.add_argument(
+        "--resume", action='store_true',
+        help="continue an interrupted conversion, skipping the media files it already "
+             "exported. Has no effect with --no-media-index.")
+
+    cli.add_argument(
+        "--compressed-textures", action='store_true',
+        help="export SLD graphics as BC1/BC4 compressed DDS textures without "
+             "decompressing them (experimental, not supported by the engine yet)")
+
+    cli.add_argument(
+        "--jobs", "-j", type=int, default=None,
+        help="number of worker processes for the media export; default: number of CPUs")
+
+    cli.add_argument(
+        "--dat-jobs", type=int, default=None,
+        help="number of processes that read the sections of the .dat file; "
+             "default: read the file in the main process")
+
+    cli.add_argument(
+        "--max-export-tasks", type=int, default=None,
+        help="maximum number of media files that are exported or wait for "
+             "their export at the same time; default: 4 per job")
 
     cli.add_argument(
-        "--jobs", "-j", type=int, default=None)
+        "--max-export-memory", type=int, default=None,
+        help="maximum size in MiB of the source data of the media files "
+             "that are exported or wait for their export; default: 256")
 
     cli.add_argument(
         "--interactive", "-i", action='store_true',
@@ -234,7 +268,7 @@ def init_subparser(cli: ArgumentParser):
 
     cli.add_argument(
         "--low-memory", action='store_true',
-        help="Activate low memory mode")
+        help="Activate low memory mode (decode .dat file contents on access)")
 
     cli.add_argument(
         "--export-api", action='store_true',
@@ -1,4 +1,4 @@
-# Copyright 2019-2023 the openage authors. See copying.md for legal info.
+# Copyright 2019-2026 the openage authors. See copying.md for legal info.
 #
 # pylint: disable=too-many-locals,too-few-public-methods,too-many-statements
 """
@@ -9,6 +9,7 @@ from __future__ import annotations
 import typing
 
 from openage.convert.value_object.read.media_types import MediaType
+from openage.util.instrumentation import instrument
 
 from ....entity_object.export.formats.sprite_metadata import LayerMode as SpriteLayerMode
 from ....entity_object.export.formats.terrain_metadata import LayerMode as TerrainLayerMode
@@ -29,6 +30,7 @@ class AoCMediaSubprocessor:
     """
 
     @classmethod
+    @instrument("media_requests")
     def convert(cls, full_data_set: GenieObjectContainer) -> None:
         """
         Create all export requests for the dataset.
@@ -1,4 +1,4 @@
-# Copyright 2020-2024 the openage authors. See copying.md for legal info.
+# Copyright 2020-2026 the openage authors. See copying.md for legal info.
 #
 # pylint: disable=too-many-lines,too-many-locals,too-many-statements
 #
@@ -13,6 +13,7 @@ from __future__ import annotations
 import typing
 
 from .....nyan.nyan_structs import MemberSpecialValue
+from .....util.instrumentation import instrument
 from ....entity_object.conversion.converter_object import RawAPIObject, \
     ConverterObjectGroup
 from ....service.conversion import internal_name_lookups
@@ -28,6 +29,7 @@ class AoCPregenSubprocessor:
     """
 
     @classmethod
+    @instrument("pregen")
     def generate(cls, full_data_set: GenieObjectContainer) -> None:
         """
         Create nyan objects for hardcoded properties.
@@ -1,4 +1,4 @@
-# Copyright 2019-2024 the openage authors. See copying.md for legal info.
+# Copyright 2019-2026 the openage authors. See copying.md for legal info.
 #
 # pylint: disable=too-many-lines,too-many-branches,too-many-statements
 # pylint: disable=too-many-locals,too-many-public-methods
@@ -10,6 +10,7 @@ import typing
 
 
 from .....log import info
+from .....util.instrumentation import instrument
 from ....entity_object.conversion.aoc.genie_civ import GenieCivilizationGroup
 from ....entity_object.conversion.aoc.genie_civ import GenieCivilizationObject
 from ....entity_object.conversion.aoc.genie_connection import GenieAgeConnection, \
@@ -100,6 +101,7 @@ class AoCProcessor:
         return modpacks
 
     @classmethod
+    @instrument()
     def _pre_processor(
         cls,
         gamespec: ArrayMember,
@@ -139,6 +141,7 @@ class AoCProcessor:
         return dataset
 
     @classmethod
+    @instrument()
     def _processor(cls, full_data_set: GenieObjectContainer) -> GenieObjectContainer:
         """
         Transfer structures used in Genie games to more openage-friendly
@@ -180,6 +183,7 @@ class AoCProcessor:
         return full_data_set
 
     @classmethod
+    @instrument()
     def _post_processor(cls, full_data_set: GenieObjectContainer) -> list[Modpack]:
         """
         Convert API-like Python objects to nyan.
@@ -201,6 +205,7 @@ class AoCProcessor:
         return AoCModpackSubprocessor.get_modpacks(full_data_set)
 
     @staticmethod
+    @instrument()
     def extract_genie_units(gamespec: ArrayMember, full_data_set: GenieObjectContainer) -> None:
         """
         Extract units from the game data.
@@ -240,6 +245,7 @@ class AoCProcessor:
             unit.add_member(unit_commands)
 
     @staticmethod
+    @instrument()
     def extract_genie_techs(gamespec: ArrayMember, full_data_set: GenieObjectContainer) -> None:
         """
         Extract techs from the game data.
@@ -263,6 +269,7 @@ class AoCProcessor:
             index += 1
 
     @staticmethod
+    @instrument()
     def extract_genie_effect_bundles(
         gamespec: ArrayMember,
         full_data_set: GenieObjectContainer
@@ -309,6 +316,7 @@ class AoCProcessor:
             index_bundle += 1
 
     @staticmethod
+    @instrument()
     def extract_genie_civs(
         gamespec: ArrayMember,
         full_data_set: GenieObjectContainer
@@ -338,6 +346,7 @@ class AoCProcessor:
             index += 1
 
     @staticmethod
+    @instrument()
     def extract_age_connections(gamespec: ArrayMember, full_data_set: GenieObjectContainer) -> None:
         """
         Extract age connections from the game data.
@@ -356,6 +365,7 @@ class AoCProcessor:
             full_data_set.age_connections.update({connection.get_id(): connection})
 
     @staticmethod
+    @instrument()
     def extract_building_connections(
         gamespec: ArrayMember,
         full_data_set: GenieObjectContainer
@@ -378,6 +388,7 @@ class AoCProcessor:
             full_data_set.building_connections.update({connection.get_id(): connection})
 
     @staticmethod
+    @instrument()
     def extract_unit_connections(
         gamespec: ArrayMember,
         full_data_set: GenieObjectContainer
@@ -399,6 +410,7 @@ class AoCProcessor:
             full_data_set.unit_connections.update({connection.get_id(): connection})
 
     @staticmethod
+    @instrument()
     def extract_tech_connections(
         gamespec: ArrayMember,
         full_data_set: GenieObjectContainer
@@ -420,6 +432,7 @@ class AoCProcessor:
             full_data_set.tech_connections.update({connection.get_id(): connection})
 
     @staticmethod
+    @instrument()
     def extract_genie_graphics(gamespec: ArrayMember, full_data_set: GenieObjectContainer) -> None:
         """
         Extract graphic definitions from the game data.
@@ -451,6 +464,7 @@ class AoCProcessor:
             genie_graphic.detect_subgraphics()
 
     @staticmethod
+    @instrument()
     def extract_genie_sounds(gamespec: ArrayMember, full_data_set: GenieObjectContainer) -> None:
         """
         Extract sound definitions from the game data.
@@ -469,6 +483,7 @@ class AoCProcessor:
             full_data_set.genie_sounds.update({sound.get_id(): sound})
 
     @staticmethod
+    @instrument()
     def extract_genie_terrains(gamespec: ArrayMember, full_data_set: GenieObjectContainer) -> None:
         """
         Extract terrains from the game data.
@@ -487,6 +502,7 @@ class AoCProcessor:
             full_data_set.genie_terrains.update({terrain.get_id(): terrain})
 
     @staticmethod
+    @instrument()
     def extract_genie_restrictions(
         gamespec: ArrayMember,
         full_data_set: GenieObjectContainer
@@ -510,6 +526,7 @@ class AoCProcessor:
             full_data_set.genie_terrain_restrictions.update({restriction.get_id(): restriction})
 
     @staticmethod
+    @instrument()
     def create_unit_lines(full_data_set: GenieObjectContainer) -> None:
         """
         Sort units into lines, based on information in the unit connections.
@@ -610,6 +627,7 @@ class AoCProcessor:
             full_data_set.unit_ref.update({unit_id: unit_line})
 
     @staticmethod
+    @instrument()
     def create_extra_unit_lines(full_data_set: GenieObjectContainer) -> None:
         """
         Create additional units that are not in the unit connections.
@@ -628,6 +646,7 @@ class AoCProcessor:
             full_data_set.unit_ref.update({unit_id: unit_line})
 
     @staticmethod
+    @instrument()
     def create_building_lines(full_data_set: GenieObjectContainer) -> None:
         """
         Establish building lines, based on information in the building connections.
@@ -737,6 +756,7 @@ class AoCProcessor:
                 full_data_set.unit_ref.update({building_id: building_line})
 
     @staticmethod
+    @instrument()
     def sanitize_effect_bundles(full_data_set: GenieObjectContainer) -> None:
         """
         Remove garbage data from effect bundles.
@@ -777,6 +797,7 @@ class AoCProcessor:
             bundle.sanitized = True
 
     @staticmethod
+    @instrument()
     def create_tech_groups(full_data_set: GenieObjectContainer) -> None:
         """
         Create techs from tech connections and unit upgrades/unlocks
@@ -940,6 +961,7 @@ class AoCProcessor:
             full_data_set.civ_boni.update({civ_bonus.get_id(): civ_bonus})
 
     @staticmethod
+    @instrument()
     def create_civ_groups(full_data_set: GenieObjectContainer) -> None:
         """
         Create civilization groups from civ objects.
@@ -960,6 +982,7 @@ class AoCProcessor:
             index += 1
 
     @staticmethod
+    @instrument()
     def create_villager_groups(full_data_set: GenieObjectContainer) -> None:
         """
         Create task groups and assign the relevant male and female group to a
@@ -1012,6 +1035,7 @@ class AoCProcessor:
             full_data_set.unit_ref.update({unit_id: villager})
 
     @staticmethod
+    @instrument()
     def create_ambient_groups(full_data_set: GenieObjectContainer) -> None:
         """
         Create ambient groups, mostly for resources and scenery.
@@ -1031,6 +1055,7 @@ class AoCProcessor:
             full_data_set.unit_ref.update({ambient_id: ambient_group})
 
     @staticmethod
+    @instrument()
     def create_variant_groups(full_data_set: GenieObjectContainer) -> None:
         """
         Create variant groups.
@@ -1051,6 +1076,7 @@ class AoCProcessor:
                 full_data_set.unit_ref.update({variant_id: variant_group})
 
     @staticmethod
+    @instrument()
     def create_terrain_groups(full_data_set: GenieObjectContainer) -> None:
         """
         Create terrain groups.
@@ -1077,6 +1103,7 @@ class AoCProcessor:
                 full_data_set.terrain_groups.update({terrain.get_id(): terrain_group})
 
     @staticmethod
+    @instrument()
     def link_building_upgrades(full_data_set: GenieObjectContainer) -> None:
         """
         Find building upgrades in the AgeUp techs and append them to the building lines.
@@ -1109,6 +1136,7 @@ class AoCProcessor:
                 full_data_set.unit_ref.update({upgrade_target_id: upgraded_line})
 
     @staticmethod
+    @instrument()
     def link_creatables(full_data_set: GenieObjectContainer) -> None:
         """
         Link creatable units and buildings to their creating entity. This is done
@@ -1142,6 +1170,7 @@ class AoCProcessor:
                     full_data_set.unit_lines[train_location_id].add_creatable(building_line)
 
     @staticmethod
+    @instrument()
     def link_researchables(full_data_set: GenieObjectContainer) -> None:
         """
         Link techs to their buildings. This is done
@@ -1160,6 +1189,7 @@ class AoCProcessor:
                 full_data_set.building_lines[research_location_id].add_researchable(tech)
 
     @staticmethod
+    @instrument()
     def link_civ_uniques(full_data_set: GenieObjectContainer) -> None:
         """
         Link civ bonus techs, unique units and unique techs to their civs.
@@ -1199,6 +1229,7 @@ class AoCProcessor:
                 full_data_set.civ_groups[civ_id].add_unique_tech(tech_group)
 
     @staticmethod
+    @instrument()
     def link_gatherers_to_dropsites(full_data_set: GenieObjectContainer) -> None:
         """
         Link gatherers to the buildings they drop resources off. This is done
@@ -1224,6 +1255,7 @@ class AoCProcessor:
                         drop_site.add_gatherer_id(unit_id)
 
     @staticmethod
+    @instrument()
     def link_garrison(full_data_set: GenieObjectContainer) -> None:
         """
         Link a garrison unit to the lines that are stored and vice versa. This is done
@@ -1337,6 +1369,7 @@ class AoCProcessor:
                             garrison_line.garrison_entities.append(unit_line)
 
     @staticmethod
+    @instrument()
     def link_trade_posts(full_data_set: GenieObjectContainer) -> None:
         """
         Link a trade post building to the lines that it trades with.
@@ -1367,6 +1400,7 @@ class AoCProcessor:
                         full_data_set.building_lines[trade_post_id].add_trading_line(unit_line)
 
     @staticmethod
+    @instrument()
     def link_repairables(full_data_set: GenieObjectContainer) -> None:
         """
         Set units/buildings as repairable
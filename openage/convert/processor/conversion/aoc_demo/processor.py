@@ -1,4 +1,4 @@
-# Copyright 2023-2023 the openage authors. See copying.md for legal info.
+# Copyright 2023-2026 the openage authors. See copying.md for legal info.
 #
 # pylint: disable=too-few-public-methods
 
@@ -9,6 +9,7 @@ from __future__ import annotations
 import typing
 
 from .....log import info
+from .....util.instrumentation import instrument
 from ....service.debug_info import debug_converter_objects, \
     debug_converter_object_groups
 from ..aoc.processor import AoCProcessor
@@ -72,6 +73,7 @@ class DemoProcessor:
         return modpacks
 
     @classmethod
+    @instrument()
     def _post_processor(cls, full_data_set: GenieObjectContainer) -> list[Modpack]:
         """
         Convert API-like Python objects to nyan.
@@ -1,4 +1,4 @@
-# Copyright 2021-2024 the openage authors. See copying.md for legal info.
+# Copyright 2021-2026 the openage authors. See copying.md for legal info.
 
 """
 Convert data from DE1 to openage formats.
@@ -8,6 +8,7 @@ import typing
 
 
 from .....log import info
+from .....util.instrumentation import instrument
 from ....entity_object.conversion.aoc.genie_graphic import GenieGraphic
 from ....entity_object.conversion.aoc.genie_object_container import GenieObjectContainer
 from ....service.debug_info import debug_converter_objects, \
@@ -73,6 +74,7 @@ class DE1Processor:
         return modpacks
 
     @classmethod
+    @instrument()
     def _pre_processor(
         cls,
         gamespec: ArrayMember,
@@ -112,6 +114,7 @@ class DE1Processor:
         return dataset
 
     @classmethod
+    @instrument()
     def _processor(
         cls,
         gamespec: ArrayMember,
@@ -154,6 +157,7 @@ class DE1Processor:
         return full_data_set
 
     @classmethod
+    @instrument()
     def _post_processor(cls, full_data_set: GenieObjectContainer) -> list[Modpack]:
         """
         Convert API-like Python objects to nyan.
@@ -174,6 +178,7 @@ class DE1Processor:
         return DE1ModpackSubprocessor.get_modpacks(full_data_set)
 
     @staticmethod
+    @instrument()
     def extract_genie_graphics(gamespec: ArrayMember, full_data_set: GenieObjectContainer) -> None:
         """
         Extract graphic definitions from the game data.
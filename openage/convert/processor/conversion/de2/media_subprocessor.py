@@ -1,4 +1,4 @@
-# Copyright 2020-2023 the openage authors. See copying.md for legal info.
+# Copyright 2020-2026 the openage authors. See copying.md for legal info.
 #
 # pylint: disable=too-many-locals
 """
@@ -8,6 +8,7 @@ requests. Subroutine of the main DE2 processor.
 from __future__ import annotations
 import typing
 
+from .....util.instrumentation import instrument
 from ....entity_object.export.formats.sprite_metadata import LayerMode
 from ....entity_object.export.media_export_request import MediaExportRequest
 from ....entity_object.export.metadata_export import SpriteMetadataExport
@@ -25,6 +26,7 @@ class DE2MediaSubprocessor:
     """
 
     @classmethod
+    @instrument("media_requests")
     def convert(cls, full_data_set: GenieObjectContainer) -> None:
         """
         Create all export requests for the dataset.
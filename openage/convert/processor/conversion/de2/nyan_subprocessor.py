@@ -1,4 +1,4 @@
-# Copyright 2020-2024 the openage authors. See copying.md for legal info.
+# Copyright 2020-2026 the openage authors. See copying.md for legal info.
 #
 # pylint: disable=too-many-lines,too-many-locals,too-many-statements,too-many-branches
 #
@@ -11,6 +11,7 @@ main DE2 processor.
 from __future__ import annotations
 import typing
 
+from .....util.instrumentation import instrument
 from ....entity_object.conversion.aoc.genie_tech import UnitLineUpgrade
 from ....entity_object.conversion.aoc.genie_unit import GenieVillagerGroup, \
     GenieGarrisonMode, GenieMonkGroup
@@ -42,6 +43,7 @@ class DE2NyanSubprocessor:
     """
 
     @classmethod
+    @instrument("nyan")
     def convert(cls, full_data_set: GenieObjectContainer) -> None:
         """
         Create nyan objects from the given dataset.
@@ -53,6 +55,7 @@ class DE2NyanSubprocessor:
         cls._check_objects(full_data_set)
 
     @classmethod
+    @instrument()
     def _check_objects(cls, full_data_set: GenieObjectContainer) -> None:
         """
         Check if objects are valid.
@@ -79,6 +82,7 @@ class DE2NyanSubprocessor:
             civ_group.check_readiness()
 
     @classmethod
+    @instrument()
     def _create_nyan_objects(cls, full_data_set: GenieObjectContainer) -> None:
         """
         Creates nyan objects from the API objects.
@@ -112,6 +116,7 @@ class DE2NyanSubprocessor:
             civ_group.execute_raw_member_pushs()
 
     @classmethod
+    @instrument()
     def _create_nyan_members(cls, full_data_set: GenieObjectContainer) -> None:
         """
         Fill nyan member values of the API objects.
@@ -138,6 +143,7 @@ class DE2NyanSubprocessor:
             civ_group.create_nyan_members()
 
     @classmethod
+    @instrument()
     def _process_game_entities(cls, full_data_set: GenieObjectContainer) -> None:
         """
         Create the RawAPIObject representation of the objects.
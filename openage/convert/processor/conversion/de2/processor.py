@@ -1,4 +1,4 @@
-# Copyright 2020-2024 the openage authors. See copying.md for legal info.
+# Copyright 2020-2026 the openage authors. See copying.md for legal info.
 #
 # pylint: disable=line-too-long,too-many-lines,too-many-branches,too-many-statements
 """
@@ -9,6 +9,7 @@ import typing
 
 
 from openage.convert.value_object.read.value_members import ArrayMember, StorageType
+from openage.util.instrumentation import instrument
 import openage.convert.value_object.conversion.aoc.internal_nyan_names as aoc_internal
 import openage.convert.value_object.conversion.de2.internal_nyan_names as de2_internal
 
@@ -79,6 +80,7 @@ class DE2Processor:
         return modpacks
 
     @classmethod
+    @instrument()
     def _pre_processor(
         cls,
         gamespec: ArrayMember,
@@ -118,6 +120,7 @@ class DE2Processor:
         return dataset
 
     @classmethod
+    @instrument()
     def _processor(cls, full_data_set: GenieObjectContainer) -> GenieObjectContainer:
         """
         Transfer structures used in Genie games to more openage-friendly
@@ -160,6 +163,7 @@ class DE2Processor:
         return full_data_set
 
     @classmethod
+    @instrument()
     def _post_processor(cls, full_data_set: GenieObjectContainer) -> list[Modpack]:
         """
         Convert API-like Python objects to nyan.
@@ -180,6 +184,7 @@ class DE2Processor:
         return DE2ModpackSubprocessor.get_modpacks(full_data_set)
 
     @staticmethod
+    @instrument()
     def extract_genie_units(gamespec: ArrayMember, full_data_set: GenieObjectContainer) -> None:
         """
         Extract units from the game data.
@@ -230,6 +235,7 @@ class DE2Processor:
                     unit.add_member(unit_commands)
 
     @staticmethod
+    @instrument()
     def extract_genie_graphics(gamespec: ArrayMember, full_data_set: GenieObjectContainer) -> None:
         """
         Extract graphic definitions from the game data.
@@ -260,6 +266,7 @@ class DE2Processor:
             genie_graphic.detect_subgraphics()
 
     @staticmethod
+    @instrument()
     def create_ambient_groups(full_data_set: GenieObjectContainer) -> None:
         """
         Create ambient groups, mostly for resources and scenery.
@@ -281,6 +288,7 @@ class DE2Processor:
             full_data_set.unit_ref.update({ambient_id: ambient_group})
 
     @staticmethod
+    @instrument()
     def create_variant_groups(full_data_set: GenieObjectContainer) -> None:
         """
         Create variant groups.
@@ -303,6 +311,7 @@ class DE2Processor:
                 full_data_set.unit_ref.update({variant_id: variant_group})
 
     @staticmethod
+    @instrument()
     def create_extra_building_lines(full_data_set: GenieObjectContainer) -> None:
         """
         Create additional units that are not in the building connections.
@@ -1,4 +1,4 @@
-# Copyright 2021-2023 the openage authors. See copying.md for legal info.
+# Copyright 2021-2026 the openage authors. See copying.md for legal info.
 #
 # pylint: disable=too-many-locals,too-many-statements
 
@@ -9,6 +9,7 @@ requests. Subroutine of the main HD processor.
 from __future__ import annotations
 import typing
 
+from .....util.instrumentation import instrument
 from ....entity_object.export.formats.sprite_metadata import LayerMode as SpriteLayerMode
 from ....entity_object.export.formats.terrain_metadata import LayerMode as TerrainLayerMode
 from ....entity_object.export.media_export_request import MediaExportRequest
@@ -28,6 +29,7 @@ class HDMediaSubprocessor:
     """
 
     @classmethod
+    @instrument("media_requests")
     def convert(cls, full_data_set: GenieObjectContainer) -> None:
         """
         Create all export requests for the dataset.
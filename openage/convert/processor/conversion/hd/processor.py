@@ -1,4 +1,4 @@
-# Copyright 2021-2024 the openage authors. See copying.md for legal info.
+# Copyright 2021-2026 the openage authors. See copying.md for legal info.
 #
 # pylint: disable=too-few-public-methods
 
@@ -10,6 +10,7 @@ import typing
 
 
 from .....log import info
+from .....util.instrumentation import instrument
 from ....entity_object.conversion.aoc.genie_object_container import GenieObjectContainer
 from ....service.debug_info import debug_converter_objects, \
     debug_converter_object_groups
@@ -73,6 +74,7 @@ class HDProcessor:
         return modpacks
 
     @classmethod
+    @instrument()
     def _pre_processor(
         cls,
         gamespec: ArrayMember,
@@ -112,6 +114,7 @@ class HDProcessor:
         return dataset
 
     @classmethod
+    @instrument()
     def _processor(cls, full_data_set: GenieObjectContainer) -> GenieObjectContainer:
         """
         Transfer structures used in Genie games to more openage-friendly
@@ -153,6 +156,7 @@ class HDProcessor:
         return full_data_set
 
     @classmethod
+    @instrument()
     def _post_processor(cls, full_data_set: GenieObjectContainer) -> list[Modpack]:
         """
         Convert API-like Python objects to nyan.
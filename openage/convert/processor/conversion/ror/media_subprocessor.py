@@ -1,4 +1,4 @@
-# Copyright 2021-2022 the openage authors. See copying.md for legal info.
+# Copyright 2021-2026 the openage authors. See copying.md for legal info.
 #
 # pylint: disable=too-many-locals,too-few-public-methods
 """
@@ -9,6 +9,7 @@ from __future__ import annotations
 import typing
 
 from openage.convert.processor.conversion.aoc.media_subprocessor import AoCMediaSubprocessor
+from openage.util.instrumentation import instrument
 
 if typing.TYPE_CHECKING:
     from openage.convert.entity_object.conversion.aoc.genie_object_container\
@@ -21,6 +22,7 @@ class RoRMediaSubprocessor:
     """
 
     @classmethod
+    @instrument("media_requests")
     def convert(cls, full_data_set: GenieObjectContainer) -> None:
         """
         Create all export requests for the dataset.
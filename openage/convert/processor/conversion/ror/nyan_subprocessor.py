@@ -1,4 +1,4 @@
-# Copyright 2020-2024 the openage authors. See copying.md for legal info.
+# Copyright 2020-2026 the openage authors. See copying.md for legal info.
 #
 # pylint: disable=too-many-lines,too-many-locals,too-many-statements,too-many-branches
 #
@@ -9,6 +9,7 @@
 Convert API-like objects to nyan objects. Subroutine of the
 main RoR processor. Reuses functionality from the AoC subprocessor.
 """
+from .....util.instrumentation import instrument
 from ....entity_object.conversion.aoc.genie_unit import GenieVillagerGroup
 from ....entity_object.conversion.combined_terrain import CombinedTerrain
 from ....entity_object.conversion.converter_object import RawAPIObject
@@ -32,6 +33,7 @@ class RoRNyanSubprocessor:
     """
 
     @classmethod
+    @instrument("nyan")
     def convert(cls, gamedata):
         """
         Create nyan objects from the given dataset.
@@ -43,6 +45,7 @@ class RoRNyanSubprocessor:
         cls._check_objects(gamedata)
 
     @classmethod
+    @instrument()
     def _check_objects(cls, full_data_set):
         """
         Check if objects are valid.
@@ -69,6 +72,7 @@ class RoRNyanSubprocessor:
             civ_group.check_readiness()
 
     @classmethod
+    @instrument()
     def _create_nyan_objects(cls, full_data_set):
         """
         Creates nyan objects from the API objects.
@@ -102,6 +106,7 @@ class RoRNyanSubprocessor:
             civ_group.execute_raw_member_pushs()
 
     @classmethod
+    @instrument()
     def _create_nyan_members(cls, full_data_set):
         """
         Fill nyan member values of the API objects.
@@ -128,6 +133,7 @@ class RoRNyanSubprocessor:
             civ_group.create_nyan_members()
 
     @classmethod
+    @instrument()
     def _process_game_entities(cls, full_data_set):
         """
         Create the RawAPIObject representation of the objects.
@@ -1,4 +1,4 @@
-# Copyright 2020-2024 the openage authors. See copying.md for legal info.
+# Copyright 2020-2026 the openage authors. See copying.md for legal info.
 #
 # pylint: disable=too-many-locals
 
@@ -9,6 +9,7 @@ but configurable in openage. E.g. HP.
 from __future__ import annotations
 import typing
 
+from .....util.instrumentation import instrument
 from ....entity_object.conversion.converter_object import ConverterObjectGroup, \
     RawAPIObject
 from ....value_object.conversion.forward_ref import ForwardRef
@@ -25,6 +26,7 @@ class RoRPregenSubprocessor:
     """
 
     @classmethod
+    @instrument("pregen")
     def generate(cls, full_data_set: GenieObjectContainer) -> None:
         """
         Create nyan objects for hardcoded properties.
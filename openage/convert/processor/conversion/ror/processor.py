@@ -1,4 +1,4 @@
-# Copyright 2020-2024 the openage authors. See copying.md for legal info.
+# Copyright 2020-2026 the openage authors. See copying.md for legal info.
 #
 # pylint: disable=line-too-long,too-many-lines,too-many-branches,too-many-statements,too-many-locals
 """
@@ -8,6 +8,7 @@ from __future__ import annotations
 import typing
 
 from .....log import info
+from .....util.instrumentation import instrument
 from ....entity_object.conversion.aoc.genie_object_container import GenieObjectContainer
 from ....entity_object.conversion.aoc.genie_tech import InitiatedTech
 from ....entity_object.conversion.aoc.genie_unit import GenieUnitObject
@@ -82,6 +83,7 @@ class RoRProcessor:
         return modpacks
 
     @classmethod
+    @instrument()
     def _pre_processor(
         cls,
         gamespec: ArrayMember,
@@ -121,6 +123,7 @@ class RoRProcessor:
         return dataset
 
     @classmethod
+    @instrument()
     def _processor(cls, gamespec: ArrayMember, full_data_set: GenieObjectContainer) -> GenieObjectContainer:
         """
         Transfer structures used in Genie games to more openage-friendly
@@ -159,6 +162,7 @@ class RoRProcessor:
         return full_data_set
 
     @classmethod
+    @instrument()
     def _post_processor(cls, full_data_set: GenieObjectContainer) -> list[Modpack]:
         """
         Convert API-like Python objects to nyan.
@@ -179,6 +183,7 @@ class RoRProcessor:
         return RoRModpackSubprocessor.get_modpacks(full_data_set)
 
     @staticmethod
+    @instrument()
     def extract_genie_units(gamespec: ArrayMember, full_data_set: GenieObjectContainer) -> None:
         """
         Extract units from the game data.
@@ -223,6 +228,7 @@ class RoRProcessor:
         full_data_set.genie_units = dict(sorted(full_data_set.genie_units.items()))
 
     @staticmethod
+    @instrument()
     def extract_genie_sounds(gamespec: ArrayMember, full_data_set: GenieObjectContainer) -> None:
         """
         Extract sound definitions from the game data.
@@ -240,6 +246,7 @@ class RoRProcessor:
             full_data_set.genie_sounds.update({sound.get_id(): sound})
 
     @staticmethod
+    @instrument()
     def create_entity_lines(gamespec: ArrayMember, full_data_set: GenieObjectContainer) -> None:
         """
         Sort units/buildings into lines, based on information from techs and civs.
@@ -406,6 +413,7 @@ class RoRProcessor:
                     full_data_set.unit_ref.update({target_id: unit_line})
 
     @staticmethod
+    @instrument()
     def create_ambient_groups(full_data_set: GenieObjectContainer) -> None:
         """
         Create ambient groups, mostly for resources and scenery.
@@ -425,6 +433,7 @@ class RoRProcessor:
             full_data_set.unit_ref.update({ambient_id: ambient_group})
 
     @staticmethod
+    @instrument()
     def create_variant_groups(full_data_set: GenieObjectContainer) -> None:
         """
         Create variant groups.
@@ -445,6 +454,7 @@ class RoRProcessor:
                 full_data_set.unit_ref.update({variant_id: variant_group})
 
     @staticmethod
+    @instrument()
     def create_tech_groups(full_data_set: GenieObjectContainer) -> None:
         """
         Create techs from tech connections and unit upgrades/unlocks
@@ -582,6 +592,7 @@ class RoRProcessor:
             full_data_set.initiated_techs.update({initiated_tech.get_id(): initiated_tech})
 
     @staticmethod
+    @instrument()
     def link_garrison(full_data_set: GenieObjectContainer) -> None:
         """
         Link a garrison unit to the lines that are stored and vice versa. This is done
@@ -625,6 +636,7 @@ class RoRProcessor:
                     line.garrison_locations.append(garrison)
 
     @staticmethod
+    @instrument()
     def link_repairables(full_data_set: GenieObjectContainer) -> None:
         """
         Set units/buildings as repairable
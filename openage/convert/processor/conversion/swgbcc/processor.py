@@ -1,4 +1,4 @@
-# Copyright 2020-2024 the openage authors. See copying.md for legal info.
+# Copyright 2020-2026 the openage authors. See copying.md for legal info.
 #
 # pylint: disable=too-many-lines,too-many-branches,too-many-statements,too-many-locals
 #
@@ -12,6 +12,7 @@ import typing
 
 
 from openage.convert.entity_object.conversion.aoc.genie_tech import BuildingUnlock
+from openage.util.instrumentation import instrument
 from .....log import info
 from ....entity_object.conversion.aoc.genie_object_container import GenieObjectContainer
 from ....entity_object.conversion.aoc.genie_tech import BuildingLineUpgrade, \
@@ -88,6 +89,7 @@ class SWGBCCProcessor:
         return modpacks
 
     @classmethod
+    @instrument()
     def _pre_processor(
         cls,
         gamespec: ArrayMember,
@@ -131,6 +133,7 @@ class SWGBCCProcessor:
         return dataset
 
     @classmethod
+    @instrument()
     def _processor(cls, full_data_set: GenieObjectContainer) -> GenieObjectContainer:
         """
         Transfer structures used in Genie games to more openage-friendly
@@ -172,6 +175,7 @@ class SWGBCCProcessor:
         return full_data_set
 
     @classmethod
+    @instrument()
     def _post_processor(cls, full_data_set: GenieObjectContainer) -> list[Modpack]:
         """
         Convert API-like Python objects to nyan.
@@ -193,6 +197,7 @@ class SWGBCCProcessor:
         return SWGBCCModpackSubprocessor.get_modpacks(full_data_set)
 
     @staticmethod
+    @instrument()
     def create_unit_lines(full_data_set: GenieObjectContainer) -> None:
         """
         Sort units into lines, based on information in the unit connections.
@@ -332,6 +337,7 @@ class SWGBCCProcessor:
         full_data_set.unit_lines.update(final_unit_lines)
 
     @staticmethod
+    @instrument()
     def create_extra_unit_lines(full_data_set: GenieObjectContainer) -> None:
         """
         Create additional units that are not in the unit connections.
@@ -352,6 +358,7 @@ class SWGBCCProcessor:
             full_data_set.unit_ref.update({unit_id: unit_line})
 
     @staticmethod
+    @instrument()
     def create_building_lines(full_data_set: GenieObjectContainer) -> None:
         """
         Establish building lines, based on information in the building connections.
@@ -512,6 +519,7 @@ class SWGBCCProcessor:
             full_data_set.building_upgrades.update({building_upgrade.get_id(): building_upgrade})
 
     @staticmethod
+    @instrument()
     def create_villager_groups(full_data_set: GenieObjectContainer) -> None:
         """
         Create task groups and assign the relevant worker group to a
@@ -568,6 +576,7 @@ class SWGBCCProcessor:
             full_data_set.unit_ref.update({unit_id: villager})
 
     @staticmethod
+    @instrument()
     def create_ambient_groups(full_data_set: GenieObjectContainer) -> None:
         """
         Create ambient groups, mostly for resources and scenery.
@@ -587,6 +596,7 @@ class SWGBCCProcessor:
             full_data_set.unit_ref.update({ambient_id: ambient_group})
 
     @staticmethod
+    @instrument()
     def create_variant_groups(full_data_set: GenieObjectContainer) -> None:
         """
         Create variant groups.
@@ -607,6 +617,7 @@ class SWGBCCProcessor:
                 full_data_set.unit_ref.update({variant_id: variant_group})
 
     @staticmethod
+    @instrument()
     def create_tech_groups(full_data_set: GenieObjectContainer) -> None:
         """
         Create techs from tech connections and unit upgrades/unlocks
@@ -777,6 +788,7 @@ class SWGBCCProcessor:
             full_data_set.civ_boni.update({civ_bonus.get_id(): civ_bonus})
 
     @staticmethod
+    @instrument()
     def link_garrison(full_data_set: GenieObjectContainer) -> None:
         """
         Link a garrison unit to the lines that are stored and vice versa. This is done
@@ -895,6 +907,7 @@ class SWGBCCProcessor:
                             garrison_line.garrison_entities.append(unit_line)
 
     @staticmethod
+    @instrument()
     def link_repairables(full_data_set: GenieObjectContainer) -> None:
         """
         Set units/buildings as repairable
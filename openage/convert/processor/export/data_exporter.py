@@ -1,4 +1,4 @@
-# Copyright 2021-2022 the openage authors. See copying.md for legal info.
+# Copyright 2021-2026 the openage authors. See copying.md for legal info.
 #
 # pylint: disable=too-few-public-methods
 """
@@ -8,6 +8,10 @@ Exports data formats from a modpack to files.
 from __future__ import annotations
 import typing
 
+import os
+
+from ...service.export.media_writer import HASH_ALGO
+from ....util.hash import hash_data
 
 if typing.TYPE_CHECKING:
     from openage.util.fslike.directory import Directory
@@ -20,7 +24,7 @@ class DataExporter:
     """
 
     @staticmethod
-    def export(data_files: list[DataDefinition], exportdir: Directory) -> None:
+    def export(data_files: list[DataDefinition], exportdir: Directory) -> dict[str, str]:
         """
         Exports data files.
 
@@ -29,11 +33,20 @@ class DataExporter:
                           and target filename should be stored in the export request.
         :type exportdir: Directory
         :type data_files: list
+        :returns: Hash values of the resulting files by their path relative to exportdir.
+        :rtype: dict
         """
+        file_hashes = {}
         for data_file in data_files:
             output_dir = exportdir.joinpath(data_file.targetdir)
-            output_content = data_file.dump()
+            output_content = data_file.dump().encode('utf-8')
+            output_path = output_dir[data_file.filename]
 
             # generate human-readable file
-            with output_dir[data_file.filename].open('wb') as outfile:
-                outfile.write(output_content.encode('utf-8'))
+            with output_path.open('wb') as outfile:
+                outfile.write(output_content)
+
+            relative_path = os.path.relpath(str(output_path), str(exportdir))
+            file_hashes[relative_path] = hash_data(output_content, HASH_ALGO)
+
+        return file_hashes
@@ -0,0 +1,113 @@
+# Copyright 2026-2026 the openage authors. See copying.md for legal info.
+#
+# pylint: disable=too-many-arguments,too-many-instance-attributes
+"""
+Export jobs for the source files of media export requests.
+"""
+from __future__ import annotations
+import typing
+
+from ...service.export.export_cost import HEADER_SIZE, estimate_export_cost, has_frame_count
+from ...service.export.media_source import get_media_source
+
+if typing.TYPE_CHECKING:
+    from openage.convert.entity_object.export.media_export_request import MediaExportRequest
+    from openage.convert.service.export.media_source import MediaSource
+    from openage.util.fslike.path import Path
+
+
+class ExportJob:
+    """
+    Export of the source file of a media export request.
+    """
+
+    __slots__ = ("request", "source_path", "target_path", "source", "cost", "export_func",
+                 "kwargs", "handle_result_func", "inputs", "aliases")
+
+    def __init__(
+        self,
+        request: MediaExportRequest,
+        source_path: Path,
+        target_path: Path,
+        export_func: typing.Callable,
+        kwargs: dict,
+        handle_result_func: typing.Callable | None
+    ):
+        """
+        :param request: Export request for a media file.
+        :param source_path: Path to the source file.
+        :param target_path: Path to the resulting file.
+        :param export_func: Function for exporting the source file data.
+        :param kwargs: Keyword arguments for the export function.
+        :param handle_result_func: Optional function for handling the result of the export function.
+        """
+        self.request = request
+        self.source_path = source_path
+        self.target_path = target_path
+        self.export_func = export_func
+        self.kwargs = kwargs
+        self.handle_result_func = handle_result_func
+
+        # Inputs of the export in the media index, if the index is used
+        self.inputs = None
+
+        # Jobs with the same source file and export settings. Their resulting
+        # files are linked to the files created by this job.
+        self.aliases: list[ExportJob] = []
+
+        # Descriptor for reading the source file in a worker process, if the
+        # file is stored natively (e.g. a loose file or a DRS archive)
+        self.source = get_media_source(source_path)
+
+        # Estimated time for exporting the file
+        file_ext = source_path.suffix.lower()[1:]
+        header = None
+        if has_frame_count(file_ext):
+            header = self.read_source(HEADER_SIZE)
+
+        self.cost = estimate_export_cost(file_ext, source_path.filesize, header)
+
+    def read_source(self, size: int = None) -> bytes:
+        """
+        Read the source file data.
+
+        :param size: Maximum number of bytes that are read. None reads the whole file.
+        """
+        if self.source is not None:
+            return self.source.read(size)
+
+        with self.source_path.open("rb") as source_file:
+            return source_file.read(-1 if size is None else size)
+
+    def get_source_data(self) -> bytes | MediaSource:
+        """
+        Return the source file data that is passed to the export function.
+
+        If the source file is stored natively, this is a descriptor, so
+        that the worker can read the file by itself and the data isn't
+        copied through the worker pool.
+        """
+        if self.source is not None:
+            return self.source
+
+        return self.read_source()
+
+    def get_source_key(self) -> tuple:
+        """
+        Return a key that is equal for all jobs that create the same files.
+
+        If the source file was hashed for the media index, jobs with
+        byte-identical source files have the same key. Otherwise, the
+        location of the source file is used.
+        """
+        inputs = self.inputs or {}
+        if inputs.get("source_hash") is not None:
+            return (inputs["source_hash"], inputs["params_hash"])
+
+        if self.source is not None:
+            source_location = (self.source.native_path, self.source.offset, self.source.size)
+
+        else:
+            source_location = self.source_path.parts
+
+        return (self.export_func, repr(self.kwargs), source_location)
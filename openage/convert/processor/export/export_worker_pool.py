@@ -0,0 +1,337 @@
+# Copyright 2026-2026 the openage authors. See copying.md for legal info.
+
+"""
+Worker processes that export the media files of a conversion run.
+"""
+from __future__ import annotations
+import typing
+
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+from ....log import info
+from ....util.hash import hash_data
+from ....util.instrumentation import get_peak_rss
+from ...service.export.load_media_cache import load_media_cache
+from ...service.export.media_source import read_media_source
+from ...service.export.media_writer import HASH_ALGO, pop_media_files
+
+if typing.TYPE_CHECKING:
+    from argparse import Namespace
+
+    from openage.util.fslike.path import Path
+
+
+# data used by all export calls in the current process, see get_worker_context()
+_WORKER_CONTEXT: dict[str, typing.Any] = {}
+
+# Default number of tasks per worker that can be in flight at the same time
+DEFAULT_TASKS_PER_WORKER = 4
+
+# Default size of the source data of the tasks in flight in MiB
+DEFAULT_TASK_MEMORY = 256
+
+
+def _set_worker_context(context: dict[str, typing.Any]) -> None:
+    """
+    Store the data used by all export calls in the current process.
+    """
+    _WORKER_CONTEXT.clear()
+    _WORKER_CONTEXT.update(context)
+
+
+def _init_worker(context: dict[str, typing.Any]) -> None:
+    """
+    Initializer of the worker processes.
+
+    :param context: Data used by all export calls.
+    """
+    if sys.platform == "win32" and context["dll_manager"] is not None:
+        context["dll_manager"].add_directories()
+
+    _set_worker_context(context)
+
+
+def _run_export(
+    task: tuple[int, typing.Callable, tuple, dict, bool]
+) -> tuple[int, typing.Any, float, list[tuple[Path, bytes, str]], str | None]:
+    """
+    Run an export function in a worker process.
+
+    :param task: ID of the export job, the export function with its
+                 arguments and keyword arguments, and whether the source
+                 file data (the first argument) is hashed.
+    :returns: ID of the export job, the result of the export function,
+              the time it took in seconds, the files it created and
+              the hash value of the source file if it was requested.
+    """
+    job_id, export_func, args, kwargs, hash_source = task
+
+    # discard the files of a previous call that failed
+    pop_media_files()
+
+    source_hash = None
+    if hash_source:
+        source_hash = hash_data(read_media_source(args[0]), HASH_ALGO)
+
+    start_time = time.perf_counter()
+    result = export_func(*args, **kwargs)
+
+    return job_id, result, time.perf_counter() - start_time, pop_media_files(), source_hash
+
+
+def _get_task_size(task: tuple[int, typing.Callable, tuple, dict, bool]) -> int:
+    """
+    Get the size of the data that is sent to a worker with an export call.
+
+    :param task: Export call, see _run_export().
+    """
+    return sum(
+        len(arg) for arg in task[2]
+        if isinstance(arg, (bytes, bytearray, memoryview))
+    )
+
+
+class _TaskWindow:
+    """
+    Limits the number of export tasks in flight and the size of their data.
+
+    A task is in flight from when it is passed to the worker pool until its
+    result is consumed. This keeps the memory of the main process flat,
+    because the worker pool would otherwise read all tasks at once and
+    queue their source data.
+    """
+
+    def __init__(self, max_tasks: int, max_size: int):
+        """
+        :param max_tasks: Maximum number of tasks in flight.
+        :param max_size: Maximum size of the data of the tasks in flight in bytes.
+                         A larger task is started when no other task is in flight.
+        """
+        self.max_tasks = max_tasks
+        self.max_size = max_size
+
+        # sizes of the tasks in flight by job ID
+        self.task_sizes: dict[int, int] = {}
+        self.size = 0
+
+        self.closed = False
+        self.condition = threading.Condition()
+
+    def acquire(self, job_id: int, size: int) -> bool:
+        """
+        Wait until a task can be started.
+
+        :param job_id: ID of the export job.
+        :param size: Size of the data of the task in bytes.
+        :returns: False if the window was closed in the meantime.
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: self.closed or not self.task_sizes or (
+                len(self.task_sizes) < self.max_tasks and
+                self.size + size <= self.max_size
+            ))
+
+            if self.closed:
+                return False
+
+            self.task_sizes[job_id] = size
+            self.size += size
+
+        return True
+
+    def release(self, job_id: int) -> None:
+        """
+        Remove a finished task.
+
+        :param job_id: ID of the export job.
+        """
+        with self.condition:
+            self.size -= self.task_sizes.pop(job_id)
+            self.condition.notify_all()
+
+    def close(self) -> None:
+        """
+        Stop waiting tasks, e.g. because the results are no longer consumed.
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+
+def get_worker_context() -> dict[str, typing.Any]:
+    """
+    Return the data that is shared by all export calls of a conversion run:
+
+        - palettes: Palettes used by the game.
+        - compression_level: PNG compression level for the resulting image files.
+        - game_version: Game edition and expansion info.
+        - cache_info: Media cache information with compression parameters from a previous run.
+
+    Only available in export functions that are run by an ExportWorkerPool.
+    """
+    return _WORKER_CONTEXT
+
+
+class ExportWorkerPool:
+    """
+    Worker processes for the export functions of all media types and modpacks
+    of a conversion run.
+
+    The data that is the same for all export calls (palettes, game version, etc.)
+    is sent to the workers only once, when they are started. The processes are
+    started on first use and are reused until the pool is closed.
+
+    The number of export calls in flight and the size of their source data are
+    limited, so that the memory usage doesn't grow with the number of files.
+    """
+
+    def __init__(self, args: Namespace):
+        """
+        :param args: Converter arguments.
+        """
+        self.job_count = args.jobs
+
+        max_tasks = getattr(args, "max_export_tasks", None)
+        if max_tasks is None:
+            max_tasks = DEFAULT_TASKS_PER_WORKER * self.get_worker_count()
+
+        max_memory = getattr(args, "max_export_memory", None)
+        if max_memory is None:
+            max_memory = DEFAULT_TASK_MEMORY
+
+        self.max_tasks = max(max_tasks, 1)
+        self.max_size = max_memory * 1024 ** 2
+
+        # window of the running export calls
+        self.window: _TaskWindow | None = None
+
+        cache_info = {}
+        if args.game_version.edition.media_cache:
+            cache_info = load_media_cache(args.game_version.edition.media_cache)
+
+        self.context = {
+            "palettes": args.palettes,
+            "compression_level": args.compression_level,
+            "game_version": args.game_version,
+            "cache_info": cache_info,
+            "dll_manager": args.dll_manager,
+        }
+
+        self.pool = None
+
+    def run(
+        self,
+        tasks: typing.Iterable[tuple[int, typing.Callable, tuple, dict, bool]]
+    ) -> typing.Iterator[tuple[int, typing.Any, float, list[tuple[Path, bytes, str]],
+                               str | None]]:
+        """
+        Run export calls and return their results in the order they are finished.
+
+        The tasks are consumed while the workers are running, so they
+        can be created lazily by a generator. A task is only consumed when
+        it fits into the window of tasks in flight.
+
+        :param tasks: ID of the export job, the export function with its
+                      arguments and keyword arguments, and whether the source
+                      file data (the first argument) is hashed.
+        :returns: IDs of the export jobs, the results of the export functions,
+                  the time they took in seconds, the files they created
+                  (see openage.convert.service.export.media_writer) and
+                  the hash values of the source files if they were requested.
+        """
+        window = _TaskWindow(self.max_tasks, self.max_size)
+        self.window = window
+
+        def get_window_tasks() -> typing.Generator[tuple[int, typing.Callable, tuple, dict, bool],
+                                                   None, None]:
+            """
+            Pass the tasks to the workers when they fit into the window.
+            """
+            for task in tasks:
+                if not window.acquire(task[0], _get_task_size(task)):
+                    return
+
+                yield task
+
+        if self.job_count == 1:
+            # run the export functions in the main process
+            _set_worker_context(self.context)
+            results = (_run_export(task) for task in get_window_tasks())
+
+        else:
+            if self.pool is None:
+                # the pool is closed in close() or terminate()
+                self.pool = multiprocessing.Pool(  # pylint: disable=consider-using-with
+                    self.job_count,
+                    initializer=_init_worker,
+                    initargs=(self.context,)
+                )
+
+            results = self.pool.imap_unordered(_run_export, get_window_tasks())
+
+        try:
+            for result in results:
+                window.release(result[0])
+                yield result
+
+        finally:
+            window.close()
+
+    def get_worker_count(self) -> int:
+        """
+        Return the number of processes that run export functions.
+        """
+        if self.job_count == 1:
+            return 1
+
+        return self.job_count or os.cpu_count() or 1
+
+    def close(self) -> None:
+        """
+        Wait for the workers to finish and stop them.
+        """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+            # the peak RSS of the workers is known after they were joined
+            info("Peak memory usage of the export: main process %.1f MiB, workers %.1f MiB",
+                 get_peak_rss() / 1024 ** 2,
+                 get_peak_rss(children=True) / 1024 ** 2)
+
+        elif self.window is not None:
+            info("Peak memory usage of the export: %.1f MiB", get_peak_rss() / 1024 ** 2)
+
+        self.window = None
+        _WORKER_CONTEXT.clear()
+
+    def terminate(self) -> None:
+        """
+        Stop the workers immediately.
+        """
+        if self.window is not None:
+            # the task handler of the pool may wait for the window
+            self.window.close()
+            self.window = None
+
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+        _WORKER_CONTEXT.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+
+        else:
+            self.terminate()
@@ -1,4 +1,4 @@
-# Copyright 2020-2022 the openage authors. See copying.md for legal info.
+# Copyright 2020-2026 the openage authors. See copying.md for legal info.
 """
 Provides functions for traversing a directory and
 generating hash values for all the items inside.
@@ -48,7 +48,8 @@ def generate_hashes(
     modpack: Modpack,
     exportdir: Directory,
     hash_algo: str = 'sha3_256',
-    bufsize: int = 32768
+    bufsize: int = 32768,
+    known_hashes: dict[str, str] = None
 ) -> None:
     """
     Generate hashes for all the items in a
@@ -63,13 +64,25 @@ def generate_hashes(
     :type hash_algo: str
     :param bufsize: Buffer size for reading files.
     :type bufsize: int
+    :param known_hashes: Hash values of files that were computed when the files
+                         were written, by their path relative to exportdir. These
+                         files are not read again. The hash values must be created
+                         with the same hashing algorithm.
+    :type known_hashes: dict
     """
+    if known_hashes is None:
+        known_hashes = {}
+
     # set the hashing algorithm in the manifest instance
     modpack.manifest.set_hashing_func(hash_algo)
 
     # traverse the directory with breadth-first way and
     # generate hash values for the items encountered
     for file in bfs_directory(exportdir):
-        hash_val = hash_file(file, hash_algo=hash_algo, bufsize=bufsize)
         relative_path = os.path.relpath(str(file), str(exportdir))
+
+        hash_val = known_hashes.get(relative_path)
+        if hash_val is None:
+            hash_val = hash_file(file, hash_algo=hash_algo, bufsize=bufsize)
+
         modpack.manifest.add_hash_value(hash_val, relative_path)
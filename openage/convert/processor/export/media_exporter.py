@@ -1,34 +1,45 @@
-# Copyright 2021-2024 the openage authors. See copying.md for legal info.
+# Copyright 2021-2026 the openage authors. See copying.md for legal info.
 #
-# pylint: disable=too-many-arguments,too-many-locals
+# pylint: disable=too-many-arguments,too-many-locals,too-few-public-methods,too-many-lines
 """
 Converts media requested by export requests to files.
 """
 from __future__ import annotations
 import typing
 
+import functools
 import logging
+import math
 import os
-import multiprocessing
-import queue
-import sys
+import time
 
 from openage.convert.entity_object.export.texture import Texture
+from openage.convert.processor.export.export_job import ExportJob
+from openage.convert.processor.export.export_worker_pool import ExportWorkerPool, get_worker_context
 from openage.convert.service import debug_info
-from openage.convert.service.export.load_media_cache import load_media_cache
+from openage.convert.service.export.media_index import INDEX_FILENAME, JOURNAL_FILENAME, \
+    JOURNAL_INTERVAL, MediaIndex, get_palette_hash
+from openage.convert.service.export.media_source import read_media_source
+from openage.convert.service.export.media_writer import MediaWriter, pop_media_files, \
+    write_media_file
 from openage.convert.value_object.read.media.blendomatic import Blendomatic
 from openage.convert.value_object.read.media_types import MediaType
 from openage.log import dbg, info, get_loglevel
+from openage.util.instrumentation import count
 from openage.util.strings import format_progress
 
 if typing.TYPE_CHECKING:
     from argparse import Namespace
 
     from openage.convert.entity_object.export.media_export_request import MediaExportRequest
-    from openage.convert.value_object.read.media.colortable import ColorTable
-    from openage.convert.value_object.init.game_version import GameVersion
+    from openage.convert.service.export.media_source import MediaSource
+    from openage.convert.value_object.read.media.sld import SLD
     from openage.util.fslike.path import Path
-    from openage.util.dll import DllDirectoryManager
+
+
+# Keyword arguments of the export functions that don't change the resulting
+# files, so they aren't part of the export settings in the media index
+RUNTIME_KWARGS = ("thread_count", "return_cache_params")
 
 
 class MediaExporter:
@@ -43,8 +54,9 @@ class MediaExporter:
         export_requests: dict[MediaType, list[MediaExportRequest]],
         sourcedir: Path,
         exportdir: Path,
-        args: Namespace
-    ) -> None:
+        args: Namespace,
+        export_pool: ExportWorkerPool = None
+    ) -> dict[str, str]:
         """
         Converts files requested by MediaExportRequests.
 
@@ -55,286 +67,452 @@ class MediaExporter:
         :param exportdir: Directory the resulting file(s) will be exported to. Target subfolder
                           and target filename should be stored in the export request.
         :param args: Converter arguments.
+        :param export_pool: Worker pool that runs the export functions. If this is None,
+                            a pool is created for this call.
         :type export_requests: dict
         :type sourcedir: Path
         :type exportdir: Path
         :type args: Namespace
+        :type export_pool: ExportWorkerPool
+        :returns: Hash values of the resulting files by their path relative to exportdir.
+        :rtype: dict
         """
-        cache_info = {}
-        if args.game_version.edition.media_cache:
-            cache_info = load_media_cache(args.game_version.edition.media_cache)
+        if export_pool is None:
+            with ExportWorkerPool(args) as new_pool:
+                return MediaExporter.export(export_requests, sourcedir, exportdir, args, new_pool)
+
+        # Packer and compression settings of the exported graphics files by their
+        # export request, which are returned by the workers for the media cache
+        cache_data = None
+        if args.debug_info > 5:
+            cache_data = {}
+
+        jobs = MediaExporter._create_jobs(export_requests, sourcedir, exportdir, args, cache_data)
+
+        # Hash values of the resulting files by their path
+        file_hashes: dict[str, str] = {}
+
+        # Index of the files exported by previous runs
+        media_index = None
+        if not args.flag("no_media_index"):
+            media_index = MediaIndex(
+                args.targetdir.joinpath(INDEX_FILENAME),
+                args.targetdir.joinpath(JOURNAL_FILENAME),
+                resume=args.flag("resume")
+            )
+            jobs = MediaExporter._skip_unchanged_jobs(
+                jobs,
+                media_index,
+                args,
+                export_pool,
+                file_hashes
+            )
+
+        jobs = MediaExporter._merge_duplicate_jobs(jobs)
+        MediaExporter._assign_threads(jobs, export_pool.get_worker_count())
+
+        info("-- Exporting %s files...", len(jobs))
+
+        # Start with the most expensive files (longest processing time first),
+        # so that the workers don't have to wait for a few large files at the
+        # end of the export
+        jobs.sort(key=lambda job: job.cost, reverse=True)
 
-        for media_type in export_requests.keys():
-            cur_export_requests = export_requests[media_type]
+        try:
+            MediaExporter._export_jobs(jobs, export_pool, media_index, file_hashes)
+
+        except BaseException:
+            # store the finished exports, so that the conversion can be resumed
+            if media_index:
+                media_index.save_journal()
+
+            raise
+
+        if media_index:
+            media_index.save()
+
+        # Log file information
+        if get_loglevel() <= logging.DEBUG:
+            for job in jobs:
+                target_path = job.target_path
+                if job.kwargs.get("compressed_textures") and not target_path.is_file():
+                    # SLD graphics were exported as DDS textures
+                    target_path = target_path.with_suffix(".dds")
 
-            # Function for reading the source file data
-            read_data_func = None
+                MediaExporter.log_fileinfo(job.source_path, target_path)
+
+        if cache_data is not None:
+            debug_info.debug_media_cache(
+                args.debugdir,
+                args.debug_info,
+                sourcedir,
+                cache_data,
+                args.game_version
+            )
+
+        return {
+            os.path.relpath(path, str(exportdir)): file_hash
+            for path, file_hash in file_hashes.items()
+        }
+
+    @staticmethod
+    def _create_jobs(
+        export_requests: dict[MediaType, list[MediaExportRequest]],
+        sourcedir: Path,
+        exportdir: Path,
+        args: Namespace,
+        cache_data: dict[MediaExportRequest, tuple] = None
+    ) -> list[ExportJob]:
+        """
+        Create the export jobs for all export requests whose source file exists.
+
+        :param export_requests: Export requests for media files by their media type.
+        :param sourcedir: Directory where all media assets are mounted.
+        :param exportdir: Directory the resulting file(s) will be exported to.
+        :param args: Converter arguments.
+        :param cache_data: If not None, the packer and compression settings of the
+                           graphics files are added to it by their export request.
+        """
+        # Export jobs of all media types, so that the workers can process
+        # them in one queue
+        jobs: list[ExportJob] = []
+
+        for media_type, cur_export_requests in export_requests.items():
+            # Function for locating the source file
+            get_source_func = None
+
+            # Keyword arguments for locating the source file
+            source_kwargs = {}
 
             # Multi-threaded function for exporting the source file data
             export_func = None
 
-            # Optional function for handling data in the outqueue
-            handle_outqueue_func = None
+            # Keyword arguments for the export function
+            export_kwargs = {}
+
+            # Optional function for handling the results of the export function
+            handle_result_func = None
 
-            kwargs = {}
             if media_type is MediaType.BLEND:
-                read_data_func = MediaExporter._get_blend_data
+                get_source_func = MediaExporter._get_blend_source
                 export_func = _export_blend
-                itargs = (sourcedir, exportdir)
-                kwargs["blend_mode_count"] = args.blend_mode_count
-                info("-- Exporting blend files...")
+                export_kwargs["blend_mode_count"] = args.blend_mode_count
 
             elif media_type is MediaType.GRAPHICS:
-                read_data_func = MediaExporter._get_graphics_data
+                get_source_func = MediaExporter._get_graphics_source
                 export_func = _export_texture
-                handle_outqueue_func = MediaExporter._handle_graphics_outqueue
-                itargs = (args.palettes, args.compression_level)
-                kwargs["cache_info"] = cache_info
-                info("-- Exporting graphics files...")
+                export_kwargs["thread_count"] = 1
+                if args.flag("compressed_textures"):
+                    export_kwargs["compressed_textures"] = True
+
+                handle_result_func = MediaExporter._handle_graphics_result
+                if cache_data is not None:
+                    export_kwargs["return_cache_params"] = True
+                    handle_result_func = functools.partial(
+                        MediaExporter._handle_graphics_result,
+                        cache_data=cache_data
+                    )
 
             elif media_type is MediaType.SOUNDS:
-                read_data_func = MediaExporter._get_sound_data
+                get_source_func = MediaExporter._get_sound_source
                 export_func = _export_sound
-                itargs = tuple()
-                kwargs["debugdir"] = args.debugdir
-                kwargs["loglevel"] = args.debug_info
-                info("-- Exporting sound files...")
+                source_kwargs["debugdir"] = args.debugdir
+                source_kwargs["loglevel"] = args.debug_info
 
             elif media_type is MediaType.TERRAIN:
-                read_data_func = MediaExporter._get_terrain_data
+                get_source_func = MediaExporter._get_terrain_source
                 export_func = _export_terrain
-                itargs = (args.palettes, args.compression_level, args.game_version)
-                info("-- Exporting terrain files...")
-
-            if args.jobs == 1:
-                MediaExporter._export_singlethreaded(
-                    cur_export_requests,
-                    sourcedir,
-                    exportdir,
-                    read_data_func,
-                    export_func,
-                    handle_outqueue_func,
-                    itargs,
-                    kwargs
-                )
 
-            else:
-                MediaExporter._export_multithreaded(
-                    cur_export_requests,
-                    sourcedir,
-                    exportdir,
-                    read_data_func,
-                    export_func,
-                    handle_outqueue_func,
-                    itargs,
-                    kwargs,
-                    args.jobs,
-                    args.dll_manager,
-                )
+            count(media_type.value, len(cur_export_requests))
 
-        if args.debug_info > 5:
-            cachedata = {}
-            for request in export_requests[MediaType.GRAPHICS]:
-                kwargs = {}
-                kwargs["palettes"] = args.palettes
-                kwargs["compression_level"] = args.compression_level
+            for request in cur_export_requests:
+                source_path = get_source_func(request, sourcedir, **source_kwargs)
+                if source_path is None:
+                    continue
 
-                cache = MediaExporter._get_media_cache(
+                jobs.append(ExportJob(
                     request,
-                    sourcedir,
-                    args.palettes,
-                    compression_level=2
-                )
+                    source_path,
+                    exportdir[request.targetdir, request.target_filename],
+                    export_func,
+                    export_kwargs,
+                    handle_result_func
+                ))
 
-                cachedata[request] = cache
+        return jobs
 
-            debug_info.debug_media_cache(
-                args.debugdir,
-                args.debug_info,
-                sourcedir,
-                cachedata,
-                args.game_version
+    @staticmethod
+    def _skip_unchanged_jobs(
+        jobs: list[ExportJob],
+        media_index: MediaIndex,
+        args: Namespace,
+        export_pool: ExportWorkerPool,
+        file_hashes: dict[str, str]
+    ) -> list[ExportJob]:
+        """
+        Remove the jobs that were exported by a previous run with the same
+        inputs and whose resulting files still exist.
+
+        The results of the skipped jobs are taken from the media index
+        and forwarded to their export requests.
+
+        :param jobs: Export jobs.
+        :param media_index: Index of the files exported by previous runs.
+        :param args: Converter arguments.
+        :param export_pool: Worker pool that runs the export functions.
+        :param file_hashes: Hash values of the resulting files by their path. The
+                            files of the skipped jobs are added to it.
+        :returns: Export jobs that have to be run.
+        """
+        palette_hash = get_palette_hash(args.palettes)
+        cache_info = export_pool.context["cache_info"]
+
+        changed_jobs = []
+        for job in jobs:
+            request = job.request
+
+            # everything that changes the resulting file(s) for the same source file
+            params = [
+                job.export_func.__name__,
+                {
+                    name: value for name, value in job.kwargs.items()
+                    if name not in RUNTIME_KWARGS
+                },
+                palette_hash,
+                args.compression_level,
+                args.game_version.edition.game_id,
+                cache_info.get(request.source_filename, None),
+            ]
+            job.inputs = media_index.get_inputs(
+                job.target_path,
+                job.source,
+                job.read_source,
+                params
             )
 
+            entry = media_index.lookup(job.target_path, job.inputs)
+            if entry is None:
+                changed_jobs.append(job)
+                continue
+
+            result = entry["result"]
+            if (job.kwargs.get("return_cache_params") and "cache_params" not in result and
+                    "pxformat" not in result):
+                # the previous export didn't return the settings for the media cache,
+                # which only exist for PNG textures
+                changed_jobs.append(job)
+                continue
+
+            if job.handle_result_func:
+                job.handle_result_func(request, result)
+
+            for filename, (_, file_hash, _) in entry["outputs"].items():
+                file_hashes[str(job.target_path.parent.joinpath(filename))] = file_hash
+
+        unchanged_count = len(jobs) - len(changed_jobs)
+        if unchanged_count:
+            info("-- Skipping %s unchanged files", unchanged_count)
+
+        count("unchanged_files", unchanged_count)
+
+        return changed_jobs
+
     @staticmethod
-    def _export_singlethreaded(
-        requests: list[MediaExportRequest],
-        sourcedir: Path,
-        exportdir: Path,
-        read_data_func: typing.Callable,
-        export_func: typing.Callable,
-        handle_outqueue_func: typing.Callable | None,
-        itargs: tuple,
-        kwargs: dict
-    ):
+    def _merge_duplicate_jobs(jobs: list[ExportJob]) -> list[ExportJob]:
         """
-        Export media files in a single thread.
+        Merge jobs that create the same files from the same source file,
+        e.g. because several graphics reference the same sprite.
 
-        :param requests: Export requests for media files.
-        :param sourcedir: Directory where all media assets are mounted. Source subfolder and
-                          source filename should be stored in the export request.
-        :param exportdir: Directory the resulting file(s) will be exported to. Target subfolder
-                          and target filename should be stored in the export request.
-        :param read_data_func: Function for reading the source file data.
-        :param export_func: Function for exporting media files.
-        :param handle_outqueue_func: Optional function for handling data in the outqueue.
-        :param itargs: Arguments for the export function.
-        :param kwargs: Keyword arguments for the export function.
-        :type requests: list[MediaExportRequest]
-        :type sourcedir: Path
-        :type exportdir: Path
-        :type read_data_func: typing.Callable
-        :type export_func: typing.Callable
-        :type handle_outqueue_func: typing.Callable
-        :type itargs: tuple
-        :type kwargs: dict
-        """
-        single_queue = queue.Queue()
-        for idx, request in enumerate(requests):
-            source_data = read_data_func(request, sourcedir, **kwargs)
-            if source_data is None:
-                continue
+        Only the first job of each group is run. The other jobs become
+        its aliases.
 
-            target_path = exportdir[request.targetdir, request.target_filename]
-
-            export_func(
-                idx,
-                source_data,
-                single_queue,
-                None,
-                request.source_filename,
-                target_path,
-                *itargs,
-                **kwargs
-            )
+        :param jobs: Export jobs.
+        :returns: Export jobs that have to be run.
+        """
+        unique_jobs: dict[tuple, ExportJob] = {}
+        for job in jobs:
+            source_key = job.get_source_key()
+            unique_job = unique_jobs.get(source_key)
+            if unique_job is None:
+                unique_jobs[source_key] = job
 
-            if get_loglevel() <= logging.DEBUG:
-                MediaExporter.log_fileinfo(
-                    sourcedir[request.get_type().value, request.source_filename],
-                    exportdir[request.targetdir, request.target_filename]
-                )
+            else:
+                unique_job.aliases.append(job)
+
+        duplicate_count = len(jobs) - len(unique_jobs)
+        if duplicate_count:
+            info("-- Linking %s files with the same source", duplicate_count)
 
-            MediaExporter._show_progress(idx + 1, len(requests))
+        count("duplicate_files", duplicate_count)
 
-        if handle_outqueue_func:
-            handle_outqueue_func(single_queue, requests)
+        return list(unique_jobs.values())
 
     @staticmethod
-    def _export_multithreaded(
-        requests: list[MediaExportRequest],
-        sourcedir: Path,
-        exportdir: Path,
-        read_data_func: typing.Callable,
-        export_func: typing.Callable,
-        handle_outqueue_func: typing.Callable | None,
-        itargs: tuple,
-        kwargs: dict,
-        job_count: int = None,
-        dll_manager: DllDirectoryManager = None,
-    ):
+    def _assign_threads(jobs: list[ExportJob], worker_count: int) -> None:
         """
-        Export media files in multiple threads.
+        Let jobs that take longer than their share of the export use several
+        threads, so that one large file doesn't keep a single worker busy
+        while the others are idle.
 
-        :param requests: Export requests for media files.
-        :param sourcedir: Directory where all media assets are mounted. Source subfolder and
-                          source filename should be stored in the export request.
-        :param exportdir: Directory the resulting file(s) will be exported to. Target subfolder
-                          and target filename should be stored in the export request.
-        :param read_data_func: Function for reading the source file data.
-        :param export_func: Function for exporting media files.
-        :param handle_outqueue_func: Optional function for handling data in the outqueue.
-        :param itargs: Arguments for the export function.
-        :param kwargs: Keyword arguments for the export function.
-        :param job_count: Number of worker processes to use.
-        :param dll_manager: Adds DLL search paths for the subrocesses (Windows-only).
-        """
-        worker_count = job_count
-        if worker_count is None:
-            # Small optimization that saves some time for small exports
-            worker_count = min(multiprocessing.cpu_count(), len(requests))
-
-        def error_callback(exception: Exception):
+        Only export functions with a thread_count keyword argument
+        support threads.
+
+        :param jobs: Export jobs.
+        :param worker_count: Number of worker processes.
+        """
+        if worker_count <= 1:
+            return
+
+        total_cost = sum(job.cost for job in jobs)
+        job_share = total_cost / worker_count
+
+        for job in jobs:
+            if "thread_count" not in job.kwargs or job.cost <= job_share:
+                continue
+
+            # the kwargs dict is shared by all jobs of a media type
+            job.kwargs = {
+                **job.kwargs,
+                "thread_count": min(worker_count, math.ceil(job.cost / job_share))
+            }
+
+    @staticmethod
+    def _export_jobs(
+        jobs: list[ExportJob],
+        export_pool: ExportWorkerPool,
+        media_index: MediaIndex | None,
+        file_hashes: dict[str, str]
+    ) -> None:
+        """
+        Run the export functions of the jobs in the worker pool and write
+        the files they create.
+
+        :param jobs: Export jobs in the order they are started.
+        :param export_pool: Worker pool that runs the export functions.
+        :param media_index: Index that the finished jobs are added to. None if
+                            no index is used. Its journal is written regularly.
+        :param file_hashes: Hash values of the resulting files by their path. The
+                            files of the finished jobs are added to it.
+        """
+        def get_tasks() -> typing.Generator[tuple[int, typing.Callable, tuple, dict, bool],
+                                            None, None]:
             """
-            Error callback for the worker pool.
+            Create the export calls for the worker pool.
+
+            The pool consumes the tasks while the workers are running, so source
+            data that is read in the main process doesn't have to be kept in
+            memory for all files at once.
+
+            Modified native source files are hashed by the workers for the
+            media index, see MediaIndex.get_inputs().
             """
-            raise exception
-
-        # Create a manager for sharing data between the workers and main process
-        with multiprocessing.Manager() as manager:
-            # Workers write the image metadata to this queue
-            # so that it can be forwarded to the export requests
-            #
-            # we cannot do this in a worker process directly
-            # because the export requests cannot be pickled
-            outqueue = manager.Queue()
-
-            expected_size = len(requests)
-
-            # Create a pool of workers
-            with multiprocessing.Pool(worker_count) as pool:
-                for idx, request in enumerate(requests):
-                    # Feed the worker with the source file data (bytes) from the
-                    # main process
-                    #
-                    # This is necessary because some image files are inside an
-                    # archive and cannot be accessed asynchronously
-                    source_data = read_data_func(request, sourcedir, **kwargs)
-                    if source_data is None:
-                        expected_size -= 1
-                        continue
-
-                    target_path = exportdir[request.targetdir, request.target_filename]
-
-                    # Start an export call in a worker process
-                    # The call is asynchronous, so the next worker can be
-                    # started immediately
-                    pool.apply_async(
-                        export_func,
-                        args=(
-                            idx,
-                            source_data,
-                            outqueue,
-                            dll_manager,
-                            request.source_filename,
-                            target_path,
-                            *itargs
-                        ),
-                        kwds=kwargs,
-                        error_callback=error_callback
-                    )
+            for job_id, job in enumerate(jobs):
+                yield (
+                    job_id,
+                    job.export_func,
+                    (
+                        job.get_source_data(),
+                        job.request.source_filename,
+                        job.target_path,
+                    ),
+                    job.kwargs,
+                    job.inputs is not None and job.inputs["source_hash"] is None
+                )
 
-                    # Show progress
-                    MediaExporter._show_progress(outqueue.qsize(), expected_size)
+        # Workers return their results (e.g. the image metadata) as soon as
+        # they are done, so that they can be forwarded to the export requests
+        # while the other files are exported
+        #
+        # we cannot do this in a worker process directly
+        # because the export requests cannot be pickled
+        start_time = time.perf_counter()
+        job_times = []
+        journal_time = start_time
+
+        # The files are written by a separate thread, so that the results
+        # of the next jobs can be handled in the meantime
+        with MediaWriter() as writer:
+            results = export_pool.run(get_tasks())
+            for done_count, (job_id, result, job_time, media_files,
+                             source_hash) in enumerate(results, start=1):
+                job = jobs[job_id]
+
+                if source_hash is not None:
+                    # aliases without a source hash have the same source file location
+                    for hashed_job in (job, *job.aliases):
+                        if hashed_job.inputs["source_hash"] is None:
+                            hashed_job.inputs["source_hash"] = source_hash
+
+                output_files = []
+                for target_path, data, file_hash in media_files:
+                    writer.write(target_path, data)
+                    output_files.append((target_path, len(data), file_hash))
+
+                MediaExporter._finish_job(job, result, output_files, media_index, file_hashes)
+
+                for alias in job.aliases:
+                    alias_files = MediaExporter._link_outputs(job, alias, output_files, writer)
+                    MediaExporter._finish_job(alias, result, alias_files, media_index, file_hashes)
+
+                job_times.append((job_time, job_id))
+                MediaExporter._show_progress(done_count, len(jobs))
+
+                if media_index and time.perf_counter() - journal_time >= JOURNAL_INTERVAL:
+                    # the journal must only contain files that are written
+                    writer.flush()
+                    media_index.save_journal()
+                    journal_time = time.perf_counter()
+
+        if job_times:
+            MediaExporter._log_parallel_efficiency(
+                jobs,
+                job_times,
+                time.perf_counter() - start_time,
+                export_pool.get_worker_count()
+            )
 
-                # Close the pool since all workers have been started
-                pool.close()
+    @staticmethod
+    def _log_parallel_efficiency(
+        jobs: list[ExportJob],
+        job_times: list[tuple[float, int]],
+        elapsed_time: float,
+        worker_count: int
+    ) -> None:
+        """
+        Log how well the export jobs were distributed over the workers.
 
-                # Show progress for remaining workers
-                while outqueue.qsize() < expected_size:
-                    MediaExporter._show_progress(outqueue.qsize(), expected_size)
+        The export can't be faster than its critical path, i.e. the longest
+        job, or than the total job time divided by the number of workers.
+        The parallel efficiency is the share of the worker time that
+        was spent running jobs.
 
-                # Wait for all workers to finish
-                pool.join()
+        :param jobs: Export jobs.
+        :param job_times: Time each job ran in a worker and the ID of the job.
+        :param elapsed_time: Wall time of the whole export.
+        :param worker_count: Number of worker processes.
+        """
+        total_time = sum(job_time for job_time, _ in job_times)
+        critical_time, critical_job_id = max(job_times)
+        lower_bound = max(critical_time, total_time / worker_count)
+        efficiency = total_time / (elapsed_time * worker_count)
 
-            if handle_outqueue_func:
-                handle_outqueue_func(outqueue, requests)
+        info("-- Exported %s files in %.2f s (lower bound %.2f s), "
+             "parallel efficiency of the workers (%s): %.0f%%",
+             len(job_times), elapsed_time, lower_bound, worker_count, efficiency * 100)
+        dbg("critical path: %s (%.2f s)",
+            jobs[critical_job_id].request.source_filename, critical_time)
 
-        # Log file information
-        if get_loglevel() <= logging.DEBUG:
-            for request in requests:
-                MediaExporter.log_fileinfo(
-                    sourcedir[request.get_type().value, request.source_filename],
-                    exportdir[request.targetdir, request.target_filename]
-                )
+        count("job_time_ms", int(total_time * 1000))
+        count("critical_path_ms", int(critical_time * 1000))
 
     @staticmethod
-    def _get_blend_data(
+    def _get_blend_source(
         request: MediaExportRequest,
         sourcedir: Path,
         **kwargs  # pylint: disable=unused-argument
-    ) -> bytes:
+    ) -> Path:
         """
-        Get the raw file data of a blending mask.
+        Get the source file of a blending mask.
 
         :param request: Export request for a blending mask.
         :param sourcedir: Directory where all media assets are mounted.
@@ -344,16 +522,16 @@ class MediaExporter:
         source_file = sourcedir[request.get_type().value,
                                 request.source_filename]
 
-        return source_file.open("rb").read()
+        return source_file
 
     @staticmethod
-    def _get_graphics_data(
+    def _get_graphics_source(
         request: MediaExportRequest,
         sourcedir: Path,
         **kwargs  # pylint: disable=unused-argument
-    ) -> bytes:
+    ) -> Path:
         """
-        Get the raw file data of a graphics file.
+        Get the source file of a graphics file.
 
         :param request: Export request for a graphics file.
         :param sourcedir: Directory where all media assets are mounted.
@@ -373,16 +551,16 @@ class MediaExporter:
                 ]
                 request.set_source_filename(other_filename)
 
-        return source_file.open("rb").read()
+        return source_file
 
     @staticmethod
-    def _get_sound_data(
+    def _get_sound_source(
         request: MediaExportRequest,
         sourcedir: Path,
         **kwargs
-    ) -> bytes | None:
+    ) -> Path | None:
         """
-        Get the raw file data of a sound file.
+        Get the source file of a sound file.
 
         :param request: Export request for a sound file.
         :param sourcedir: Directory where all media assets are mounted.
@@ -399,16 +577,16 @@ class MediaExporter:
                                               source_file)
             return None
 
-        return source_file.open("rb").read()
+        return source_file
 
     @staticmethod
-    def _get_terrain_data(
+    def _get_terrain_source(
         request: MediaExportRequest,
         sourcedir: Path,
         **kwargs  # pylint: disable=unused-argument
-    ) -> bytes:
+    ) -> Path:
         """
-        Get the raw file data of a terrain graphics file.
+        Get the source file of a terrain graphics file.
 
         :param request: Export request for a terrain graphics file.
         :param sourcedir: Directory where all media assets are mounted.
@@ -418,30 +596,105 @@ class MediaExporter:
         source_file = sourcedir[request.get_type().value,
                                 request.source_filename]
 
-        return source_file.open("rb").read()
+        return source_file
 
     @staticmethod
-    def _handle_graphics_outqueue(
-        outqueue: multiprocessing.Queue,
-        requests: list[MediaExportRequest]
-    ):
+    def _finish_job(
+        job: ExportJob,
+        result: typing.Any,
+        output_files: list[tuple[Path, int, str]],
+        media_index: MediaIndex | None,
+        file_hashes: dict[str, str]
+    ) -> None:
+        """
+        Forward the result of a finished job to its export request
+        and remember the files it created.
+
+        :param job: Finished export job.
+        :param result: Result of the export function.
+        :param output_files: Paths, sizes and hash values of the files created by the job.
+        :param media_index: Index that the job is added to. None if no index is used.
+        :param file_hashes: Hash values of the resulting files by their path.
         """
-        Collect the metadata from the workers and forward it to the
-        export requests.
+        if job.handle_result_func:
+            job.handle_result_func(job.request, result)
+
+        for output_path, _, file_hash in output_files:
+            file_hashes[str(output_path)] = file_hash
+
+        if media_index:
+            media_index.update(
+                job.target_path,
+                job.inputs,
+                {
+                    output_path.name: (file_size, file_hash)
+                    for output_path, file_size, file_hash in output_files
+                },
+                result
+            )
 
-        This must be called before the manager of the queue is shutdown!
+    @staticmethod
+    def _link_outputs(
+        job: ExportJob,
+        alias: ExportJob,
+        output_files: list[tuple[Path, int, str]],
+        writer: MediaWriter
+    ) -> list[tuple[Path, int, str]]:
+        """
+        Create the resulting files of an alias from the files of the job
+        it is an alias of.
+
+        :param job: Finished export job.
+        :param alias: Alias of the export job.
+        :param output_files: Paths, sizes and hash values of the files created by the job.
+        :param writer: Writer of the files created by the job.
+        :returns: Paths, sizes and hash values of the files of the alias.
+        """
+        alias_files = []
+        for output_path, file_size, file_hash in output_files:
+            # The files of a job start with the stem of the target filename,
+            # e.g. blend_0.png, blend_1.png, ... or texture.dds for texture.png
+            filename_suffix = output_path.name[len(job.target_path.stem):]
+            alias_path = alias.target_path.parent.joinpath(
+                f"{alias.target_path.stem}{filename_suffix}"
+            )
+
+            if alias_path.parts != output_path.parts:
+                writer.link(output_path, alias_path)
 
-        :param outqueue: Queue for passing metadata to the main process.
-        :param requests: Export requests for graphics files.
-        :type outqueue: multiprocessing.Queue
-        :type requests: list[MediaExportRequest]
+            alias_files.append((alias_path, file_size, file_hash))
+
+        return alias_files
+
+    @staticmethod
+    def _handle_graphics_result(
+        request: MediaExportRequest,
+        metadata: dict,
+        cache_data: dict[MediaExportRequest, tuple] = None
+    ):
         """
-        while not outqueue.empty():
-            idx, metadata = outqueue.get()
-            update_data = {requests[idx].target_filename: metadata}
-            requests[idx].set_changed()
-            requests[idx].notify_observers(update_data)
-            requests[idx].clear_changed()
+        Forward the metadata of an exported graphics file to its
+        export request.
+
+        :param request: Export request for a graphics file.
+        :param metadata: Metadata of the exported image.
+        :param cache_data: Packer and compression settings by export request. The
+                           settings returned by the export function are added to it.
+        :type request: MediaExportRequest
+        :type metadata: dict
+        :type cache_data: dict
+        """
+        if "cache_params" in metadata:
+            # the result is stored in the media index as it is
+            metadata = metadata.copy()
+            cache_params = metadata.pop("cache_params")
+            if cache_data is not None:
+                cache_data[request] = cache_params
+
+        update_data = {request.target_filename: metadata}
+        request.set_changed()
+        request.notify_observers(update_data)
+        request.clear_changed()
 
     @staticmethod
     def _show_progress(
@@ -459,83 +712,6 @@ class MediaExporter:
         print(f"-- Files done: {format_progress(current_size, total_size)}",
               end = "\r", flush = True)
 
-    @staticmethod
-    def _get_media_cache(
-        export_request: MediaExportRequest,
-        sourcedir: Path,
-        palettes: dict[int, ColorTable],
-        compression_level: int
-    ) -> None:
-        """
-        Convert a media file and return the used settings. This performs
-        a dry run, i.e. the graphics media is not saved on the filesystem.
-
-        :param export_request: Export request for a graphics file.
-        :param sourcedir: Directory where all media assets are mounted. Source subfolder and
-                          source filename should be stored in the export request.
-        :param exportdir: Directory the resulting file(s) will be exported to. Target subfolder
-                          and target filename should be stored in the export request.
-        :param palettes: Palettes used by the game.
-        :param compression_level: PNG compression level for the resulting image file.
-        :type export_request: MediaExportRequest
-        :type sourcedir: Path
-        :type exportdir: Path
-        :type palettes: dict
-        :type compression_level: int
-        """
-        source_file = sourcedir[
-            export_request.get_type().value,
-            export_request.source_filename
-        ]
-
-        try:
-            media_file = source_file.open("rb")
-
-        except FileNotFoundError:
-            if source_file.suffix.lower() == ".smx":
-                # Rename extension to SMP and try again
-                other_filename = export_request.source_filename[:-1] + "p"
-                source_file = sourcedir[
-                    export_request.get_type().value,
-                    other_filename
-                ]
-
-            media_file = source_file.open("rb")
-
-        if source_file.suffix.lower() == ".slp":
-            from ...value_object.read.media.slp import SLP
-            image = SLP(media_file.read())
-
-        elif source_file.suffix.lower() == ".smp":
-            from ...value_object.read.media.smp import SMP
-            image = SMP(media_file.read())
-
-        elif source_file.suffix.lower() == ".smx":
-            from ...value_object.read.media.smx import SMX
-            image = SMX(media_file.read())
-
-        elif source_file.suffix.lower() == ".sld":
-            from ...value_object.read.media.sld import SLD
-            image = SLD(media_file.read())
-
-        else:
-            raise SyntaxError(f"Source file {source_file.name} has an unrecognized extension: "
-                              f"{source_file.suffix.lower()}")
-
-        from .texture_merge import merge_frames
-        texture = Texture(image, palettes)
-        merge_frames(texture)
-        MediaExporter.save_png(
-            texture,
-            None,
-            None,
-            compression_level=compression_level,
-            cache=None,
-            dry_run=True
-        )
-
-        return texture.get_cache_params()
-
     @staticmethod
     def save_png(
         texture: Texture,
@@ -560,40 +736,11 @@ class MediaExporter:
         :type compression_level: int
         :type dry_run: bool
         """
-        from ...service.export.png import png_create
-
-        compression_levels = {
-            0: png_create.CompressionMethod.COMPR_NONE,
-            1: png_create.CompressionMethod.COMPR_DEFAULT,
-            2: png_create.CompressionMethod.COMPR_OPTI,
-            3: png_create.CompressionMethod.COMPR_GREEDY,
-            4: png_create.CompressionMethod.COMPR_AGGRESSIVE,
-        }
-
-        if not dry_run:
-            _, ext = os.path.splitext(filename)
+        _save_png(texture, targetdir[filename], compression_level, cache, dry_run)
 
-            # only allow png
-            if ext != ".png":
-                raise ValueError("Filename invalid, a texture must be saved"
-                                 f"as '*.png', not '*.{ext}'")
-
-        compression_method = compression_levels.get(
-            compression_level,
-            png_create.CompressionMethod.COMPR_DEFAULT
-        )
-        png_data, compr_params = png_create.save(
-            texture.image_data.data,
-            compression_method,
-            cache
-        )
-
-        if not dry_run:
-            with targetdir[filename].open("wb") as imagefile:
-                imagefile.write(png_data)
-
-        if compr_params:
-            texture.best_compr = (compression_level, *compr_params)
+        with MediaWriter() as writer:
+            for target_path, png_data, _ in pop_media_files():
+                writer.write(target_path, png_data)
 
     @staticmethod
     def log_fileinfo(
@@ -620,29 +767,20 @@ class MediaExporter:
 
 
 def _export_blend(
-    request_id: int,
-    blendfile_data: bytes,
-    outqueue: multiprocessing.Queue,
-    dll_manager: DllDirectoryManager,
+    blendfile_data: bytes | MediaSource,
     source_filename: str,  # pylint: disable=unused-argument
-    targetdir: Path,
-    target_filename: str,
+    target_path: Path,
     blend_mode_count: int = None
 ) -> None:
     """
     Convert and export a blending mode.
 
-    :param request_id: ID of the export request.
-    :param blendfile_data: Raw file data of the blending mask.
-    :param outqueue: Queue for passing metadata to the main process.
-    :param dll_manager: Adds DLL search paths for the subrocesses (Windows-only).
-    :param target_path: Path to the resulting image file.
+    :param blendfile_data: Raw file data of the blending mask or a descriptor for reading it.
+    :param source_filename: Filename of the source file.
+    :param target_path: Path prefix of the resulting image files.
     :param blend_mode_count: Number of blending modes extracted from the source file.
     """
-    if sys.platform == "win32" and dll_manager is not None:
-        dll_manager.add_directories()
-
-    blend_data = Blendomatic(blendfile_data, blend_mode_count)
+    blend_data = Blendomatic(read_media_source(blendfile_data), blend_mode_count)
 
     from .texture_merge import merge_frames
 
@@ -651,71 +789,48 @@ def _export_blend(
         merge_frames(texture)
         _save_png(
             texture,
-            targetdir.joinpath(f"{target_filename}_{idx}.png")
+            target_path.parent.joinpath(f"{target_path.name}_{idx}.png")
         )
 
-    outqueue.put(request_id)
-
 
 def _export_sound(
-    request_id: int,
-    sound_data: bytes,
-    outqueue: multiprocessing.Queue,
-    dll_manager: DllDirectoryManager,
+    sound_data: bytes | MediaSource,
     source_filename: str,  # pylint: disable=unused-argument
-    target_path: Path,
-    **kwargs  # pylint: disable=unused-argument
+    target_path: Path
 ) -> None:
     """
     Convert and export a sound file.
 
-    :param request_id: ID of the export request.
-    :param sound_data: Raw file data of the sound file.
-    :param outqueue: Queue for passing metadata to the main process.
-    :param dll_manager: Adds DLL search paths for the subrocesses (Windows-only).
+    :param sound_data: Raw file data of the sound file or a descriptor for reading it.
+    :param source_filename: Filename of the source file.
     :param target_path: Path to the resulting sound file.
     """
-    if sys.platform == "win32" and dll_manager is not None:
-        dll_manager.add_directories()
-
     from ...service.export.opus.opusenc import encode
-    encoded = encode(sound_data)
+    encoded = encode(read_media_source(sound_data))
 
     if isinstance(encoded, (str, int)):
         raise RuntimeError(f"opusenc failed: {encoded}")
 
-    with target_path.open("wb") as outfile:
-        outfile.write(encoded)
-
-    outqueue.put(request_id)
+    write_media_file(target_path, encoded)
 
 
 def _export_terrain(
-    request_id: int,
-    graphics_data: bytes,
-    outqueue: multiprocessing.Queue,
-    dll_manager: DllDirectoryManager,
+    graphics_data: bytes | MediaSource,
     source_filename: str,
-    target_path: Path,
-    palettes: dict[int, ColorTable],
-    compression_level: int,
-    game_version: GameVersion
+    target_path: Path
 ) -> None:
     """
     Convert and export a terrain graphics file.
 
-    :param request_id: ID of the export request.
-    :param graphics_data: Raw file data of the graphics file.
-    :param outqueue: Queue for passing the image metadata to the main process.
-    :param dll_manager: Adds DLL search paths for the subrocesses (Windows-only).
+    :param graphics_data: Raw file data of the graphics file or a descriptor for reading it.
     :param source_filename: Filename of the source file.
     :param target_path: Path to the resulting image file.
-    :param palettes: Palettes used by the game.
-    :param compression_level: PNG compression level for the resulting image file.
-    :param game_version: Game edition and expansion info.
     """
-    if sys.platform == "win32" and dll_manager is not None:
-        dll_manager.add_directories()
+    context = get_worker_context()
+    palettes = context["palettes"]
+    game_version = context["game_version"]
+
+    graphics_data = read_media_source(graphics_data)
 
     file_ext = source_filename.split('.')[-1].lower()
     if file_ext == "slp":
@@ -727,10 +842,8 @@ def _export_terrain(
         pass
 
     elif file_ext == "png":
-        with target_path.open("wb") as imagefile:
-            imagefile.write(graphics_data)
+        write_media_file(target_path, graphics_data)
 
-        outqueue.put(request_id)
         return
 
     else:
@@ -750,38 +863,40 @@ def _export_terrain(
     _save_png(
         texture,
         target_path,
-        compression_level=compression_level
+        compression_level=context["compression_level"]
     )
 
-    outqueue.put(request_id)
-
 
 def _export_texture(
-    request_id: int,
-    graphics_data: bytes,
-    outqueue: multiprocessing.Queue,
-    dll_manager: DllDirectoryManager,
+    graphics_data: bytes | MediaSource,
     source_filename: str,
     target_path: Path,
-    palettes: dict[int, ColorTable],
-    compression_level: int,
-    cache_info: dict = None
-) -> None:
+    thread_count: int = 1,
+    compressed_textures: bool = False,
+    return_cache_params: bool = False
+) -> dict:
     """
     Convert and export a graphics file to a PNG texture.
 
-    :param request_id: ID of the export request.
-    :param graphics_data: Raw file data of the graphics file.
-    :param outqueue: Queue for passing the image metadata to the main process.
-    :param dll_manager: Adds DLL search paths for the subrocesses (Windows-only).
+    :param graphics_data: Raw file data of the graphics file or a descriptor for reading it.
     :param source_filename: Filename of the source file.
     :param target_path: Path to the resulting image file.
-    :param palettes: Palettes used by the game.
-    :param compression_level: PNG compression level for the resulting image file.
-    :param cache_info: Media cache information with compression parameters from a previous run.
+    :param thread_count: Number of threads used for decoding the frames and
+                         compressing the PNG.
+    :param compressed_textures: If True, SLD graphics are exported as block compressed
+                                DDS textures instead (see _export_compressed_texture()).
+    :param return_cache_params: If True, the packer and compression settings used for
+                                the PNG are added to the metadata as "cache_params"
+                                (see Texture.get_cache_params()), so that the media
+                                cache can be created without converting the file again.
+    :returns: Metadata of the exported image.
     """
-    if sys.platform == "win32" and dll_manager is not None:
-        dll_manager.add_directories()
+    context = get_worker_context()
+    palettes = context["palettes"]
+    compression_level = context["compression_level"]
+    cache_info = context["cache_info"]
+
+    graphics_data = read_media_source(graphics_data)
 
     file_ext = source_filename.split('.')[-1].lower()
     if file_ext == "slp":
@@ -800,6 +915,9 @@ def _export_texture(
         from ...value_object.read.media.sld import SLD
         image = SLD(graphics_data)
 
+        if compressed_textures:
+            return _export_compressed_texture(image, target_path, thread_count)
+
     else:
         raise SyntaxError(f"Source file {source_filename} has an unrecognized extension: "
                           f"{file_ext}")
@@ -816,16 +934,56 @@ def _export_texture(
 
     from .texture_merge import merge_frames
 
-    texture = Texture(image, palettes)
+    texture = Texture(image, palettes, thread_count=thread_count)
     merge_frames(texture, cache=packer_cache)
     _save_png(
         texture,
         target_path,
         compression_level=compression_level,
-        cache=compr_cache
+        cache=compr_cache,
+        thread_count=thread_count
     )
-    metadata = (request_id, texture.get_metadata().copy())
-    outqueue.put(metadata)
+
+    metadata = texture.get_metadata().copy()
+    if return_cache_params:
+        metadata["cache_params"] = texture.get_cache_params()
+
+    return metadata
+
+
+def _export_compressed_texture(
+    image: SLD,
+    target_path: Path,
+    thread_count: int = 1
+) -> dict:
+    """
+    Export the BC1/BC4 compressed blocks of an SLD graphics file to a DDS
+    texture without decompressing them. This skips decoding the frames and
+    compressing the PNG, and the renderer can upload the blocks directly.
+
+    The texture replaces the PNG file, i.e. it is saved at the target path
+    with the .dds extension.
+
+    :param image: SLD graphics file.
+    :param target_path: Path to the resulting image file.
+    :param thread_count: Number of threads used for reading the frames.
+    :returns: Metadata of the exported image, with the pixel format of the blocks.
+    """
+    from ...service.export.dds import create_dds
+    from .texture_merge import merge_compressed_frames
+
+    frames = image.get_frames(0, thread_count)
+    if len(frames) == 0:
+        # Use shadows if no main graphics are inside
+        frames = image.get_frames(1, thread_count)
+
+    block_data, metadata = merge_compressed_frames(frames)
+    block_format = frames[0].block_format
+
+    write_media_file(target_path.with_suffix(".dds"), create_dds(block_data, block_format))
+
+    metadata["pxformat"] = block_format
+    return metadata
 
 
 def _save_png(
@@ -833,7 +991,8 @@ def _save_png(
     target_path: Path,
     compression_level: int = 1,
     cache: dict = None,
-    dry_run: bool = False
+    dry_run: bool = False,
+    thread_count: int = 1
 ) -> None:
     """
     Store the image data into the target directory path,
@@ -843,6 +1002,7 @@ def _save_png(
     :param target_path: Path to the resulting image file.
     :param compression_level: PNG compression level used for the resulting image file.
     :param dry_run: If True, create the PNG but don't save it as a file.
+    :param thread_count: Number of threads used for compressing the PNG.
     """
     from ...service.export.png import png_create
 
@@ -869,12 +1029,13 @@ def _save_png(
     png_data, compr_params = png_create.save(
         texture.image_data.data,
         compression_method,
-        cache
+        cache,
+        thread_count
     )
 
     if not dry_run:
-        with target_path.open("wb") as imagefile:
-            imagefile.write(png_data)
+        write_media_file(target_path, png_data)
 
-    if compr_params:
-        texture.best_compr = (compression_level, *compr_params)
+    # only the greedy search returns deflate settings, but the media
+    # cache needs the compression level of every texture
+    texture.best_compr = (compression_level, *(compr_params or ()))
@@ -1,4 +1,4 @@
-# Copyright 2020-2022 the openage authors. See copying.md for legal info.
+# Copyright 2020-2026 the openage authors. See copying.md for legal info.
 #
 # pylint: disable=too-few-public-methods
 """
@@ -9,6 +9,7 @@ import typing
 
 
 from ....log import info
+from ....util.instrumentation import count, span
 from .data_exporter import DataExporter
 from .generate_manifest_hashes import generate_hashes
 from .media_exporter import MediaExporter
@@ -17,6 +18,7 @@ if typing.TYPE_CHECKING:
     from argparse import Namespace
 
     from openage.convert.entity_object.conversion.modpack import Modpack
+    from openage.convert.processor.export.export_worker_pool import ExportWorkerPool
 
 
 class ModpackExporter:
@@ -25,14 +27,21 @@ class ModpackExporter:
     """
 
     @staticmethod
-    def export(modpack: Modpack, args: Namespace) -> None:
+    def export(
+        modpack: Modpack,
+        args: Namespace,
+        export_pool: ExportWorkerPool = None
+    ) -> None:
         """
         Export a modpack to a directory.
 
         :param modpack: Modpack that is going to be exported.
         :param args: Converter arguments.
+        :param export_pool: Worker pool for exporting the media files. If this is None,
+                            a pool is created for this modpack.
         :type modpack: ..dataformats.modpack.Modpack
         :type args: Namespace
+        :type export_pool: ExportWorkerPool
         """
         sourcedir = args.srcdir
         exportdir = args.targetdir
@@ -42,13 +51,18 @@ class ModpackExporter:
         info("Starting export...")
         info("Dumping info file...")
 
+        # Hash values of the exported files for the manifest
+        file_hashes = {}
+
         # Modpack info file
-        DataExporter.export([modpack.info], modpack_dir)
+        file_hashes.update(DataExporter.export([modpack.info], modpack_dir))
 
         info("Dumping data files...")
 
         # Data files
-        DataExporter.export(modpack.get_data_files(), modpack_dir)
+        with span("data"):
+            file_hashes.update(DataExporter.export(modpack.get_data_files(), modpack_dir))
+            count("files", len(modpack.get_data_files()))
 
         if args.flag("no_media"):
             info("Skipping media file export...")
@@ -57,13 +71,22 @@ class ModpackExporter:
         info("Exporting media files...")
 
         # Media files
-        MediaExporter.export(modpack.get_media_files(), sourcedir, modpack_dir, args)
+        with span("media"):
+            file_hashes.update(MediaExporter.export(
+                modpack.get_media_files(),
+                sourcedir,
+                modpack_dir,
+                args,
+                export_pool
+            ))
 
         info("Dumping metadata files...")
 
         # Metadata files
-        DataExporter.export(modpack.get_metadata_files(), modpack_dir)
+        with span("metadata"):
+            file_hashes.update(DataExporter.export(modpack.get_metadata_files(), modpack_dir))
 
         # Manifest file
-        generate_hashes(modpack, modpack_dir)
-        DataExporter.export([modpack.manifest], modpack_dir)
+        with span("manifest"):
+            generate_hashes(modpack, modpack_dir, known_hashes=file_hashes)
+            DataExporter.export([modpack.manifest], modpack_dir)
@@ -0,0 +1,229 @@
+# Copyright 2026-2026 the openage authors. See copying.md for legal info.
+
+"""
+Tests for the media export of a conversion run.
+"""
+
+from argparse import Namespace
+import os
+import tempfile
+
+from ....testing.convert_benchmark.synthetic import create_game_version, create_palette, \
+    create_sld, create_slp
+from ....testing.testing import assert_value
+from ....util.fslike.directory import Directory
+from ....util.fslike.wrapper import DirectoryCreator
+from ....util.hash import hash_data
+from ...entity_object.export.media_export_request import MediaExportRequest
+from ...service.export.dds import DDS_HEADER
+from ...service.export.load_media_cache import load_media_cache
+from ...service.export.media_index import MediaIndex
+from ...service.export.media_writer import HASH_ALGO, MediaWriter, pop_media_files
+from ...value_object.read.media.sld import SLD
+from ...value_object.read.media_types import MediaType
+from .export_job import ExportJob
+from .export_worker_pool import ExportWorkerPool
+from .media_exporter import MediaExporter, _export_compressed_texture
+
+
+def _export_nothing(source_data, source_filename, target_path):
+    """
+    Export function of the test jobs, which are never run.
+    """
+    del source_data, source_filename, target_path
+
+
+def duplicate_jobs():
+    """
+    Jobs that create the same files from the same source file are merged,
+    and the files of the merged jobs are linked to the files of the job
+    that is run.
+    """
+    # pylint: disable=protected-access,too-many-locals
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Directory(tmpdir).root
+        root["source"].mkdirs()
+        root["output"].mkdirs()
+
+        source_files = {
+            "a.slp": create_slp(2, 16, 16, seed=0),
+            "b.slp": create_slp(2, 16, 16, seed=0),
+            "c.slp": create_slp(2, 16, 16, seed=1),
+        }
+        for filename, source_data in source_files.items():
+            with root["source", filename].open("wb") as source_file:
+                source_file.write(source_data)
+
+        def create_job(source_filename, target_filename):
+            request = MediaExportRequest(MediaType.GRAPHICS, "output",
+                                         source_filename, target_filename)
+            return ExportJob(request, root["source", source_filename],
+                             root["output", target_filename], _export_nothing, {}, None)
+
+        # without source hashes, only jobs with the same source file location are merged
+        jobs = [create_job("a.slp", "a.png"), create_job("a.slp", "a2.png"),
+                create_job("b.slp", "b.png")]
+        merged = MediaExporter._merge_duplicate_jobs(jobs)
+        assert_value(merged, [jobs[0], jobs[2]])
+        assert_value(jobs[0].aliases, [jobs[1]])
+
+        # with source hashes, byte-identical source files are merged, too
+        jobs = [create_job(filename, filename.replace(".slp", ".png"))
+                for filename in source_files]
+        for job in jobs:
+            job.inputs = {
+                "source_hash": hash_data(source_files[job.request.source_filename], HASH_ALGO),
+                "params_hash": "params",
+            }
+
+        merged = MediaExporter._merge_duplicate_jobs(jobs)
+        assert_value(merged, [jobs[0], jobs[2]])
+        assert_value(jobs[0].aliases, [jobs[1]])
+
+        # the files of the alias are named after its target filename
+        output_data = b"exported"
+        output_files = [
+            (root["output", f"a_{idx}.png"], len(output_data), hash_data(output_data, HASH_ALGO))
+            for idx in range(2)
+        ]
+        with MediaWriter() as writer:
+            for output_path, _, _ in output_files:
+                writer.write(output_path, output_data)
+
+            alias_files = MediaExporter._link_outputs(jobs[0], jobs[1], output_files, writer)
+
+        assert_value([alias_path.name for alias_path, _, _ in alias_files],
+                     ["b_0.png", "b_1.png"])
+        assert_value([file_hash for _, _, file_hash in alias_files],
+                     [file_hash for _, _, file_hash in output_files])
+
+        for alias_path, _, _ in alias_files:
+            with alias_path.open("rb") as alias_file:
+                assert_value(alias_file.read(), output_data)
+
+        assert_value(sorted(os.listdir(os.path.join(tmpdir, "output"))),
+                     ["a_0.png", "a_1.png", "b_0.png", "b_1.png"])
+
+
+def unchanged_jobs():
+    """
+    Jobs are skipped if the source file and the settings that change the
+    resulting files are the same as in the previous export.
+    """
+    # pylint: disable=protected-access
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Directory(tmpdir).root
+        root["cache"].mkdirs()
+        root["output"].mkdirs()
+
+        source_data = create_slp(2, 16, 16)
+        with root["a.slp"].open("wb") as source_file:
+            source_file.write(source_data)
+
+        args = Namespace(jobs=1, palettes={50500: create_palette()}, compression_level=1,
+                         game_version=create_game_version("AOC"), dll_manager=None)
+        export_pool = ExportWorkerPool(args)
+        index = MediaIndex(root["cache", "index.json"], root["cache", "journal.json"])
+
+        results = []
+
+        def create_job(**kwargs):
+            request = MediaExportRequest(MediaType.GRAPHICS, "output", "a.slp", "a.png")
+            return ExportJob(request, root["a.slp"], root["output", "a.png"], _export_nothing,
+                             kwargs, lambda request, result: results.append(result))
+
+        def skip_unchanged(job):
+            return MediaExporter._skip_unchanged_jobs([job], index, args, export_pool, {})
+
+        job = create_job(thread_count=1)
+        assert_value(skip_unchanged(job), [job])
+
+        output_data = b"exported"
+        with job.target_path.open("wb") as output_file:
+            output_file.write(output_data)
+
+        job.inputs.update(source_hash=hash_data(source_data, HASH_ALGO))
+        index.update(job.target_path, job.inputs,
+                     {"a.png": (len(output_data), hash_data(output_data, HASH_ALGO))},
+                     {"size": [16, 16]})
+        index.save()
+
+        # the number of threads doesn't change the resulting file
+        assert_value(skip_unchanged(create_job(thread_count=4)), [])
+        assert_value(results, [{"size": [16, 16]}])
+
+        # the previous result doesn't contain the settings for the media cache
+        job = create_job(thread_count=1, return_cache_params=True)
+        assert_value(skip_unchanged(job), [job])
+
+        job = create_job(thread_count=1, compressed_textures=True)
+        assert_value(skip_unchanged(job), [job])
+
+
+def compressed_texture():
+    """
+    The blocks of SLD graphics are exported to a DDS texture that has the
+    size of the texture atlas in the metadata.
+    """
+    image = SLD(create_sld(3, 20, 12))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        target_path = Directory(tmpdir).root["a.png"]
+
+        pop_media_files()
+        metadata = _export_compressed_texture(image, target_path)
+        media_files = pop_media_files()
+
+    assert_value([path.name for path, _, _ in media_files], ["a.dds"])
+    assert_value(metadata["pxformat"], "bc1")
+    assert_value(len(metadata["subtex_metadata"]), 3)
+
+    # BC1 blocks store 4x4 pixels in 8 bytes
+    width, height = metadata["size"]
+    dds_data = media_files[0][1]
+    header = DDS_HEADER.unpack(dds_data[:DDS_HEADER.size])
+    assert_value(header[3:6], (height, width, width * height // 2))
+    assert_value(header[10], b"DXT1")
+    assert_value(len(dds_data), DDS_HEADER.size + width * height // 2)
+
+
+def media_cache():
+    """
+    The media cache is created from the settings returned by the graphics
+    export, for exported files as well as for skipped unchanged files.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = DirectoryCreator(Directory(tmpdir).root).root
+
+        source_filenames = [f"{file_id}.slp" for file_id in range(3)]
+        for file_id, filename in enumerate(source_filenames):
+            with root["source", MediaType.GRAPHICS.value, filename].open("wb") as source_file:
+                source_file.write(create_slp(2, 16, 16, seed=file_id))
+
+        args = Namespace(jobs=1, palettes={50500: create_palette()}, compression_level=1,
+                         game_version=create_game_version("AOC"), dll_manager=None,
+                         debugdir=root["debug"], debug_info=6, blend_mode_count=None,
+                         targetdir=root["converted"], flag=lambda name: False)
+
+        cache_texts = []
+        for _ in range(2):
+            export_requests = {
+                MediaType.GRAPHICS: [
+                    MediaExportRequest(MediaType.GRAPHICS, "graphics", filename,
+                                       filename.replace(".slp", ".png"))
+                    for filename in source_filenames
+                ]
+            }
+            MediaExporter.export(export_requests, root["source"], root["converted", "mod"], args)
+
+            cache_path = root["debug", "export", "media_cache.toml"]
+            cache_info = load_media_cache(cache_path)
+            assert_value(sorted(cache_info), source_filenames)
+            assert_value(all(cache["packer_settings"] and cache["compr_settings"] == [1]
+                             for cache in cache_info.values()), True)
+
+            with cache_path.open("r") as cache_file:
+                cache_texts.append(cache_file.read())
+
+        # the second export skips the unchanged files
+        assert_value(cache_texts[1], cache_texts[0])
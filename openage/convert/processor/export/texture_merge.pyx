@@ -1,4 +1,4 @@
-# Copyright 2014-2024 the openage authors. See copying.md for legal info.
+# Copyright 2014-2026 the openage authors. See copying.md for legal info.
 #
 # cython: infer_types=True
 # pylint: disable=too-many-locals
@@ -18,6 +18,7 @@ from ...entity_object.export.texture import TextureImage
 from ...service.export.png.binpack cimport DeterministicPacker, RowPacker, ColumnPacker, BinaryTreePacker, BestPacker
 from ...value_object.read.media.hardcoded.texture import (MAX_TEXTURE_DIMENSION, MARGIN,
                                                           TERRAIN_ASPECT_RATIO)
+from ...value_object.read.media.sld import TRANSPARENT_BLOCKS
 
 class PackerType(Enum):
     """
@@ -146,3 +147,70 @@ cdef void cmerge_frames(texture, packer_type=PackerType.BINPACK, cache=None) exc
         # Only generate these values if no custom packer was used
         # TODO: It might make sense to do it anyway for debugging purposes
         texture.best_packer_hints = packer.get_mapping_hints(blocks)
+
+
+def merge_compressed_frames(frames):
+    """
+    Merge the compressed 4x4 pixel blocks of SLD layers into a single
+    image atlas without decompressing them.
+
+    The frames are packed in units of blocks, so that every frame starts
+    at a block boundary of the atlas.
+
+    :param frames: SLD layers with the same block compression format.
+    :type frames: list
+    :returns: Blocks of the atlas with the shape (height / 4, width / 4, 8)
+              and the metadata of the atlas.
+    :rtype: tuple
+    """
+    if len(frames) == 0:
+        raise ValueError("cannot create texture with empty input frame list")
+
+    cdef list frame_blocks = [frame.get_block_data() for frame in frames]
+    cdef list blocks = [block(idx, data.shape[1], data.shape[0])
+                        for idx, data in enumerate(frame_blocks)]
+
+    # the margin is one block wide
+    cdef BestPacker packer = BestPacker([BinaryTreePacker(margin=MARGIN, aspect_ratio=1)])
+    packer.pack(blocks)
+
+    cdef int width = 4 * packer.width()
+    cdef int height = 4 * packer.height()
+    assert width <= MAX_TEXTURE_DIMENSION, "Texture width limit exceeded"
+    assert height <= MAX_TEXTURE_DIMENSION, "Texture height limit exceeded"
+
+    atlas_blocks = numpy.empty((height // 4, width // 4, 8), dtype=numpy.uint8)
+    atlas_blocks[:, :] = numpy.frombuffer(TRANSPARENT_BLOCKS[frames[0].block_format],
+                                          dtype=numpy.uint8)
+
+    cdef int pos_x
+    cdef int pos_y
+
+    cdef list drawn_frames_meta = []
+    for index, (frame, sub_blocks) in enumerate(zip(frames, frame_blocks)):
+        pos_x, pos_y = packer.pos(index)
+
+        atlas_blocks[pos_y:pos_y + sub_blocks.shape[0],
+                     pos_x:pos_x + sub_blocks.shape[1]] = sub_blocks
+
+        hotspot_x, hotspot_y = frame.get_hotspot()
+
+        drawn_frames_meta.append(
+            {
+                "x":  4 * pos_x,
+                "y":  4 * pos_y,
+                "w":  4 * sub_blocks.shape[1],
+                "h":  4 * sub_blocks.shape[0],
+                "cx": hotspot_x,
+                "cy": hotspot_y,
+            }
+        )
+
+    spam("merged %d compressed frames to %dx%d atlas.", len(frames), width, height)
+
+    metadata = {
+        "size": (width, height),
+        "subtex_metadata": drawn_frames_meta,
+    }
+
+    return atlas_blocks, metadata
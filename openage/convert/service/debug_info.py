@@ -1,4 +1,4 @@
-# Copyright 2020-2023 the openage authors. See copying.md for legal info.
+# Copyright 2020-2026 the openage authors. See copying.md for legal info.
 
 # TODO pylint: disable=C,R
 """
@@ -8,6 +8,7 @@ Creates debug output from data in a conversion run.
 from __future__ import annotations
 import typing
 
+import json
 
 from openage.convert.entity_object.conversion.aoc.genie_tech import AgeUpgrade, \
     UnitLineUpgrade, BuildingLineUpgrade, UnitUnlock, BuildingUnlock
@@ -31,6 +32,7 @@ if typing.TYPE_CHECKING:
     from openage.convert.entity_object.conversion.aoc.genie_object_container import GenieObjectContainer
     from openage.convert.value_object.init.game_version import GameVersion
     from openage.util.fslike.directory import Directory
+    from openage.util.instrumentation import Recorder
 
 
 def debug_cli_args(debugdir: Directory, loglevel: int, args: Namespace) -> None:
@@ -679,26 +681,43 @@ def debug_media_cache(
         log.write(logtext)
 
 
-def debug_execution_time(debugdir: Directory, loglevel: int, stages_time: dict[str, float]) -> None:
+def debug_instrumentation(debugdir: Directory, loglevel: int, recorder: Recorder) -> None:
     """
-    Create debug output for execution time for each stage
+    Create debug output for the execution time and memory usage of each stage
 
     :param debugdir: Output directory for the debug info.
     :type debugdir: Directory
     :param loglevel: Determines how detailed the output is.
     :type loglevel: int
-    :param stages_time: Dict with execution time for each stage.
-    :type stages_time: dict
+    :param recorder: Recorder with the measured spans of the stages.
+    :type recorder: Recorder
     """
     if loglevel < 1:
         return
 
+    summary = recorder.get_summary()
+
     logfile = debugdir["execution_time"]
-    logtext = "".join(f"{k}: {v}\n" for k, v in stages_time.items())
+    logtext = ""
+    pending = list(reversed(summary["spans"]))
+    while pending:
+        span = pending.pop()
+        logtext += f"{span['name']}: {span['wall_time']}\n"
+        pending.extend(reversed(span.get("children", [])))
 
     with logfile.open("w") as log:
         log.write(logtext)
 
+    # spans with all measurements
+    logfile = debugdir["execution_time.json"]
+    with logfile.open("w") as log:
+        json.dump(summary, log, indent=4)
+
+    # timeline for chrome://tracing or https://ui.perfetto.dev
+    logfile = debugdir["execution_trace.json"]
+    with logfile.open("w") as log:
+        json.dump(recorder.get_trace_events(), log)
+
 
 def debug_not_found_sounds(debugdir: Directory, loglevel: int, sound: Path) -> None:
     """
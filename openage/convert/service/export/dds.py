@@ -0,0 +1,88 @@
+# Copyright 2026-2026 the openage authors. See copying.md for legal info.
+
+"""
+Creates DDS textures from block compressed pixel data.
+
+The blocks are stored as they are, so that they can be uploaded
+to the GPU without decompressing them.
+"""
+from __future__ import annotations
+import typing
+
+from struct import Struct
+
+if typing.TYPE_CHECKING:
+    import numpy
+
+
+# struct dds_file_header {
+#   char[4]      magic;
+#   unsigned int size;
+#   unsigned int flags;
+#   unsigned int height;
+#   unsigned int width;
+#   unsigned int pitch_or_linear_size;
+#   unsigned int depth;
+#   unsigned int mipmap_count;
+#   unsigned int reserved1[11];
+#   unsigned int pixel_format_size;
+#   unsigned int pixel_format_flags;
+#   char[4]      fourcc;
+#   unsigned int rgb_bit_count;
+#   unsigned int bit_masks[4];
+#   unsigned int caps;
+#   unsigned int caps2;
+#   unsigned int caps3;
+#   unsigned int caps4;
+#   unsigned int reserved2;
+# };
+DDS_HEADER = Struct("< 4s 7I 44x 2I 4s 5I 5I")
+
+# header flags: DDSD_CAPS | DDSD_HEIGHT | DDSD_WIDTH | DDSD_PIXELFORMAT | DDSD_LINEARSIZE
+DDS_HEADER_FLAGS = 0x1 | 0x2 | 0x4 | 0x1000 | 0x80000
+
+# pixel format flags: DDPF_FOURCC
+DDS_PIXEL_FORMAT_FLAGS = 0x4
+
+# caps: DDSCAPS_TEXTURE
+DDS_CAPS = 0x1000
+
+# FourCC codes of the block compression formats
+FOURCC = {
+    "bc1": b"DXT1",
+    "bc4": b"ATI1",
+}
+
+
+def create_dds(block_data: numpy.ndarray, block_format: str) -> bytes:
+    """
+    Create a DDS texture from compressed 4x4 pixel blocks.
+
+    :param block_data: Blocks of the texture with the shape (height / 4, width / 4, 8).
+    :param block_format: Compression format of the blocks (see FOURCC).
+    :returns: Content of the DDS file.
+    """
+    fourcc = FOURCC.get(block_format)
+    if fourcc is None:
+        raise ValueError(f"DDS textures with block format {block_format} are not supported")
+
+    height_blocks, width_blocks, _ = block_data.shape
+
+    header = DDS_HEADER.pack(
+        b"DDS ",
+        DDS_HEADER.size - 4,
+        DDS_HEADER_FLAGS,
+        4 * height_blocks,
+        4 * width_blocks,
+        block_data.nbytes,
+        0,
+        0,
+        32,
+        DDS_PIXEL_FORMAT_FLAGS,
+        fourcc,
+        0, 0, 0, 0, 0,
+        DDS_CAPS,
+        0, 0, 0, 0,
+    )
+
+    return header + block_data.tobytes()
@@ -0,0 +1,365 @@
+# Copyright 2026-2026 the openage authors. See copying.md for legal info.
+
+"""
+Index of the media files exported by previous conversion runs.
+
+The index stores the inputs (source file, palettes, export settings) and
+the resulting files of every export request. Exports whose inputs are
+unchanged and whose files still exist can be skipped in the next run.
+
+While the media files are exported, the index is written to a journal
+file from time to time. If the conversion is interrupted, the journal
+contains the exports that were finished and can be used to resume the
+conversion.
+"""
+from __future__ import annotations
+import typing
+
+import hashlib
+import json
+import os
+
+from ....log import dbg, info, warn
+from .media_writer import HASH_ALGO
+
+if typing.TYPE_CHECKING:
+    from openage.convert.service.export.media_source import MediaSource
+    from openage.convert.value_object.read.media.colortable import ColorTable
+    from openage.util.fslike.path import Path
+
+
+# Location of the index in the converted assets directory
+INDEX_FILENAME = "cache/media_index.json"
+
+# Location of the journal of an unfinished export in the converted assets directory
+JOURNAL_FILENAME = "cache/media_journal.json"
+
+# Time between two writes of the journal in seconds
+JOURNAL_INTERVAL = 30.0
+
+# Version of the index file format
+FILE_VERSION = 2
+
+# Version of the media export functions. Increase this if the exported files
+# change for the same source file, so that all media files are exported again.
+EXPORT_VERSION = 2
+
+
+def get_palette_hash(palettes: dict[int, ColorTable]) -> str:
+    """
+    Get a hash value of the palettes used for exporting graphics.
+
+    :param palettes: Palettes used by the game.
+    """
+    hashfunc = hashlib.new(HASH_ALGO)
+    for palette_id in sorted(palettes):
+        hashfunc.update(repr((palette_id, palettes[palette_id].palette)).encode())
+
+    return hashfunc.hexdigest()
+
+
+class MediaIndex:
+    """
+    Inputs and output files of the media export requests of previous
+    conversion runs, by target path.
+    """
+
+    def __init__(self, index_path: Path, journal_path: Path, resume: bool = False):
+        """
+        :param index_path: Path of the index file.
+        :param journal_path: Path of the journal file.
+        :param resume: If True, continue the export of an interrupted conversion
+                       with the entries from the journal file. Otherwise, the
+                       entries changed by the interrupted conversion are removed
+                       from the index and the journal file is removed.
+        """
+        self.index_path = index_path
+        self.journal_path = journal_path
+
+        # Inputs, output files and result of the export function by target path
+        self.entries: dict[str, dict[str, typing.Any]] = {}
+
+        # file stats of the native source files by native path
+        self._stat_cache: dict[str | bytes, tuple[int, int]] = {}
+
+        # target paths of the entries whose output files have to be
+        # stat'ed when the entries are written, by entry key
+        self._new_entries: dict[str, Path] = {}
+
+        if index_path.is_file():
+            self.entries.update(self.load(index_path))
+
+        if journal_path.is_file():
+            if resume:
+                journal_entries = self.load(journal_path)
+                info("Resuming the media export with %d entries from the journal",
+                     len(journal_entries))
+                self.entries.update(journal_entries)
+
+            else:
+                self._discard_journal()
+
+    def _discard_journal(self) -> None:
+        """
+        Remove the journal of an interrupted conversion that isn't resumed.
+
+        The interrupted conversion may have overwritten the output files of
+        index entries, so only the entries that are unchanged in the journal
+        are kept. The index file is rewritten before the journal is removed,
+        so that it never contains the outdated entries again.
+        """
+        journal_entries = self.load(self.journal_path)
+        outdated_keys = [
+            key for key, entry in self.entries.items()
+            if journal_entries.get(key) != entry
+        ]
+        if outdated_keys:
+            info("Discarding %d media index entries of an interrupted conversion",
+                 len(outdated_keys))
+            for key in outdated_keys:
+                del self.entries[key]
+
+            self._write(self.index_path)
+
+        self.journal_path.unlink()
+
+    @staticmethod
+    def load(path: Path) -> dict[str, dict[str, typing.Any]]:
+        """
+        Read the entries from an index or journal file.
+
+        Files that can't be read or have a different version are ignored,
+        i.e. all media files are exported again.
+
+        :param path: Path of the index or journal file.
+        """
+        try:
+            with path.open("r") as index_file:
+                index_data = json.load(index_file)
+
+        except (OSError, ValueError) as err:
+            warn("Cannot read media index %s: %s", path, err)
+            return {}
+
+        if index_data.get("file_version") != FILE_VERSION:
+            dbg("Ignoring media index with file version %s",
+                index_data.get("file_version"))
+            return {}
+
+        if index_data.get("export_version") != EXPORT_VERSION:
+            dbg("Ignoring media index of export version %s",
+                index_data.get("export_version"))
+            return {}
+
+        return index_data["entries"]
+
+    def save(self) -> None:
+        """
+        Write the entries to the index file after a finished export.
+
+        The journal file is removed, because all of its entries are
+        contained in the index now.
+        """
+        self._write(self.index_path)
+
+        if self.journal_path.is_file():
+            self.journal_path.unlink()
+
+    def save_journal(self) -> None:
+        """
+        Write the entries to the journal file during an export, or
+        after an export that was interrupted.
+
+        The output files of all entries must be written before.
+        """
+        self._write(self.journal_path)
+
+    def _write(self, path: Path) -> None:
+        """
+        Write the entries to a file.
+
+        The entries are written to a temporary file first, which then
+        replaces the file. This way, the file is complete even if the
+        conversion is killed while writing it.
+
+        :param path: Path of the index or journal file.
+        """
+        self._add_output_mtimes()
+
+        index_data = {
+            "file_version": FILE_VERSION,
+            "export_version": EXPORT_VERSION,
+            "hash_algo": HASH_ALGO,
+            "entries": self.entries,
+        }
+
+        temp_path = path.with_name(path.name + ".tmp")
+        with temp_path.open("w") as index_file:
+            json.dump(index_data, index_file, separators=(",", ":"))
+
+        native_temp_path = temp_path.resolve_native_path()
+        native_path = path.resolve_native_path_w()
+        if native_temp_path and native_path:
+            # replaces an existing file on all platforms
+            os.replace(native_temp_path, native_path)
+
+        else:
+            if path.is_file():
+                path.unlink()
+
+            temp_path.rename(path)
+
+    def get_inputs(
+        self,
+        target_path: Path,
+        source: MediaSource | None,
+        read_source: typing.Callable[[], bytes],
+        params: list
+    ) -> dict[str, typing.Any]:
+        """
+        Get the inputs of an export request.
+
+        Source files that are not stored natively are hashed here. Native
+        source files are never read in the main process: If the file wasn't
+        modified since the last run, the hash value from the index is used.
+        Otherwise, the source hash is None and the file is hashed by the
+        worker that exports it.
+
+        :param target_path: Path to the resulting file.
+        :param source: Descriptor of the source file if it is stored natively.
+        :param read_source: Function for reading the source file data.
+        :param params: Settings that change the resulting file, e.g. the
+                       compression level. Must be JSON serializable.
+        """
+        source_stat = None
+        source_hash = None
+        if source is not None:
+            source_stat = self._get_source_stat(source)
+
+            entry = self.entries.get(self.get_key(target_path))
+            if entry and entry["source_stat"] == source_stat:
+                source_hash = entry["source_hash"]
+
+        else:
+            source_hash = hashlib.new(HASH_ALGO, read_source()).hexdigest()
+
+        params_hash = hashlib.new(
+            HASH_ALGO,
+            json.dumps(params, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+        return {
+            "source_stat": source_stat,
+            "source_hash": source_hash,
+            "params_hash": params_hash,
+        }
+
+    def lookup(
+        self,
+        target_path: Path,
+        inputs: dict[str, typing.Any]
+    ) -> dict[str, typing.Any] | None:
+        """
+        Find the entry of a previous export with the same inputs.
+
+        :param target_path: Path to the resulting file.
+        :param inputs: Inputs of the export request, see get_inputs().
+        :returns: The entry of the previous export or None if the inputs changed
+                  or one of the output files was removed or modified.
+        """
+        if inputs["source_hash"] is None:
+            # the source file was modified since the last run
+            return None
+
+        entry = self.entries.get(self.get_key(target_path))
+        if entry is None:
+            return None
+
+        if (entry["source_hash"] != inputs["source_hash"] or
+                entry["params_hash"] != inputs["params_hash"]):
+            return None
+
+        for filename, (filesize, _, mtime) in entry["outputs"].items():
+            output_path = target_path.parent.joinpath(filename)
+            if (not output_path.is_file() or output_path.filesize != filesize or
+                    output_path.mtime != mtime):
+                return None
+
+        return entry
+
+    def update(
+        self,
+        target_path: Path,
+        inputs: dict[str, typing.Any],
+        outputs: dict[str, tuple[int, str]],
+        result: typing.Any = None
+    ) -> None:
+        """
+        Store the inputs and output files of a finished export.
+
+        :param target_path: Path to the resulting file.
+        :param inputs: Inputs of the export request, see get_inputs(). The
+                       source hash must be set.
+        :param outputs: Size and hash value of the files created by the export
+                        by their filename. The files must be in the directory
+                        of the target path. Their modification times are added
+                        when the entries are written, so the files must be
+                        written by then.
+        :param result: Result of the export function. Must be JSON serializable.
+        """
+        key = self.get_key(target_path)
+        self.entries[key] = {
+            **inputs,
+            "outputs": {
+                filename: [filesize, file_hash]
+                for filename, (filesize, file_hash) in outputs.items()
+            },
+            "result": result,
+        }
+        self._new_entries[key] = target_path
+
+    def _add_output_mtimes(self) -> None:
+        """
+        Add the modification times of the output files to the new entries.
+
+        Entries whose output files don't exist are removed.
+        """
+        for key, target_path in self._new_entries.items():
+            entry = self.entries.get(key)
+            if entry is None:
+                continue
+
+            for filename, output in entry["outputs"].items():
+                output_path = target_path.parent.joinpath(filename)
+                if not output_path.is_file():
+                    del self.entries[key]
+                    break
+
+                output.append(output_path.mtime)
+
+        self._new_entries.clear()
+
+    @staticmethod
+    def get_key(target_path: Path) -> str:
+        """
+        Get the key of an export request in the index.
+
+        :param target_path: Path to the resulting file.
+        """
+        return "/".join(
+            part.decode() if isinstance(part, bytes) else part
+            for part in target_path.parts
+        )
+
+    def _get_source_stat(self, source: MediaSource) -> list:
+        """
+        Get the location and modification time of a native source file.
+        """
+        file_stat = self._stat_cache.get(source.native_path)
+        if file_stat is None:
+            stat_result = os.stat(source.native_path)
+            file_stat = (stat_result.st_mtime_ns, stat_result.st_size)
+            self._stat_cache[source.native_path] = file_stat
+
+        # lists, so that the stat can be compared with the one read from the index file
+        return [os.fsdecode(source.native_path), source.offset, source.size, *file_stat]
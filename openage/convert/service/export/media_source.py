@@ -0,0 +1,113 @@
+# Copyright 2026-2026 the openage authors. See copying.md for legal info.
+
+"""
+Descriptors for media source files that worker processes can read themselves.
+
+Sending a descriptor to a worker instead of the file data avoids reading
+every source file in the main process and copying it through the pipes
+of the worker pool.
+"""
+from __future__ import annotations
+import typing
+
+import mmap
+
+from ....util.fslike.filecollection import FileCollection
+
+if typing.TYPE_CHECKING:
+    from openage.util.fslike.path import Path
+
+
+# memory maps of archives opened by the current process, by native path
+_ARCHIVE_MAPS: dict[str | bytes, mmap.mmap] = {}
+
+
+class MediaSource:
+    """
+    Location of a media source file on the native filesystem.
+
+    The source is either a loose file or a file stored at an offset
+    inside an archive (e.g. a DRS file).
+    """
+
+    __slots__ = ('native_path', 'offset', 'size')
+
+    def __init__(self, native_path: str | bytes, offset: int = None, size: int = None):
+        """
+        :param native_path: Path of the file that contains the source data.
+        :param offset: Offset of the source data in an archive file.
+                       None if the source is a loose file.
+        :param size: Size of the source data in an archive file.
+        """
+        self.native_path = native_path
+        self.offset = offset
+        self.size = size
+
+    def read(self, size: int = None) -> bytes:
+        """
+        Read the source data.
+
+        Archives are memory-mapped once per process, so that reading
+        many files from the same archive doesn't reopen it every time.
+
+        :param size: Maximum number of bytes that are read from the start of
+                     the source data, e.g. for reading a header. None reads all data.
+        """
+        if self.offset is None:
+            with open(self.native_path, "rb") as source_file:
+                return source_file.read(-1 if size is None else size)
+
+        archive_map = _ARCHIVE_MAPS.get(self.native_path)
+        if archive_map is None:
+            with open(self.native_path, "rb") as archive_file:
+                archive_map = mmap.mmap(archive_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+            _ARCHIVE_MAPS[self.native_path] = archive_map
+
+        if size is None or size > self.size:
+            size = self.size
+
+        return archive_map[self.offset:self.offset + size]
+
+    def __repr__(self):
+        if self.offset is None:
+            return f"MediaSource({self.native_path!r})"
+
+        return f"MediaSource({self.native_path!r}, {self.offset}, {self.size})"
+
+
+def get_media_source(source_path: Path) -> MediaSource | None:
+    """
+    Locate a source file on the native filesystem.
+
+    :param source_path: Path to the source file, e.g. in the mounted asset directories.
+    :returns: A descriptor of the source file or None if the file only
+              exists in a virtual filesystem, e.g. an in-memory archive.
+    """
+    native_path = source_path.resolve_native_path()
+    if native_path is not None:
+        return MediaSource(native_path)
+
+    # pylint: disable=protected-access
+    resolved_path = source_path._resolve_r()
+    if resolved_path is None or not isinstance(resolved_path.fsobj, FileCollection):
+        return None
+
+    entry = resolved_path.fsobj.get_fileentry(resolved_path.parts)
+    location = entry.get_native_location()
+    if location is None:
+        return None
+
+    return MediaSource(*location)
+
+
+def read_media_source(source_data: bytes | MediaSource) -> bytes:
+    """
+    Return the data of a source file that was passed to a worker.
+
+    :param source_data: Source file data or a descriptor of the source file.
+    """
+    if isinstance(source_data, MediaSource):
+        return source_data.read()
+
+    return source_data
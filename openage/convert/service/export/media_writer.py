@@ -0,0 +1,239 @@
+# Copyright 2026-2026 the openage authors. See copying.md for legal info.
+
+"""
+Writes the files created by the media export functions.
+
+The export functions only encode the files. The encoded data is hashed
+while it is still in memory and then written by one writer thread in
+the main process, so that the files don't have to be read again for
+the modpack manifest.
+"""
+from __future__ import annotations
+import typing
+
+import os
+import queue
+import shutil
+import threading
+
+from ....util.hash import hash_data
+
+if typing.TYPE_CHECKING:
+    from openage.util.fslike.path import Path
+
+
+# Hashing algorithm of the modpack manifest
+HASH_ALGO = "sha3_256"
+
+# files created by the export call that is running in the current process
+_MEDIA_FILES: list[tuple[Path, bytes, str]] = []
+
+
+def write_media_file(target_path: Path, data: bytes) -> None:
+    """
+    Pass a file created by an export function to the writer.
+
+    The file is written after the export function returns.
+
+    :param target_path: Path to the resulting file.
+    :param data: Encoded file data.
+    """
+    _MEDIA_FILES.append((target_path, data, hash_data(data, HASH_ALGO)))
+
+
+def pop_media_files() -> list[tuple[Path, bytes, str]]:
+    """
+    Return and forget the files created by the export functions
+    since the last call.
+
+    :returns: Paths, data and hash values of the created files.
+    """
+    media_files = _MEDIA_FILES.copy()
+    _MEDIA_FILES.clear()
+
+    return media_files
+
+
+class MediaWriter:
+    """
+    Writes media files in a background thread.
+
+    Files are written in the order they are passed to the writer. The
+    written files and their directories are synced to the disk when the
+    writer is closed, not while the files are written.
+    """
+
+    def __init__(self, max_queued: int = 64):
+        """
+        :param max_queued: Maximum number of files that wait to be written.
+        """
+        self.queue: queue.Queue = queue.Queue(max_queued)
+
+        # exception that stopped the writer thread
+        self.error: BaseException | None = None
+
+        # native paths of the written files and of the directories of the
+        # written files and links, which are synced when the writer is closed
+        self.written_files: list[str | bytes] = []
+        self.written_dirs: set[str | bytes] = set()
+
+        self.thread = threading.Thread(target=self._run, name="media writer", daemon=True)
+        self.thread.start()
+
+    def write(self, target_path: Path, data: bytes) -> None:
+        """
+        Write a file.
+
+        :param target_path: Path to the resulting file.
+        :param data: File data.
+        """
+        self._put((target_path, data, None))
+
+    def link(self, source_path: Path, target_path: Path) -> None:
+        """
+        Create a hard link to a file that was passed to the writer before.
+        If the filesystem doesn't support hard links, the file is copied.
+
+        :param source_path: Path to the existing file.
+        :param target_path: Path to the new file.
+        """
+        self._put((target_path, None, source_path))
+
+    def flush(self) -> None:
+        """
+        Wait until the pending files are written.
+        """
+        if self.thread.is_alive():
+            self.queue.join()
+
+        if self.error:
+            raise self.error
+
+    def close(self) -> None:
+        """
+        Wait for the pending files and sync them to the disk.
+
+        Only the written files and their directories are synced, not the
+        other changes of the filesystems.
+        """
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+
+        if self.error:
+            raise self.error
+
+        for native_path in self.written_files:
+            _sync_path(native_path, os.O_RDWR)
+
+        if os.name != "nt":
+            # directories can't be opened on Windows
+            for native_path in self.written_dirs:
+                _sync_path(native_path, os.O_RDONLY)
+
+        self.written_files.clear()
+        self.written_dirs.clear()
+
+    def _put(self, item: tuple) -> None:
+        """
+        Pass an item to the writer thread.
+        """
+        if self.error:
+            raise self.error
+
+        self.queue.put(item)
+
+    def _run(self) -> None:
+        """
+        Write the queued files until the writer is closed.
+        """
+        while True:
+            item = self.queue.get()
+            if item is None:
+                self.queue.task_done()
+                return
+
+            if self.error:
+                # discard the remaining files
+                self.queue.task_done()
+                continue
+
+            try:
+                target_path, data, source_path = item
+
+                # Existing files may be hard links to other files,
+                # which would be changed by writing into them
+                if target_path.is_file():
+                    target_path.unlink()
+
+                if source_path is None:
+                    with target_path.open("wb") as outfile:
+                        outfile.write(data)
+
+                else:
+                    _link_file(source_path, target_path)
+
+                native_path = target_path.resolve_native_path()
+                if native_path:
+                    if source_path is None:
+                        # links share the data of a file that is synced already
+                        self.written_files.append(native_path)
+
+                    self.written_dirs.add(os.path.dirname(native_path))
+
+            except BaseException as exc:  # pylint: disable=broad-except
+                self.error = exc
+
+            self.queue.task_done()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+
+        else:
+            # don't hide the original exception
+            self.queue.put(None)
+            self.thread.join()
+
+
+def _sync_path(native_path: str | bytes, flags: int) -> None:
+    """
+    Flush the changes of a file or directory to the disk.
+
+    :param native_path: Path of the file or directory in the native filesystem.
+    :param flags: Flags for opening the file or directory.
+    """
+    file_descriptor = os.open(native_path, flags)
+    try:
+        os.fsync(file_descriptor)
+
+    finally:
+        os.close(file_descriptor)
+
+
+def _link_file(source_path: Path, target_path: Path) -> None:
+    """
+    Create a hard link to a file. If the filesystem doesn't
+    support hard links, the file is copied.
+
+    :param source_path: Path to the existing file.
+    :param target_path: Path to the new file.
+    """
+    target_path.parent.mkdirs()
+
+    source_native = source_path.resolve_native_path()
+    target_native = target_path.resolve_native_path_w()
+    if source_native and target_native:
+        try:
+            os.link(source_native, target_native)
+            return
+
+        except OSError:
+            # e.g. the files are on different devices
+            pass
+
+    with source_path.open("rb") as infile, target_path.open("wb") as outfile:
+        shutil.copyfileobj(infile, outfile)
@@ -1,16 +1,18 @@
-# Copyright 2020-2023 the openage authors. See copying.md for legal info.
+# Copyright 2020-2026 the openage authors. See copying.md for legal info.
 
 from libc.stdio cimport FILE
 
-cdef extern from "png.h":
+cdef extern from "png.h" nogil:
     const char PNG_LIBPNG_VER_STRING[]
     const int PNG_COLOR_TYPE_RGBA
+    const int PNG_COLOR_TYPE_PALETTE
     const int PNG_INTERLACE_NONE
     const int PNG_COMPRESSION_TYPE_DEFAULT
     const int PNG_FILTER_TYPE_DEFAULT
     const int PNG_TRANSFORM_IDENTITY
     const int PNG_IMAGE_VERSION
     const char PNG_FORMAT_RGBA
+    const char PNG_FORMAT_RGBA_COLORMAP
 
     const unsigned int PNG_FILTER_NONE
     const unsigned int PNG_ALL_FILTERS
@@ -34,6 +36,14 @@ cdef extern from "png.h":
     ctypedef png_info **png_infopp
     ctypedef const png_info *png_const_inforp
 
+    ctypedef struct png_color:
+        png_byte red
+        png_byte green
+        png_byte blue
+    ctypedef const png_color *png_const_colorp
+    ctypedef struct png_color_16
+    ctypedef const png_color_16 *png_const_color_16p
+
     ctypedef const char *png_const_charp
     ctypedef void *png_voidp
     ctypedef void *png_rw_ptr
@@ -72,6 +82,15 @@ cdef extern from "png.h":
                       int interlace_method,
                       int compression_method,
                       int filter_method)
+    void png_set_PLTE(png_structrp png_ptr,
+                      png_inforp info_ptr,
+                      png_const_colorp palette,
+                      int num_palette)
+    void png_set_tRNS(png_structrp png_ptr,
+                      png_inforp info_ptr,
+                      png_const_bytep trans_alpha,
+                      int num_trans,
+                      png_const_color_16p trans_color)
     void png_init_io(png_structrp png_ptr,
                      png_FILE_p fp)
     void png_set_rows(png_const_structrp png_ptr,
@@ -1,4 +1,4 @@
-# Copyright 2020-2021 the openage authors. See copying.md for legal info.
+# Copyright 2020-2026 the openage authors. See copying.md for legal info.
 #
 # cython: infer_types=True
 
@@ -6,14 +6,18 @@
 Creates valid PNG files as bytearrays by utilizing libpng.
 """
 
-from libc.stdint cimport uint8_t
+from libc.stdint cimport uint8_t, uint32_t
 from libc.stdlib cimport malloc, free
 from libc.string cimport memcpy, memset
 
 from ..opus.bytearray cimport PyByteArray_AS_STRING
 from . cimport libpng
 from . cimport png_tmp_file
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+from itertools import repeat
+import struct
+import zlib
 
 cimport cython
 import numpy
@@ -50,18 +54,46 @@ cdef int GREEDY_COMPR_STRAT_MAX = 3
 cdef int GREEDY_FILTER_0 = libpng.PNG_FILTER_NONE
 cdef int GREEDY_FILTER_5 = libpng.PNG_ALL_FILTERS
 
+# Images with less data (in bytes) are always compressed by one thread
+cdef Py_ssize_t PARALLEL_DEFLATE_MIN_SIZE = 1024 * 1024
+
+# Size of the parts of the image data that are compressed by the threads
+cdef Py_ssize_t PARALLEL_DEFLATE_CHUNK_SIZE = 256 * 1024
+
+# Size of the deflate window. The end of the previous part is used
+# as the dictionary for the next part, so that the compression is
+# almost as good as with one thread.
+cdef Py_ssize_t DEFLATE_WINDOW_SIZE = 32 * 1024
+
+# Number of slots of the hash table for finding the colors of an image
+# (4 times the maximum palette size, must be a power of 2)
+cdef enum:
+    COLOR_TABLE_BITS = 10
+    COLOR_TABLE_SIZE = 1 << COLOR_TABLE_BITS
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
 def save(numpy.ndarray[numpy.uint8_t, ndim=3, mode="c"] imagedata not None,
-         compr_method=CompressionMethod.COMPR_DEFAULT, compr_settings=None):
+         compr_method=CompressionMethod.COMPR_DEFAULT, compr_settings=None,
+         int thread_count=1):
     """
     Convert an image matrix with RGBA colors to a PNG. The PNG is returned
     as a bytearray or bytes object.
 
+    Images with at most 256 different RGBA colors, e.g. sprites that use one
+    palette, are stored as palette-indexed PNG (PLTE + tRNS chunks). They
+    decode to exactly the same RGBA values, including the special pixels
+    (player color, outlines) that are marked in the alpha channel.
+
     The function provides the option to reduce the resulting PNG size by
     doing multiple compression trials.
 
+    With more than one thread, the compression trials run in parallel. Large
+    images without row filters are compressed in parallel parts.
+
     :param imagedata: A 3-dimensional array with RGBA color values for pixels.
     :type imagedata: numpy.ndarray
     :param compr_method: The compression optimization method.
@@ -70,6 +102,8 @@ def save(numpy.ndarray[numpy.uint8_t, ndim=3, mode="c"] imagedata not None,
                            memory level, strategy and filter method (in that
                            order) used for encoding the PNG.
     :type compr_settings: tuple
+    :param thread_count: Number of threads used for compressing the PNG.
+    :type thread_count: int
     :returns: A bytearray containing the generated PNG file as well as the
               settings that generate the smallest PNG, if the compression
               method COMPR_GREEDY was chosen.
@@ -77,12 +111,20 @@ def save(numpy.ndarray[numpy.uint8_t, ndim=3, mode="c"] imagedata not None,
     """
     cdef unsigned int width = imagedata.shape[1]
     cdef unsigned int height = imagedata.shape[0]
+
+    # Palette with the RGBA values of the colors of an indexed image
+    palette = None
+
+    indexed_image = index_colors(imagedata)
+    if indexed_image is not None:
+        imagedata, palette = indexed_image
+
     cdef numpy.uint8_t[:,:,::1] mview = imagedata
 
     cdef greedy_cache_param cache
 
     if compr_method is CompressionMethod.COMPR_DEFAULT:
-        outdata = optimize_default(mview, width, height)
+        outdata = optimize_default(mview, width, height, palette)
         best_settings = None
 
     elif compr_method is CompressionMethod.COMPR_GREEDY:
@@ -99,7 +141,8 @@ def save(numpy.ndarray[numpy.uint8_t, ndim=3, mode="c"] imagedata not None,
             cache.strat = 0xFF
             cache.filters = 0xFF
 
-        outdata, used_settings = optimize_greedy(mview, width, height, cache)
+        outdata, used_settings = optimize_greedy(mview, width, height, cache, thread_count,
+                                                 palette)
         best_settings = (used_settings["compr_lvl"], used_settings["mem_lvl"],
                          used_settings["strat"], used_settings["filters"])
 
@@ -109,7 +152,8 @@ def save(numpy.ndarray[numpy.uint8_t, ndim=3, mode="c"] imagedata not None,
         cache.strat = 0
         cache.filters = 8
 
-        outdata, used_settings = optimize_greedy(mview, width, height, cache)
+        outdata, used_settings = optimize_greedy(mview, width, height, cache, thread_count,
+                                                 palette)
         best_settings = None
 
     else:
@@ -118,20 +162,153 @@ def save(numpy.ndarray[numpy.uint8_t, ndim=3, mode="c"] imagedata not None,
     return outdata, best_settings
 
 
+cdef tuple index_colors(numpy.ndarray[numpy.uint8_t, ndim=3, mode="c"] imagedata):
+    """
+    Convert an image with RGBA colors to palette indices if it has
+    at most 256 different colors.
+
+    :param imagedata: A 3-dimensional array with RGBA color values for pixels.
+    :type imagedata: numpy.ndarray
+    :returns: A 3-dimensional array with one palette index per pixel and the
+              palette with the RGBA values of the colors, or None if the image
+              has more colors.
+    :rtype: tuple
+    """
+    cdef numpy.ndarray[numpy.uint8_t, ndim=3, mode="c"] indices = \
+        numpy.empty((imagedata.shape[0], imagedata.shape[1], 1), dtype=numpy.uint8)
+    cdef numpy.ndarray[numpy.uint8_t, ndim=2, mode="c"] palette = \
+        numpy.empty((256, 4), dtype=numpy.uint8)
+
+    cdef const numpy.uint8_t[:,:,::1] image_view = imagedata
+    cdef numpy.uint8_t[:,:,::1] indices_view = indices
+    cdef numpy.uint8_t[:,::1] palette_view = palette
+
+    cdef int color_count
+    with nogil:
+        color_count = find_palette(image_view, indices_view, palette_view)
+
+    if color_count <= 0:
+        return None
+
+    return indices, palette[:color_count]
+
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
-cdef bytearray optimize_default(numpy.uint8_t[:,:,::1] imagedata, int width, int height):
+cdef int find_palette(const numpy.uint8_t[:,:,::1] imagedata,
+                      numpy.uint8_t[:,:,::1] indices,
+                      numpy.uint8_t[:,::1] palette) noexcept nogil:
+    """
+    Find the colors of an image and store the palette index of every pixel.
+
+    Colors with transparency are placed at the start of the palette,
+    so that the tRNS chunk only has to contain their alpha values.
+
+    :param imagedata: A memory view of a 3-dimensional array with RGBA color
+                      values for pixels.
+    :type imagedata: uint8_t[:,:,::1]
+    :param indices: Memory view for the palette indices of the pixels.
+    :type indices: uint8_t[:,:,::1]
+    :param palette: Memory view for 256 RGBA colors of the palette.
+    :type palette: uint8_t[:,::1]
+    :returns: Number of colors in the palette, or -1 if the image has
+              more than 256 colors.
+    :rtype: int
+    """
+    # Hash table from the colors to their palette indices
+    cdef uint32_t table_colors[COLOR_TABLE_SIZE]
+    cdef int table_indices[COLOR_TABLE_SIZE]
+
+    # Colors in the order they were found
+    cdef uint32_t colors[256]
+    cdef int color_count = 0
+
+    # Palette indices of the colors after sorting them
+    cdef uint8_t sorted_indices[256]
+    cdef int sorted_count = 0
+
+    cdef const uint8_t *px
+    cdef uint32_t color
+    cdef uint32_t slot
+    cdef int last_index = -1
+    cdef uint32_t last_color = 0
+
+    cdef Py_ssize_t x
+    cdef Py_ssize_t y
+    cdef int i
+
+    for i in range(COLOR_TABLE_SIZE):
+        table_indices[i] = -1
+
+    for y in range(imagedata.shape[0]):
+        for x in range(imagedata.shape[1]):
+            px = &imagedata[y, x, 0]
+            color = px[0] | (px[1] << 8) | (px[2] << 16) | (<uint32_t>px[3] << 24)
+
+            # neighboring pixels often have the same color
+            if color != last_color or last_index < 0:
+                # multiplicative hashing
+                slot = (color * <uint32_t>2654435761) >> (32 - COLOR_TABLE_BITS)
+                while table_indices[slot] >= 0 and table_colors[slot] != color:
+                    slot = (slot + 1) & (COLOR_TABLE_SIZE - 1)
+
+                if table_indices[slot] < 0:
+                    if color_count == 256:
+                        return -1
+
+                    table_colors[slot] = color
+                    table_indices[slot] = color_count
+                    colors[color_count] = color
+                    color_count += 1
+
+                last_color = color
+                last_index = table_indices[slot]
+
+            indices[y, x, 0] = last_index
+
+    # Colors with transparency first, then the opaque colors
+    for i in range(color_count):
+        if colors[i] >> 24 != 255:
+            sorted_indices[i] = sorted_count
+            sorted_count += 1
+
+    for i in range(color_count):
+        if colors[i] >> 24 == 255:
+            sorted_indices[i] = sorted_count
+            sorted_count += 1
+
+    for i in range(color_count):
+        palette[sorted_indices[i], 0] = colors[i] & 0xFF
+        palette[sorted_indices[i], 1] = (colors[i] >> 8) & 0xFF
+        palette[sorted_indices[i], 2] = (colors[i] >> 16) & 0xFF
+        palette[sorted_indices[i], 3] = colors[i] >> 24
+
+    for y in range(indices.shape[0]):
+        for x in range(indices.shape[1]):
+            indices[y, x, 0] = sorted_indices[indices[y, x, 0]]
+
+    return color_count
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef bytearray optimize_default(numpy.uint8_t[:,:,::1] imagedata, int width, int height,
+                                numpy.ndarray palette):
     """
     Create an in-memory PNG with the default libpng compression level and copy it to
     a bytearray.
 
     :param imagedata: A memory view of a 3-dimensional array with RGBA color
-                      values for pixels. The array is expected to be C-aligned.
+                      values or palette indices for pixels. The array is expected
+                      to be C-aligned.
     :type imagedata: uint8_t[:,:,::1]
     :param width: Width of the image in pixels.
     :type width: int
     :param height: Height of the image in pixels.
     :type height: int
+    :param palette: RGBA values of the palette colors if the image data contains
+                    palette indices, otherwise None.
+    :type palette: numpy.ndarray
     :returns: A bytearray containing the generated PNG file.
     :rtype: bytearray
     """
@@ -143,6 +320,14 @@ cdef bytearray optimize_default(numpy.uint8_t[:,:,::1] imagedata, int width, int
     write_image.height = height
     write_image.format = libpng.PNG_FORMAT_RGBA
 
+    cdef const uint8_t[:,::1] palette_view
+    cdef const void *colormap = NULL
+    if palette is not None:
+        palette_view = palette
+        colormap = &palette_view[0,0]
+        write_image.format = libpng.PNG_FORMAT_RGBA_COLORMAP
+        write_image.colormap_entries = palette_view.shape[0]
+
     # Get required byte size
     cdef libpng.png_alloc_size_t write_image_size = 0
     cdef void *rgb_data = &imagedata[0,0,0]
@@ -152,7 +337,7 @@ cdef bytearray optimize_default(numpy.uint8_t[:,:,::1] imagedata, int width, int
                                                         0,
                                                         rgb_data,
                                                         0,
-                                                        NULL)
+                                                        colormap)
 
     if not wresult:
         raise MemoryError("Could not allocate memory for PNG conversion.")
@@ -165,7 +350,7 @@ cdef bytearray optimize_default(numpy.uint8_t[:,:,::1] imagedata, int width, int
                                                0,
                                                rgb_data,
                                                0,
-                                               NULL)
+                                               colormap)
 
     if not wresult:
         raise MemoryError("Write to buffer failed for PNG conversion.")
@@ -181,7 +366,8 @@ cdef bytearray optimize_default(numpy.uint8_t[:,:,::1] imagedata, int width, int
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-cdef optimize_greedy(numpy.uint8_t[:,:,::1] imagedata, int width, int height, greedy_cache_param cache):
+cdef optimize_greedy(numpy.uint8_t[:,:,::1] imagedata, int width, int height, greedy_cache_param cache,
+                     int thread_count, numpy.ndarray palette):
     """
     Create an in-memory PNG by greedily searching for the result with the
     smallest file size and copying it to a bytes object.
@@ -191,7 +377,8 @@ cdef optimize_greedy(numpy.uint8_t[:,:,::1] imagedata, int width, int height, gr
     case the search for the best parameters is skipped.
 
     :param imagedata: A memory view of a 3-dimensional array with RGBA color
-                      values for pixels. The array is expected to be C-aligned.
+                      values or palette indices for pixels. The array is expected
+                      to be C-aligned.
     :type imagedata: uint8_t[:,:,::1]
     :param width: Width of the image in pixels.
     :type width: int
@@ -200,32 +387,46 @@ cdef optimize_greedy(numpy.uint8_t[:,:,::1] imagedata, int width, int height, gr
     :param cache: A struct containing compression parameters for the PNG generation. Pass
                    a struct with all values intialized to 0xFF to run the greedy search.
     :type cache: greedy_cache_param
+    :param thread_count: Number of threads used for compressing the PNG.
+    :type thread_count: int
+    :param palette: RGBA values of the palette colors if the image data contains
+                    palette indices, otherwise None.
+    :type palette: numpy.ndarray
     :returns: A bytearray containing the generated PNG file as well as the
               settings that generate the smallest PNG.
     :rtype: tuple
     """
     if cache.compr_lvl == 0xFF:
-        cache = optimize_greedy_iterate(imagedata, width, height)
+        # The search already creates the PNG with the best settings
+        return optimize_greedy_iterate(imagedata, width, height, thread_count, palette)
 
-    cdef png_tmp_file.tmp_file_buffer_state bufstate
-    bufstate.buffer = NULL
-    bufstate.size = 0
+    cdef Py_ssize_t data_size = <Py_ssize_t>width * height * imagedata.shape[2]
 
-    write_to_buffer(imagedata,
-                    &bufstate,
-                    cache.compr_lvl,
-                    cache.mem_lvl,
-                    cache.strat,
-                    cache.filters,
-                    width, height)
+    if (thread_count > 1 and cache.filters == libpng.PNG_FILTER_NONE and
+            data_size >= PARALLEL_DEFLATE_MIN_SIZE):
+        outbuffer = write_parallel(numpy.asarray(imagedata),
+                                   cache.compr_lvl,
+                                   cache.mem_lvl,
+                                   cache.strat,
+                                   thread_count,
+                                   palette)
 
-    outbuffer = <bytes>bufstate.buffer[:bufstate.size]
+    else:
+        outbuffer = write_to_bytes(imagedata,
+                                   cache.compr_lvl,
+                                   cache.mem_lvl,
+                                   cache.strat,
+                                   cache.filters,
+                                   width, height,
+                                   palette)
 
     return outbuffer, cache
 
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
-cdef greedy_cache_param optimize_greedy_iterate(numpy.uint8_t[:,:,::1] imagedata, int width, int height):
+cdef optimize_greedy_iterate(numpy.uint8_t[:,:,::1] imagedata, int width, int height, int thread_count,
+                             numpy.ndarray palette):
     """
     Try several different compression settings and choose the settings
     that generate the smallest PNG. The function tries 8 different
@@ -243,57 +444,260 @@ cdef greedy_cache_param optimize_greedy_iterate(numpy.uint8_t[:,:,::1] imagedata
     :type width: int
     :param height: Height of the image in pixels.
     :type height: int
-    :returns: Settings that generate the smallest PNG.
-    :rtype: greedy_cache_param
+    :param thread_count: Number of threads that run the trials.
+    :type thread_count: int
+    :param palette: RGBA values of the palette colors if the image data contains
+                    palette indices, otherwise None.
+    :type palette: numpy.ndarray
+    :returns: The smallest PNG and the settings that generate it.
+    :rtype: tuple
     """
-    cdef int     best_filesize = 0x7fffffff
-    cdef int     current_filesize = 0x7fffffff
-    cdef uint8_t best_compr_lvl = 0xFF
-    cdef uint8_t best_compr_mem_lvl = 0xFF
-    cdef uint8_t best_compr_strat = 0xFF
-    cdef uint8_t best_filters = 0xFF
-
     cdef greedy_cache_param result
 
-    cdef png_tmp_file.tmp_file_buffer_state bufstate
-
-    for filters in range(GREEDY_FILTER_0, GREEDY_FILTER_5 + 1):
-        if filters != GREEDY_FILTER_0 and filters != GREEDY_FILTER_5:
-            continue
-
+    trials = []
+    for filters in (GREEDY_FILTER_0, GREEDY_FILTER_5):
         for strategy in range(GREEDY_COMPR_STRAT_MIN, GREEDY_COMPR_STRAT_MAX + 1):
             for compr_lvl in range(GREEDY_COMPR_LVL_MIN, GREEDY_COMPR_LVL_MAX + 1):
                 for mem_lvl in range(GREEDY_COMPR_MEM_LVL_MIN, GREEDY_COMPR_MEM_LVL_MAX + 1):
-                    bufstate.buffer = NULL
-                    bufstate.size = 0
+                    trials.append((compr_lvl, mem_lvl, strategy, filters))
+
+    best_trial = None
+    best_outbuffer = None
+
+    if thread_count > 1:
+        with ThreadPoolExecutor(min(thread_count, len(trials))) as executor:
+            outbuffers = list(executor.map(
+                encode_trial,
+                repeat(imagedata),
+                repeat(width),
+                repeat(height),
+                trials,
+                repeat(palette)
+            ))
+
+    else:
+        outbuffers = (encode_trial(imagedata, width, height, trial, palette) for trial in trials)
+
+    for trial, outbuffer in zip(trials, outbuffers):
+        if best_outbuffer is None or len(outbuffer) < len(best_outbuffer):
+            # Save the settings if we found a better result
+            best_trial = trial
+            best_outbuffer = outbuffer
 
-                    write_to_buffer(
-                        imagedata,
+    result.compr_lvl = best_trial[0]
+    result.mem_lvl = best_trial[1]
+    result.strat = best_trial[2]
+    result.filters = best_trial[3]
+
+    return best_outbuffer, result
+
+
+def encode_trial(numpy.uint8_t[:,:,::1] imagedata, int width, int height, tuple trial,
+                 numpy.ndarray palette=None):
+    """
+    Create an in-memory PNG with the compression settings of a trial.
+
+    :param trial: Compression level, memory level, strategy and filters.
+    :type trial: tuple
+    :param palette: RGBA values of the palette colors for indexed images.
+    :type palette: numpy.ndarray
+    """
+    return write_to_bytes(imagedata, trial[0], trial[1], trial[2], trial[3], width, height,
+                          palette)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef bytes write_to_bytes(numpy.uint8_t[:,:,::1] imagedata,
+                          int compression_level, int memory_level,
+                          int compression_strategy, int filters,
+                          int width, int height,
+                          numpy.ndarray palette):
+    """
+    Create an in-memory PNG and copy it to a bytes object. The GIL is
+    released while the PNG is created.
+
+    See write_to_buffer() for the parameters. The palette contains the
+    RGBA values of the colors if the image data contains palette indices,
+    otherwise it is None.
+    """
+    cdef png_tmp_file.tmp_file_buffer_state bufstate
+    bufstate.buffer = NULL
+    bufstate.size = 0
+
+    cdef const uint8_t[:,::1] palette_view
+    cdef const uint8_t *palette_data = NULL
+    cdef int palette_size = 0
+    if palette is not None:
+        palette_view = palette
+        palette_data = &palette_view[0,0]
+        palette_size = palette_view.shape[0]
+
+    with nogil:
+        write_to_buffer(imagedata,
                         &bufstate,
-                        compr_lvl,
-                        mem_lvl,
-                        strategy,
+                        compression_level,
+                        memory_level,
+                        compression_strategy,
                         filters,
-                        width,
-                        height
-                    )
+                        width, height,
+                        palette_data, palette_size)
+
+    try:
+        outbuffer = <bytes>bufstate.buffer[:bufstate.size]
+
+    finally:
+        free(bufstate.buffer)
+
+    return outbuffer
+
+
+cdef bytes write_parallel(numpy.ndarray imagedata,
+                          int compression_level, int memory_level,
+                          int compression_strategy, int thread_count,
+                          numpy.ndarray palette):
+    """
+    Create an in-memory PNG without row filters by compressing
+    parts of the image data in parallel.
+
+    Every part is compressed to a raw deflate stream that ends at a byte
+    boundary (Z_SYNC_FLUSH), so the streams of all parts can be
+    concatenated into the zlib stream of the IDAT chunk.
+
+    :param imagedata: A 3-dimensional array with RGBA color values or palette
+                      indices for pixels.
+    :type imagedata: numpy.ndarray
+    :param compression_level: zlib compression level setting. (allowed: 1-9)
+    :type compression_level: int
+    :param memory_level: zlib compression memory level setting. (allowed: 1-9)
+    :type memory_level: int
+    :param compression_strategy: zlib compression strategy setting.  (allowed: 0-3)
+    :type compression_strategy: int
+    :param thread_count: Number of threads that compress the image data.
+    :type thread_count: int
+    :param palette: RGBA values of the palette colors if the image data contains
+                    palette indices, otherwise None.
+    :type palette: numpy.ndarray
+    """
+    cdef unsigned int height = imagedata.shape[0]
+    cdef unsigned int width = imagedata.shape[1]
+    cdef unsigned int channels = imagedata.shape[2]
+
+    # Every row starts with its filter type, which is 0 (none)
+    scanlines = numpy.zeros((height, width * channels + 1), dtype=numpy.uint8)
+    scanlines[:, 1:] = imagedata.reshape(height, width * channels)
+    rawdata = memoryview(scanlines).cast("B")
+
+    cdef Py_ssize_t data_size = len(rawdata)
+    part_starts = range(0, data_size, PARALLEL_DEFLATE_CHUNK_SIZE)
+
+    with ThreadPoolExecutor(thread_count) as executor:
+        checksum = executor.submit(zlib.adler32, rawdata)
+        parts = list(executor.map(
+            deflate_part,
+            repeat(rawdata),
+            part_starts,
+            repeat(compression_level),
+            repeat(memory_level),
+            repeat(compression_strategy)
+        ))
+
+    idat_data = b"".join((
+        zlib_header(compression_level, compression_strategy),
+        *parts,
+        struct.pack(">I", checksum.result())
+    ))
+
+    color_type = libpng.PNG_COLOR_TYPE_RGBA
+    palette_chunks = []
+    if palette is not None:
+        color_type = libpng.PNG_COLOR_TYPE_PALETTE
+        palette_chunks.append(png_chunk(b"PLTE", palette[:, :3].tobytes()))
+
+        # the colors with transparency are at the start of the palette
+        trans_count = numpy.count_nonzero(palette[:, 3] != 255)
+        if trans_count > 0:
+            palette_chunks.append(png_chunk(b"tRNS", palette[:trans_count, 3].tobytes()))
+
+    return b"".join((
+        PNG_SIGNATURE,
+        png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8,
+                                       color_type,
+                                       libpng.PNG_COMPRESSION_TYPE_DEFAULT,
+                                       libpng.PNG_FILTER_TYPE_DEFAULT,
+                                       libpng.PNG_INTERLACE_NONE)),
+        *palette_chunks,
+        png_chunk(b"IDAT", idat_data),
+        png_chunk(b"IEND", b""),
+    ))
+
+
+def deflate_part(rawdata, Py_ssize_t start, int compression_level, int memory_level,
+                 int compression_strategy):
+    """
+    Compress a part of the image data to a raw deflate stream.
 
-                    current_filesize = bufstate.size
+    :param rawdata: Filtered image data.
+    :param start: Offset of the part in the image data.
+    """
+    cdef Py_ssize_t end = min(start + PARALLEL_DEFLATE_CHUNK_SIZE, len(rawdata))
+
+    if start > 0:
+        compressor = zlib.compressobj(compression_level, zlib.DEFLATED, -15,
+                                      memory_level, compression_strategy,
+                                      zdict=rawdata[max(start, DEFLATE_WINDOW_SIZE) - DEFLATE_WINDOW_SIZE:start])
+
+    else:
+        compressor = zlib.compressobj(compression_level, zlib.DEFLATED, -15,
+                                      memory_level, compression_strategy)
+
+    outdata = compressor.compress(rawdata[start:end])
+
+    if end == len(rawdata):
+        # the last part ends the stream
+        outdata += compressor.flush(zlib.Z_FINISH)
+
+    else:
+        outdata += compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    return outdata
+
+
+cdef bytes zlib_header(int compression_level, int compression_strategy):
+    """
+    Create the header of a zlib stream with a 32K window.
+    """
+    cdef int cmf = 0x78
+    cdef int flevel
+
+    if compression_strategy >= zlib.Z_HUFFMAN_ONLY or compression_level < 2:
+        flevel = 0
+
+    elif compression_level < 6:
+        flevel = 1
+
+    elif compression_level == 6:
+        flevel = 2
 
-                    if current_filesize < best_filesize:
-                        # Save the settings if we found a better result
-                        best_compr_lvl = compr_lvl
-                        best_compr_mem_lvl = mem_lvl
-                        best_compr_strat = strategy
-                        best_filters = filters
-                        best_filesize = current_filesize
+    else:
+        flevel = 3
+
+    cdef int flg = flevel << 6
+    flg += (31 - (cmf * 256 + flg) % 31) % 31
+
+    return bytes((cmf, flg))
 
-    result.compr_lvl = best_compr_lvl
-    result.mem_lvl = best_compr_mem_lvl
-    result.strat = best_compr_strat
-    result.filters = best_filters
 
-    return result
+cdef bytes png_chunk(bytes chunk_type, bytes data):
+    """
+    Create a PNG chunk with length and checksum.
+    """
+    return b"".join((
+        struct.pack(">I", len(data)),
+        chunk_type,
+        data,
+        struct.pack(">I", zlib.crc32(data, zlib.crc32(chunk_type))),
+    ))
 
 
 @cython.boundscheck(False)
@@ -365,12 +769,15 @@ cdef void write_to_buffer(numpy.uint8_t[:,:,::1] imagedata,
                           png_tmp_file.tmp_file_buffer_state *bufstate,
                           int compression_level, int memory_level,
                           int compression_strategy, int filters,
-                          int width, int height):
+                          int width, int height,
+                          const uint8_t *palette = NULL, int palette_size = 0) noexcept nogil:
     """
-    Write an image matrix with RGBA color values to a given buffer.
+    Write an image matrix with RGBA color values or palette indices
+    to a given buffer.
 
     :param imagedata: A memory view of a 3-dimensional array with RGBA color
-                      values for pixels. The array is expected to be C-aligned.
+                      values or palette indices for pixels. The array is
+                      expected to be C-aligned.
     :type imagedata: uint8_t[:,:,::1]
     :param bufstate: Struct containing the pointer to and the size of a buffer.
     :type bufstate: png_tmp_file.tmp_file_buffer_state*
@@ -386,7 +793,16 @@ cdef void write_to_buffer(numpy.uint8_t[:,:,::1] imagedata,
     :type width: int
     :param height: Height of the image in pixels.
     :type height: int
+    :param palette: RGBA values of the palette colors if the image data contains
+                    palette indices, otherwise NULL.
+    :type palette: const uint8_t*
+    :param palette_size: Number of colors in the palette.
+    :type palette_size: int
     """
+    cdef libpng.png_color plte[256]
+    cdef libpng.png_byte trans[256]
+    cdef int trans_count = 0
+
     write_ptr = libpng.png_create_write_struct(libpng.PNG_LIBPNG_VER_STRING,
                                                NULL,
                                                NULL,
@@ -399,13 +815,38 @@ cdef void write_to_buffer(numpy.uint8_t[:,:,::1] imagedata,
     libpng.png_set_compression_strategy(write_ptr, compression_strategy)
     libpng.png_set_filter(write_ptr, libpng.PNG_FILTER_TYPE_DEFAULT, filters)
 
-    libpng.png_set_IHDR(write_ptr, write_info_ptr,
-                        width, height,
-                        8,
-                        libpng.PNG_COLOR_TYPE_RGBA,
-                        libpng.PNG_INTERLACE_NONE,
-                        libpng.PNG_COMPRESSION_TYPE_DEFAULT,
-                        libpng.PNG_FILTER_TYPE_DEFAULT)
+    if palette == NULL:
+        libpng.png_set_IHDR(write_ptr, write_info_ptr,
+                            width, height,
+                            8,
+                            libpng.PNG_COLOR_TYPE_RGBA,
+                            libpng.PNG_INTERLACE_NONE,
+                            libpng.PNG_COMPRESSION_TYPE_DEFAULT,
+                            libpng.PNG_FILTER_TYPE_DEFAULT)
+
+    else:
+        libpng.png_set_IHDR(write_ptr, write_info_ptr,
+                            width, height,
+                            8,
+                            libpng.PNG_COLOR_TYPE_PALETTE,
+                            libpng.PNG_INTERLACE_NONE,
+                            libpng.PNG_COMPRESSION_TYPE_DEFAULT,
+                            libpng.PNG_FILTER_TYPE_DEFAULT)
+
+        for idx in range(palette_size):
+            plte[idx].red = palette[4 * idx]
+            plte[idx].green = palette[4 * idx + 1]
+            plte[idx].blue = palette[4 * idx + 2]
+            trans[idx] = palette[4 * idx + 3]
+
+            # the colors with transparency are at the start of the palette
+            if trans[idx] != 255:
+                trans_count = idx + 1
+
+        libpng.png_set_PLTE(write_ptr, write_info_ptr, plte, palette_size)
+
+        if trans_count > 0:
+            libpng.png_set_tRNS(write_ptr, write_info_ptr, trans, trans_count, NULL)
 
     # Set ur write function for writing to buffer
     libpng.png_set_write_fn(write_ptr,
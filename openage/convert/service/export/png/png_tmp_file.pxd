@@ -1,10 +1,10 @@
-# Copyright 2020-2020 the openage authors. See copying.md for legal info.
+# Copyright 2020-2026 the openage authors. See copying.md for legal info.
 
 from . cimport libpng
 from libc.stdint cimport uint8_t
 from libcpp.vector cimport vector
 
-cdef extern from *:
+cdef extern from * nogil:
     """
     // Copyright 2021-2021 the openage authors. See copying.md for legal info.
 
@@ -0,0 +1,270 @@
+# Copyright 2026-2026 the openage authors. See copying.md for legal info.
+
+"""
+Tests for the media export services.
+"""
+
+import io
+import os
+import tempfile
+
+import numpy
+from PIL import Image
+
+from ....testing.convert_benchmark.synthetic import create_drs, create_game_version, \
+    create_slp
+from ....testing.testing import assert_raises, assert_value, result
+from ....util.fslike.directory import Directory
+from ....util.hash import hash_data
+from ....util.fslike.union import Union
+from ....util.fslike.wrapper import Synchronizer
+from ...value_object.read.media.drs import DRS
+from .dds import DDS_HEADER, DDS_HEADER_FLAGS, create_dds
+from .media_index import MediaIndex
+from .media_source import MediaSource, get_media_source
+from .media_writer import HASH_ALGO, MediaWriter
+from .png.png_create import CompressionMethod, save
+
+
+def media_source():
+    """
+    Media sources are found through the wrappers and unions of the
+    mounted asset directories.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        slp_files = [(file_id, "slp", create_slp(2, 16, 16, seed=file_id))
+                     for file_id in range(3)]
+        drs_data = create_drs(slp_files)
+
+        with open(os.path.join(tmpdir, "graphics.drs"), "wb") as drs_file:
+            drs_file.write(drs_data)
+
+        with open(os.path.join(tmpdir, "loose.slp"), "wb") as loose_file:
+            loose_file.write(slp_files[0][2])
+
+        # same structure as the source directory of a conversion
+        srcdir = Directory(tmpdir).root
+        data_dir = Union().root
+        data_dir.mount(srcdir)
+
+        with srcdir["graphics.drs"].open("rb") as drs_file:
+            drs = DRS(drs_file, create_game_version("AOC"),
+                      srcdir["graphics.drs"].resolve_native_path())
+            data_dir["graphics"].mount(drs.root)
+
+            for source_dir in (data_dir, Synchronizer(data_dir).root):
+                source = get_media_source(source_dir["loose.slp"])
+                assert_value(type(source), MediaSource)
+                assert_value(source.offset, None)
+                assert_value(source.read(), slp_files[0][2])
+
+                for file_id, _, file_data in slp_files:
+                    source = get_media_source(source_dir["graphics", f"{file_id}.slp"])
+                    assert_value(type(source), MediaSource)
+                    assert_value(source.read(), file_data)
+                    assert_value(source.read(size=4), file_data[:4])
+
+                assert_value(get_media_source(source_dir["missing.slp"]), None)
+
+
+def media_index():
+    """
+    The media index finds exports with unchanged inputs and outputs,
+    without reading native source files in the main process.
+    """
+    def read_source():
+        raise AssertionError("native source file was read in the main process")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Directory(tmpdir).root
+        root["cache"].mkdirs()
+        root["output"].mkdirs()
+
+        source_data = create_slp(2, 16, 16)
+        with root["source.slp"].open("wb") as source_file:
+            source_file.write(source_data)
+
+        target_path = root["output", "source.png"]
+        index = MediaIndex(root["cache", "index.json"], root["cache", "journal.json"])
+
+        # a new source file is hashed by the worker that exports it
+        inputs = index.get_inputs(target_path, get_media_source(root["source.slp"]),
+                                  read_source, ["params"])
+        assert_value(inputs["source_hash"], None)
+        assert_value(index.lookup(target_path, inputs), None)
+
+        output_data = b"exported"
+        with target_path.open("wb") as output_file:
+            output_file.write(output_data)
+
+        inputs["source_hash"] = hash_data(source_data, HASH_ALGO)
+        index.update(target_path, inputs,
+                     {"source.png": (len(output_data), hash_data(output_data, HASH_ALGO))},
+                     "result")
+        index.save()
+
+        # the hash value of an unchanged source file is taken from the index
+        index = MediaIndex(root["cache", "index.json"], root["cache", "journal.json"])
+        inputs = index.get_inputs(target_path, get_media_source(root["source.slp"]),
+                                  read_source, ["params"])
+        assert_value(inputs["source_hash"], hash_data(source_data, HASH_ALGO))
+        assert_value(index.lookup(target_path, inputs)["result"], "result")
+
+        other_inputs = index.get_inputs(target_path, get_media_source(root["source.slp"]),
+                                        read_source, ["other params"])
+        assert_value(index.lookup(target_path, other_inputs), None)
+
+        # an output file that was modified without changing its size is exported again
+        with target_path.open("wb") as output_file:
+            output_file.write(b"modified")
+
+        output_mtime = os.stat(target_path.resolve_native_path()).st_mtime
+        os.utime(target_path.resolve_native_path(), (output_mtime + 10, output_mtime + 10))
+        assert_value(index.lookup(target_path, inputs), None)
+
+        # a modified native source file isn't read in the main process
+        source_mtime = os.stat(root["source.slp"].resolve_native_path()).st_mtime
+        os.utime(root["source.slp"].resolve_native_path(), (source_mtime + 10, source_mtime + 10))
+        index = MediaIndex(root["cache", "index.json"], root["cache", "journal.json"])
+        inputs = index.get_inputs(target_path, get_media_source(root["source.slp"]),
+                                  read_source, ["params"])
+        assert_value(inputs["source_hash"], None)
+
+        # other source files are hashed in the main process
+        inputs = index.get_inputs(target_path, None, lambda: source_data, ["params"])
+        assert_value(inputs["source_hash"], hash_data(source_data, HASH_ALGO))
+
+
+def media_journal():
+    """
+    The journal of an interrupted conversion is used if the conversion is
+    resumed. Otherwise, the index entries it changed are discarded.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Directory(tmpdir).root
+        root["cache"].mkdirs()
+        root["output"].mkdirs()
+
+        index_path = root["cache", "index.json"]
+        journal_path = root["cache", "journal.json"]
+
+        def export(index, filename, source_data):
+            target_path = root["output", filename]
+            with target_path.open("wb") as output_file:
+                output_file.write(source_data)
+
+            inputs = index.get_inputs(target_path, None, lambda: source_data, ["params"])
+            index.update(target_path, inputs,
+                         {filename: (len(source_data), hash_data(source_data, HASH_ALGO))})
+
+        index = MediaIndex(index_path, journal_path)
+        export(index, "a.png", b"a")
+        export(index, "b.png", b"b")
+        index.save()
+
+        # interrupted conversion that exported a.png again
+        index = MediaIndex(index_path, journal_path)
+        export(index, "a.png", b"changed")
+        index.save_journal()
+
+        index = MediaIndex(index_path, journal_path, resume=True)
+        assert_value(sorted(index.entries), ["output/a.png", "output/b.png"])
+        assert_value(index.entries["output/a.png"]["source_hash"],
+                     hash_data(b"changed", HASH_ALGO))
+
+        # the journal is still used by the resumed conversion
+        assert_value(journal_path.is_file(), True)
+
+        index = MediaIndex(index_path, journal_path)
+        assert_value(sorted(index.entries), ["output/b.png"])
+        assert_value(sorted(MediaIndex.load(index_path)), ["output/b.png"])
+        assert_value(journal_path.is_file(), False)
+
+
+def media_writer():
+    """
+    The media writer writes and links files in the order they are passed
+    to it and syncs them to the disk when it is closed.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Directory(tmpdir).root
+        root["output", "linked"].mkdirs()
+
+        with MediaWriter() as writer:
+            writer.write(root["output", "a.png"], b"a")
+            writer.link(root["output", "a.png"], root["output", "linked", "a.png"])
+            writer.write(root["output", "b.png"], b"b")
+
+            writer.flush()
+            assert_value(len(writer.written_files), 2)
+            assert_value(len(writer.written_dirs), 2)
+
+        # the synced files are forgotten
+        assert_value(writer.written_files, [])
+
+        for parts, data in ((("a.png",), b"a"), (("linked", "a.png"), b"a"), (("b.png",), b"b")):
+            with root["output"].joinpath(parts).open("rb") as output_file:
+                assert_value(output_file.read(), data)
+
+        # an existing file is replaced instead of written into
+        with MediaWriter() as writer:
+            writer.write(root["output", "linked", "a.png"], b"c")
+
+        with root["output", "a.png"].open("rb") as output_file:
+            assert_value(output_file.read(), b"a")
+
+
+def dds_texture():
+    """
+    DDS textures store the compressed blocks after a header with the
+    size and the FourCC code of the block format.
+    """
+    block_data = numpy.arange(3 * 5 * 8, dtype=numpy.uint8).reshape((3, 5, 8))
+
+    for block_format, fourcc in (("bc1", b"DXT1"), ("bc4", b"ATI1")):
+        dds_data = create_dds(block_data, block_format)
+        assert_value(DDS_HEADER.size, 128)
+        assert_value(len(dds_data), DDS_HEADER.size + block_data.nbytes)
+
+        header = DDS_HEADER.unpack(dds_data[:DDS_HEADER.size])
+        magic, header_size, flags, height, width, linear_size = header[:6]
+        assert_value((magic, header_size, flags), (b"DDS ", 124, DDS_HEADER_FLAGS))
+        assert_value((width, height, linear_size), (20, 12, block_data.nbytes))
+
+        pixel_format_size, _, header_fourcc = header[8:11]
+        assert_value((pixel_format_size, header_fourcc), (32, fourcc))
+
+        assert_value(dds_data[DDS_HEADER.size:], block_data.tobytes())
+
+    with assert_raises(ValueError):
+        result(create_dds(block_data, "bc7"))
+
+
+def indexed_png():
+    """
+    Images with up to 256 colors are saved as indexed PNGs, images with
+    more colors as RGBA PNGs. Both decode to the same RGBA values.
+    """
+    rng = numpy.random.default_rng(0)
+
+    # few colors, with player color pixels and transparent pixels
+    few_colors = rng.integers(0, 3, (40, 60, 4), dtype=numpy.uint8) * 60
+    few_colors[0, :4] = ((0, 3, 0, 254), (0, 5, 0, 254), (0, 0, 0, 0), (0, 0, 0, 0))
+
+    colors_256 = numpy.zeros((16, 16, 4), dtype=numpy.uint8)
+    colors_256[..., 0] = numpy.arange(256).reshape((16, 16))
+    colors_256[..., 3] = 255
+
+    colors_257 = numpy.zeros((1, 257, 4), dtype=numpy.uint8)
+    colors_257[0, :256, 0] = numpy.arange(256)
+    colors_257[0, 256, 3] = 7
+
+    for image, mode in ((few_colors, "P"), (colors_256, "P"), (colors_257, "RGBA")):
+        for compr_method, compr_settings, thread_count in (
+                (CompressionMethod.COMPR_DEFAULT, None, 1),
+                (CompressionMethod.COMPR_GREEDY, (9, 8, 0, 8), 2)):
+            png_data, _ = save(image, compr_method, compr_settings, thread_count)
+
+            decoded = Image.open(io.BytesIO(bytes(png_data)))
+            assert_value(decoded.mode, mode)
+            assert_value(numpy.array_equal(numpy.array(decoded.convert("RGBA")), image), True)
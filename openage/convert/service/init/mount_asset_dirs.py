@@ -1,4 +1,4 @@
-# Copyright 2020-2023 the openage authors. See copying.md for legal info.
+# Copyright 2020-2026 the openage authors. See copying.md for legal info.
 #
 # pylint: disable=too-many-branches
 """
@@ -33,7 +33,8 @@ def mount_asset_dirs(
         Mounts the DRS file from srcdir's filename at result's target.
         """
         drspath = srcdir[filename]
-        result[target].mount(DRS(drspath.open('rb'), game_version).root)
+        drs = DRS(drspath.open('rb'), game_version, drspath.resolve_native_path())
+        result[target].mount(drs.root)
 
     # Mount the media sources of the game edition
     for media_type, media_paths in game_version.edition.media_paths.items():
@@ -1,4 +1,4 @@
-# Copyright 2020-2024 the openage authors. See copying.md for legal info.
+# Copyright 2020-2026 the openage authors. See copying.md for legal info.
 
 """
 Module for reading .dat files.
@@ -6,25 +6,53 @@ Module for reading .dat files.
 from __future__ import annotations
 import typing
 
-import os
-import pickle
-from tempfile import gettempdir
-from zlib import decompress
+import hashlib
+import multiprocessing
+import zlib
 
-from ....log import spam, dbg, info, warn
-from ...value_object.read.media.datfile.empiresdat import EmpiresDatWrapper
+from ....log import spam, dbg
+from ...value_object.read.media.datfile.empiresdat import EmpiresDat, EmpiresDatWrapper
 from ...value_object.read.media_types import MediaType
+from ...value_object.read.member_access import READ, READ_GEN
+from ...value_object.read.read_plan import SubdataStep, get_read_plan
+from ...value_object.read.value_members import ArrayMember, ContainerMember, StorageType
+from .gamespec_cache import get_gamespec_cache_name, load_gamespec_cache, \
+    write_gamespec_cache
 
 if typing.TYPE_CHECKING:
     from openage.convert.value_object.init.game_version import GameVersion
-    from openage.convert.value_object.read.read_members import ArrayMember
+    from openage.convert.value_object.read.value_members import ValueMember
     from openage.util.fslike.directory import Directory
+    from openage.util.fslike.path import Path
     from openage.util.fslike.wrapper import GuardedFile
 
 
-def get_gamespec(srcdir: Directory, game_version: GameVersion, pickle_cache: bool) -> ArrayMember:
+# size of the chunks in which the .dat file is read
+DAT_CHUNK_SIZE = 1024 * 1024
+
+# data used by the processes that read .dat file sections, see _init_section_reader()
+_SECTION_READER_CONTEXT: dict[str, typing.Any] = {}
+
+
+def get_gamespec(
+    srcdir: Directory,
+    game_version: GameVersion,
+    cachedir: Path = None,
+    dynamic_load: bool = False,
+    jobs: int = 1
+) -> ArrayMember:
     """
     Reads empires.dat file.
+
+    :param srcdir: Source directory of the game.
+    :param game_version: Game version of the source files.
+    :param cachedir: Directory for gamespec cache files. If this is None,
+                     the cache is not used.
+    :param dynamic_load: Keep the decompressed data and decode large structs
+                         (units, graphics, techs, ...) on access. The cache
+                         is not used in this mode.
+    :param jobs: Number of processes that read the top-level sections
+                 of the file. Not used together with dynamic_load.
     """
     if game_version.edition.game_id in ("ROR", "AOE1DE", "AOC", "HDEDITION", "AOE2DE"):
         filepath = srcdir.joinpath(game_version.edition.media_paths[MediaType.DATFILE][0])
@@ -40,14 +68,22 @@ def get_gamespec(srcdir: Directory, game_version: GameVersion, pickle_cache: boo
         raise RuntimeError("No service found for reading data file of "
                            f"version {game_version.edition.game_id}")
 
-    cache_file = os.path.join(
-        gettempdir(), f"{game_version.edition.game_id}_{filepath.name}.pickle")
+    cache_file = None
+    if cachedir is not None and not dynamic_load:
+        # try to use the cached result from a previous run
+        with filepath.open('rb') as empiresdat_file:
+            dat_digest = get_dat_digest(empiresdat_file)
+
+        cache_file = cachedir[get_gamespec_cache_name(dat_digest, game_version)]
+        gamespec = load_gamespec_cache(cache_file)
+        if gamespec is not None:
+            return gamespec
 
     with filepath.open('rb') as empiresdat_file:
-        gamespec = load_gamespec(empiresdat_file,
-                                 game_version,
-                                 cache_file,
-                                 pickle_cache)
+        gamespec = load_gamespec(empiresdat_file, game_version, dynamic_load, jobs)
+
+    if cache_file is not None:
+        write_gamespec_cache(cache_file, gamespec)
 
     return gamespec
 
@@ -55,49 +91,25 @@ def get_gamespec(srcdir: Directory, game_version: GameVersion, pickle_cache: boo
 def load_gamespec(
     fileobj: GuardedFile,
     game_version: GameVersion,
-    cachefile_name: str = None,
-    pickle_cache: bool = False,
-    dynamic_load = False
+    dynamic_load: bool = False,
+    jobs: int = 1
 ) -> ArrayMember:
     """
     Helper method that loads the contents of a 'empires.dat' gzipped wrapper
     file.
 
-    If cachefile_name is given, this file is consulted before performing the
-    load.
-    """
-    # try to use the cached result from a previous run
-    if cachefile_name:
-        try:
-            with open(cachefile_name, "rb") as cachefile:
-                # pickle.load() can fail in many ways, we need to catch all.
-                # pylint: disable=broad-except
-                try:
-                    info("using cached wrapper: %s", cachefile_name)
-                    gamespec = pickle.load(cachefile)
-                    return gamespec
-                except Exception:
-                    warn("could not use cached wrapper:")
-                    import traceback
-                    traceback.print_exc()
-                    warn("we will just skip the cache, no worries.")
-
-        except FileNotFoundError:
-            pass
-
-    # read the file ourselves
-
-    dbg("reading dat file")
-    compressed_data = fileobj.read()
+    :param jobs: Number of processes that read the top-level sections
+                 of the file. Not used together with dynamic_load.
+    """
+    dbg("reading and decompressing dat file")
+    file_data = decompress_dat(fileobj)
     fileobj.close()
 
-    dbg("decompressing dat file")
-    # -15: there's no header, window size is 15.
-    file_data = decompress(compressed_data, -15)
-    del compressed_data
-
     spam("length of decompressed data: %d", len(file_data))
 
+    if jobs > 1 and not dynamic_load:
+        return read_gamespec_sections(file_data, game_version, jobs)
+
     wrapper = EmpiresDatWrapper()
     _, gamespec = wrapper.read(file_data, 0, game_version, dynamic_load=dynamic_load)
 
@@ -105,9 +117,200 @@ def load_gamespec(
     gamespec = gamespec[0]
     del wrapper
 
-    if cachefile_name and pickle_cache:
-        dbg("dumping dat file contents to cache file: %s", cachefile_name)
-        with open(cachefile_name, "wb") as cachefile:
-            pickle.dump(gamespec, cachefile)
-
     return gamespec
+
+
+def decompress_dat(fileobj: typing.BinaryIO) -> bytearray:
+    """
+    Decompress a .dat file while it is read in chunks, so that the
+    compressed data is never held in memory completely.
+
+    The file is decompressed completely before it is parsed, the
+    read plans need random access to the decompressed data.
+
+    :param fileobj: Opened .dat file.
+    :returns: The decompressed file data.
+    """
+    # -15: there's no header, window size is 15.
+    decompressor = zlib.decompressobj(-15)
+
+    file_data = bytearray()
+    while True:
+        chunk = fileobj.read(DAT_CHUNK_SIZE)
+        if not chunk:
+            break
+
+        file_data += decompressor.decompress(chunk)
+
+    file_data += decompressor.flush()
+
+    return file_data
+
+
+def get_dat_digest(fileobj: typing.BinaryIO) -> bytes:
+    """
+    Get the SHA3-256 digest of the raw (compressed) data of a .dat file.
+
+    :param fileobj: Opened .dat file.
+    """
+    hashfunc = hashlib.sha3_256()
+    while True:
+        chunk = fileobj.read(DAT_CHUNK_SIZE)
+        if not chunk:
+            break
+
+        hashfunc.update(chunk)
+
+    return hashfunc.digest()
+
+
+class DatSection:
+    """
+    Top-level section of a .dat file (graphics, terrains, civs, ...)
+    that can be read independently of the other sections.
+    """
+    # pylint: disable=too-few-public-methods
+
+    __slots__ = ('step_index', 'start', 'end', 'attributes')
+
+    def __init__(
+        self,
+        step_index: int,
+        start: int,
+        end: int,
+        attributes: dict[str, typing.Any]
+    ):
+        """
+        :param step_index: Index of the step that reads the section in
+                           the read plan of EmpiresDat.
+        :param start: Offset of the section in the decompressed data.
+        :param end: Offset after the section.
+        :param attributes: Values of the EmpiresDat members read before
+                           the section, e.g. its length.
+        """
+        self.step_index = step_index
+        self.start = start
+        self.end = end
+        self.attributes = attributes
+
+
+def scan_gamespec_sections(
+    file_data: bytes,
+    game_version: GameVersion
+) -> list[typing.Union[ValueMember, DatSection]]:
+    """
+    Find the top-level sections of a decompressed .dat file.
+
+    The members between the sections (counts, pointers, ...) are read
+    directly. The substructs of the sections are only walked over to find
+    where the next member starts.
+
+    :param file_data: Decompressed .dat file data.
+    :param game_version: Game version of the .dat file.
+    :returns: The members between the sections and the sections in the
+              order in which they are stored.
+    """
+    plan = get_read_plan(EmpiresDat, game_version)
+    subdata_names = {step.var_name for step in plan.steps if isinstance(step, SubdataStep)}
+
+    obj = EmpiresDat()
+    offset = 0
+    parts = []
+    for step_index, step in enumerate(plan.steps):
+        if isinstance(step, SubdataStep) and step.export == READ_GEN:
+            attributes = {name: value for name, value in obj.__dict__.items()
+                          if name not in subdata_names}
+
+            start = offset
+            walk_step = SubdataStep(READ, step.var_name, step.storage_type, step.var_type)
+            offset, _ = walk_step.read(obj, file_data, offset, game_version, EmpiresDat, [])
+
+            parts.append(DatSection(step_index, start, offset, attributes))
+            continue
+
+        # the members of EmpiresDat can't abort reading
+        members = []
+        offset, _ = step.read(obj, file_data, offset, game_version, EmpiresDat, members)
+        parts.extend(members)
+
+    return parts
+
+
+def read_gamespec_section(
+    file_data: bytes,
+    game_version: GameVersion,
+    section: DatSection
+) -> list[ValueMember]:
+    """
+    Read the members of a top-level section of a decompressed .dat file.
+
+    :param file_data: Decompressed .dat file data.
+    :param game_version: Game version of the .dat file.
+    :param section: Section found by scan_gamespec_sections().
+    """
+    step = get_read_plan(EmpiresDat, game_version).steps[section.step_index]
+
+    members = []
+    offset, _ = step.read(EmpiresDat(**section.attributes), file_data, section.start,
+                          game_version, EmpiresDat, members)
+
+    if offset != section.end:
+        raise SyntaxError(f"section at offset {section.start:#08x} ends at {offset:#08x}, "
+                          f"expected {section.end:#08x}")
+
+    return members
+
+
+def _init_section_reader(file_data: bytes, game_version: GameVersion) -> None:
+    """
+    Initializer of the processes that read .dat file sections.
+    """
+    _SECTION_READER_CONTEXT["file_data"] = file_data
+    _SECTION_READER_CONTEXT["game_version"] = game_version
+
+
+def _read_section(section: DatSection) -> list[ValueMember]:
+    """
+    Read a .dat file section in a section reader process.
+    """
+    return read_gamespec_section(_SECTION_READER_CONTEXT["file_data"],
+                                 _SECTION_READER_CONTEXT["game_version"],
+                                 section)
+
+
+def read_gamespec_sections(
+    file_data: bytes,
+    game_version: GameVersion,
+    jobs: int
+) -> ArrayMember:
+    """
+    Read a decompressed .dat file in two passes. The first pass finds the
+    top-level sections, which are then read by a pool of processes.
+
+    The result is the same as the result of load_gamespec() without jobs.
+
+    :param file_data: Decompressed .dat file data.
+    :param game_version: Game version of the .dat file.
+    :param jobs: Number of processes that read the sections.
+    """
+    parts = scan_gamespec_sections(file_data, game_version)
+    sections = [part for part in parts if isinstance(part, DatSection)]
+
+    dbg("reading %d dat file sections with %d processes", len(sections), jobs)
+
+    with multiprocessing.Pool(min(jobs, len(sections)),
+                              initializer=_init_section_reader,
+                              initargs=(file_data, game_version)) as pool:
+        section_members = pool.imap(_read_section, sections)
+
+        members = []
+        for part in parts:
+            if isinstance(part, DatSection):
+                members.extend(next(section_members))
+
+            else:
+                members.append(part)
+
+    # same structure as the result of EmpiresDatWrapper
+    return ArrayMember("empiresdat", StorageType.CONTAINER_MEMBER,
+                       [ContainerMember("", members)])
@@ -0,0 +1,595 @@
+# Copyright 2026-2026 the openage authors. See copying.md for legal info.
+#
+# pylint: disable=too-many-return-statements,too-many-locals
+
+"""
+Versioned on-disk cache for the contents of .dat files.
+
+The cache stores the ValueMember tree of a gamespec in a compact columnar
+binary format. Cache files are content-addressed, i.e. their name is derived
+from the hash of the source .dat file, the game version and the version of the
+reader code (including the struct definitions used for reading). Outdated
+cache files are therefore never used.
+
+Loading a cache file only reads the columns. The top-level sections of the
+gamespec (units, graphics, techs, ...) are decoded on first access.
+"""
+from __future__ import annotations
+import typing
+
+from array import array
+from collections.abc import MutableMapping
+import hashlib
+import struct
+import sys
+import types
+
+from ....log import dbg, info, warn
+from ...value_object.read.dynamic_loader import DynamicLoader
+from ...value_object.read.genie_structure import GenieStructure
+from ...value_object.read.media.datfile.empiresdat import EmpiresDatWrapper
+from ...value_object.read.read_members import ReadMember
+from ...value_object.read.value_members import ArrayMember, BitfieldMember, BooleanMember, \
+    ContainerMember, FloatMember, IDMember, IntMember, StringMember, StorageType, \
+    TypedArrayMember, TYPED_ARRAY_MEMBERS
+
+if typing.TYPE_CHECKING:
+    from openage.convert.value_object.init.game_version import GameVersion
+    from openage.convert.value_object.read.value_members import ValueMember
+    from openage.util.fslike.path import Path
+
+
+# Increase this when the reader code or the cache format changes
+# in a way that is not detected by the struct definition hash.
+GAMESPEC_CACHE_VERSION = 1
+
+GAMESPEC_CACHE_MAGIC = b"OAGSPEC\x00"
+
+# node type tags
+TAG_INT = 0
+TAG_FLOAT = 1
+TAG_BOOL = 2
+TAG_ID = 3
+TAG_BITFIELD = 4
+TAG_STRING = 5
+TAG_CONTAINER = 6
+TAG_ARRAY = 7
+
+MEMBER_TAGS = {
+    IntMember: TAG_INT,
+    FloatMember: TAG_FLOAT,
+    BooleanMember: TAG_BOOL,
+    IDMember: TAG_ID,
+    BitfieldMember: TAG_BITFIELD,
+    StringMember: TAG_STRING,
+    ContainerMember: TAG_CONTAINER,
+    ArrayMember: TAG_ARRAY,
+}
+
+# array types and the allowed member types of the arrays
+ARRAY_TYPES = (
+    (StorageType.ARRAY_INT, StorageType.INT_MEMBER),
+    (StorageType.ARRAY_FLOAT, StorageType.FLOAT_MEMBER),
+    (StorageType.ARRAY_BOOL, StorageType.BOOLEAN_MEMBER),
+    (StorageType.ARRAY_ID, StorageType.ID_MEMBER),
+    (StorageType.ARRAY_BITFIELD, StorageType.BITFIELD_MEMBER),
+    (StorageType.ARRAY_STRING, StorageType.STRING_MEMBER),
+    (StorageType.ARRAY_CONTAINER, StorageType.CONTAINER_MEMBER),
+)
+ARRAY_TYPE_IDS = {array_type: idx for idx, (array_type, _) in enumerate(ARRAY_TYPES)}
+
+# marks gamespec sections that are not decoded yet
+_NOT_LOADED = object()
+
+# column names and array typecodes in the order they are stored
+COLUMNS = (
+    ("tags", "B"),          # node type tags
+    ("names", "I"),         # string table index of the node name
+    ("ints", "q"),          # values of int, bool, id and bitfield nodes
+    ("floats", "d"),        # values of float nodes
+    ("strings", "I"),       # string table index of string node values
+    ("child_counts", "I"),  # number of children of container and array nodes
+    ("array_types", "B"),   # index of the allowed member type of array nodes
+    ("sections", "Q"),      # column positions of the top-level sections
+    ("string_ends", "I"),   # end offsets of the strings in the string table
+    ("string_data", "B"),   # utf-8 encoded string table
+)
+
+
+def get_gamespec_cache_name(dat_digest: bytes, game_version: GameVersion) -> str:
+    """
+    Get the content-addressed filename of the cache for a .dat file.
+
+    :param dat_digest: SHA3-256 digest of the raw (compressed) data of the .dat file.
+    :param game_version: Game version the .dat file is read for.
+    """
+    hashfunc = hashlib.sha3_256()
+    hashfunc.update(b"%d\x00" % GAMESPEC_CACHE_VERSION)
+
+    hashfunc.update(game_version.edition.game_id.encode())
+    for expansion in game_version.expansions:
+        hashfunc.update(b"\x00" + expansion.game_id.encode())
+
+    hashfunc.update(b"\x00" + get_struct_definition_hash(game_version).encode())
+    hashfunc.update(dat_digest)
+
+    return f"{game_version.edition.game_id.lower()}-{hashfunc.hexdigest()[:32]}.gamespec"
+
+
+def get_struct_definition_hash(game_version: GameVersion) -> str:
+    """
+    Hash the struct definitions that are used for reading the .dat file,
+    so that the cache is invalidated when they change.
+    """
+    hashfunc = hashlib.sha3_256()
+    visited = set()
+
+    def hash_struct(cls: type[GenieStructure]) -> None:
+        if cls in visited:
+            return
+
+        visited.add(cls)
+        hashfunc.update(f"struct {cls.__module__}.{cls.__qualname__}\n".encode())
+
+        for member in cls.get_data_format_members(game_version):
+            hashfunc.update(_format_definition(member, hash_struct).encode())
+            hashfunc.update(b"\n")
+
+    hash_struct(EmpiresDatWrapper)
+
+    return hashfunc.hexdigest()
+
+
+def _format_definition(definition: typing.Any, hash_struct: typing.Callable) -> str:
+    """
+    Create a stable string representation of a member definition.
+    """
+    if isinstance(definition, type) and issubclass(definition, GenieStructure):
+        hash_struct(definition)
+        return definition.__qualname__
+
+    if isinstance(definition, (list, tuple)):
+        return "(" + ",".join(_format_definition(item, hash_struct) for item in definition) + ")"
+
+    if isinstance(definition, (set, frozenset)):
+        return "{" + ",".join(sorted(_format_definition(item, hash_struct)
+                                     for item in definition)) + "}"
+
+    if isinstance(definition, dict):
+        return "{" + ",".join(sorted(f"{_format_definition(key, hash_struct)}:"
+                                     f"{_format_definition(value, hash_struct)}"
+                                     for key, value in definition.items())) + "}"
+
+    if isinstance(definition, ReadMember):
+        return type(definition).__name__ + _format_definition(vars(definition), hash_struct)
+
+    if callable(definition) and hasattr(definition, "__code__"):
+        # lambdas for lengths and offset checks
+        return _format_code(definition.__code__)
+
+    return repr(definition)
+
+
+def _format_code(code: types.CodeType) -> str:
+    """
+    Create a stable string representation of a code object.
+    """
+    consts = ",".join(_format_code(const) if isinstance(const, types.CodeType) else repr(const)
+                      for const in code.co_consts)
+
+    return f"<code {code.co_code.hex()} ({consts}) {code.co_names!r}>"
+
+
+class GamespecEncoder:
+    """
+    Encodes a gamespec ValueMember tree into columns.
+    """
+
+    def __init__(self):
+        self.columns = {name: array(typecode) for name, typecode in COLUMNS}
+        self.string_ids = {}
+
+    def add_string(self, value: str) -> int:
+        """
+        Add a string to the string table and return its index.
+        """
+        string_id = self.string_ids.get(value)
+        if string_id is None:
+            string_id = len(self.string_ids)
+            self.string_ids[value] = string_id
+
+            string_data = self.columns["string_data"]
+            string_data.frombytes(value.encode("utf-8"))
+            self.columns["string_ends"].append(len(string_data))
+
+        return string_id
+
+    def encode_gamespec(self, gamespec: ArrayMember) -> None:
+        """
+        Encode the gamespec returned by the .dat file reader.
+
+        The top-level sections of the gamespec are stored so that
+        they can be decoded individually.
+        """
+        if len(gamespec) != 1:
+            raise TypeError(f"expected exactly one gamespec container in {gamespec}")
+
+        container = gamespec[0]
+
+        self.columns["tags"].append(TAG_ARRAY)
+        self.columns["names"].append(self.add_string(gamespec.name))
+        self.columns["child_counts"].append(1)
+        self.columns["array_types"].append(ARRAY_TYPE_IDS[StorageType.ARRAY_CONTAINER])
+
+        self.columns["tags"].append(TAG_CONTAINER)
+        self.columns["names"].append(self.add_string(container.name))
+        self.columns["child_counts"].append(len(container))
+
+        sections = self.columns["sections"]
+        for key, member in container.value.items():
+            sections.extend(self.get_positions())
+            self.encode(key, member)
+
+    def get_positions(self) -> tuple[int, ...]:
+        """
+        Get the current positions in the node and value columns.
+        """
+        return (
+            len(self.columns["tags"]),
+            len(self.columns["ints"]),
+            len(self.columns["floats"]),
+            len(self.columns["strings"]),
+            len(self.columns["child_counts"]),
+            len(self.columns["array_types"]),
+        )
+
+    def encode(self, key: str, member: ValueMember) -> None:
+        """
+        Encode a member and its submembers in preorder.
+        """
+        if key != member.name:
+            raise TypeError(f"container key '{key}' does not match member name "
+                            f"'{member.name}'")
+
+        tag = MEMBER_TAGS.get(type(member))
+        if tag is None and isinstance(member, ArrayMember):
+            # e.g. arrays of records
+            tag = TAG_ARRAY
+
+        if tag is None:
+            raise TypeError(f"cannot encode member {member} of type {type(member)}")
+
+        columns = self.columns
+        columns["tags"].append(tag)
+        columns["names"].append(self.add_string(member.name))
+
+        if tag == TAG_FLOAT:
+            columns["floats"].append(member.value)
+
+        elif tag == TAG_STRING:
+            columns["strings"].append(self.add_string(member.value))
+
+        elif tag == TAG_CONTAINER:
+            if isinstance(member.value, DynamicLoader):
+                raise TypeError(f"cannot encode dynamically loaded member {member}")
+
+            columns["child_counts"].append(len(member))
+            for subkey, submember in member.value.items():
+                self.encode(subkey, submember)
+
+        elif tag == TAG_ARRAY:
+            columns["child_counts"].append(len(member))
+            columns["array_types"].append(ARRAY_TYPE_IDS[member.get_type()])
+            for submember in member.value:
+                self.encode(submember.name, submember)
+
+        else:
+            columns["ints"].append(member.value)
+
+    def write(self, fileobj: typing.BinaryIO) -> None:
+        """
+        Write the columns to a file.
+        """
+        fileobj.write(GAMESPEC_CACHE_MAGIC)
+        fileobj.write(struct.pack("<IB", GAMESPEC_CACHE_VERSION,
+                                  sys.byteorder == "little"))
+
+        for name, _ in COLUMNS:
+            column = self.columns[name]
+            fileobj.write(struct.pack("<Q", len(column)))
+            fileobj.write(column.tobytes())
+
+
+class GamespecDecoder:
+    """
+    Decodes gamespec members from the columns of a cache file.
+    """
+
+    def __init__(self, data: bytes):
+        view = memoryview(data)
+
+        if view[:len(GAMESPEC_CACHE_MAGIC)] != GAMESPEC_CACHE_MAGIC:
+            raise ValueError("not a gamespec cache file")
+
+        pos = len(GAMESPEC_CACHE_MAGIC)
+        version, little_endian = struct.unpack_from("<IB", view, pos)
+        pos += struct.calcsize("<IB")
+
+        if version != GAMESPEC_CACHE_VERSION:
+            raise ValueError(f"unsupported gamespec cache version {version}")
+
+        self.columns = {}
+        for name, typecode in COLUMNS:
+            count, = struct.unpack_from("<Q", view, pos)
+            pos += 8
+
+            column = array(typecode)
+            end = pos + count * column.itemsize
+            column.frombytes(view[pos:end])
+            pos = end
+
+            if bool(little_endian) != (sys.byteorder == "little"):
+                column.byteswap()
+
+            self.columns[name] = column
+
+        string_data = self.columns["string_data"].tobytes()
+        string_ends = self.columns["string_ends"]
+        self.strings = [
+            sys.intern(string_data[start:end].decode("utf-8"))
+            for start, end in zip([0] + string_ends[:-1].tolist(), string_ends)
+        ]
+
+    def decode_gamespec(self) -> ArrayMember:
+        """
+        Create the gamespec with lazily decoded top-level sections.
+        """
+        names = self.columns["names"]
+        child_counts = self.columns["child_counts"]
+
+        sections = self.columns["sections"]
+        section_count = child_counts[1]
+        section_positions = [
+            tuple(sections[idx * 6:idx * 6 + 6]) for idx in range(section_count)
+        ]
+
+        section_keys = [self.strings[names[positions[0]]] for positions in section_positions]
+
+        lazy_sections = LazySectionDict(self, zip(section_keys, section_positions))
+        container = ContainerMember(self.strings[names[1]], lazy_sections)
+
+        return ArrayMember(self.strings[names[0]], StorageType.CONTAINER_MEMBER, [container])
+
+    def decode_section(self, positions: tuple[int, ...]) -> ValueMember:
+        """
+        Decode a section starting at the given column positions.
+        """
+        cursors = list(positions)
+        return self.decode(cursors)
+
+    def decode(self, cursors: list[int]) -> ValueMember:
+        """
+        Decode a member and its submembers starting at the given column positions.
+        The cursors are advanced past the decoded nodes.
+        """
+        columns = self.columns
+        node = cursors[0]
+        tag = columns["tags"][node]
+
+        if tag not in (TAG_CONTAINER, TAG_ARRAY):
+            return self.decode_primitives(cursors, 1)[0]
+
+        name = self.strings[columns["names"][node]]
+        cursors[0] += 1
+
+        if tag == TAG_CONTAINER:
+            child_count = columns["child_counts"][cursors[4]]
+            cursors[4] += 1
+
+            return ContainerMember(name, [self.decode(cursors) for _ in range(child_count)])
+
+        child_count = columns["child_counts"][cursors[4]]
+        cursors[4] += 1
+        allowed_member_type = ARRAY_TYPES[columns["array_types"][cursors[5]]][1]
+        cursors[5] += 1
+
+        if allowed_member_type is StorageType.CONTAINER_MEMBER:
+            submembers = [self.decode(cursors) for _ in range(child_count)]
+
+        elif allowed_member_type in TYPED_ARRAY_MEMBERS and child_count and \
+                columns["names"][cursors[0]:cursors[0] + child_count].count(
+                    columns["names"][node]) == child_count:
+            # values of typed arrays can be taken from the value columns directly
+            if allowed_member_type is StorageType.FLOAT_MEMBER:
+                values = columns["floats"][cursors[2]:cursors[2] + child_count]
+                cursors[2] += child_count
+
+            else:
+                values = columns["ints"][cursors[1]:cursors[1] + child_count]
+                cursors[1] += child_count
+
+            cursors[0] += child_count
+
+            return TypedArrayMember(name, allowed_member_type, values)
+
+        else:
+            submembers = self.decode_primitives(cursors, child_count)
+
+        return ArrayMember(name, allowed_member_type, submembers)
+
+    def decode_primitives(self, cursors: list[int], count: int) -> list[ValueMember]:
+        """
+        Decode a run of primitive members.
+        """
+        columns = self.columns
+        tags = columns["tags"]
+        names = columns["names"]
+        ints = columns["ints"]
+        floats = columns["floats"]
+        string_values = columns["strings"]
+        strings = self.strings
+
+        node, int_pos, float_pos, string_pos = cursors[:4]
+
+        result = []
+        for node in range(node, node + count):
+            tag = tags[node]
+            name = strings[names[node]]
+
+            if tag == TAG_FLOAT:
+                result.append(FloatMember(name, floats[float_pos]))
+                float_pos += 1
+
+            elif tag == TAG_STRING:
+                result.append(StringMember(name, strings[string_values[string_pos]]))
+                string_pos += 1
+
+            elif tag == TAG_INT:
+                result.append(IntMember(name, ints[int_pos]))
+                int_pos += 1
+
+            elif tag == TAG_ID:
+                result.append(IDMember(name, ints[int_pos]))
+                int_pos += 1
+
+            elif tag == TAG_BOOL:
+                result.append(BooleanMember(name, ints[int_pos]))
+                int_pos += 1
+
+            elif tag == TAG_BITFIELD:
+                result.append(BitfieldMember(name, ints[int_pos]))
+                int_pos += 1
+
+            else:
+                raise ValueError(f"unexpected node type {tag} in primitive member run")
+
+        cursors[:4] = (cursors[0] + count, int_pos, float_pos, string_pos)
+
+        return result
+
+
+class LazySectionDict(MutableMapping):
+    """
+    Dict of the top-level gamespec sections that decodes
+    each section on first access.
+    """
+
+    __slots__ = ('_decoder', '_positions', '_sections')
+
+    def __init__(
+        self,
+        decoder: GamespecDecoder,
+        sections: typing.Iterable[tuple[str, tuple[int, ...]]]
+    ):
+        self._decoder = decoder
+
+        # column positions of the sections that are not decoded yet
+        self._positions = {}
+
+        # decoded sections, or _NOT_LOADED for sections that are not decoded yet
+        self._sections = {}
+
+        for key, positions in sections:
+            self._positions[key] = positions
+            self._sections[key] = _NOT_LOADED
+
+    def __getitem__(self, key: str) -> ValueMember:
+        """
+        Get a section and decode it if it is not loaded yet.
+        """
+        value = self._sections[key]
+        if value is _NOT_LOADED:
+            value = self._decoder.decode_section(self._positions.pop(key))
+            self._sections[key] = value
+
+            if not self._positions:
+                # all sections are loaded
+                self._decoder = None
+
+        return value
+
+    def __setitem__(self, key: str, value: ValueMember) -> None:
+        self._positions.pop(key, None)
+        self._sections[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._sections[key]
+        self._positions.pop(key, None)
+
+    def __contains__(self, key) -> bool:
+        return key in self._sections
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self._sections)
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+    def __reduce__(self):
+        return (dict, (dict(self.items()),))
+
+    def __repr__(self) -> str:
+        return f"LazySectionDict<{len(self) - len(self._positions)}/{len(self)} loaded>"
+
+
+def load_gamespec_cache(cache_file: Path) -> typing.Union[ArrayMember, None]:
+    """
+    Load a gamespec from a cache file.
+
+    :param cache_file: Path to the cache file.
+    :returns: The gamespec or None if the cache file cannot be used.
+    """
+    if not cache_file.is_file():
+        return None
+
+    # decoding can fail in many ways, we need to catch all.
+    # pylint: disable=broad-except
+    try:
+        with cache_file.open("rb") as cachefile:
+            decoder = GamespecDecoder(cachefile.read())
+
+        info("using cached gamespec: %s", cache_file)
+        return decoder.decode_gamespec()
+
+    except Exception as exc:
+        warn("could not use cached gamespec %s: %s", cache_file, exc)
+        warn("we will just skip the cache, no worries.")
+
+    return None
+
+
+def write_gamespec_cache(cache_file: Path, gamespec: ArrayMember) -> None:
+    """
+    Store a gamespec in a cache file. Outdated cache files for
+    the same game in the cache directory are removed.
+
+    :param cache_file: Path to the cache file.
+    :param gamespec: The gamespec read from the .dat file.
+    """
+    encoder = GamespecEncoder()
+
+    try:
+        encoder.encode_gamespec(gamespec)
+
+    except (TypeError, OverflowError) as exc:
+        warn("gamespec cannot be cached: %s", exc)
+        return
+
+    cache_dir = cache_file.parent
+    cache_dir.mkdirs()
+
+    # remove outdated caches for this game
+    game_prefix = cache_file.name.split("-")[0] + "-"
+    for path in cache_dir.iterdir():
+        if path.name.startswith(game_prefix) and path.suffix == ".gamespec":
+            path.unlink()
+
+    # write to a temporary file first, so that an interrupted
+    # write never leaves a broken cache file
+    tmp_file = cache_dir[cache_file.name + ".tmp"]
+    with tmp_file.open("wb") as cachefile:
+        encoder.write(cachefile)
+
+    tmp_file.rename(cache_file)
+
+    dbg("dumped dat file contents to cache file: %s", cache_file)
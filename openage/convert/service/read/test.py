@@ -0,0 +1,195 @@
+# Copyright 2026-2026 the openage authors. See copying.md for legal info.
+
+"""
+Tests for reading .dat files and the gamespec cache.
+"""
+
+import copy
+import io
+import pickle
+import tempfile
+import zlib
+
+from ....testing.convert_benchmark.synthetic import create_dat, create_game_version
+from ....testing.testing import assert_value
+from ....util.fslike.directory import Directory
+from ...entity_object.conversion.converter_object import ConverterObject
+from ...tool.driver import get_converter
+from ...value_object.read.dynamic_loader import DynamicLoader
+from ...value_object.read.test import dump_member
+from ...value_object.read.value_members import IntMember, ValueMember
+from .gamedata import DatSection, get_dat_digest, load_gamespec, scan_gamespec_sections
+from .gamespec_cache import LazySectionDict, get_gamespec_cache_name, load_gamespec_cache, \
+    write_gamespec_cache
+
+
+def gamespec_cache():
+    """
+    A gamespec loaded from the cache has the same members as the
+    gamespec read from the .dat file.
+    """
+    game_version = create_game_version("AOE2DE")
+    dat_data = create_dat(game_version)
+    gamespec = load_gamespec(io.BytesIO(dat_data), game_version)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cachedir = Directory(tmpdir).root
+
+        dat_digest = get_dat_digest(io.BytesIO(dat_data))
+        cache_file = cachedir[get_gamespec_cache_name(dat_digest, game_version)]
+        write_gamespec_cache(cache_file, gamespec)
+
+        cached = load_gamespec_cache(cache_file)
+
+        # the cache of another .dat file or game version is never used
+        other_digest = get_dat_digest(io.BytesIO(create_dat(game_version, seed=1)))
+        assert_value(get_gamespec_cache_name(other_digest, game_version) != cache_file.name,
+                     True)
+        assert_value(get_gamespec_cache_name(dat_digest, create_game_version("AOC"))
+                     != cache_file.name, True)
+
+        # a broken cache file is ignored
+        with cache_file.open("wb") as cachefile:
+            cachefile.write(b"broken")
+
+        assert_value(load_gamespec_cache(cache_file), None)
+
+    sections = cached[0].value
+    assert_value(type(sections), LazySectionDict)
+    assert_value(list(sections), list(gamespec[0].value))
+
+    # sections are decoded on access
+    first_key = next(iter(sections))
+    assert_value(dump_member(sections[first_key]), dump_member(gamespec[0][first_key]))
+    assert_value(repr(sections), f"LazySectionDict<1/{len(sections)} loaded>")
+
+    # copies of the sections never contain undecoded sections
+    for section_copy in (dict(sections), {**sections}, copy.copy(sections),
+                         pickle.loads(pickle.dumps(sections))):
+        assert_value(list(section_copy), list(sections))
+        assert_value(all(isinstance(member, ValueMember)
+                         for member in section_copy.values()), True)
+
+    assert_value(dump_member(cached[0]), dump_member(gamespec[0]))
+
+
+def gamespec_sections():
+    """
+    Reading the sections of a .dat file in multiple processes creates the
+    same members as reading the file sequentially.
+    """
+    for game_id in ("AOC", "SWGB", "AOE2DE"):
+        game_version = create_game_version(game_id)
+        dat_data = create_dat(game_version)
+
+        gamespec = load_gamespec(io.BytesIO(dat_data), game_version)
+        parallel_gamespec = load_gamespec(io.BytesIO(dat_data), game_version, jobs=2)
+
+        assert_value(dump_member(parallel_gamespec), dump_member(gamespec))
+
+        # the sections are stored one after another
+        sections = [part for part in scan_gamespec_sections(zlib.decompress(dat_data, -15),
+                                                            game_version)
+                    if isinstance(part, DatSection)]
+        assert_value(all(section.end == next_section.start
+                         for section, next_section in zip(sections, sections[1:])
+                         if next_section.step_index == section.step_index + 1), True)
+
+
+def dump_dataset(dataset) -> dict:
+    """
+    Convert the converter objects of a dataset into comparable dicts.
+    """
+    dump = {}
+    for name, objects in vars(dataset).items():
+        if not isinstance(objects, dict) or not objects:
+            continue
+
+        if not all(isinstance(obj, ConverterObject) for obj in objects.values()):
+            continue
+
+        dump[name] = {
+            obj_id: [(member_name, dump_member(member))
+                     for member_name, member in obj.members.items()]
+            for obj_id, obj in objects.items()
+        }
+
+    return dump
+
+
+def dynamic_load():
+    """
+    The pre-processor creates the same dataset from dynamically loaded
+    members as from members that are read at once.
+    """
+    for game_id in ("AOC", "AOE2DE", "ROR", "SWGB"):
+        game_version = create_game_version(game_id)
+        dat_data = create_dat(game_version)
+        converter = get_converter(game_version)
+
+        gamespecs = [load_gamespec(io.BytesIO(dat_data), game_version, dynamic_load=dynamic)
+                     for dynamic in (False, True)]
+
+        # pylint: disable=protected-access
+        dataset, dynamic_dataset = (
+            dump_dataset(converter._pre_processor(spec, game_version, None, []))
+            for spec in gamespecs
+        )
+        gamespec, dynamic_gamespec = gamespecs
+
+        assert_value(list(dynamic_dataset), list(dataset))
+        for name, objects in dataset.items():
+            assert_value(list(dynamic_dataset[name]), list(objects))
+            for obj_id, members in objects.items():
+                assert_value(dynamic_dataset[name][obj_id], members)
+
+        # the objects don't change the structs they were read from
+        assert_value(dump_member(dynamic_gamespec[0]["civs"][0]),
+                     dump_member(gamespec[0]["civs"][0]))
+
+
+def dynamic_loader_cache():
+    """
+    Loaders keep their changes when their members are evicted from the
+    cache and copies of a loader don't change each other.
+    """
+    game_version = create_game_version("AOC")
+    gamespec = load_gamespec(io.BytesIO(create_dat(game_version)), game_version,
+                             dynamic_load=True)
+    units = [unit.value for unit in gamespec[0]["civs"][0]["units"].value]
+    assert_value(all(isinstance(loader, DynamicLoader) for loader in units), True)
+
+    cache_size = DynamicLoader.cache_size
+    DynamicLoader.cache_size = 2
+
+    try:
+        loader = units[0]
+        member_names = list(loader)
+        first_name = member_names[0]
+        hitpoints = IntMember("hit_points", 1234)
+
+        loader_copy = loader.copy()
+        loader_copy["hit_points"] = hitpoints
+        del loader_copy[first_name]
+        loader_copy["extra"] = hitpoints
+
+        # evict the members of the loader
+        for other_loader in units[1:]:
+            other_loader.load()
+
+        assert_value(loader.members, None)
+        assert_value(len(DynamicLoader._loaded) <= 2, True)  # pylint: disable=protected-access
+
+        # the changes survive and are only visible in the copy
+        assert_value(loader_copy["hit_points"], hitpoints)
+        assert_value(first_name in loader_copy, False)
+        assert_value(list(loader_copy), member_names[1:] + ["extra"])
+        assert_value(list(loader), member_names)
+        assert_value(loader["hit_points"].value != 1234, True)
+
+        # removed members that are added again are moved to the end
+        loader_copy[first_name] = hitpoints
+        assert_value(list(loader_copy), member_names[1:] + ["extra", first_name])
+
+    finally:
+        DynamicLoader.cache_size = cache_size
@@ -1,4 +1,4 @@
-# Copyright 2023-2024 the openage authors. See copying.md for legal info.
+# Copyright 2023-2026 the openage authors. See copying.md for legal info.
 
 """
 Export tool for dumping the nyan API of the engine from the converter.
@@ -51,16 +51,19 @@ def export_api(exportdir: UnionPath) -> None:
     targetdir = DirectoryCreator(exportdir).root
     outdir = targetdir / "engine"
 
+    # Hash values of the exported files for the manifest
+    file_hashes = {}
+
     # Modpack info file
-    DataExporter.export([modpack.info], outdir)
+    file_hashes.update(DataExporter.export([modpack.info], outdir))
 
     info("Dumping data files...")
 
     # Data files
-    DataExporter.export(modpack.get_data_files(), outdir)
+    file_hashes.update(DataExporter.export(modpack.get_data_files(), outdir))
 
     # Manifest file
-    generate_hashes(modpack, outdir)
+    generate_hashes(modpack, outdir, known_hashes=file_hashes)
     DataExporter.export([modpack.manifest], outdir)
 
 
@@ -1,6 +1,6 @@
-# Copyright 2015-2024 the openage authors. See copying.md for legal info.
+# Copyright 2015-2026 the openage authors. See copying.md for legal info.
 #
-# pylint: disable=too-many-return-statements
+# pylint: disable=too-many-return-statements,too-many-branches
 
 """
 Receives cleaned-up srcdir and targetdir objects from .main, and drives the
@@ -8,14 +8,14 @@ actual conversion process.
 """
 from __future__ import annotations
 import typing
-import timeit
-
 
 from ...log import info, dbg
+from ...util.instrumentation import count, span, start_recording, stop_recording
+from ..processor.export.export_worker_pool import ExportWorkerPool
 from ..processor.export.modpack_exporter import ModpackExporter
 from ..service.debug_info import debug_gamedata_format
 from ..service.debug_info import debug_string_resources, \
-    debug_registered_graphics, debug_modpack, debug_execution_time
+    debug_registered_graphics, debug_modpack, debug_instrumentation
 from ..service.read.gamedata import get_gamespec
 from ..service.read.palette import get_palettes
 from ..service.read.register_media import get_existing_graphics
@@ -32,7 +32,17 @@ def convert(args: Namespace) -> None:
     args must hold srcdir and targetdir (FS-like objects),
     plus any additional configuration options.
     """
-    convert_metadata(args)
+    # measure the converter stages, memory is only traced for high debug
+    # levels because tracemalloc slows down the conversion a lot
+    start_recording(trace_memory=args.debug_info >= 5)
+
+    try:
+        convert_metadata(args)
+
+    finally:
+        recorder = stop_recording()
+
+    debug_instrumentation(args.debugdir, args.debug_info, recorder)
     # with args.targetdir[GAMESPEC_VERSION_FILENAME].open('w') as fil:
     #     fil.write(EmpiresDat.get_hash(args.game_version))
 
@@ -60,65 +70,72 @@ def convert_metadata(args: Namespace) -> None:
         return
 
     gamedata_path = args.targetdir.joinpath('gamedata')
-    if gamedata_path.exists():
+    if gamedata_path.exists() and not args.flag("resume"):
         gamedata_path.removerecursive()
 
-    # Record time taken for each stage
-    stages_time = {}
-
     # Read .dat
-    stage_start = timeit.default_timer()
-    debug_gamedata_format(args.debugdir, args.debug_info, args.game_version)
-    gamespec = get_gamespec(args.srcdir, args.game_version, not args.flag("no_pickle_cache"))
+    with span("read") as read_span:
+        debug_gamedata_format(args.debugdir, args.debug_info, args.game_version)
+        if args.flag("no_pickle_cache"):
+            gamespec_cachedir = None
+
+        else:
+            gamespec_cachedir = args.targetdir.joinpath("cache/gamespec")
+
+        with span("dat"):
+            gamespec = get_gamespec(args.srcdir, args.game_version, gamespec_cachedir,
+                                    args.flag("low_memory"), args.dat_jobs or 1)
+
+        # Blending mode count
+        if args.game_version.edition.game_id == "SWGB":
+            args.blend_mode_count = gamespec[0]["blend_mode_count_swgb"].value
+
+        else:
+            args.blend_mode_count = None
 
-    # Blending mode count
-    if args.game_version.edition.game_id == "SWGB":
-        args.blend_mode_count = gamespec[0]["blend_mode_count_swgb"].value
+        # Read strings
+        with span("strings"):
+            string_resources = get_string_resources(args)
+            count("languages", len(string_resources.get_tables()))
 
-    else:
-        args.blend_mode_count = None
+        debug_string_resources(args.debugdir, args.debug_info, string_resources)
 
-    # Read strings
-    string_resources = get_string_resources(args)
-    debug_string_resources(args.debugdir, args.debug_info, string_resources)
+        # Existing graphic IDs/filenames
+        with span("graphics"):
+            existing_graphics = get_existing_graphics(args)
+            count("graphics", len(existing_graphics))
 
-    # Existing graphic IDs/filenames
-    existing_graphics = get_existing_graphics(args)
-    debug_registered_graphics(args.debugdir, args.debug_info, existing_graphics)
+        debug_registered_graphics(args.debugdir, args.debug_info, existing_graphics)
 
-    stage_end = timeit.default_timer()
-    info("Finished metadata read (%.2f seconds)", stage_end - stage_start)
-    stages_time.update({"read": stage_end - stage_start})
+    if read_span:
+        info("Finished metadata read (%.2f seconds)", read_span.wall_time)
 
     # nyan conversion
-    stage_start = timeit.default_timer()
-    modpacks = args.converter.convert(gamespec,
-                                      args,
-                                      string_resources,
-                                      existing_graphics)
+    with span("convert") as convert_span:
+        modpacks = args.converter.convert(gamespec,
+                                          args,
+                                          string_resources,
+                                          existing_graphics)
 
-    stage_end = timeit.default_timer()
-    info("Finished data conversion (%.2f seconds)", stage_end - stage_start)
-    stages_time.update({"convert": stage_end - stage_start})
+    if convert_span:
+        info("Finished data conversion (%.2f seconds)", convert_span.wall_time)
 
     # Export modpacks
-    stage_start = timeit.default_timer()
-    for modpack in modpacks:
-        mod_export_start = timeit.default_timer()
-        ModpackExporter.export(modpack, args)
-        debug_modpack(args.debugdir, args.debug_info, modpack)
-
-        mod_export_end = timeit.default_timer()
-        info("Finished export of modpack '%s' v%s (%.2f seconds)",
-             modpack.info.packagename,
-             modpack.info.version,
-             mod_export_end - mod_export_start)
-
-    stage_end = timeit.default_timer()
-    info("Finished export (%.2f seconds)", stage_end - stage_start)
-    stages_time.update({"export": stage_end - stage_start})
-
-    debug_execution_time(args.debugdir, args.debug_info, stages_time)
+    # the media files of all modpacks are exported by the same worker processes
+    with span("export") as export_span, ExportWorkerPool(args) as export_pool:
+        for modpack in modpacks:
+            with span("modpack", modpack=modpack.info.packagename) as modpack_span:
+                ModpackExporter.export(modpack, args, export_pool)
+                debug_modpack(args.debugdir, args.debug_info, modpack)
+
+            if modpack_span:
+                info("Finished export of modpack '%s' v%s (%.2f seconds)",
+                     modpack.info.packagename,
+                     modpack.info.version,
+                     modpack_span.wall_time)
+
+    if export_span:
+        info("Finished export (%.2f seconds)", export_span.wall_time)
 
     # TODO: player palettes
     # player_palette = PlayerColorTable(palette)
@@ -1,6 +1,7 @@
-# Copyright 2014-2022 the openage authors. See copying.md for legal info.
+# Copyright 2014-2026 the openage authors. See copying.md for legal info.
 
 # TODO pylint: disable=C,R
+# pylint: disable=protected-access
 
 """
 Dynamically load and unload data from a file at runtime.
@@ -9,19 +10,45 @@ Dynamically load and unload data from a file at runtime.
 from __future__ import annotations
 import typing
 
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
 if typing.TYPE_CHECKING:
     from openage.convert.value_object.read.genie_structure import GenieStructure
     from openage.convert.value_object.init.game_version import GameVersion
     from openage.convert.value_object.read.value_members import ValueMember
 
 
-class DynamicLoader:
+# marks members that were removed from a DynamicLoader
+_REMOVED = object()
+
+# member name tuples shared by all loaders with the same members
+_MEMBER_NAMES = {}
+
+
+class DynamicLoader(MutableMapping):
     """
     Member that can be loaded and unloaded at runtime, saving
     memory in the process.
+
+    The loader behaves like the member dict of a ContainerMember. Members
+    are decoded from the source data on first access and kept in a
+    bounded cache shared by all loaders. Changes to the loader (e.g.
+    replacing or removing members) are stored separately, so they
+    survive unloading.
+
+    Copies of a loader (see copy()) share its decoded members, but
+    store their changes separately.
     """
 
-    __slots__ = ('name', 'datacls', 'game_version', 'srcdata', 'offset', 'members', '_loaded')
+    __slots__ = ('name', 'datacls', 'game_version', 'srcdata', 'offset', 'varargs',
+                 'prefix', 'members', 'base', '_member_names', '_changes', '_moved')
+
+    # maximum number of loaders whose members are kept in memory
+    cache_size = 4096
+
+    # currently loaded loaders in least recently used order
+    _loaded = OrderedDict()
 
     def __init__(
         self,
@@ -29,30 +56,88 @@ class DynamicLoader:
         datacls: type[GenieStructure],
         game_version: GameVersion,
         srcdata: bytes,
-        offset: int
+        offset: int,
+        varargs: dict[str, typing.Any] = None,
+        prefix: list[ValueMember] = None
     ):
+        """
+        :param name: Name of the loader.
+        :param datacls: Struct class that is read from the source data.
+        :param game_version: Game version the struct is read for.
+        :param srcdata: Source data that contains the struct.
+        :param offset: Start offset of the struct in the source data.
+        :param varargs: Arguments passed to the struct constructor.
+        :param prefix: Members read before the struct (e.g. its subtype).
+        """
         self.datacls = datacls
         self.game_version = game_version
 
         self.srcdata = srcdata
         self.offset = offset
-        self._loaded = False
+        self.varargs = varargs or None
+        self.prefix = prefix or None
 
         self.name = name
         self.members = None
 
+        # loader that decodes the members of a copy
+        self.base: DynamicLoader | None = None
+
+        self._member_names = None
+        self._changes = None
+
+        # names of members of the source data that were removed and added
+        # again, which are iterated after the other members like in a dict
+        self._moved = None
+
+    def copy(self) -> DynamicLoader:
+        """
+        Create a loader for the same struct with a copy of the changes.
+
+        Like a copy of a member dict, the copy has the same members, but
+        adding, replacing or removing members of one of the loaders
+        doesn't change the other one.
+        """
+        loader = DynamicLoader(self.name, self.datacls, self.game_version, self.srcdata,
+                               self.offset, self.varargs, self.prefix)
+        loader.base = self.base or self
+
+        if self._changes:
+            loader._changes = self._changes.copy()
+
+        if self._moved:
+            loader._moved = self._moved.copy()
+
+        return loader
+
     def load(self) -> dict[str, ValueMember]:
         """
         Read the members from the provided source data.
         """
-        datacls = self.datacls()
-        _, members = datacls.read(self.srcdata, self.offset, self.game_version, dynamic_load=False)
+        if self.base is not None:
+            return self.base.load()
 
-        self.members = {}
-        for member in members:
-            self.members[member.name] = member
+        # avoid circular import
+        from .read_plan import get_read_plan
 
-        self._loaded = True
+        members = list(self.prefix) if self.prefix else []
+
+        datacls = self.datacls
+        plan = get_read_plan(datacls, self.game_version, lazy=True)
+        plan.read(datacls(**(self.varargs or {})), self.srcdata, self.offset,
+                  self.game_version, datacls, members)
+
+        self.members = {member.name: member for member in members}
+
+        if self._member_names is None:
+            member_names = tuple(self.members)
+            self._member_names = _MEMBER_NAMES.setdefault(member_names, member_names)
+
+        loaded = DynamicLoader._loaded
+        loaded[id(self)] = self
+        while len(loaded) > self.cache_size:
+            _, oldest = loaded.popitem(last=False)
+            oldest.members = None
 
         return self.members
 
@@ -60,22 +145,97 @@ class DynamicLoader:
         """
         Delete the loaded members.
         """
-        del self.members
-        self._loaded = False
+        if self.base is not None:
+            self.base.unload()
+            return
+
+        DynamicLoader._loaded.pop(id(self), None)
+        self.members = None
+
+    def _get_members(self) -> dict[str, ValueMember]:
+        """
+        Get the loaded members and load them if necessary.
+        """
+        if self.base is not None:
+            return self.base._get_members()
+
+        if self.members is None:
+            return self.load()
+
+        DynamicLoader._loaded.move_to_end(id(self))
+        return self.members
+
+    def _get_member_names(self) -> tuple[str, ...]:
+        """
+        Get the names of the members in the source data.
+        """
+        if self.base is not None:
+            return self.base._get_member_names()
+
+        if self._member_names is None:
+            self.load()
+
+        return self._member_names
 
     def __getitem__(self, key) -> ValueMember:
         """
-        Retrieve submembers from the loaded members or load them temporarily
-        if they have not been loaded previously.
+        Retrieve submembers from the loaded members or load them
+        if they are not loaded.
         """
-        if self._loaded:
-            return self.members[key]
+        if self._changes and key in self._changes:
+            member = self._changes[key]
+            if member is _REMOVED:
+                raise KeyError(key)
+
+            return member
+
+        return self._get_members()[key]
+
+    def __setitem__(self, key, member: ValueMember) -> None:
+        if self._changes is None:
+            self._changes = {}
+
+        elif self._changes.get(key) is _REMOVED:
+            del self._changes[key]
+            if self._moved is None:
+                self._moved = set()
+
+            self._moved.add(key)
+
+        self._changes[key] = member
+
+    def __delitem__(self, key) -> None:
+        if key not in self:
+            raise KeyError(key)
+
+        self[key] = _REMOVED
+
+    def __contains__(self, key) -> bool:
+        if self._changes and key in self._changes:
+            return self._changes[key] is not _REMOVED
+
+        return key in self._get_member_names()
+
+    def __iter__(self) -> typing.Iterator[str]:
+        member_names = self._get_member_names()
+        changes = self._changes
+
+        if not changes:
+            yield from member_names
+            return
+
+        moved = self._moved or ()
+        for key in member_names:
+            if key not in moved and changes.get(key) is not _REMOVED:
+                yield key
+
+        for key, member in changes.items():
+            if member is not _REMOVED and (key in moved or key not in member_names):
+                yield key
 
-        # else (expensive)
-        self.load()
-        item = self.members[key]
-        self.unload()
-        return item
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
 
     def __repr__(self) -> str:
-        return f"DynamicLoader<{'loaded' if self._loaded else 'unloaded'}>"
+        loaded = (self.base or self).members is not None
+        return f"DynamicLoader<{'loaded' if loaded else 'unloaded'}>"
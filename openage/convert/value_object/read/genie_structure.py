@@ -1,4 +1,4 @@
-# Copyright 2014-2024 the openage authors. See copying.md for legal info.
+# Copyright 2014-2026 the openage authors. See copying.md for legal info.
 
 # TODO pylint: disable=C,R
 
@@ -12,7 +12,8 @@ import struct
 from openage.convert.value_object.read.dynamic_loader import DynamicLoader
 
 from ....util.strings import decode_until_null
-from .member_access import READ, READ_GEN, READ_UNKNOWN, SKIP, MemberAccess
+from .member_access import READ_GEN, READ_UNKNOWN, SKIP, MemberAccess
+from .read_plan import get_read_plan
 from .read_members import (IncludeMembers, ContinueReadMember,
                            MultisubtypeMember, GroupMember, SubdataMember,
                            ReadMember,
@@ -82,6 +83,8 @@ class GenieStructure:
         recursively read defined binary data from raw at given offset.
 
         this is used to fill the python classes with data from the binary input.
+        members of the struct are read with a precompiled read plan
+        (see read_plan.py) unless explicit member definitions are passed.
         """
         if cls:
             target_class = cls
@@ -91,28 +94,45 @@ class GenieStructure:
         # Members are returned at the end
         generated_value_members = []
 
-        # break out of the current reading loop when members don't exist in
-        # source data file
-        stop_reading_members = False
-
-        if not members:
-            members = target_class.get_data_format(game_version,
-                                                   allowed_modes=(True,
-                                                                  READ,
-                                                                  READ_GEN,
-                                                                  READ_UNKNOWN,
-                                                                  SKIP),
-                                                   flatten_includes=False)
-
         # Save the start offset in case dynamic loading is active
         # we still need to read over the whole structure to know
         # where it stops
         start_offset = offset
-        for _, export, var_name, storage_type, var_type in members:
-            if export == READ_GEN and dynamic_load and self.dynamic_load:
-                # Do not create members if dynamic loading is active
-                export = READ
 
+        if members:
+            # on-the-fly member definitions are read without a plan
+            offset = self._read_members(raw, offset, game_version, target_class,
+                                        members, generated_value_members)
+
+        else:
+            plan = get_read_plan(cls or self.__class__, game_version,
+                                 bool(dynamic_load and self.dynamic_load),
+                                 lazy=bool(dynamic_load))
+            offset = plan.read(self, raw, offset, game_version,
+                               target_class, generated_value_members)
+
+        if dynamic_load and self.dynamic_load:
+            return offset, DynamicLoader("", self.__class__, game_version, raw, start_offset)
+
+        return offset, generated_value_members
+
+    def _read_members(
+        self,
+        raw: bytes,
+        offset: int,
+        game_version: GameVersion,
+        target_class: type,
+        members: tuple,
+        generated_value_members: list[ValueMember]
+    ) -> int:
+        """
+        Read the given member definitions one by one.
+        """
+        # break out of the current reading loop when members don't exist in
+        # source data file
+        stop_reading_members = False
+
+        for _, export, var_name, storage_type, var_type in members:
             if stop_reading_members:
                 if isinstance(var_type, ReadMember):
                     replacement_value = var_type.get_empty_value()
@@ -143,10 +163,7 @@ class GenieStructure:
                 )
                 generated_value_members.extend(gen_members)
 
-        if dynamic_load and self.dynamic_load:
-            return offset, DynamicLoader("", self.__class__, game_version, raw, start_offset)
-
-        return offset, generated_value_members
+        return offset
 
     def _read_group(
         self,
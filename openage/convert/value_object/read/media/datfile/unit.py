@@ -1,4 +1,4 @@
-# Copyright 2013-2024 the openage authors. See copying.md for legal info.
+# Copyright 2013-2026 the openage authors. See copying.md for legal info.
 
 # TODO pylint: disable=C,R,too-many-lines
 from __future__ import annotations
@@ -100,6 +100,8 @@ class UnitCommand(GenieStructure):
 
 class UnitHeader(GenieStructure):
 
+    dynamic_load = True
+
     @classmethod
     @cache
     def get_data_format_members(
@@ -266,6 +268,8 @@ class UnitObject(GenieStructure):
     base properties for every unit entry.
     """
 
+    dynamic_load = True
+
     @classmethod
     @cache
     def get_data_format_members(
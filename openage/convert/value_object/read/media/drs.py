@@ -1,4 +1,4 @@
-# Copyright 2013-2024 the openage authors. See copying.md for legal info.
+# Copyright 2013-2026 the openage authors. See copying.md for legal info.
 
 """
 Code for reading Genie .DRS archives.
@@ -92,10 +92,17 @@ class DRSEntry(FileEntry):
     Entry in a DRS archive.
     """
 
-    def __init__(self, fileobj: GuardedFile, offset: int, size: int):
+    def __init__(
+        self,
+        fileobj: GuardedFile,
+        offset: int,
+        size: int,
+        native_path: str | bytes = None
+    ):
         self.fileobj = fileobj
         self.offset = offset
         self.entry_size = size
+        self.native_path = native_path
 
     def open_r(self):
         return StreamFragment(self.fileobj, self.offset, self.entry_size)
@@ -103,17 +110,35 @@ class DRSEntry(FileEntry):
     def size(self) -> int:
         return self.entry_size
 
+    def get_native_location(self) -> tuple[str | bytes, int, int] | None:
+        if self.native_path is None:
+            return None
+
+        return self.native_path, self.offset, self.entry_size
+
 
 class DRS(FileCollection):
     """
     represents a file archive in DRS format.
     """
 
-    def __init__(self, fileobj: GuardedFile, game_version: GameVersion):
+    def __init__(
+        self,
+        fileobj: GuardedFile,
+        game_version: GameVersion,
+        native_path: str | bytes = None
+    ):
+        """
+        :param fileobj: Opened DRS file.
+        :param game_version: Game edition and expansion info.
+        :param native_path: Path of the DRS file on the native filesystem, if it has one.
+                            Allows other processes to read the archived files directly.
+        """
         super().__init__()
 
         # queried from the outside
         self.fileobj = fileobj
+        self.native_path = native_path
 
         # read header
         if game_version.edition.game_id == "SWGB":
@@ -150,7 +175,7 @@ class DRS(FileCollection):
             self.tables.append(table_header)
 
         for filename, offset, size in self.read_tables():
-            file_entry = DRSEntry(self.fileobj, offset, size)
+            file_entry = DRSEntry(self.fileobj, offset, size, native_path)
 
             self.add_fileentry([filename.encode()], file_entry)
 
@@ -1,8 +1,10 @@
-# Copyright 2022-2023 the openage authors. See copying.md for legal info.
+# Copyright 2022-2026 the openage authors. See copying.md for legal info.
 #
 # cython: infer_types=True
 
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+from itertools import repeat
 import numpy
 from struct import Struct, unpack_from
 
@@ -12,6 +14,7 @@ cimport cython
 cimport numpy
 
 from libc.stdint cimport uint8_t
+from libc.string cimport memcpy
 from libcpp cimport bool
 from libcpp.pair cimport pair
 from libcpp.vector cimport vector
@@ -19,11 +22,18 @@ from libcpp.vector cimport vector
 # SLD files have little endian byte order
 endianness = "< "
 
-cdef struct pixel:
-    uint8_t r
-    uint8_t g
-    uint8_t b
-    uint8_t a
+cdef struct compressed_block:
+    # 4x4 pixels compressed with BC1 or BC4
+    uint8_t data[8]
+
+
+# Compressed blocks with fully transparent pixels by compression format.
+# BC1: both colors are black and all pixels use color 3 (transparent)
+# BC4: both values are 0 and all pixels use value 6 (transparent)
+TRANSPARENT_BLOCKS = {
+    "bc1": b"\x00\x00\x00\x00\xff\xff\xff\xff",
+    "bc4": b"\x00\x00\xb6\x6d\xdb\xb6\x6d\xdb",
+}
 
 
 class SLDLayerType(Enum):
@@ -133,7 +143,7 @@ cdef class SLD:
         # SLD reuses their pixel data on some occasions
         cdef (unsigned short, unsigned short) previous_size = (0, 0)
         cdef (unsigned short, unsigned short) previous_offset = (0, 0)
-        cdef vector[vector[pixel]] *previous_layer = NULL
+        cdef vector[compressed_block] *previous_layer = NULL
         cdef SLDLayer previous_main
         cdef SLDLayer previous_shadow
         cdef SLDLayer previous_outline
@@ -257,7 +267,7 @@ cdef class SLD:
 
                     if flag0 & 0x80 and frame_index > 0:
                         previous = previous_main
-                        previous_layer = previous.get_pcolor()
+                        previous_layer = previous.get_blocks()
                         previous_size = previous.layer_info.size
                         previous_offset = previous.layer_info.offset
 
@@ -277,7 +287,7 @@ cdef class SLD:
 
                     if flag0 & 0x80 and frame_index > 0:
                         previous = previous_shadow
-                        previous_layer = previous.get_pcolor()
+                        previous_layer = previous.get_blocks()
                         previous_size = previous.layer_info.size
                         previous_offset = previous.layer_info.offset
 
@@ -301,7 +311,7 @@ cdef class SLD:
 
                     if flag0 & 0x80 and frame_index > 0:
                         previous = previous_dmg_mask
-                        previous_layer = previous.get_pcolor()
+                        previous_layer = previous.get_blocks()
                         previous_size = previous.layer_info.size
                         previous_offset = previous.layer_info.offset
 
@@ -321,7 +331,7 @@ cdef class SLD:
 
                     if flag0 & 0x80 and frame_index > 0:
                         previous = previous_playercolor
-                        previous_layer = previous.get_pcolor()
+                        previous_layer = previous.get_blocks()
                         previous_size = previous.layer_info.size
                         previous_offset = previous.layer_info.offset
 
@@ -340,7 +350,7 @@ cdef class SLD:
                 # padding to size % 4
                 current_offset += (4 - current_offset) % 4
 
-    cpdef get_frames(self, layer: int = 0):
+    cpdef get_frames(self, layer: int = 0, int thread_count = 1):
         """
         Get the frames in the SLD.
 
@@ -351,8 +361,11 @@ cdef class SLD:
                         - 3 = damage mask
                         - 4 = playercolor mask
         :type layer: int
+        :param thread_count: Number of threads used for decoding the frames.
+        :type thread_count: int
         """
         cdef list frames
+        cdef list chains
         cdef SLDLayer layer_def
 
         layer_type = LAYER_TYPES.get(
@@ -378,13 +391,23 @@ cdef class SLD:
         else:
             frames = []
 
-        for layer_def in frames:
-            layer_def.process_drawing_cmds(
-                self.data,
-                layer_def.layer_info.command_array_size,
-                layer_def.layer_info.command_array_offset,
-                layer_def.layer_info.compressed_data_offset
-            )
+        if thread_count > 1 and len(frames) > 1:
+            # Layers that reuse blocks of the previous frame can only be
+            # decoded after the previous layer. The layers are split into
+            # chains of such layers, which are decoded in parallel.
+            chains = []
+            for layer_def in frames:
+                if layer_def.previous_layer == NULL or not chains:
+                    chains.append([])
+
+                chains[-1].append(layer_def)
+
+            with ThreadPoolExecutor(min(thread_count, len(chains))) as executor:
+                # consume the results to get the exceptions
+                list(executor.map(decode_layers, repeat(self.data), chains))
+
+        else:
+            decode_layers(self.data, frames)
 
         return frames
 
@@ -500,15 +523,21 @@ cdef class SLDLayer:
     # layer information
     cdef SLDLayerHeader layer_info
 
-    # matrix representing the 4x4 blocks and the pixels in the image
-    cdef vector[vector[pixel]] pcolor
+    # compression format of the blocks, e.g. "bc1"
+    cdef readonly str block_format
+
+    # compressed 4x4 pixel blocks of the layer, in the order of the image
+    cdef vector[compressed_block] blocks
+
+    # block used for the skipped parts of the layer
+    cdef compressed_block transparent_block
 
     # Previous layer
     cdef (unsigned short, unsigned short) previous_size
     cdef (unsigned short, unsigned short) previous_offset
-    cdef vector[vector[pixel]] *previous_layer
+    cdef vector[compressed_block] *previous_layer
 
-    def __init__(self, frame_header, layer_header):
+    def __init__(self, frame_header, layer_header, block_format):
         """
         SMX layer definition superclass. There can be various types of
         layers inside an SMX frame.
@@ -517,11 +546,18 @@ cdef class SLDLayer:
         :type frame_header: SLDFrameHeader
         :param layer_header: Header definition of the layer.
         :type layer_header: SLDLayerHeader
+        :param block_format: Compression format of the blocks (see TRANSPARENT_BLOCKS).
+        :type block_format: str
         """
         self.frame_info = frame_header
         self.layer_info = layer_header
 
-        self.pcolor.reserve((self.layer_info.size[0] // 4) * (self.layer_info.size[1] // 4))
+        self.block_format = block_format
+
+        cdef const uint8_t[::1] transparent_block = TRANSPARENT_BLOCKS[block_format]
+        memcpy(self.transparent_block.data, &transparent_block[0], sizeof(compressed_block))
+
+        self.blocks.reserve((self.layer_info.size[0] // 4) * (self.layer_info.size[1] // 4))
 
         self.previous_size = (0, 0)
         self.previous_offset = (0, 0)
@@ -529,15 +565,17 @@ cdef class SLDLayer:
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
-    cdef void process_drawing_cmds(self,
-                                   const uint8_t[::1] &data_raw,
-                                   unsigned int cmd_size,
-                                   unsigned int first_cmd_offset,
-                                   unsigned int first_data_offset):
+    cdef int process_drawing_cmds(self,
+                                  const uint8_t[::1] &data_raw,
+                                  unsigned int cmd_size,
+                                  unsigned int first_cmd_offset,
+                                  unsigned int first_data_offset) except -1 nogil:
         """
         Process skip and draw commands from the command array.
+
+        The blocks are stored without decompressing them.
         """
-        cdef vector[pixel] transparent_block = vector[pixel](16)
+        cdef compressed_block block
 
         cdef unsigned char skip_count
         cdef unsigned char draw_count
@@ -546,11 +584,14 @@ cdef class SLDLayer:
         cdef unsigned int data_offset = first_data_offset
         cdef unsigned int block_idx = 0
 
+        # blocks of a previous call, e.g. if the frames are requested twice
+        self.blocks.clear()
+
         for _ in range(cmd_size):
             skip_count = data_raw[cmd_offset]
             for _ in range(skip_count):
                 if self.previous_layer == NULL:
-                    self.pcolor.push_back(transparent_block)
+                    self.blocks.push_back(self.transparent_block)
 
                 else:
                     previous_block_idx = get_block_index(
@@ -564,11 +605,10 @@ cdef class SLDLayer:
                         block_idx
                     )
                     if previous_block_idx >= 0:
-                        prev_block = self.previous_layer.at(previous_block_idx)
-                        self.pcolor.push_back(prev_block)
+                        self.blocks.push_back(self.previous_layer.at(previous_block_idx))
 
                     else:
-                        self.pcolor.push_back(transparent_block)
+                        self.blocks.push_back(self.transparent_block)
 
                 block_idx += 1
 
@@ -576,20 +616,21 @@ cdef class SLDLayer:
 
             draw_count = data_raw[cmd_offset]
             for _ in range(draw_count):
-                self.pcolor.push_back(self.decompress_block(data_raw, data_offset))
-                data_offset += 8
+                memcpy(block.data, &data_raw[data_offset], sizeof(compressed_block))
+                self.blocks.push_back(block)
+                data_offset += sizeof(compressed_block)
                 block_idx += 1
 
             cmd_offset += 1
 
-        return
+        return 0
 
-    @cython.boundscheck(False)
-    cdef vector[pixel] decompress_block(self,
-                                        const uint8_t[::1] &data_raw,
-                                        Py_ssize_t block_offset):
+    cdef void decompress_block(self,
+                               const uint8_t *block,
+                               uint8_t *pixels,
+                               Py_ssize_t row_stride) noexcept nogil:
         """
-        Decompress a 4x4 pixel block.
+        Decompress a 4x4 pixel block into the RGBA pixels of an image.
         """
         pass
 
@@ -598,7 +639,7 @@ cdef class SLDLayer:
         unsigned short height,
         unsigned short offset_x,
         unsigned short offset_y,
-        vector[vector[pixel]] *previous
+        vector[compressed_block] *previous
     ):
         """
         Set a reference to the previous layer.
@@ -607,24 +648,69 @@ cdef class SLDLayer:
         self.previous_offset = (offset_x, offset_y)
         self.previous_layer = previous
 
-    cdef inline vector[vector[pixel]] *get_pcolor(self):
+    cdef inline vector[compressed_block] *get_blocks(self):
         """
-        Get the pixel data for the layer.
+        Get the compressed blocks of the layer.
         """
-        return &self.pcolor
+        return &self.blocks
 
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
     def get_picture_data(self):
         """
-        Convert the palette index matrix to a RGBA image.
+        Decompress the blocks of the layer to a RGBA image.
 
         :return: Array of RGBA values.
         :rtype: numpy.ndarray
         """
-        return determine_rgba_matrix(
-            self.pcolor,
-            self.layer_info.size[0],
-            self.layer_info.size[1]
-        )
+        cdef size_t width = self.layer_info.size[0]
+        cdef size_t height = self.layer_info.size[1]
+
+        cdef numpy.ndarray[numpy.uint8_t, ndim=3, mode="c"] array_data = \
+            numpy.zeros((height, width, 4), dtype=numpy.uint8)
+
+        cdef uint8_t[:, :, ::1] array_view = array_data
+
+        cdef size_t width_blocks = width // 4
+        cdef size_t block_count = min(self.blocks.size(), width_blocks * (height // 4))
+        cdef size_t block_idx
+
+        # the GIL is released, so that several layers can be converted by threads
+        with nogil:
+            for block_idx in range(block_count):
+                self.decompress_block(
+                    self.blocks[block_idx].data,
+                    &array_view[4 * (block_idx // width_blocks), 4 * (block_idx % width_blocks), 0],
+                    array_view.strides[0]
+                )
+
+        return array_data
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    def get_block_data(self):
+        """
+        Get the compressed blocks of the layer without decompressing them,
+        e.g. for uploading them to the GPU.
+
+        :return: Array of blocks with the shape (height / 4, width / 4, 8).
+        :rtype: numpy.ndarray
+        """
+        cdef size_t width_blocks = self.layer_info.size[0] // 4
+        cdef size_t height_blocks = self.layer_info.size[1] // 4
+
+        cdef numpy.ndarray[numpy.uint8_t, ndim=3, mode="c"] block_data = \
+            numpy.empty((height_blocks, width_blocks, sizeof(compressed_block)), dtype=numpy.uint8)
+        block_data[:, :] = numpy.frombuffer(TRANSPARENT_BLOCKS[self.block_format], dtype=numpy.uint8)
+
+        cdef uint8_t[:, :, ::1] block_view = block_data
+
+        cdef size_t block_count = min(self.blocks.size(), width_blocks * height_blocks)
+        if block_count > 0:
+            memcpy(&block_view[0, 0, 0], self.blocks.data(), block_count * sizeof(compressed_block))
+
+        return block_data
 
     def get_hotspot(self):
         """
@@ -641,267 +727,138 @@ cdef class SLDLayerBC1(SLDLayer):
     Compressed SLD layer using BC1 block compression.
     """
     def __init__(self, frame_header, layer_header):
-        super().__init__(frame_header, layer_header)
+        super().__init__(frame_header, layer_header, "bc1")
 
     @cython.boundscheck(False)
-    cdef inline vector[pixel] decompress_block(self,
-                                               const uint8_t[::1] &data_raw,
-                                               Py_ssize_t block_offset):
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cdef void decompress_block(self,
+                               const uint8_t *block,
+                               uint8_t *pixels,
+                               Py_ssize_t row_stride) noexcept nogil:
         """
-        Decompress a 4x4 pixel block.
+        Decompress a 4x4 pixel block into the RGBA pixels of an image.
         """
-        cdef size_t offset
+        cdef int x
+        cdef int y
+        cdef int channel
         cdef unsigned char byte_val
-        cdef unsigned char index
         cdef unsigned char mask = 0b0000_0011
-        cdef vector[pixel] block
-        block.reserve(16)
-
-        # Lookup table
-        cdef pixel c0
-        cdef pixel c1
-        cdef pixel c2
-        cdef pixel c3
-
-        cdef unsigned short c0_val = data_raw[block_offset] + (data_raw[block_offset + 1] << 8)
-        cdef unsigned short c1_val = data_raw[block_offset + 2] + (data_raw[block_offset + 3] << 8)
-
-        # Color 0
-        c0.r = (data_raw[block_offset + 1] & 0b1111_1000) >> 3
-        c0.g = ((data_raw[block_offset + 1] & 0b0000_0111) << 3) +\
-            ((data_raw[block_offset] & 0b1110_0000) >> 5)
-        c0.b = data_raw[block_offset] & 0b0001_1111
-
-        # Expand to RGBA32 color space
-        c0.r *= 8
-        c0.g *= 4
-        c0.b *= 8
-        c0.a = 255
-
-        # Color 1
-        c1.r = (data_raw[block_offset + 3] & 0b1111_1000) >> 3
-        c1.g = ((data_raw[block_offset + 3] & 0b0000_0111) << 3) +\
-            ((data_raw[block_offset + 2] & 0b1110_0000) >> 5)
-        c1.b = data_raw[block_offset + 2] & 0b0001_1111
-
-        # Expand to RGBA32 color space
-        c1.r *= 8
-        c1.g *= 4
-        c1.b *= 8
-        c1.a = 255
 
-        # Color 2 + 3
-        if c0_val > c1_val:
-            c2.r = (2 * c0.r + c1.r + 1) // 3
-            c2.g = (2 * c0.g + c1.g + 1) // 3
-            c2.b = (2 * c0.b + c1.b + 1) // 3
-            c2.a = 255
-
-            c3.r = (c0.r + 2 * c1.r + 1) // 3
-            c3.g = (c0.g + 2 * c1.g + 1) // 3
-            c3.b = (c0.b + 2 * c1.b + 1) // 3
-            c3.a = 255
-
-        else:
-            c2.r = (c0.r + c1.r) // 2
-            c2.g = (c0.g + c1.g) // 2
-            c2.b = (c0.b + c1.b) // 2
-            c2.a = 255
-
-            c3.r = 0
-            c3.g = 0
-            c3.b = 0
-            c3.a = 0
+        # Lookup table with the RGBA values of the 4 colors
+        cdef uint8_t colors[4][4]
 
-        # Lookup pixels
-        offset = block_offset + 4
-        for _ in range(4):
-            byte_val = data_raw[offset]
-            for _ in range(4):
-                index = byte_val & mask
+        cdef unsigned short c0_val = block[0] + (block[1] << 8)
+        cdef unsigned short c1_val = block[2] + (block[3] << 8)
 
-                if index == 0b00:
-                    block.push_back(c0)
+        # Color 0, expanded to RGBA32 color space
+        colors[0][0] = ((block[1] & 0b1111_1000) >> 3) * 8
+        colors[0][1] = (((block[1] & 0b0000_0111) << 3) +
+                        ((block[0] & 0b1110_0000) >> 5)) * 4
+        colors[0][2] = (block[0] & 0b0001_1111) * 8
+        colors[0][3] = 255
 
-                elif index == 0b01:
-                    block.push_back(c1)
+        # Color 1, expanded to RGBA32 color space
+        colors[1][0] = ((block[3] & 0b1111_1000) >> 3) * 8
+        colors[1][1] = (((block[3] & 0b0000_0111) << 3) +
+                        ((block[2] & 0b1110_0000) >> 5)) * 4
+        colors[1][2] = (block[2] & 0b0001_1111) * 8
+        colors[1][3] = 255
 
-                elif index == 0b10:
-                    block.push_back(c2)
+        # Color 2 + 3
+        if c0_val > c1_val:
+            for channel in range(3):
+                colors[2][channel] = (2 * colors[0][channel] + colors[1][channel] + 1) // 3
+                colors[3][channel] = (colors[0][channel] + 2 * colors[1][channel] + 1) // 3
 
-                elif index == 0b11:
-                    block.push_back(c3)
+            colors[2][3] = 255
+            colors[3][3] = 255
 
+        else:
+            for channel in range(3):
+                colors[2][channel] = (colors[0][channel] + colors[1][channel]) // 2
+                colors[3][channel] = 0
+
+            colors[2][3] = 255
+            colors[3][3] = 0
+
+        # Lookup pixels, one byte with 2 bit indices per row
+        for y in range(4):
+            byte_val = block[4 + y]
+            for x in range(4):
+                memcpy(pixels + y * row_stride + 4 * x, colors[byte_val & mask], 4)
                 byte_val = byte_val >> 2
 
-            offset += 1
-
-        return block
-
-    def get_picture_data(self):
-        """
-        Convert the palette index matrix to a RGBA image.
-
-        :return: Array of RGBA values.
-        :rtype: numpy.ndarray
-        """
-        return determine_rgba_matrix(
-            self.pcolor,
-            self.layer_info.size[0],
-            self.layer_info.size[1]
-        )
-
 
 cdef class SLDLayerBC4(SLDLayer):
     """
     Compressed SLD layer using BC4 block compression.
     """
     def __init__(self, frame_header, layer_header):
-        super().__init__(frame_header, layer_header)
+        super().__init__(frame_header, layer_header, "bc4")
 
     @cython.boundscheck(False)
-    cdef inline vector[pixel] decompress_block(self,
-                                               const uint8_t[::1] &data_raw,
-                                               Py_ssize_t block_offset):
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cdef void decompress_block(self,
+                               const uint8_t *block,
+                               uint8_t *pixels,
+                               Py_ssize_t row_stride) noexcept nogil:
         """
-        Decompress a 4x4 pixel block.
+        Decompress a 4x4 pixel block into the RGBA pixels of an image.
+
+        TODO: Greyscale export support
         """
-        cdef size_t offset
+        cdef int i
+        cdef int y
         cdef unsigned int pixel_indices
         cdef unsigned char index
         cdef unsigned char mask = 0b0000_0111
-        cdef vector[pixel] block
-        block.reserve(16)
-
-        # Lookup table
-        cdef pixel c0
-        cdef pixel c1
-        cdef pixel c2
-        cdef pixel c3
-        cdef pixel c4
-        cdef pixel c5
-        cdef pixel c6
-        cdef pixel c7
-
-        # Color 0
-        c0.r = data_raw[block_offset]
-        c0.g = 0
-        c0.b = 0
-        c0.a = 255
-
-        # Color 1
-        c1.r = data_raw[block_offset + 1]
-        c1.g = 0
-        c1.b = 0
-        c1.a = 255
+        cdef uint8_t *px
 
-        # Color 2 + 3
-        if c0.r > c1.r:
-            c2.r = (6 * c0.r + 1 * c1.r) // 7
-            c2.g = 0
-            c2.b = 0
-            c2.a = 255
-            c3.r = (5 * c0.r + 2 * c1.r) // 7
-            c3.g = 0
-            c3.b = 0
-            c3.a = 255
-            c4.r = (4 * c0.r + 3 * c1.r) // 7
-            c4.g = 0
-            c4.b = 0
-            c4.a = 255
-            c5.r = (3 * c0.r + 4 * c1.r) // 7
-            c5.g = 0
-            c5.b = 0
-            c5.a = 255
-            c6.r = (2 * c0.r + 5 * c1.r) // 7
-            c6.g = 0
-            c6.b = 0
-            c6.a = 255
-            c7.r = (1 * c0.r + 6 * c1.r) // 7
-            c7.g = 0
-            c7.b = 0
-            c7.a = 255
+        # Lookup table with the red and alpha values of the 8 colors
+        cdef uint8_t red[8]
+        cdef uint8_t alpha[8]
 
-        else:
-            c2.r = (4 * c0.r + 1 * c1.r) // 5
-            c2.g = 0
-            c2.b = 0
-            c2.a = 255
-            c3.r = (3 * c0.r + 2 * c1.r) // 5
-            c3.g = 0
-            c3.b = 0
-            c3.a = 255
-            c4.r = (2 * c0.r + 3 * c1.r) // 5
-            c4.g = 0
-            c4.b = 0
-            c4.a = 255
-            c5.r = (1 * c0.r + 4 * c1.r) // 5
-            c5.g = 0
-            c5.b = 0
-            c5.a = 255
-            c6.r = 0
-            c6.g = 0
-            c6.b = 0
-            c6.a = 0
-            c7.r = 255
-            c7.g = 0
-            c7.b = 0
-            c7.a = 255
-
-        # Lookup pixels
-        offset = block_offset + 2
-        for _ in range(2):
-            pixel_indices = data_raw[offset] | (data_raw[offset + 1] << 8) | (data_raw[offset + 2] << 16)
-            for _ in range(8):
-                # apply mask 0b111 to get 3 bits for index
-                index = pixel_indices & mask
+        for i in range(8):
+            alpha[i] = 255
 
-                if index == 0b000:
-                    block.push_back(c0)
+        # Color 0 + 1
+        red[0] = block[0]
+        red[1] = block[1]
 
-                elif index == 0b001:
-                    block.push_back(c1)
+        # Color 2 - 7
+        if red[0] > red[1]:
+            for i in range(1, 7):
+                red[i + 1] = ((7 - i) * red[0] + i * red[1]) // 7
 
-                elif index == 0b010:
-                    block.push_back(c2)
-
-                elif index == 0b011:
-                    block.push_back(c3)
+        else:
+            for i in range(1, 5):
+                red[i + 1] = ((5 - i) * red[0] + i * red[1]) // 5
 
-                elif index == 0b100:
-                    block.push_back(c4)
+            red[6] = 0
+            alpha[6] = 0
+            red[7] = 255
 
-                elif index == 0b101:
-                    block.push_back(c5)
+        # Lookup pixels, 3 bytes with 3 bit indices per 2 rows
+        for y in range(0, 4, 2):
+            pixel_indices = block[2 + 3 * y // 2] | \
+                (block[3 + 3 * y // 2] << 8) | \
+                (block[4 + 3 * y // 2] << 16)
 
-                elif index == 0b110:
-                    block.push_back(c6)
+            for i in range(8):
+                # apply mask 0b111 to get 3 bits for index
+                index = pixel_indices & mask
 
-                elif index == 0b111:
-                    block.push_back(c7)
+                px = pixels + (y + i // 4) * row_stride + 4 * (i % 4)
+                px[0] = red[index]
+                px[1] = 0
+                px[2] = 0
+                px[3] = alpha[index]
 
                 # Shift indices to read next 3 bits
                 pixel_indices = pixel_indices >> 3
 
-            offset += 3
-
-        return block
-
-    def get_picture_data(self):
-        """
-        Convert the palette index matrix to a RGBA image.
-
-        :return: Array of RGBA values.
-        :rtype: numpy.ndarray
-        """
-        # TODO: Greyscale export support
-        # return determine_greyscale_matrix(self.pcolor, self.layer_info.size[0], self.layer_info.size[1])
-        return determine_rgba_matrix(
-            self.pcolor,
-            self.layer_info.size[0],
-            self.layer_info.size[1]
-        )
-
 
 @cython.cdivision(True)
 cdef inline short get_block_index(
@@ -913,7 +870,7 @@ cdef inline short get_block_index(
     unsigned short offset2_x,
     unsigned short offset2_y,
     unsigned short block_idx1
-):
+) noexcept nogil:
     """
     Get the vector index of a pixel block for a previous layer.
 
@@ -951,94 +908,26 @@ cdef inline short get_block_index(
     return block_idx2
 
 
-@cython.boundscheck(False)
-@cython.wraparound(False)
-cdef numpy.ndarray determine_rgba_matrix(vector[vector[pixel]] &block_matrix,
-                                         Py_ssize_t width,
-                                         Py_ssize_t height):
-    """
-    converts blocks to an rgba matrix.
-
-    :param image_matrix: A 2-dimensional array of SLD pixels.
+def decode_layers(const uint8_t[::1] data_raw, list layers):
     """
-    cdef numpy.ndarray[numpy.uint8_t, ndim=3, mode="c"] array_data = \
-        numpy.zeros((height, width, 4), dtype=numpy.uint8)
-
-    cdef vector[pixel] current_block
-
-    cdef size_t block_x
-    cdef size_t block_y
-
-    cdef size_t img_x = 0
-    cdef size_t img_y = 0
-
-    for block_idx in range(block_matrix.size()):
-        current_block = block_matrix[block_idx]
-
-        block_x = 0
-        block_y = 0
-        for x in range(16):
-            px = current_block[x]
-
-            # array_data[y, x] = (r, g, b, alpha)
-            array_data[img_y + block_y, img_x + block_x, 0] = px.r
-            array_data[img_y + block_y, img_x + block_x, 1] = px.g
-            array_data[img_y + block_y, img_x + block_x, 2] = px.b
-            array_data[img_y + block_y, img_x + block_x, 3] = px.a
-
-            block_x += 1
-            if block_x > 3:
-                block_x = 0
-                block_y += 1
-
-        img_x += 4
-        if img_x >= width:
-            img_x = 0
-            img_y += 4
-
-    return array_data
+    Read the compressed blocks of SLD layers in their order.
 
+    The GIL is released while a layer is read, so that
+    several chains of layers can be read by threads.
 
-@cython.boundscheck(False)
-@cython.wraparound(False)
-cdef numpy.ndarray determine_greyscale_matrix(vector[vector[pixel]] &block_matrix,
-                                              Py_ssize_t width,
-                                              Py_ssize_t height):
+    :param data_raw: File content of the SLD.
+    :param layers: Layers that are read.
     """
-    converts blocks to an rgba matrix.
-
-    :param image_matrix: A 2-dimensional array of SLD pixels.
-    """
-    cdef numpy.ndarray[numpy.uint8_t, ndim=2, mode="c"] array_data = \
-        numpy.zeros((height, width), dtype=numpy.uint8)
-
-    cdef vector[pixel] current_block
-
-    cdef size_t block_x
-    cdef size_t block_y
-
-    cdef size_t img_x = 0
-    cdef size_t img_y = 0
-
-    for block_idx in range(block_matrix.size()):
-        current_block = block_matrix[block_idx]
-
-        block_x = 0
-        block_y = 0
-        for x in range(16):
-            px = current_block[x]
-
-            # array_data[y, x] = (r, g, b, alpha)
-            array_data[img_y + block_y, img_x + block_x] = px.r
-
-            block_x += 1
-            if block_x > 3:
-                block_x = 0
-                block_y += 1
+    cdef SLDLayer layer_def
+    cdef SLDLayerHeader layer_info
 
-        img_x += 4
-        if img_x >= width:
-            img_x = 0
-            img_y += 4
+    for layer_def in layers:
+        layer_info = layer_def.layer_info
 
-    return array_data
+        with nogil:
+            layer_def.process_drawing_cmds(
+                data_raw,
+                layer_info.command_array_size,
+                layer_info.command_array_offset,
+                layer_info.compressed_data_offset
+            )
@@ -1,4 +1,4 @@
-# Copyright 2013-2023 the openage authors. See copying.md for legal info.
+# Copyright 2013-2026 the openage authors. See copying.md for legal info.
 #
 # cython: infer_types=True
 
@@ -55,18 +55,13 @@ cdef enum slp_type:
     slp_standard        # standard type
     slp_shadow          # shadow SLP (v4.0 and higher)
 
-# One SLP pixel.
-cdef struct pixel:
-    pixel_type type
-    uint8_t value
-
-
-cdef struct pixel32:
-    pixel_type type
-    uint8_t r
-    uint8_t g
-    uint8_t b
-    uint8_t a
+# Row of the RGBA image that a frame is drawn into.
+cdef struct row_buffer:
+    uint8_t *pixels             # RGBA values of the row
+    size_t width                # number of pixels in the row
+    size_t pos                  # position of the next pixel that is drawn
+    const uint8_t *palette      # colors of the palette
+    Py_ssize_t palette_stride   # number of values per palette color
 
 
 class SLPLayerType(Enum):
@@ -314,8 +309,8 @@ cdef class SLPFrame:
     # stores the file offset for the first drawing command
     cdef vector[int] cmd_offsets
 
-    # palette index matrix representing the final image
-    cdef vector[vector[pixel]] pcolor
+    # SLP data, the drawing commands are decoded when the image is requested
+    cdef object data
 
     def __init__(self, frame_info, data):
         self.info = frame_info
@@ -323,9 +318,7 @@ cdef class SLPFrame:
         if not (isinstance(data, bytes) or isinstance(data, bytearray)):
             raise ValueError("Frame data must be some bytes object")
 
-        # memory pointer
-        # convert the bytes obj to char*
-        cdef const uint8_t[::1] data_raw = data
+        self.data = data
 
         cdef unsigned short left
         cdef unsigned short right
@@ -334,7 +327,6 @@ cdef class SLPFrame:
         cdef int cmd_offset
 
         cdef size_t row_count = self.info.size[1]
-        self.pcolor.reserve(row_count)
 
         # process bondary table
         for i in range(row_count):
@@ -360,78 +352,67 @@ cdef class SLPFrame:
             )[0]
             self.cmd_offsets.push_back(cmd_offset)
 
-        for i in range(row_count):
-            self.pcolor.push_back(self.create_palette_color_row(data_raw, i))
-
-    cdef vector[pixel] create_palette_color_row(self,
-                                                const uint8_t[::1] &data_raw,
-                                                Py_ssize_t rowid):
+    cdef int draw_row(self,
+                      const uint8_t[::1] &data_raw,
+                      row_buffer &row,
+                      Py_ssize_t rowid) except -1 nogil:
         """
-        create palette indices (colors) for the given rowid.
+        draw the pixels of the given rowid into the row buffer.
+        the row buffer is filled with transparent pixels before.
         """
-
-        cdef vector[pixel] row_data
-        cdef Py_ssize_t i
-
-        first_cmd_offset = self.cmd_offsets[rowid]
+        cdef int first_cmd_offset = self.cmd_offsets[rowid]
         cdef boundary_def bounds = self.boundaries[rowid]
-        cdef size_t pixel_count = self.info.size[0]
-
-        # preallocate memory
-        row_data.reserve(pixel_count)
+        cdef size_t pixel_count = row.width
 
         # row is completely transparent
         if bounds.full_row:
-            for _ in range(pixel_count):
-                row_data.push_back(pixel(color_transparent, 0))
-
-            return row_data
+            return 0
 
-        # start drawing the left transparent space
-        for i in range(bounds.left):
-            row_data.push_back(pixel(color_transparent, 0))
+        # skip the left transparent space
+        row.pos = bounds.left
 
         # process the drawing commands for this row.
         self.process_drawing_cmds(data_raw,
-                                  row_data,
+                                  row,
                                   rowid,
                                   first_cmd_offset,
                                   pixel_count - bounds.right)
 
-        # finish by filling up the right transparent space
-        for i in range(bounds.right):
-            row_data.push_back(pixel(color_transparent, 0))
+        # the right transparent space is left as it is
+        cdef size_t got = row.pos + bounds.right
 
         # verify size of generated row
-        if row_data.size() != pixel_count:
-            got = row_data.size()
-            summary = (
-                f"{got:d}/{pixel_count:d} -> row {rowid:d}, "
-                f"offset {first_cmd_offset:d} / {first_cmd_offset:#x}"
-            )
-            message = (
-                f"got {'LESS' if got < pixel_count else 'MORE'} pixels than expected: {summary}, "
-                f"missing: {abs(pixel_count - got):d}"
-            )
+        if got != pixel_count:
+            with gil:
+                summary = (
+                    f"{got:d}/{pixel_count:d} -> row {rowid:d}, "
+                    f"offset {first_cmd_offset:d} / {first_cmd_offset:#x}"
+                )
+                message = (
+                    f"got {'LESS' if got < pixel_count else 'MORE'} pixels than expected: {summary}, "
+                    f"missing: {abs(pixel_count - got):d}"
+                )
 
-            raise Exception(message)
+                raise Exception(message)
 
-        return row_data
+        return 0
 
     @cython.boundscheck(False)
-    cdef void process_drawing_cmds(self,
-                                   const uint8_t[::1] &data_raw,
-                                   vector[pixel] &row_data,
-                                   Py_ssize_t rowid,
-                                   Py_ssize_t first_cmd_offset,
-                                   size_t expected_size):
-        pass
+    cdef int process_drawing_cmds(self,
+                                  const uint8_t[::1] &data_raw,
+                                  row_buffer &row,
+                                  Py_ssize_t rowid,
+                                  Py_ssize_t first_cmd_offset,
+                                  size_t expected_size) except -1 nogil:
+        return 0
 
     def get_picture_data(self, palette):
         """
-        Convert the palette index matrix to a colored image.
+        Draw the frame into an RGBA image, using the palette for the colors.
         """
-        return determine_rgba_matrix(self.pcolor, palette)
+        cdef const uint8_t[:, ::1] m_lookup = palette
+
+        return draw_frame(self, self.info.size, &m_lookup[0, 0], m_lookup.shape[1])
 
     def get_hotspot(self):
         """
@@ -469,12 +450,12 @@ cdef class SLPMainFrameAoC(SLPFrame):
         super().__init__(frame_info, data)
 
     @cython.boundscheck(False)
-    cdef void process_drawing_cmds(self,
-                                   const uint8_t[::1] &data_raw,
-                                   vector[pixel] &row_data,
-                                   Py_ssize_t rowid,
-                                   Py_ssize_t first_cmd_offset,
-                                   size_t expected_size):
+    cdef int process_drawing_cmds(self,
+                                  const uint8_t[::1] &data_raw,
+                                  row_buffer &row,
+                                  Py_ssize_t rowid,
+                                  Py_ssize_t first_cmd_offset,
+                                  size_t expected_size) except -1 nogil:
         """
         create palette indices (colors) for the drawing commands
         found for this row in the SLP frame.
@@ -496,11 +477,12 @@ cdef class SLPMainFrameAoC(SLPFrame):
 
         # work through commands till end of row.
         while not eor:
-            if row_data.size() > expected_size:
-                raise Exception(
-                    f"Only {expected_size:d} pixels should be drawn in row {rowid:d}, " +
-                    f"but we have {row_data.size():d} already!"
-                )
+            if row.pos > expected_size:
+                with gil:
+                    raise Exception(
+                        f"Only {expected_size:d} pixels should be drawn in row {rowid:d}, " +
+                        f"but we have {row.pos:d} already!"
+                    )
 
             # fetch drawing instruction
             cmd = data_raw[dpos]
@@ -525,7 +507,7 @@ cdef class SLPMainFrameAoC(SLPFrame):
                     dpos += 1
                     color = data_raw[dpos]
 
-                    row_data.push_back(pixel(color_standard, color))
+                    draw_pixel(row, color_standard, color)
 
             elif lowest_crumb == 0b00000001:
                 # skip command
@@ -534,8 +516,7 @@ cdef class SLPMainFrameAoC(SLPFrame):
 
                 cpack = cmd_or_next(data_raw, cmd, 2, dpos)
                 dpos = cpack.dpos
-                for _ in range(cpack.count):
-                    row_data.push_back(pixel(color_transparent, 0))
+                row.pos += cpack.count
 
             elif lower_nibble == 0x02:
                 # big_color_list command
@@ -548,7 +529,7 @@ cdef class SLPMainFrameAoC(SLPFrame):
                 for _ in range(pixel_count):
                     dpos += 1
                     color = data_raw[dpos]
-                    row_data.push_back(pixel(color_standard, color))
+                    draw_pixel(row, color_standard, color)
 
             elif lower_nibble == 0x03:
                 # big_skip command
@@ -559,8 +540,7 @@ cdef class SLPMainFrameAoC(SLPFrame):
                 nextbyte = data_raw[dpos]
                 pixel_count = (higher_nibble << 4) + nextbyte
 
-                for _ in range(pixel_count):
-                    row_data.push_back(pixel(color_transparent, 0))
+                row.pos += pixel_count
 
             elif lower_nibble == 0x06:
                 # player_color_list command
@@ -573,7 +553,7 @@ cdef class SLPMainFrameAoC(SLPFrame):
                     dpos += 1
                     color = data_raw[dpos]
 
-                    row_data.push_back(pixel(color_player, color))
+                    draw_pixel(row, color_player, color)
 
             elif lower_nibble == 0x07:
                 # fill command
@@ -586,7 +566,7 @@ cdef class SLPMainFrameAoC(SLPFrame):
                 color = data_raw[dpos]
 
                 for _ in range(cpack.count):
-                    row_data.push_back(pixel(color_standard, color))
+                    draw_pixel(row, color_standard, color)
 
             elif lower_nibble == 0x0A:
                 # fill player color command
@@ -599,7 +579,7 @@ cdef class SLPMainFrameAoC(SLPFrame):
                 color = data_raw[dpos]
 
                 for _ in range(cpack.count):
-                    row_data.push_back(pixel(color_player, color))
+                    draw_pixel(row, color_player, color)
 
             elif lower_nibble == 0x0B:
                 # shadow command
@@ -609,7 +589,7 @@ cdef class SLPMainFrameAoC(SLPFrame):
                 dpos = cpack.dpos
 
                 for _ in range(cpack.count):
-                    row_data.push_back(pixel(color_shadow, 0))
+                    draw_pixel(row, color_shadow, 0)
 
             elif lower_nibble == 0x0E:
                 # "extended" commands. higher nibble specifies the instruction.
@@ -618,36 +598,40 @@ cdef class SLPMainFrameAoC(SLPFrame):
                     # render hint xflip command
                     # render hint: only draw the following command,
                     # if this sprite is not flipped left to right
-                    spam("render hint: xfliptest")
+                    with gil:
+                        spam("render hint: xfliptest")
 
                 elif higher_nibble == 0x10:
                     # render h notxflip command
                     # render hint: only draw the following command,
                     # if this sprite IS flipped left to right.
-                    spam("render hint: !xfliptest")
+                    with gil:
+                        spam("render hint: !xfliptest")
 
                 elif higher_nibble == 0x20:
                     # table use normal command
                     # set the transform color table to normal,
                     # for the standard drawing commands
-                    spam("image wants normal color table now")
+                    with gil:
+                        spam("image wants normal color table now")
 
                 elif higher_nibble == 0x30:
                     # table use alternat command
                     # set the transform color table to alternate,
                     # this affects all following standard commands
-                    spam("image wants alternate color table now")
+                    with gil:
+                        spam("image wants alternate color table now")
 
                 elif higher_nibble == 0x40:
                     # outline_1 command
                     # the next pixel shall be drawn as special color 1,
                     # if it is obstructed later in rendering
-                    row_data.push_back(pixel(color_special_1, 0))
+                    draw_pixel(row, color_special_1, 0)
 
                 elif higher_nibble == 0x60:
                     # outline_2 command
                     # same as above, but special color 2
-                    row_data.push_back(pixel(color_special_2, 0))
+                    draw_pixel(row, color_special_2, 0)
 
                 elif higher_nibble == 0x50:
                     # outline_span_1 command
@@ -657,7 +641,7 @@ cdef class SLPMainFrameAoC(SLPFrame):
                     pixel_count = data_raw[dpos]
 
                     for _ in range(pixel_count):
-                        row_data.push_back(pixel(color_special_1, 0))
+                        draw_pixel(row, color_special_1, 0)
 
                 elif higher_nibble == 0x70:
                     # outline_span_2 command
@@ -667,26 +651,29 @@ cdef class SLPMainFrameAoC(SLPFrame):
                     pixel_count = data_raw[dpos]
 
                     for _ in range(pixel_count):
-                        row_data.push_back(pixel(color_special_2, 0))
+                        draw_pixel(row, color_special_2, 0)
 
                 elif higher_nibble == 0x80:
                     # dither command
-                    raise NotImplementedError("dither not implemented")
+                    with gil:
+                        raise NotImplementedError("dither not implemented")
 
                 elif higher_nibble in (0x90, 0xA0):
                     # 0x90: premultiplied alpha
                     # 0xA0: original alpha
-                    raise NotImplementedError("extended alpha not implemented")
+                    with gil:
+                        raise NotImplementedError("extended alpha not implemented")
 
             else:
-                raise Exception(
-                    f"unknown slp drawing command: " +
-                    f"{cmd:#x} in row {rowid:d}")
+                with gil:
+                    raise Exception(
+                        f"unknown slp drawing command: " +
+                        f"{cmd:#x} in row {rowid:d}")
 
             dpos += 1
 
-        # end of row reached, return the created pixel array.
-        return
+        # end of row reached
+        return 0
 
 
 cdef class SLPMainFrameDE(SLPFrame):
@@ -698,12 +685,12 @@ cdef class SLPMainFrameDE(SLPFrame):
         super().__init__(frame_info, data)
 
     @cython.boundscheck(False)
-    cdef void process_drawing_cmds(self,
-                                   const uint8_t[::1] &data_raw,
-                                   vector[pixel] &row_data,
-                                   Py_ssize_t rowid,
-                                   Py_ssize_t first_cmd_offset,
-                                   size_t expected_size):
+    cdef int process_drawing_cmds(self,
+                                  const uint8_t[::1] &data_raw,
+                                  row_buffer &row,
+                                  Py_ssize_t rowid,
+                                  Py_ssize_t first_cmd_offset,
+                                  size_t expected_size) except -1 nogil:
         """
         create palette indices (colors) for the drawing commands
         found for this row in the SLP frame.
@@ -725,11 +712,12 @@ cdef class SLPMainFrameDE(SLPFrame):
 
         # work through commands till end of row.
         while not eor:
-            if row_data.size() > expected_size:
-                raise Exception(
-                    f"Only {expected_size:d} pixels should be drawn in row {rowid:d}, "
-                    f"but we have {row_data.size():d} already!"
-                )
+            if row.pos > expected_size:
+                with gil:
+                    raise Exception(
+                        f"Only {expected_size:d} pixels should be drawn in row {rowid:d}, "
+                        f"but we have {row.pos:d} already!"
+                    )
 
             # fetch drawing instruction
             cmd = data_raw[dpos]
@@ -754,7 +742,7 @@ cdef class SLPMainFrameDE(SLPFrame):
                     dpos += 1
                     color = data_raw[dpos]
 
-                    row_data.push_back(pixel(color_standard, color))
+                    draw_pixel(row, color_standard, color)
 
             elif lowest_crumb == 0b00000001:
                 # skip command
@@ -763,8 +751,7 @@ cdef class SLPMainFrameDE(SLPFrame):
 
                 cpack = cmd_or_next(data_raw, cmd, 2, dpos)
                 dpos = cpack.dpos
-                for _ in range(cpack.count):
-                    row_data.push_back(pixel(color_transparent, 0))
+                row.pos += cpack.count
 
             elif lower_nibble == 0x02:
                 # big_color_list command
@@ -777,7 +764,7 @@ cdef class SLPMainFrameDE(SLPFrame):
                 for _ in range(pixel_count):
                     dpos += 1
                     color = data_raw[dpos]
-                    row_data.push_back(pixel(color_standard, color))
+                    draw_pixel(row, color_standard, color)
 
             elif lower_nibble == 0x03:
                 # big_skip command
@@ -788,8 +775,7 @@ cdef class SLPMainFrameDE(SLPFrame):
                 nextbyte = data_raw[dpos]
                 pixel_count = (higher_nibble << 4) + nextbyte
 
-                for _ in range(pixel_count):
-                    row_data.push_back(pixel(color_transparent, 0))
+                row.pos += pixel_count
 
             elif lower_nibble == 0x06:
                 # player_color_list command
@@ -802,7 +788,7 @@ cdef class SLPMainFrameDE(SLPFrame):
                     color = data_raw[dpos]
 
                     # version 3.0 uses extra palettes for player colors
-                    row_data.push_back(pixel(color_player_v4, color))
+                    draw_pixel(row, color_player_v4, color)
 
             elif lower_nibble == 0x07:
                 # fill command
@@ -815,7 +801,7 @@ cdef class SLPMainFrameDE(SLPFrame):
                 color = data_raw[dpos]
 
                 for _ in range(cpack.count):
-                    row_data.push_back(pixel(color_standard, color))
+                    draw_pixel(row, color_standard, color)
 
             elif lower_nibble == 0x0A:
                 # fill player color command
@@ -829,7 +815,7 @@ cdef class SLPMainFrameDE(SLPFrame):
 
                 for _ in range(cpack.count):
                     # version 3.0 uses extra palettes for player colors
-                    row_data.push_back(pixel(color_player_v4, color))
+                    draw_pixel(row, color_player_v4, color)
 
             elif lower_nibble == 0x0B:
                 # shadow command
@@ -839,7 +825,7 @@ cdef class SLPMainFrameDE(SLPFrame):
                 dpos = cpack.dpos
 
                 for _ in range(cpack.count):
-                    row_data.push_back(pixel(color_shadow, 0))
+                    draw_pixel(row, color_shadow, 0)
 
             elif lower_nibble == 0x0E:
                 # "extended" commands. higher nibble specifies the instruction.
@@ -848,36 +834,40 @@ cdef class SLPMainFrameDE(SLPFrame):
                     # render hint xflip command
                     # render hint: only draw the following command,
                     # if this sprite is not flipped left to right
-                    spam("render hint: xfliptest")
+                    with gil:
+                        spam("render hint: xfliptest")
 
                 elif higher_nibble == 0x10:
                     # render h notxflip command
                     # render hint: only draw the following command,
                     # if this sprite IS flipped left to right.
-                    spam("render hint: !xfliptest")
+                    with gil:
+                        spam("render hint: !xfliptest")
 
                 elif higher_nibble == 0x20:
                     # table use normal command
                     # set the transform color table to normal,
                     # for the standard drawing commands
-                    spam("image wants normal color table now")
+                    with gil:
+                        spam("image wants normal color table now")
 
                 elif higher_nibble == 0x30:
                     # table use alternat command
                     # set the transform color table to alternate,
                     # this affects all following standard commands
-                    spam("image wants alternate color table now")
+                    with gil:
+                        spam("image wants alternate color table now")
 
                 elif higher_nibble == 0x40:
                     # outline_1 command
                     # the next pixel shall be drawn as special color 1,
                     # if it is obstructed later in rendering
-                    row_data.push_back(pixel(color_special_1, 0))
+                    draw_pixel(row, color_special_1, 0)
 
                 elif higher_nibble == 0x60:
                     # outline_2 command
                     # same as above, but special color 2
-                    row_data.push_back(pixel(color_special_2, 0))
+                    draw_pixel(row, color_special_2, 0)
 
                 elif higher_nibble == 0x50:
                     # outline_span_1 command
@@ -887,7 +877,7 @@ cdef class SLPMainFrameDE(SLPFrame):
                     pixel_count = data_raw[dpos]
 
                     for _ in range(pixel_count):
-                        row_data.push_back(pixel(color_special_1, 0))
+                        draw_pixel(row, color_special_1, 0)
 
                 elif higher_nibble == 0x70:
                     # outline_span_2 command
@@ -897,26 +887,29 @@ cdef class SLPMainFrameDE(SLPFrame):
                     pixel_count = data_raw[dpos]
 
                     for _ in range(pixel_count):
-                        row_data.push_back(pixel(color_special_2, 0))
+                        draw_pixel(row, color_special_2, 0)
 
                 elif higher_nibble == 0x80:
                     # dither command
-                    raise NotImplementedError("dither not implemented")
+                    with gil:
+                        raise NotImplementedError("dither not implemented")
 
                 elif higher_nibble in (0x90, 0xA0):
                     # 0x90: premultiplied alpha
                     # 0xA0: original alpha
-                    raise NotImplementedError("extended alpha not implemented")
+                    with gil:
+                        raise NotImplementedError("extended alpha not implemented")
 
             else:
-                raise Exception(
-                    f"unknown slp drawing command: " +
-                    f"{cmd:#x} in row {rowid:d}")
+                with gil:
+                    raise Exception(
+                        f"unknown slp drawing command: " +
+                        f"{cmd:#x} in row {rowid:d}")
 
             dpos += 1
 
-        # end of row reached, return the created pixel array.
-        return
+        # end of row reached
+        return 0
 
 
 cdef class SLPMainFrameDE41(SLPFrame):
@@ -929,12 +922,12 @@ cdef class SLPMainFrameDE41(SLPFrame):
         super().__init__(frame_info, data)
 
     @cython.boundscheck(False)
-    cdef void process_drawing_cmds(self,
-                                   const uint8_t[::1] &data_raw,
-                                   vector[pixel] &row_data,
-                                   Py_ssize_t rowid,
-                                   Py_ssize_t first_cmd_offset,
-                                   size_t expected_size):
+    cdef int process_drawing_cmds(self,
+                                  const uint8_t[::1] &data_raw,
+                                  row_buffer &row,
+                                  Py_ssize_t rowid,
+                                  Py_ssize_t first_cmd_offset,
+                                  size_t expected_size) except -1 nogil:
         """
         create palette indices (colors) for the drawing commands
         found for this row in the SLP frame.
@@ -956,11 +949,12 @@ cdef class SLPMainFrameDE41(SLPFrame):
 
         # work through commands till end of row.
         while not eor:
-            if row_data.size() > expected_size:
-                raise Exception(
-                    f"Only {expected_size:d} pixels should be drawn in row {rowid:d}, "
-                    f"but we have {row_data.size():d} already!"
-                )
+            if row.pos > expected_size:
+                with gil:
+                    raise Exception(
+                        f"Only {expected_size:d} pixels should be drawn in row {rowid:d}, "
+                        f"but we have {row.pos:d} already!"
+                    )
 
             # fetch drawing instruction
             cmd = data_raw[dpos]
@@ -985,7 +979,7 @@ cdef class SLPMainFrameDE41(SLPFrame):
                     dpos += 2
                     color = data_raw[dpos]
 
-                    row_data.push_back(pixel(color_standard, color))
+                    draw_pixel(row, color_standard, color)
 
             elif lowest_crumb == 0b00000001:
                 # skip command
@@ -994,8 +988,7 @@ cdef class SLPMainFrameDE41(SLPFrame):
 
                 cpack = cmd_or_next(data_raw, cmd, 2, dpos)
                 dpos = cpack.dpos
-                for _ in range(cpack.count):
-                    row_data.push_back(pixel(color_transparent, 0))
+                row.pos += cpack.count
 
             elif lower_nibble == 0x02:
                 # big_color_list command
@@ -1009,7 +1002,7 @@ cdef class SLPMainFrameDE41(SLPFrame):
                     dpos += 2
                     color = data_raw[dpos]
 
-                    row_data.push_back(pixel(color_standard, color))
+                    draw_pixel(row, color_standard, color)
 
             elif lower_nibble == 0x03:
                 # big_skip command
@@ -1020,8 +1013,7 @@ cdef class SLPMainFrameDE41(SLPFrame):
                 nextbyte = data_raw[dpos]
                 pixel_count = (higher_nibble << 4) + nextbyte
 
-                for _ in range(pixel_count):
-                    row_data.push_back(pixel(color_transparent, 0))
+                row.pos += pixel_count
 
             elif lower_nibble == 0x06:
                 # player_color_list command
@@ -1034,7 +1026,7 @@ cdef class SLPMainFrameDE41(SLPFrame):
                     color = data_raw[dpos]
 
                     # version 3.0 uses extra palettes for player colors
-                    row_data.push_back(pixel(color_player_v4, color))
+                    draw_pixel(row, color_player_v4, color)
 
             elif lower_nibble == 0x07:
                 # fill command
@@ -1047,7 +1039,7 @@ cdef class SLPMainFrameDE41(SLPFrame):
                 color = data_raw[dpos]
 
                 for _ in range(cpack.count):
-                    row_data.push_back(pixel(color_standard, color))
+                    draw_pixel(row, color_standard, color)
 
             elif lower_nibble == 0x0A:
                 # fill player color command
@@ -1061,7 +1053,7 @@ cdef class SLPMainFrameDE41(SLPFrame):
 
                 for _ in range(cpack.count):
                     # since version 3.0 uses extra palettes for player colors
-                    row_data.push_back(pixel(color_player_v4, color))
+                    draw_pixel(row, color_player_v4, color)
 
             elif lower_nibble == 0x0B:
                 # shadow command
@@ -1071,7 +1063,7 @@ cdef class SLPMainFrameDE41(SLPFrame):
                 dpos = cpack.dpos
 
                 for _ in range(cpack.count):
-                    row_data.push_back(pixel(color_shadow, 0))
+                    draw_pixel(row, color_shadow, 0)
 
             elif lower_nibble == 0x0E:
                 # "extended" commands. higher nibble specifies the instruction.
@@ -1080,36 +1072,40 @@ cdef class SLPMainFrameDE41(SLPFrame):
                     # render hint xflip command
                     # render hint: only draw the following command,
                     # if this sprite is not flipped left to right
-                    spam("render hint: xfliptest")
+                    with gil:
+                        spam("render hint: xfliptest")
 
                 elif higher_nibble == 0x10:
                     # render h notxflip command
                     # render hint: only draw the following command,
                     # if this sprite IS flipped left to right.
-                    spam("render hint: !xfliptest")
+                    with gil:
+                        spam("render hint: !xfliptest")
 
                 elif higher_nibble == 0x20:
                     # table use normal command
                     # set the transform color table to normal,
                     # for the standard drawing commands
-                    spam("image wants normal color table now")
+                    with gil:
+                        spam("image wants normal color table now")
 
                 elif higher_nibble == 0x30:
                     # table use alternat command
                     # set the transform color table to alternate,
                     # this affects all following standard commands
-                    spam("image wants alternate color table now")
+                    with gil:
+                        spam("image wants alternate color table now")
 
                 elif higher_nibble == 0x40:
                     # outline_1 command
                     # the next pixel shall be drawn as special color 1,
                     # if it is obstructed later in rendering
-                    row_data.push_back(pixel(color_special_1, 0))
+                    draw_pixel(row, color_special_1, 0)
 
                 elif higher_nibble == 0x60:
                     # outline_2 command
                     # same as above, but special color 2
-                    row_data.push_back(pixel(color_special_2, 0))
+                    draw_pixel(row, color_special_2, 0)
 
                 elif higher_nibble == 0x50:
                     # outline_span_1 command
@@ -1119,7 +1115,7 @@ cdef class SLPMainFrameDE41(SLPFrame):
                     pixel_count = data_raw[dpos]
 
                     for _ in range(pixel_count):
-                        row_data.push_back(pixel(color_special_1, 0))
+                        draw_pixel(row, color_special_1, 0)
 
                 elif higher_nibble == 0x70:
                     # outline_span_2 command
@@ -1129,26 +1125,29 @@ cdef class SLPMainFrameDE41(SLPFrame):
                     pixel_count = data_raw[dpos]
 
                     for _ in range(pixel_count):
-                        row_data.push_back(pixel(color_special_2, 0))
+                        draw_pixel(row, color_special_2, 0)
 
                 elif higher_nibble == 0x80:
                     # dither command
-                    raise NotImplementedError("dither not implemented")
+                    with gil:
+                        raise NotImplementedError("dither not implemented")
 
                 elif higher_nibble in (0x90, 0xA0):
                     # 0x90: premultiplied alpha
                     # 0xA0: original alpha
-                    raise NotImplementedError("extended alpha not implemented")
+                    with gil:
+                        raise NotImplementedError("extended alpha not implemented")
 
             else:
-                raise Exception(
-                    f"unknown slp drawing command: " +
-                    f"{cmd:#x} in row {rowid:d}")
+                with gil:
+                    raise Exception(
+                        f"unknown slp drawing command: " +
+                        f"{cmd:#x} in row {rowid:d}")
 
             dpos += 1
 
-        # end of row reached, return the created pixel array.
-        return
+        # end of row reached
+        return 0
 
 
 cdef class SLPShadowFrame(SLPFrame):
@@ -1160,12 +1159,12 @@ cdef class SLPShadowFrame(SLPFrame):
         super().__init__(frame_info, data)
 
     @cython.boundscheck(False)
-    cdef void process_drawing_cmds(self,
-                                   const uint8_t[::1] &data_raw,
-                                   vector[pixel] &row_data,
-                                   Py_ssize_t rowid,
-                                   Py_ssize_t first_cmd_offset,
-                                   size_t expected_size):
+    cdef int process_drawing_cmds(self,
+                                  const uint8_t[::1] &data_raw,
+                                  row_buffer &row,
+                                  Py_ssize_t rowid,
+                                  Py_ssize_t first_cmd_offset,
+                                  size_t expected_size) except -1 nogil:
         """
         create palette indices (colors) for the drawing commands
         found for this row in the SLP frame.
@@ -1188,11 +1187,12 @@ cdef class SLPShadowFrame(SLPFrame):
 
         # work through commands till end of row.
         while not eor:
-            if row_data.size() > expected_size:
-                raise Exception(
-                    f"Only {expected_size} pixels should be drawn in row {rowid:d}, "
-                    f"but we have {row_data.size():d} already!"
-                )
+            if row.pos > expected_size:
+                with gil:
+                    raise Exception(
+                        f"Only {expected_size} pixels should be drawn in row {rowid:d}, "
+                        f"but we have {row.pos:d} already!"
+                    )
 
             # fetch drawing instruction
             cmd = data_raw[dpos]
@@ -1218,7 +1218,7 @@ cdef class SLPShadowFrame(SLPFrame):
                     color = data_raw[dpos]
 
                     # shadows in v4.0 draw a different color
-                    row_data.push_back(pixel(color_shadow_v4, color))
+                    draw_pixel(row, color_shadow_v4, color)
 
             elif lowest_crumb == 0b00000001:
                 # skip command
@@ -1227,8 +1227,7 @@ cdef class SLPShadowFrame(SLPFrame):
 
                 cpack = cmd_or_next(data_raw, cmd, 2, dpos)
                 dpos = cpack.dpos
-                for _ in range(cpack.count):
-                    row_data.push_back(pixel(color_transparent, 0))
+                row.pos += cpack.count
 
             elif lower_nibble == 0x02:
                 # big_color_list command
@@ -1241,7 +1240,7 @@ cdef class SLPShadowFrame(SLPFrame):
                 for _ in range(pixel_count):
                     dpos += 1
                     color = data_raw[dpos]
-                    row_data.push_back(pixel(color_shadow_v4, color))
+                    draw_pixel(row, color_shadow_v4, color)
 
             elif lower_nibble == 0x03:
                 # big_skip command
@@ -1252,8 +1251,7 @@ cdef class SLPShadowFrame(SLPFrame):
                 nextbyte = data_raw[dpos]
                 pixel_count = (higher_nibble << 4) + nextbyte
 
-                for _ in range(pixel_count):
-                    row_data.push_back(pixel(color_transparent, 0))
+                row.pos += pixel_count
 
             elif lower_nibble == 0x06:
                 # player_color_list command
@@ -1266,7 +1264,7 @@ cdef class SLPShadowFrame(SLPFrame):
                     color = data_raw[dpos]
 
                     # version 3.0 uses extra palettes for player colors
-                    row_data.push_back(pixel(color_player_v4, color))
+                    draw_pixel(row, color_player_v4, color)
 
             elif lower_nibble == 0x07:
                 # fill command
@@ -1280,18 +1278,19 @@ cdef class SLPShadowFrame(SLPFrame):
 
                 for _ in range(cpack.count):
                     # shadows in v4.0 draw a different color
-                    row_data.push_back(pixel(color_shadow_v4, color))
+                    draw_pixel(row, color_shadow_v4, color)
 
             else:
-                raise Exception(
-                    f"unknown slp shadow drawing command: " +
-                    f"{cmd:#x} in row {rowid:d}"
-                )
+                with gil:
+                    raise Exception(
+                        f"unknown slp shadow drawing command: " +
+                        f"{cmd:#x} in row {rowid:d}"
+                    )
 
             dpos += 1
 
-        # end of row reached, return the created pixel array.
-        return
+        # end of row reached
+        return 0
 
 
 cdef class SLPFrame32:
@@ -1320,8 +1319,8 @@ cdef class SLPFrame32:
     # stores the file offset for the first drawing command
     cdef vector[int] cmd_offsets
 
-    # palette index matrix representing the final image
-    cdef vector[vector[pixel32]] pcolor
+    # SLP data, the drawing commands are decoded when the image is requested
+    cdef object data
 
     def __init__(self, frame_info, data):
         self.info = frame_info
@@ -1329,9 +1328,7 @@ cdef class SLPFrame32:
         if not (isinstance(data, bytes) or isinstance(data, bytearray)):
             raise ValueError("Frame data must be some bytes object")
 
-        # memory pointer
-        # convert the bytes obj to char*
-        cdef const uint8_t[::1] data_raw = data
+        self.data = data
 
         cdef unsigned short left
         cdef unsigned short right
@@ -1340,7 +1337,6 @@ cdef class SLPFrame32:
         cdef int cmd_offset
 
         cdef size_t row_count = self.info.size[1]
-        self.pcolor.reserve(row_count)
 
         # process bondary table
         for i in range(row_count):
@@ -1366,70 +1362,58 @@ cdef class SLPFrame32:
             )[0]
             self.cmd_offsets.push_back(cmd_offset)
 
-        for i in range(row_count):
-            self.pcolor.push_back(self.create_palette_color_row(data_raw, i))
-
-    cdef vector[pixel32] create_palette_color_row(self,
-                                                  const uint8_t[::1] &data_raw,
-                                                  Py_ssize_t rowid):
+    cdef int draw_row(self,
+                      const uint8_t[::1] &data_raw,
+                      row_buffer &row,
+                      Py_ssize_t rowid) except -1 nogil:
         """
-        create palette indices (colors) for the given rowid.
+        draw the pixels of the given rowid into the row buffer.
+        the row buffer is filled with transparent pixels before.
         """
-        cdef vector[pixel32] row_data
-        cdef Py_ssize_t i
-
-        first_cmd_offset = self.cmd_offsets[rowid]
+        cdef int first_cmd_offset = self.cmd_offsets[rowid]
         cdef boundary_def bounds = self.boundaries[rowid]
-        cdef size_t pixel_count = self.info.size[0]
-
-        # preallocate memory
-        row_data.reserve(pixel_count)
+        cdef size_t pixel_count = row.width
 
         # row is completely transparent
         if bounds.full_row:
-            for _ in range(pixel_count):
-                row_data.push_back(pixel32(color_transparent, 0, 0, 0, 0))
-
-            return row_data
+            return 0
 
-        # start drawing the left transparent space
-        for i in range(bounds.left):
-            row_data.push_back(pixel32(color_transparent, 0, 0, 0, 0))
+        # skip the left transparent space
+        row.pos = bounds.left
 
         # process the drawing commands for this row.
         self.process_drawing_cmds(data_raw,
-                                  row_data,
+                                  row,
                                   rowid,
                                   first_cmd_offset,
                                   pixel_count - bounds.right)
 
-        # finish by filling up the right transparent space
-        for i in range(bounds.right):
-            row_data.push_back(pixel32(color_transparent, 0, 0, 0, 0))
+        # the right transparent space is left as it is
+        cdef size_t got = row.pos + bounds.right
 
         # verify size of generated row
-        if row_data.size() != pixel_count:
-            got = row_data.size()
-            summary = (
-                f"{got:d}/{pixel_count:d} -> row {rowid:d}, "
-                f"offset {first_cmd_offset:d} / {first_cmd_offset:#x}"
-            )
-            message = (
-                f"got {'LESS' if got < pixel_count else 'MORE'} pixels than expected: {summary}, "
-                f"missing: {abs(pixel_count - got):d}"
-            )
+        if got != pixel_count:
+            with gil:
+                summary = (
+                    f"{got:d}/{pixel_count:d} -> row {rowid:d}, "
+                    f"offset {first_cmd_offset:d} / {first_cmd_offset:#x}"
+                )
+                message = (
+                    f"got {'LESS' if got < pixel_count else 'MORE'} pixels than expected: {summary}, "
+                    f"missing: {abs(pixel_count - got):d}"
+                )
 
-            raise Exception(message)
+                raise Exception(message)
 
-        return row_data
+        return 0
 
     @cython.boundscheck(False)
-    cdef void process_drawing_cmds(self,
-                                   const uint8_t[::1] &data_raw,
-                                   vector[pixel32] &row_data,
-                                   Py_ssize_t rowid,
-                                   Py_ssize_t first_cmd_offset,
-                                   size_t expected_size):
+    cdef int process_drawing_cmds(self,
+                                  const uint8_t[::1] &data_raw,
+                                  row_buffer &row,
+                                  Py_ssize_t rowid,
+                                  Py_ssize_t first_cmd_offset,
+                                  size_t expected_size) except -1 nogil:
         """
         create palette indices (colors) for the drawing commands
         found for this row in the SLP frame.
@@ -1449,17 +1433,14 @@ cdef class SLPFrame32:
         cdef cmd_pack cpack
         cdef int pixel_count
 
-        # Color channels are saved in BGRA order
-        cdef vector[uint8_t] pixel_data
-        pixel_data.reserve(4)
-
         # work through commands till end of row.
         while not eor:
-            if row_data.size() > expected_size:
-                raise Exception(
-                    f"Only {expected_size:d} pixels should be drawn in row {rowid:d}, " +
-                    f"but we have {row_data.size():d} already!"
-                )
+            if row.pos > expected_size:
+                with gil:
+                    raise Exception(
+                        f"Only {expected_size:d} pixels should be drawn in row {rowid:d}, " +
+                        f"but we have {row.pos:d} already!"
+                    )
 
             # fetch drawing instruction
             cmd = data_raw[dpos]
@@ -1480,17 +1461,10 @@ cdef class SLPFrame32:
                 # draw the following bytes as palette colors
                 pixel_count = cmd >> 2
                 for _ in range(pixel_count):
-                    for _ in range(4):
-                        dpos += 1
-                        pixel_data.push_back(data_raw[dpos])
-
-                    row_data.push_back(pixel32(color_standard,
-                                               pixel_data[2],
-                                               pixel_data[1],
-                                               pixel_data[0],
-                                               255))
-
-                    pixel_data.clear()
+                    draw_pixel32(row, color_standard,
+                                 data_raw[dpos + 3], data_raw[dpos + 2], data_raw[dpos + 1],
+                                 255)
+                    dpos += 4
 
             elif lowest_crumb == 0b00000001:
                 # skip command
@@ -1498,8 +1472,7 @@ cdef class SLPFrame32:
                 # count = cmd >> 2; if count == 0: count = nextbyte
                 cpack = cmd_or_next(data_raw, cmd, 2, dpos)
                 dpos = cpack.dpos
-                for _ in range(cpack.count):
-                    row_data.push_back(pixel32(color_transparent, 0, 0, 0, 0))
+                row.pos += cpack.count
 
             elif lower_nibble == 0x02:
                 # big_color_list command
@@ -1509,17 +1482,10 @@ cdef class SLPFrame32:
                 pixel_count = (higher_nibble << 4) + nextbyte
 
                 for _ in range(pixel_count):
-                    for _ in range(4):
-                        dpos += 1
-                        pixel_data.push_back(data_raw[dpos])
-
-                    row_data.push_back(pixel32(color_standard,
-                                               pixel_data[2],
-                                               pixel_data[1],
-                                               pixel_data[0],
-                                               255))
-
-                    pixel_data.clear()
+                    draw_pixel32(row, color_standard,
+                                 data_raw[dpos + 3], data_raw[dpos + 2], data_raw[dpos + 1],
+                                 255)
+                    dpos += 4
 
             elif lower_nibble == 0x03:
                 # big_skip command
@@ -1530,8 +1496,7 @@ cdef class SLPFrame32:
                 nextbyte = data_raw[dpos]
                 pixel_count = (higher_nibble << 4) + nextbyte
 
-                for _ in range(pixel_count):
-                    row_data.push_back(pixel32(color_transparent, 0, 0, 0, 0))
+                row.pos += pixel_count
 
             elif lower_nibble == 0x06:
                 # player_color_list command
@@ -1543,7 +1508,7 @@ cdef class SLPFrame32:
                     dpos += 1
                     player_color = data_raw[dpos]
 
-                    row_data.push_back(pixel32(color_player, player_color, 0, 0, 0))
+                    draw_pixel32(row, color_player, player_color, 0, 0, 0)
 
             elif lower_nibble == 0x07:
                 # fill command
@@ -1552,17 +1517,10 @@ cdef class SLPFrame32:
                 dpos = cpack.dpos
 
                 for _ in range(cpack.count):
-                    for _ in range(4):
-                        dpos += 1
-                        pixel_data.push_back(data_raw[dpos])
-
-                    row_data.push_back(pixel32(color_standard,
-                                               pixel_data[2],
-                                               pixel_data[1],
-                                               pixel_data[0],
-                                               255))
-
-                    pixel_data.clear()
+                    draw_pixel32(row, color_standard,
+                                 data_raw[dpos + 3], data_raw[dpos + 2], data_raw[dpos + 1],
+                                 255)
+                    dpos += 4
 
             elif lower_nibble == 0x0A:
                 # fill player color command
@@ -1574,7 +1532,7 @@ cdef class SLPFrame32:
                 player_color = data_raw[dpos]
 
                 for _ in range(cpack.count):
-                    row_data.push_back(pixel32(color_player, player_color, 0, 0, 0))
+                    draw_pixel32(row, color_player, player_color, 0, 0, 0)
 
             elif lower_nibble == 0x0B:
                 # shadow command
@@ -1583,7 +1541,7 @@ cdef class SLPFrame32:
                 dpos = cpack.dpos
 
                 for _ in range(cpack.count):
-                    row_data.push_back(pixel32(color_shadow, 0, 0, 0, 0))
+                    draw_pixel32(row, color_shadow, 0, 0, 0, 0)
 
             elif lower_nibble == 0x0E:
                 # "extended" commands. higher nibble specifies the instruction.
@@ -1592,36 +1550,40 @@ cdef class SLPFrame32:
                     # render hint xflip command
                     # render hint: only draw the following command,
                     # if this sprite is not flipped left to right
-                    spam("render hint: xfliptest")
+                    with gil:
+                        spam("render hint: xfliptest")
 
                 elif higher_nibble == 0x10:
                     # render h notxflip command
                     # render hint: only draw the following command,
                     # if this sprite IS flipped left to right.
-                    spam("render hint: !xfliptest")
+                    with gil:
+                        spam("render hint: !xfliptest")
 
                 elif higher_nibble == 0x20:
                     # table use normal command
                     # set the transform color table to normal,
                     # for the standard drawing commands
-                    spam("image wants normal color table now")
+                    with gil:
+                        spam("image wants normal color table now")
 
                 elif higher_nibble == 0x30:
                     # table use alternat command
                     # set the transform color table to alternate,
                     # this affects all following standard commands
-                    spam("image wants alternate color table now")
+                    with gil:
+                        spam("image wants alternate color table now")
 
                 elif higher_nibble == 0x40:
                     # outline_1 command
                     # the next pixel shall be drawn as special color 1,
                     # if it is obstructed later in rendering
-                    row_data.push_back(pixel32(color_special_1, 0, 0, 0, 0))
+                    draw_pixel32(row, color_special_1, 0, 0, 0, 0)
 
                 elif higher_nibble == 0x60:
                     # outline_2 command
                     # same as above, but special color 2
-                    row_data.push_back(pixel32(color_special_2, 0, 0, 0, 0))
+                    draw_pixel32(row, color_special_2, 0, 0, 0, 0)
 
                 elif higher_nibble == 0x50:
                     # outline_span_1 command
@@ -1631,7 +1593,7 @@ cdef class SLPFrame32:
                     pixel_count = data_raw[dpos]
 
                     for _ in range(pixel_count):
-                        row_data.push_back(pixel32(color_special_1, 0, 0, 0, 0))
+                        draw_pixel32(row, color_special_1, 0, 0, 0, 0)
 
                 elif higher_nibble == 0x70:
                     # outline_span_2 command
@@ -1641,11 +1603,12 @@ cdef class SLPFrame32:
                     pixel_count = data_raw[dpos]
 
                     for _ in range(pixel_count):
-                        row_data.push_back(pixel32(color_special_2, 0, 0, 0, 0))
+                        draw_pixel32(row, color_special_2, 0, 0, 0, 0)
 
                 elif higher_nibble == 0x80:
                     # dither command
-                    raise NotImplementedError("dither not implemented")
+                    with gil:
+                        raise NotImplementedError("dither not implemented")
 
                 elif higher_nibble == 0x90:
                     # 0x90: premultiplied alpha
@@ -1654,38 +1617,33 @@ cdef class SLPFrame32:
                     pixel_count = nextbyte
 
                     for _ in range(pixel_count):
-                        for _ in range(4):
-                            dpos += 1
-                            pixel_data.push_back(data_raw[dpos])
-
-                        row_data.push_back(pixel32(color_standard,
-                                                   pixel_data[2],
-                                                   pixel_data[1],
-                                                   pixel_data[0],
-                                                   255 - pixel_data[3]))
-
-                        pixel_data.clear()
+                        draw_pixel32(row, color_standard,
+                                     data_raw[dpos + 3], data_raw[dpos + 2], data_raw[dpos + 1],
+                                     255 - data_raw[dpos + 4])
+                        dpos += 4
 
                 elif higher_nibble == 0xA0:
                     # 0xA0: original alpha
-                    raise NotImplementedError("original alpha not implemented")
+                    with gil:
+                        raise NotImplementedError("original alpha not implemented")
 
             else:
-                raise Exception(
-                    f"unknown slp drawing command: " +
-                    f"{cmd:#x} in row {rowid:d}")
+                with gil:
+                    raise Exception(
+                        f"unknown slp drawing command: " +
+                        f"{cmd:#x} in row {rowid:d}")
 
             dpos += 1
 
-        # end of row reached, return the created pixel array.
-        return
+        # end of row reached
+        return 0
 
 
     def get_picture_data(self, palette):
         """
-        Convert the palette index matrix to a colored image.
+        Draw the frame into an RGBA image.
         """
-        return determine_rgba_matrix32(self.pcolor)
+        return draw_frame(self, self.info.size, NULL, 0)
 
     def get_hotspot(self):
         """
@@ -1710,7 +1668,7 @@ cdef class SLPFrame32:
 cdef inline cmd_pack cmd_or_next(const uint8_t[::1] &data_raw,
                                  uint8_t cmd,
                                  uint8_t n,
-                                 Py_ssize_t pos):
+                                 Py_ssize_t pos) noexcept nogil:
     """
     to save memory, the draw amount may be encoded into
     the drawing command itself in the upper n bits.
@@ -1725,174 +1683,135 @@ cdef inline cmd_pack cmd_or_next(const uint8_t[::1] &data_raw,
         return cmd_pack(data_raw[pos], pos)
 
 
-@cython.boundscheck(False)
-@cython.wraparound(False)
-cdef numpy.ndarray determine_rgba_matrix(vector[vector[pixel]] &image_matrix,
-                                         numpy.ndarray[numpy.uint8_t, ndim=2, mode="c"] palette):
+# fused type for the frames that can be drawn by draw_frame()
+ctypedef fused SLPFrameVariant:
+    SLPFrame
+    SLPFrame32
+
+
+cdef numpy.ndarray draw_frame(SLPFrameVariant frame,
+                              tuple size,
+                              const uint8_t *palette,
+                              Py_ssize_t palette_stride):
     """
-    converts a palette index image matrix to an rgba matrix.
+    draws the rows of a frame into an rgba matrix.
+
+    :param frame: Frame that is drawn.
+    :param size: Width and height of the frame.
+    :param palette: Colors of the palette used by the frame. NULL for 32-bit frames.
+    :param palette_stride: Number of values per palette color.
     """
-    cdef size_t height = image_matrix.size()
-    cdef size_t width = image_matrix[0].size()
+    cdef size_t width = size[0]
+    cdef size_t height = size[1]
 
+    # transparent pixels are (0, 0, 0, 0), so they don't have to be drawn
     cdef numpy.ndarray[numpy.uint8_t, ndim=3, mode="c"] array_data = \
         numpy.zeros((height, width, 4), dtype=numpy.uint8)
 
-    cdef uint8_t[:, ::1] m_lookup = palette
-
-    cdef uint8_t r
-    cdef uint8_t g
-    cdef uint8_t b
-    cdef uint8_t alpha
+    cdef const uint8_t[::1] data_raw = frame.data
+    cdef row_buffer row = row_buffer(<uint8_t *> array_data.data, width, 0,
+                                     palette, palette_stride)
 
-    cdef vector[pixel] current_row
-    cdef pixel px
-    cdef pixel_type px_type
-    cdef int px_val
-
-    cdef size_t x
+    # the GIL is released, so that several frames can be drawn by threads
     cdef size_t y
-
-    for y in range(height):
-        current_row = image_matrix[y]
-
-        for x in range(width):
-            px = current_row[x]
-            px_type = px.type
-            px_val = px.value
-
-            if px_type == color_standard:
-                # simply look up the color index in the table
-                r = m_lookup[px_val][0]
-                g = m_lookup[px_val][1]
-                b = m_lookup[px_val][2]
-                alpha = 255
-
-            elif px_type == color_transparent:
-                r, g, b, alpha = 0, 0, 0, 0
-
-            elif px_type == color_shadow:
-                r, g, b, alpha = 0, 0, 0, 100
-
-            elif px_type == color_shadow_v4:
-                r, g, b = 0, 0, 0
-                alpha = 255 - (px_val << 2)
-
-                # change alpha values to match openage texture formats
-                # even alphas are used for commands marking *special* pixels (player color, etc.)
-                # odd alphas are used for normal pixels (= displayed as-is with transparency)
-                alpha = alpha | 0x01
-
-            else:
-                if px_type == color_player_v4 or px_type == color_player:
-                    # mark this pixel as player color
-                    alpha = 254
-
-                elif px_type == color_special_2 or\
-                     px_type == color_black:
-                    alpha = 250  # mark this pixel as special outline
-
-                elif px_type == color_special_1:
-                    alpha = 252  # mark this pixel as outline
-
-                else:
-                    raise ValueError("unknown pixel type: %d" % px_type)
-
-                # Store player color index in g channel
-                r, b = 0, 0
-                g = px_val
-
-            # array_data[y, x] = (r, g, b, alpha)
-            array_data[y, x, 0] = r
-            array_data[y, x, 1] = g
-            array_data[y, x, 2] = b
-            array_data[y, x, 3] = alpha
+    with nogil:
+        for y in range(height):
+            row.pos = 0
+            frame.draw_row(data_raw, row, y)
+            row.pixels += 4 * width
 
     return array_data
 
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-cdef numpy.ndarray determine_rgba_matrix32(vector[vector[pixel32]] &image_matrix):
+cdef inline void draw_pixel(row_buffer &row, pixel_type px_type, uint8_t px_val) noexcept nogil:
     """
-    converts a 32-Bit SLP image matrix to an rgba matrix.
+    draws a palette pixel at the current position of a row and
+    moves to the next position.
+    pixels beyond the end of the row are only counted.
     """
-    cdef size_t height = image_matrix.size()
-    cdef size_t width = image_matrix[0].size()
+    if row.pos >= row.width:
+        row.pos += 1
+        return
 
-    cdef numpy.ndarray[numpy.uint8_t, ndim=3, mode="c"] array_data = \
-        numpy.zeros((height, width, 4), dtype=numpy.uint8)
+    cdef uint8_t *px = row.pixels + 4 * row.pos
+    cdef const uint8_t *color
 
-    cdef uint8_t r
-    cdef uint8_t g
-    cdef uint8_t b
-    cdef uint8_t alpha
+    row.pos += 1
 
-    cdef vector[pixel32] current_row
-    cdef pixel32 px
-    cdef pixel_type px_type
-    cdef int px_val
+    if px_type == color_standard:
+        # simply look up the color index in the table
+        color = row.palette + px_val * row.palette_stride
+        px[0] = color[0]
+        px[1] = color[1]
+        px[2] = color[2]
+        px[3] = 255
 
-    cdef size_t x
-    cdef size_t y
+    elif px_type == color_shadow:
+        px[3] = 100
 
-    for y in range(height):
-        current_row = image_matrix[y]
+    elif px_type == color_shadow_v4:
+        # change alpha values to match openage texture formats
+        # even alphas are used for commands marking *special* pixels (player color, etc.)
+        # odd alphas are used for normal pixels (= displayed as-is with transparency)
+        px[3] = <uint8_t>(255 - (px_val << 2)) | 0x01
 
-        for x in range(width):
-            px = current_row[x]
-            px_type = px.type
+    else:
+        # Store player color index in g channel
+        px[1] = px_val
+
+        if px_type == color_player_v4 or px_type == color_player:
+            # mark this pixel as player color
+            px[3] = 254
 
-            if px_type == color_standard:
-                # simply look up the color index in the table
-                r = px.r
-                g = px.g
-                b = px.b
-                alpha = px.a
+        elif px_type == color_special_2 or px_type == color_black:
+            px[3] = 250  # mark this pixel as special outline
 
-                # change alpha values to match openage texture formats
-                # even alphas are used for commands marking *special* pixels (player color, etc.)
-                # odd alphas are used for normal pixels (= displayed as-is with transparency)
-                alpha = alpha | 0x01
+        elif px_type == color_special_1:
+            px[3] = 252  # mark this pixel as outline
 
-            elif px_type == color_transparent:
-                r, g, b, alpha = 0, 0, 0, 0
 
-            elif px_type == color_shadow:
-                r, g, b, alpha = 0, 0, 0, 100
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline void draw_pixel32(row_buffer &row, pixel_type px_type,
+                              uint8_t r, uint8_t g, uint8_t b, uint8_t alpha) noexcept nogil:
+    """
+    draws a 32-Bit SLP pixel at the current position of a row and
+    moves to the next position. special pixels store their value in r.
+    pixels beyond the end of the row are only counted.
+    """
+    if row.pos >= row.width:
+        row.pos += 1
+        return
 
-            elif px_type == color_shadow_v4:
-                r, g, b = 0, 0, 0
-                alpha = 255 - (px.r << 2)
+    cdef uint8_t *px = row.pixels + 4 * row.pos
 
-                # change alpha values to match openage texture formats
-                # even alphas are used for commands marking *special* pixels (player color, etc.)
-                # odd alphas are used for normal pixels (= displayed as-is with transparency)
-                alpha = alpha | 0x01
+    row.pos += 1
 
-            else:
-                if px_type == color_player_v4 or px_type == color_player:
-                    # mark this pixel as player color
-                    alpha = 254
+    if px_type == color_standard:
+        px[0] = r
+        px[1] = g
+        px[2] = b
 
-                elif px_type == color_special_2 or\
-                     px_type == color_black:
-                    alpha = 250  # mark this pixel as special outline
+        # change alpha values to match openage texture formats
+        # even alphas are used for commands marking *special* pixels (player color, etc.)
+        # odd alphas are used for normal pixels (= displayed as-is with transparency)
+        px[3] = alpha | 0x01
 
-                elif px_type == color_special_1:
-                    alpha = 252  # mark this pixel as outline
+    elif px_type == color_shadow:
+        px[3] = 100
 
-                else:
-                    raise ValueError("unknown pixel type: %d" % px_type)
+    else:
+        # Store player color index in g channel
+        px[1] = r
 
-                # Store player color index in g channel
-                r, b = 0, 0
-                g = px.r
+        if px_type == color_player_v4 or px_type == color_player:
+            # mark this pixel as player color
+            px[3] = 254
 
-            # array_data[y, x] = (r, g, b, alpha)
-            array_data[y, x, 0] = r
-            array_data[y, x, 1] = g
-            array_data[y, x, 2] = b
-            array_data[y, x, 3] = alpha
+        elif px_type == color_special_2 or px_type == color_black:
+            px[3] = 250  # mark this pixel as special outline
 
-    return array_data
+        elif px_type == color_special_1:
+            px[3] = 252  # mark this pixel as outline
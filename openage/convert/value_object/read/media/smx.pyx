@@ -1,4 +1,4 @@
-# Copyright 2019-2025 the openage authors. See copying.md for legal info.
+# Copyright 2019-2026 the openage authors. See copying.md for legal info.
 #
 # cython: infer_types=True
 
@@ -12,7 +12,7 @@ from .....log import spam, dbg
 cimport cython
 cimport numpy
 
-from libc.stdint cimport uint8_t, uint16_t
+from libc.stdint cimport uint8_t
 from libcpp cimport bool
 from libcpp.vector cimport vector
 
@@ -38,13 +38,20 @@ cdef enum pixel_type:
     color_outline       # player color outline pixel
 
 
-# One uncompressed SMP pixel.
-cdef struct pixel:
-    pixel_type type
-    uint8_t index               # index in a palette section
-    uint8_t palette             # palette number and palette section
-    uint8_t damage_modifier_1   # modifier for damage (part 1)
-    uint8_t damage_modifier_2   # modifier for damage (part 2)
+# Row of the RGBA image that a layer is drawn into.
+cdef struct row_buffer:
+    uint8_t *pixels             # RGBA values of the row
+    size_t width                # number of pixels in the row
+    size_t pos                  # position of the next pixel that is drawn
+    const uint8_t *palette      # colors of the palette
+    Py_ssize_t palette_stride   # number of values per palette color
+
+
+# Position of the next row in the data of a layer.
+cdef struct data_position:
+    Py_ssize_t cmd_offset       # offset of the next drawing command
+    Py_ssize_t color_offset     # offset of the next pixel data
+    int chunk_pos               # position in the compressed chunk
 
 
 class SMXLayerType(Enum):
@@ -345,8 +352,11 @@ cdef class SMXLayer:
     # contains (left, right, full_row) number of boundary pixels
     cdef vector[boundary_def] boundaries
 
-    # pixel matrix representing the final image
-    cdef vector[vector[pixel]] pcolor
+    # type of the layer
+    cdef object variant
+
+    # layer data, the drawing commands are decoded when the image is requested
+    cdef object data
 
     def __init__(
         self,
@@ -376,16 +386,14 @@ cdef class SMXLayer:
         if not (isinstance(data, bytes) or isinstance(data, bytearray)):
             raise ValueError("Layer data must be some bytes object")
 
-        # memory pointer
-        # convert the bytes obj to char*
-        cdef const uint8_t[::1] data_raw = data
+        self.variant = variant
+        self.data = data
 
         cdef unsigned short left
         cdef unsigned short right
 
         cdef size_t i
         cdef size_t row_count = self.info.size[1]
-        self.pcolor.reserve(row_count)
 
         # process bondary table
         for i in range(row_count):
@@ -402,121 +410,124 @@ cdef class SMXLayer:
             else:
                 self.boundaries.push_back(boundary_def(left, right, False))
 
-        cdef int cmd_offset = self.info.qdl_command_table_offset
-        cdef int color_offset = self.info.qdl_color_table_offset
-        cdef int chunk_pos = 0
+    def draw(self, SMXLayerVariant variant, const uint8_t[:, ::1] palette) -> numpy.ndarray:
+        """
+        Draw the rows of the layer into an RGBA image.
 
-        # process cmd table
-        for i in range(row_count):
-            cmd_offset, color_offset, chunk_pos, row_data = \
-                self.create_color_row(variant, data_raw, i, cmd_offset, color_offset, chunk_pos)
-            self.pcolor.push_back(row_data)
-
-
-    cdef inline (int, int, int, vector[pixel]) create_color_row(self,
-                                                                SMXLayerVariant variant,
-                                                                const uint8_t[::1] &data_raw,
-                                                                Py_ssize_t rowid,
-                                                                int cmd_offset,
-                                                                int color_offset,
-                                                                int chunk_pos):
+        :param variant: Type of the layer.
+        :param palette: Color palette used for normal pixels in the sprite.
         """
-        Extract colors (pixels) for a pixel row in the layer.
+        cdef const uint8_t[::1] data_raw = self.data
+
+        cdef size_t width = self.info.size[0]
+        cdef size_t height = self.info.size[1]
+
+        # transparent pixels are (0, 0, 0, 0), so they don't have to be drawn
+        cdef numpy.ndarray[numpy.uint8_t, ndim=3, mode="c"] array_data = \
+            numpy.zeros((height, width, 4), dtype=numpy.uint8)
+
+        cdef row_buffer row = row_buffer(<uint8_t *> array_data.data, width, 0,
+                                         &palette[0, 0], palette.shape[1])
+
+        cdef data_position position = data_position(self.info.qdl_command_table_offset,
+                                                     self.info.qdl_color_table_offset,
+                                                     0)
+
+        # the GIL is released, so that several layers can be drawn by threads
+        cdef size_t i
+        with nogil:
+            for i in range(height):
+                row.pos = 0
+                self.draw_row(variant, data_raw, row, i, position)
+                row.pixels += 4 * width
+
+        return array_data
+
+    cdef inline int draw_row(self,
+                             SMXLayerVariant variant,
+                             const uint8_t[::1] &data_raw,
+                             row_buffer &row,
+                             Py_ssize_t rowid,
+                             data_position &position) except -1 nogil:
+        """
+        Draw the pixels of a row in the layer into the row buffer.
+        The row buffer is filled with transparent pixels before.
 
         :param variant: Type of the layer.
         :param data_raw: Raw data of the layer.
+        :param row: Row of the image that is drawn.
         :param rowid: Index of the current row in the layer.
-        :param cmd_offset: Offset of the command table of the layer.
-        :param color_offset: Offset of the color table of the layer.
-        :param chunk_pos: Current position in the compressed chunk.
+        :param position: Position of the row in the command and color tables
+                         of the layer. Moved to the next row.
         """
-
-        cdef vector[pixel] row_data
-        cdef Py_ssize_t i
-
-        cdef int first_cmd_offset = cmd_offset
-        cdef int first_color_offset = color_offset
+        cdef int first_cmd_offset = position.cmd_offset
         cdef boundary_def bounds = self.boundaries[rowid]
-        cdef size_t pixel_count = self.info.size[0]
-
-        # preallocate memory
-        row_data.reserve(pixel_count)
+        cdef size_t pixel_count = row.width
 
         # row is completely transparent
         if bounds.full_row:
-            for _ in range(pixel_count):
-                row_data.push_back(pixel(color_transparent, 0, 0, 0, 0))
+            return 0
 
-            return cmd_offset, color_offset, chunk_pos, row_data
-
-        # start drawing the left transparent space
-        for i in range(bounds.left):
-            row_data.push_back(pixel(color_transparent, 0, 0, 0, 0))
+        # skip the left transparent space
+        row.pos = bounds.left
 
         # process the drawing commands for this row.
-        next_cmd_offset, next_color_offset, chunk_pos, row_data = \
-            self.process_drawing_cmds(
-                variant,
-                data_raw,
-                row_data,
-                rowid,
-                first_cmd_offset,
-                first_color_offset,
-                chunk_pos,
-                pixel_count - bounds.right
-            )
+        self.process_drawing_cmds(
+            variant,
+            data_raw,
+            row,
+            rowid,
+            position,
+            pixel_count - bounds.right
+        )
 
-        # finish by filling up the right transparent space
-        for i in range(bounds.right):
-            row_data.push_back(pixel(color_transparent, 0, 0, 0, 0))
+        # the right transparent space is left as it is
+        cdef size_t got = row.pos + bounds.right
 
         # verify size of generated row
-        if row_data.size() != pixel_count:
-            got = row_data.size()
-            summary = "%d/%d -> row %d, layer type %s, offset %d / %#x" % (
-                got, pixel_count, rowid, repr(self.info.layer_type),
-                first_cmd_offset, first_cmd_offset
-                )
-            txt = "got %%s pixels than expected: %s, missing: %d" % (
-                summary, abs(pixel_count - got))
+        if got != pixel_count:
+            with gil:
+                summary = "%d/%d -> row %d, layer type %s, offset %d / %#x" % (
+                    got, pixel_count, rowid, repr(self.info.layer_type),
+                    first_cmd_offset, first_cmd_offset
+                    )
+                txt = "got %%s pixels than expected: %s, missing: %d" % (
+                    summary, abs(pixel_count - got))
 
-            raise Exception(txt % ("LESS" if got < pixel_count else "MORE"))
+                raise Exception(txt % ("LESS" if got < pixel_count else "MORE"))
 
-        return next_cmd_offset, next_color_offset, chunk_pos, row_data
+        return 0
 
 
     @cython.boundscheck(False)
-    cdef inline (int, int, int, vector[pixel]) process_drawing_cmds(self,
-                                                                    SMXLayerVariant variant,
-                                                                    const uint8_t[::1] &data_raw,
-                                                                    vector[pixel] &row_data,
-                                                                    Py_ssize_t rowid,
-                                                                    Py_ssize_t first_cmd_offset,
-                                                                    Py_ssize_t first_color_offset,
-                                                                    int chunk_pos,
-                                                                    size_t expected_size):
+    cdef inline int process_drawing_cmds(self,
+                                         SMXLayerVariant variant,
+                                         const uint8_t[::1] &data_raw,
+                                         row_buffer &row,
+                                         Py_ssize_t rowid,
+                                         data_position &position,
+                                         size_t expected_size) except -1 nogil:
         """
-        extract colors (pixels) for the drawing commands that were
-        compressed with 8to5 compression.
+        draw the pixels of the drawing commands of a row.
 
         :param variant: Type of the layer.
         :param data_raw: Raw data of the layer.
-        :param row_data: Stores the extracted pixels. May be prefilled with transparent pixels.
+        :param row: Row of the image that is drawn. Positioned after the left transparent space.
         :param rowid: Row index.
-        :param first_cmd_offset: Offset of the first drawing command in the data.
-        :param first_color_offset: Offset of the first color command in the data.
-        :param chunk_pos: Current position in the compressed chunk.
+        :param position: Offsets of the first drawing command and the first color
+                         in the data, and the position in the compressed chunk.
+                         Moved to the next row.
         :param expected_size: Expected number of pixels in the row.
         """
         # position in the command array, we start at the first command of this row
-        cdef Py_ssize_t dpos_cmd = first_cmd_offset
+        cdef Py_ssize_t dpos_cmd = position.cmd_offset
 
         # Position in the pixel data array
-        cdef Py_ssize_t dpos_color = first_color_offset
+        cdef Py_ssize_t dpos_color = position.color_offset
 
         # Position in the compression chunk.
+        cdef int chunk_pos = position.chunk_pos
         cdef bool odd = chunk_pos
-        cdef int px_dpos = 0 # For loop iterator
 
         # is the end of the current row reached?
         cdef bool eor = False
@@ -524,24 +535,9 @@ cdef class SMXLayer:
         cdef uint8_t cmd = 0
         cdef uint8_t lower_crumb = 0
         cdef int pixel_count = 0
-        cdef vector[uint8_t] pixel_data
-        pixel_data.reserve(4)
-
-        # Pixel data temporary values that need further decompression
-        cdef uint8_t pixel_data_odd_0 = 0
-        cdef uint8_t pixel_data_odd_1 = 0
-        cdef uint8_t pixel_data_odd_2 = 0
-        cdef uint8_t pixel_data_odd_3 = 0
 
-        # Mask for even indices
-        # cdef uint8_t pixel_mask_even_0 = 0xFF
+        # Mask for the palette section of even indices
         cdef uint8_t pixel_mask_even_1 = 0b00000011
-        cdef uint8_t pixel_mask_even_2 = 0b11110000
-        cdef uint8_t pixel_mask_even_3 = 0b00111111
-
-        if SMXLayerVariant is SMXMainLayer8to5 or SMXLayerVariant is SMXMainLayer4plus1:
-            # Position in the pixel data array
-            dpos_color = first_color_offset
 
         cdef uint8_t palette_section_block = 0
         cdef uint8_t palette_section = 0
@@ -549,12 +545,13 @@ cdef class SMXLayer:
 
         # work through commands till end of row.
         while not eor:
-            if row_data.size() > expected_size:
-                raise Exception(
-                    f"Only {expected_size:d} pixels should be drawn in row {rowid:d} "
-                    f"with layer type {self.info.layer_type:#x}, but we have {row_data.size():d} "
-                    f"already!"
-                )
+            if row.pos > expected_size:
+                with gil:
+                    raise Exception(
+                        f"Only {expected_size:d} pixels should be drawn in row {rowid:d} "
+                        f"with layer type {self.info.layer_type:#x}, but we have {row.pos:d} "
+                        f"already!"
+                    )
 
             # fetch drawing instruction
             cmd = data_raw[dpos_cmd]
@@ -570,14 +567,13 @@ cdef class SMXLayer:
                 # shadows sometimes need an extra pixel at
                 # the end
                 if SMXLayerVariant is SMXShadowLayer:
-                    if row_data.size() < expected_size:
+                    if row.pos < expected_size:
                         # copy the last drawn pixel
                         # (still stored in nextbyte)
                         #
                         # TODO: confirm that this is the
                         #       right way to do it
-                        row_data.push_back(pixel(color_shadow,
-                                                nextbyte, 0, 0, 0))
+                        draw_pixel(row, color_shadow, nextbyte, 0)
                 continue
 
             elif lower_crumb == 0b00000000:
@@ -587,8 +583,7 @@ cdef class SMXLayer:
 
                 pixel_count = (cmd >> 2) + 1
 
-                for _ in range(pixel_count):
-                    row_data.push_back(pixel(color_transparent, 0, 0, 0, 0))
+                row.pos += pixel_count
 
             elif lower_crumb == 0b00000001:
                 # color_list command
@@ -602,52 +597,30 @@ cdef class SMXLayer:
                 pixel_count = (cmd >> 2) + 1
 
                 if SMXLayerVariant is SMXMainLayer8to5:
-                    pixel_data.reserve(4)
                     for _ in range(pixel_count):
                         # Start fetching pixel data
+                        # the damage modifiers in the remaining bits are not drawn
                         if odd:
-                            # Odd indices require manual extraction of each of the 4 values
+                            # Odd indices require manual extraction of the values
 
                             # Palette index. Essentially a rotation of (byte[1]byte[2])
                             # by 6 to the left, then masking with 0x00FF.
-                            pixel_data_odd_0 = data_raw[dpos_color + 1]
-                            pixel_data_odd_1 = data_raw[dpos_color + 2]
-                            pixel_data.push_back((pixel_data_odd_0 >> 2) | (pixel_data_odd_1 << 6))
-
                             # Palette section. Described in byte[2] in bits 4-5.
-                            pixel_data.push_back((pixel_data_odd_1 >> 2) & 0x03)
-
-                            # Damage mask 1. Essentially a rotation of (byte[3]byte[4])
-                            # by 6 to the left, then masking with 0x00F0.
-                            pixel_data_odd_2 = data_raw[dpos_color + 3]
-                            pixel_data_odd_3 = data_raw[dpos_color + 4]
-                            pixel_data.push_back(((pixel_data_odd_2 >> 2) | (pixel_data_odd_3 << 6)) & 0xF0)
-
-                            # Damage mask 2. Described in byte[4] in bits 0-5.
-                            pixel_data.push_back((pixel_data_odd_3 >> 2) & 0x3F)
-
-                            row_data.push_back(pixel(color_standard,
-                                                    pixel_data[0],
-                                                    pixel_data[1],
-                                                    pixel_data[2],
-                                                    pixel_data[3]))
+                            draw_pixel(row, color_standard,
+                                       <uint8_t>((data_raw[dpos_color + 1] >> 2) |
+                                                 (data_raw[dpos_color + 2] << 6)),
+                                       (data_raw[dpos_color + 2] >> 2) & 0x03)
 
                             # Go to next pixel
                             dpos_color += 5
 
                         else:
                             # Even indices can be read "as is". They just have to be masked.
-                            for i in range(4):
-                                pixel_data.push_back(data_raw[dpos_color + i])
-
-                            row_data.push_back(pixel(color_standard,
-                                                    pixel_data[0],
-                                                    pixel_data[1] & pixel_mask_even_1,
-                                                    pixel_data[2] & pixel_mask_even_2,
-                                                    pixel_data[3] & pixel_mask_even_3))
+                            draw_pixel(row, color_standard,
+                                       data_raw[dpos_color],
+                                       data_raw[dpos_color + 1] & pixel_mask_even_1)
 
                         odd = not odd
-                        pixel_data.clear()
 
                 if SMXLayerVariant is SMXMainLayer4plus1:
                     palette_section_block = data_raw[dpos_color + (4 - chunk_pos)]
@@ -656,11 +629,9 @@ cdef class SMXLayer:
                         # Start fetching pixel data
                         palette_section = (
                             palette_section_block >> (2 * chunk_pos)) & 0x03
-                        row_data.push_back(pixel(color_standard,
-                                                data_raw[dpos_color],
-                                                palette_section,
-                                                0,
-                                                0))
+                        draw_pixel(row, color_standard,
+                                   data_raw[dpos_color],
+                                   palette_section)
 
                         dpos_color += 1
                         chunk_pos += 1
@@ -676,15 +647,13 @@ cdef class SMXLayer:
                         dpos_cmd += 1
                         nextbyte = data_raw[dpos_cmd]
 
-                        row_data.push_back(pixel(color_shadow,
-                                                nextbyte, 0, 0, 0))
+                        draw_pixel(row, color_shadow, nextbyte, 0)
 
                 if SMXLayerVariant is SMXOutlineLayer:
                     # we don't know the color the game wants
                     # so we just draw index 0
                     for _ in range(pixel_count):
-                        row_data.push_back(pixel(color_outline,
-                                                0, 0, 0, 0))
+                        draw_pixel(row, color_outline, 0, 0)
 
             elif lower_crumb == 0b00000010:
                 if SMXLayerVariant is SMXMainLayer8to5:
@@ -700,49 +669,28 @@ cdef class SMXLayer:
 
                     for _ in range(pixel_count):
                         # Start fetching pixel data
+                        # the damage modifiers in the remaining bits are not drawn
                         if odd:
-                            # Odd indices require manual extraction of each of the 4 values
+                            # Odd indices require manual extraction of the values
 
                             # Palette index. Essentially a rotation of (byte[1]byte[2])
                             # by 6 to the left, then masking with 0x00FF.
-                            pixel_data_odd_0 = data_raw[dpos_color + 1]
-                            pixel_data_odd_1 = data_raw[dpos_color + 2]
-                            pixel_data.push_back((pixel_data_odd_0 >> 2) | (pixel_data_odd_1 << 6))
-
                             # Palette section. Described in byte[2] in bits 4-5.
-                            pixel_data.push_back((pixel_data_odd_1 >> 2) & 0x03)
-
-                            # Damage modifier 1. Essentially a rotation of (byte[3]byte[4])
-                            # by 6 to the left, then masking with 0x00F0.
-                            pixel_data_odd_2 = data_raw[dpos_color + 3]
-                            pixel_data_odd_3 = data_raw[dpos_color + 4]
-                            pixel_data.push_back(((pixel_data_odd_2 >> 2) | (pixel_data_odd_3 << 6)) & 0xF0)
-
-                            # Damage modifier 2. Described in byte[4] in bits 0-5.
-                            pixel_data.push_back((pixel_data_odd_3 >> 2) & 0x3F)
-
-                            row_data.push_back(pixel(color_player,
-                                                    pixel_data[0],
-                                                    pixel_data[1],
-                                                    pixel_data[2],
-                                                    pixel_data[3]))
+                            draw_pixel(row, color_player,
+                                       <uint8_t>((data_raw[dpos_color + 1] >> 2) |
+                                                 (data_raw[dpos_color + 2] << 6)),
+                                       (data_raw[dpos_color + 2] >> 2) & 0x03)
 
                             # Go to next pixel
                             dpos_color += 5
 
                         else:
                             # Even indices can be read "as is". They just have to be masked.
-                            for px_dpos in range(4):
-                                pixel_data.push_back(data_raw[dpos_color + px_dpos])
-
-                            row_data.push_back(pixel(color_player,
-                                                    pixel_data[0],
-                                                    pixel_data[1] & pixel_mask_even_1,
-                                                    pixel_data[2] & pixel_mask_even_2,
-                                                    pixel_data[3] & pixel_mask_even_3))
+                            draw_pixel(row, color_player,
+                                       data_raw[dpos_color],
+                                       data_raw[dpos_color + 1] & pixel_mask_even_1)
 
                         odd = not odd
-                        pixel_data.clear()
 
                 elif SMXLayerVariant is SMXMainLayer4plus1:
                     # player_color command
@@ -757,11 +705,9 @@ cdef class SMXLayer:
                     for _ in range(pixel_count):
                         # Start fetching pixel data
                         palette_section = (palette_section_block >> (2 * chunk_pos)) & 0x03
-                        row_data.push_back(pixel(color_player,
-                                                data_raw[dpos_color],
-                                                palette_section,
-                                                0,
-                                                0))
+                        draw_pixel(row, color_player,
+                                   data_raw[dpos_color],
+                                   palette_section)
 
                         dpos_color += 1
                         chunk_pos += 1
@@ -773,29 +719,35 @@ cdef class SMXLayer:
                             palette_section_block = data_raw[dpos_color + 4]
 
             else:
-                raise Exception(
-                    f"unknown smx main graphics layer drawing command: " +
-                    f"{cmd:#x} in row {rowid:d}"
-                )
+                with gil:
+                    raise Exception(
+                        f"unknown smx main graphics layer drawing command: " +
+                        f"{cmd:#x} in row {rowid:d}"
+                    )
 
             # Process next command
             dpos_cmd += 1
 
+        position.cmd_offset = dpos_cmd
+        position.chunk_pos = chunk_pos
+
         if SMXLayerVariant is SMXMainLayer8to5 or SMXLayerVariant is SMXMainLayer4plus1:
-            return dpos_cmd, dpos_color, chunk_pos, row_data
+            position.color_offset = dpos_color
         elif SMXLayerVariant is SMXOutlineLayer or SMXLayerVariant is SMXShadowLayer:
-            return dpos_cmd, dpos_cmd, chunk_pos, row_data
+            position.color_offset = dpos_cmd
+
+        return 0
 
 
     def get_picture_data(self, palette) -> numpy.ndarray:
         """
-        Convert the palette index matrix to a RGBA image.
+        Draw the layer into a RGBA image.
 
         :param palette: Color palette used for pixels in the sprite.
         :type palette: .colortable.ColorTable
         :return: Array of RGBA values.
         """
-        return determine_rgba_matrix(self.pcolor, palette)
+        return self.draw(self.variant, palette)
 
     def get_hotspot(self) -> tuple[int, int]:
         """
@@ -819,144 +771,54 @@ cdef class SMXLayer:
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-cdef numpy.ndarray determine_rgba_matrix(vector[vector[pixel]] &image_matrix,
-                                         numpy.ndarray[numpy.uint8_t, ndim=2, mode="c"] palette):
-    """
-    converts a palette index image matrix to an rgba matrix.
-
-    :param image_matrix: A 2-dimensional array of SMP pixels.
-    :param palette: Color palette used for normal pixels in the sprite.
-    """
-
-    cdef size_t height = image_matrix.size()
-    cdef size_t width = image_matrix[0].size()
-
-    cdef numpy.ndarray[numpy.uint8_t, ndim=3, mode="c"] array_data = \
-        numpy.zeros((height, width, 4), dtype=numpy.uint8)
-
-    cdef uint8_t[:, ::1] m_lookup = palette
-
-    cdef uint8_t r = 0
-    cdef uint8_t g = 0
-    cdef uint8_t b = 0
-    cdef uint8_t alpha = 0
-
-    cdef vector[pixel] current_row
-    cdef pixel px
-    cdef pixel_type px_type
-    cdef uint8_t px_index = 0
-    cdef uint8_t px_palette = 0
-
-    cdef uint16_t palette_section = 0
-
-    cdef size_t x = 0
-    cdef size_t y = 0
-
-    for y in range(height):
-
-        current_row = image_matrix[y]
-
-        for x in range(width):
-            px = current_row[x]
-
-            px_type = px.type
-            px_index = px.index
-            px_palette = px.palette
-
-            if px_type == color_standard:
-                # look up the palette secition
-                # palettes have 1024 entries
-                # divided into 4 sections
-                palette_section = px_palette
-
-                # the index has to be adjusted
-                # to the palette section
-                index = px_index + (palette_section * 256)
-
-                # look up the color index in the
-                # main graphics table
-                r = m_lookup[index][0]
-                g = m_lookup[index][1]
-                b = m_lookup[index][2]
-                alpha = m_lookup[index][3]
-
-                # alpha values are unused
-                # in 0x0C and 0x0B version of SMP/SMX
-                alpha = 255
-
-            elif px_type == color_transparent:
-                r, g, b, alpha = 0, 0, 0, 0
-
-            elif px_type == color_shadow:
-                r, g, b, alpha = 0, 0, 0, px_index
-
-                # change alpha values to match openage texture formats
-                # even alphas are used for commands marking *special* pixels (player color, etc.)
-                # odd alphas are used for normal pixels (= displayed as-is with transparency)
-                alpha = alpha | 0x01
-
-            else:
-                if px_type == color_player:
-                    alpha = 254
-
-                elif px_type == color_outline:
-                    alpha = 252
-
-                else:
-                    raise ValueError(f"unknown pixel type: {px_type:#x}")
-
-                # Store player color index in g channel
-                r, b = 0, 0
-                g = px_index
-
-            # array_data[y, x] = (r, g, b, alpha)
-            array_data[y, x, 0] = r
-            array_data[y, x, 1] = g
-            array_data[y, x, 2] = b
-            array_data[y, x, 3] = alpha
-
-    return array_data
-
-
-@cython.boundscheck(False)
-@cython.wraparound(False)
-cdef numpy.ndarray determine_damage_matrix(vector[vector[pixel]] &image_matrix):
+cdef inline void draw_pixel(row_buffer &row, pixel_type px_type,
+                            uint8_t px_index, uint8_t px_palette) noexcept nogil:
     """
-    converts the damage modifier values to an image using the RG values.
-
-    :param image_matrix: A 2-dimensional array of SMP pixels.
+    draws a SMP pixel at the current position of a row and
+    moves to the next position.
+    pixels beyond the end of the row are only counted.
+
+    :param row: Row of the image that is drawn.
+    :param px_type: Type of the pixel.
+    :param px_index: Index in a palette section.
+    :param px_palette: Palette section.
     """
-
-    cdef size_t height = image_matrix.size()
-    cdef size_t width = image_matrix[0].size()
-
-    cdef numpy.ndarray[numpy.uint8_t, ndim=3, mode="c"] array_data = \
-        numpy.zeros((height, width, 4), dtype=numpy.uint8)
-
-    cdef uint8_t r = 0
-    cdef uint8_t g = 0
-    cdef uint8_t b = 0
-    cdef uint8_t alpha = 0
-
-    cdef vector[pixel] current_row
-    cdef pixel px
-
-    cdef size_t x = 0
-    cdef size_t y = 0
-
-    for y in range(height):
-
-        current_row = image_matrix[y]
-
-        for x in range(width):
-            px = current_row[x]
-
-            r, g, b, alpha = px.damage_modifier_1, px.damage_modifier_2, 0, 255
-
-            # array_data[y, x] = (r, g, b, alpha)
-            array_data[y, x, 0] = r
-            array_data[y, x, 1] = g
-            array_data[y, x, 2] = b
-            array_data[y, x, 3] = alpha
-
-    return array_data
+    if row.pos >= row.width:
+        row.pos += 1
+        return
+
+    cdef uint8_t *px = row.pixels + 4 * row.pos
+    cdef const uint8_t *color
+
+    row.pos += 1
+
+    if px_type == color_standard:
+        # look up the palette secition
+        # palettes have 1024 entries
+        # divided into 4 sections
+        # the index has to be adjusted
+        # to the palette section
+        color = row.palette + (px_index + px_palette * 256) * row.palette_stride
+        px[0] = color[0]
+        px[1] = color[1]
+        px[2] = color[2]
+
+        # alpha values are unused
+        # in 0x0C and 0x0B version of SMP/SMX
+        px[3] = 255
+
+    elif px_type == color_shadow:
+        # change alpha values to match openage texture formats
+        # even alphas are used for commands marking *special* pixels (player color, etc.)
+        # odd alphas are used for normal pixels (= displayed as-is with transparency)
+        px[3] = px_index | 0x01
+
+    else:
+        # Store player color index in g channel
+        px[1] = px_index
+
+        if px_type == color_player:
+            px[3] = 254
+
+        elif px_type == color_outline:
+            px[3] = 252
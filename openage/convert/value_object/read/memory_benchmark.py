@@ -0,0 +1,129 @@
+# Copyright 2026-2026 the openage authors. See copying.md for legal info.
+
+"""
+Memory benchmark for the gamespec read from the .dat file of a game.
+
+Run it for the installation dirs of the games you want to compare, e.g.
+
+    python3 -m openage test --demo \\
+        openage.convert.value_object.read.memory_benchmark.gamespec_memory \\
+        ~/games/aoc ~/games/aoe2de
+"""
+
+from __future__ import annotations
+import typing
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from ....log import info, err
+from ....util.fslike.directory import CaseIgnoringDirectory
+from .dynamic_loader import DynamicLoader
+from .value_members import ArrayMember, ContainerMember
+
+if typing.TYPE_CHECKING:
+    from openage.convert.value_object.read.value_members import ValueMember
+
+
+def count_members(member: ValueMember) -> int:
+    """
+    Count a member and all of its submembers. Dynamically loaded
+    containers are counted as one member.
+    """
+    if isinstance(member, ContainerMember):
+        if isinstance(member.value, DynamicLoader):
+            return 1
+
+        return 1 + sum(count_members(submember) for submember in member.value.values())
+
+    if isinstance(member, ArrayMember):
+        return 1 + sum(count_members(submember) for submember in member.value)
+
+    return 1
+
+
+def measure_gamespec_memory(game_dir: str, cfg_dir, low_memory: bool) -> dict[str, typing.Any]:
+    """
+    Read the gamespec of the game installed in game_dir and
+    measure the memory it occupies.
+    """
+    # avoid import cycle with the converter services
+    from ...service.init.version_detect import create_version_objects
+    from ...service.read.gamedata import get_gamespec
+    from ...tool.subtool.version_select import get_game_version
+
+    srcdir = CaseIgnoringDirectory(game_dir).root
+
+    game_version = get_game_version(srcdir,
+                                    *create_version_objects(cfg_dir / "converter" / "games"))
+    if not game_version.edition:
+        raise ValueError(f"no supported game found in {game_dir}")
+
+    gc.collect()
+    tracemalloc.start()
+
+    start = time.perf_counter()
+    gamespec = get_gamespec(srcdir, game_version, dynamic_load=low_memory)
+    read_time = time.perf_counter() - start
+
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    member_count = count_members(gamespec)
+
+    return {
+        "game": game_version.edition.game_id,
+        "low_memory": low_memory,
+        "read_time": read_time,
+        "gamespec_bytes": current,
+        "peak_bytes": peak,
+        "members": member_count,
+        "bytes_per_member": current / member_count,
+    }
+
+
+def gamespec_memory(args) -> int:
+    """
+    Measures the memory usage of the gamespec of one or more games.
+    """
+    cli = argparse.ArgumentParser()
+    cli.add_argument("game_dirs", nargs="+", metavar="game_dir",
+                     help="installation directory of a game, e.g. AoC or DE2")
+    cli.add_argument("--low-memory", action="store_true",
+                     help="read the gamespec like the converter in low memory mode")
+    cli.add_argument("--output", "-o", default=None, metavar="results.json",
+                     help="store the results in a JSON file")
+    args = cli.parse_args(args)
+
+    from ....cvar.location import get_config_path
+    cfg_dir = get_config_path()
+
+    results = []
+    for game_dir in args.game_dirs:
+        try:
+            result = measure_gamespec_memory(game_dir, cfg_dir, args.low_memory)
+
+        except ValueError as exc:
+            err("%s", exc)
+            return 1
+
+        results.append(result)
+
+        info("%s: read in %.2f s, gamespec %.1f MiB (peak %.1f MiB), "
+             "%d members, %.1f bytes per member",
+             result["game"],
+             result["read_time"],
+             result["gamespec_bytes"] / 2 ** 20,
+             result["peak_bytes"] / 2 ** 20,
+             result["members"],
+             result["bytes_per_member"])
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as outfile:
+            json.dump(results, outfile, indent=4)
+
+    return 0
@@ -0,0 +1,849 @@
+# Copyright 2026-2026 the openage authors. See copying.md for legal info.
+
+# TODO pylint: disable=C,R
+# pylint: disable=protected-access,unused-argument
+
+"""
+Compiled read plans for GenieStructure classes.
+
+Reading a struct by walking its data format generator re-does the same
+type dispatch and struct format building for every single instance. A read
+plan does this work once per (struct class, game version) and fuses adjacent
+fixed-size primitive members into a single precompiled struct.Struct.
+"""
+
+from __future__ import annotations
+import typing
+
+from array import array
+from functools import cache
+import math
+import struct
+
+from ....util.strings import decode_until_null
+from .dynamic_loader import DynamicLoader
+from .record_array import RecordArrayMember, RecordLayout
+from .member_access import READ, READ_GEN, READ_UNKNOWN, SKIP
+from .read_members import (ContinueReadMember, DynLengthMember, EnumLookupMember,
+                           GroupMember, IncludeMembers, MultisubtypeMember, ReadMember,
+                           SubdataMember)
+from .value_members import ArrayMember, BitfieldMember, BooleanMember, ContainerMember, \
+    FloatMember, IDMember, IntMember, StringMember, TypedArrayMember
+from .value_members import StorageType, TYPED_ARRAY_MEMBERS
+
+if typing.TYPE_CHECKING:
+    from openage.convert.value_object.init.game_version import GameVersion
+    from openage.convert.value_object.read.genie_structure import GenieStructure
+    from openage.convert.value_object.read.member_access import MemberAccess
+    from openage.convert.value_object.read.value_members import ValueMember
+
+
+# value member classes for storing a single primitive value
+SCALAR_MEMBER_TYPES = {
+    StorageType.INT_MEMBER: IntMember,
+    StorageType.FLOAT_MEMBER: FloatMember,
+    StorageType.BOOLEAN_MEMBER: BooleanMember,
+    StorageType.ID_MEMBER: IDMember,
+}
+
+# array storage type -> (allowed member type, value member class)
+ARRAY_MEMBER_TYPES = {
+    StorageType.ARRAY_INT: (StorageType.INT_MEMBER, IntMember),
+    StorageType.ARRAY_FLOAT: (StorageType.FLOAT_MEMBER, FloatMember),
+    StorageType.ARRAY_BOOL: (StorageType.BOOLEAN_MEMBER, BooleanMember),
+    StorageType.ARRAY_ID: (StorageType.ID_MEMBER, IDMember),
+    StorageType.ARRAY_STRING: (StorageType.STRING_MEMBER, StringMember),
+}
+
+# storage types of EnumLookupMembers -> value member class
+ENUM_MEMBER_TYPES = {
+    StorageType.INT_MEMBER: IntMember,
+    StorageType.ID_MEMBER: IDMember,
+    StorageType.BITFIELD_MEMBER: BitfieldMember,
+    StorageType.STRING_MEMBER: StringMember,
+}
+
+# marks attributes that are computed on first use
+_UNSET = object()
+
+# kinds of values stored in a fused primitive step
+SLOT_SCALAR = 0
+SLOT_STRING = 1
+SLOT_ENUM = 2
+
+
+class FusedPrimitiveStep:
+    """
+    Reads a run of fixed-size primitive members with one struct.Struct call.
+
+    Every slot of the step corresponds to exactly one value in the unpacked result.
+    """
+
+    __slots__ = ('struct', 'names', 'unknown_slots', 'float_slots', 'string_slots',
+                 'enum_slots', 'gen_slots', 'can_stop')
+
+    def __init__(self, fmt: str, slots: list[tuple]):
+        """
+        :param fmt: Struct format string of the fused members.
+        :param slots: Slot definitions (kind, export, var_name, rel_offset,
+                      member_cls, var_type, is_float) of every read value.
+        """
+        self.struct = struct.Struct(fmt)
+        self.can_stop = False
+
+        self.names = tuple(slot[2] for slot in slots)
+
+        # slots that need additional processing after unpacking
+        self.unknown_slots = []
+        self.float_slots = []
+        self.string_slots = []
+        self.enum_slots = []
+
+        # slots that generate value members: (index, name, member class, source)
+        # where source is 0 for the raw value and 1 for the processed value
+        self.gen_slots = []
+
+        for idx, (kind, export, var_name, rel_offset, member_cls, var_type, is_float) \
+                in enumerate(slots):
+            if export == READ_UNKNOWN:
+                self.unknown_slots.append((idx, rel_offset))
+
+            if is_float:
+                self.float_slots.append((idx, rel_offset))
+
+            if kind == SLOT_STRING:
+                self.string_slots.append(idx)
+
+            elif kind == SLOT_ENUM:
+                self.enum_slots.append((idx, rel_offset, var_type))
+
+            if export == READ_GEN:
+                source = int(kind == SLOT_STRING or member_cls is StringMember)
+                self.gen_slots.append((idx, var_name, member_cls, source))
+
+        self.unknown_slots = tuple(self.unknown_slots)
+        self.float_slots = tuple(self.float_slots)
+        self.string_slots = tuple(self.string_slots)
+        self.enum_slots = tuple(self.enum_slots)
+        self.gen_slots = tuple(self.gen_slots)
+
+    def read(
+        self,
+        obj: GenieStructure,
+        raw: bytes,
+        offset: int,
+        game_version: GameVersion,
+        target_class: type,
+        generated_value_members: list[ValueMember]
+    ) -> tuple[int, bool]:
+        result = self.struct.unpack_from(raw, offset)
+
+        names = self.names
+        if self.unknown_slots:
+            # for unknown variables, generate uid for the unknown
+            # memory location
+            names = list(names)
+            for idx, rel_offset in self.unknown_slots:
+                names[idx] = "unknown-0x%08x" % (offset + rel_offset)
+
+        for idx, rel_offset in self.float_slots:
+            if not math.isfinite(result[idx]):
+                raise SyntaxError("invalid float when "
+                                  "reading %s at offset %# 08x" % (
+                                      names[idx], offset + rel_offset))
+
+        values = result
+        if self.string_slots or self.enum_slots:
+            values = list(result)
+
+            for idx in self.string_slots:
+                # stringify char array
+                values[idx] = decode_until_null(values[idx])
+
+            for idx, rel_offset, var_type in self.enum_slots:
+                if not var_type.verify_read_data(obj, (values[idx],)):
+                    raise SyntaxError("invalid data when reading %s "
+                                      "at offset %# 08x" % (names[idx], offset + rel_offset))
+
+                values[idx] = var_type.entry_hook(values[idx])
+
+        if self.gen_slots:
+            sources = (result, values)
+            generated_value_members.extend([
+                member_cls(var_name, sources[source][idx])
+                for idx, var_name, member_cls, source in self.gen_slots
+            ])
+
+        # store members' data values
+        obj.__dict__.update(zip(names, values))
+
+        return offset + self.struct.size, False
+
+
+class ArrayStep:
+    """
+    Reads a primitive array with a fixed length or a length
+    that is stored in another member.
+    """
+
+    __slots__ = ('export', 'var_name', 'storage_type', 'var_type',
+                 'length', 'symbol', 'member_types', 'structs', 'can_stop')
+
+    def __init__(
+        self,
+        export: MemberAccess,
+        var_name: str,
+        storage_type: StorageType,
+        var_type: str,
+        length: typing.Union[int, str],
+        symbol: str
+    ):
+        self.export = export
+        self.var_name = var_name
+        self.storage_type = storage_type
+        self.var_type = var_type
+        self.length = length
+        self.symbol = symbol
+        self.member_types = ARRAY_MEMBER_TYPES[storage_type]
+        self.can_stop = False
+
+        # precompiled structs by array length
+        self.structs = {}
+
+    def read(
+        self,
+        obj: GenieStructure,
+        raw: bytes,
+        offset: int,
+        game_version: GameVersion,
+        target_class: type,
+        generated_value_members: list[ValueMember]
+    ) -> tuple[int, bool]:
+        data_count = self.length
+        if isinstance(data_count, str):
+            # dynamic length specified by member name
+            data_count = getattr(obj, data_count)
+
+        array_struct = self.structs.get(data_count)
+        if array_struct is None:
+            if data_count < 0:
+                # let the generic reader raise the error
+                offset, _, _ = obj._read_primitive(
+                    raw, offset, self.export, self.var_name,
+                    self.storage_type, self.var_type
+                )
+                return offset, False
+
+            array_struct = struct.Struct("< %d%s" % (data_count, self.symbol))
+            self.structs[data_count] = array_struct
+
+        if self.export == SKIP:
+            return offset + array_struct.size, False
+
+        var_name = self.var_name
+        if self.export == READ_UNKNOWN:
+            var_name = "unknown-0x%08x" % offset
+
+        result = array_struct.unpack_from(raw, offset)
+
+        if self.export == READ_GEN:
+            allowed_member_type, member_cls = self.member_types
+
+            if allowed_member_type in TYPED_ARRAY_MEMBERS:
+                generated_value_members.append(TypedArrayMember(
+                    var_name,
+                    allowed_member_type,
+                    array(self.symbol, result)
+                ))
+
+            else:
+                generated_value_members.append(ArrayMember(
+                    var_name,
+                    allowed_member_type,
+                    [member_cls(var_name, elem) for elem in result]
+                ))
+
+        setattr(obj, var_name, result)
+
+        return offset + array_struct.size, False
+
+
+class SubdataStep:
+    """
+    Reads a list of substructs with the read plans of their classes.
+    """
+
+    __slots__ = ('export', 'var_name', 'storage_type', 'var_type', 'lazy', 'child_plans',
+                 'subtype_plan', 'record_layout', 'can_stop')
+
+    def __init__(
+        self,
+        export: MemberAccess,
+        var_name: str,
+        storage_type: StorageType,
+        var_type: MultisubtypeMember,
+        lazy: bool = False
+    ):
+        self.export = export
+        self.var_name = var_name
+        self.storage_type = storage_type
+        self.var_type = var_type
+        self.lazy = lazy
+        self.can_stop = False
+
+        # read plans of the substruct classes and whether
+        # the substructs are loaded dynamically
+        self.child_plans = {}
+
+        # read plan of the subtype member of multisubtype substructs
+        self.subtype_plan = None
+
+        # record layout if the substructs are read into a structured array
+        self.record_layout = _UNSET
+
+    def get_child_plan(
+        self,
+        new_data_class: type,
+        game_version: GameVersion
+    ) -> tuple[ReadPlan, bool]:
+        """
+        Get the read plan for a substruct class.
+
+        :returns: The read plan and whether the substruct members are
+                  loaded dynamically instead of being generated.
+        """
+        child_plan = self.child_plans.get(new_data_class)
+        if child_plan is None:
+            # avoid circular import
+            from .genie_structure import GenieStructure
+
+            if not issubclass(new_data_class, GenieStructure):
+                raise TypeError("dumped data "
+                                "is not exportable: %s" % (
+                                    new_data_class.__name__))
+
+            if self.export != READ_GEN:
+                # members of the substructs are discarded anyway
+                child_plan = (get_read_plan(new_data_class, game_version, True), False)
+
+            elif self.lazy and new_data_class.dynamic_load:
+                # only walk over the substruct to find its end
+                child_plan = (get_read_plan(new_data_class, game_version, True), True)
+
+            else:
+                child_plan = (get_read_plan(new_data_class, game_version, lazy=self.lazy), False)
+
+            self.child_plans[new_data_class] = child_plan
+
+        return child_plan
+
+    def get_subtype_plan(self) -> ReadPlan:
+        """
+        Get the read plan for the member that determines the subtype
+        of the next substruct.
+        """
+        if self.subtype_plan is None:
+            self.subtype_plan = compile_read_plan([self.var_type.subtype_definition])
+
+        return self.subtype_plan
+
+    def get_record_layout(self, game_version: GameVersion) -> typing.Union[RecordLayout, None]:
+        """
+        Get the record layout if the substructs have a fixed size and
+        can be read into a structured array.
+        """
+        if self.record_layout is _UNSET:
+            self.record_layout = None
+
+            var_type = self.var_type
+            if isinstance(var_type, SubdataMember) and not var_type.offset_to:
+                new_data_class = var_type.class_lookup[None]
+                _, dynamic = self.get_child_plan(new_data_class, game_version)
+
+                if not dynamic:
+                    # check the full plan, the child plan may skip generating members
+                    steps = get_read_plan(new_data_class, game_version).steps
+                    if len(steps) == 1 and isinstance(steps[0], FusedPrimitiveStep):
+                        self.record_layout = RecordLayout(steps[0])
+
+        return self.record_layout
+
+    def read(
+        self,
+        obj: GenieStructure,
+        raw: bytes,
+        offset: int,
+        game_version: GameVersion,
+        target_class: type,
+        generated_value_members: list[ValueMember]
+    ) -> tuple[int, bool]:
+        var_type = self.var_type
+        var_name = self.var_name
+        export = self.export
+
+        # arguments passed to the next-level constructor.
+        varargs = dict()
+
+        if var_type.passed_args:
+            if isinstance(var_type.passed_args, str):
+                var_type.passed_args = set(var_type.passed_args)
+            for passed_member_name in var_type.passed_args:
+                varargs[passed_member_name] = getattr(obj, passed_member_name)
+
+        list_len = var_type.get_length(obj)
+
+        record_layout = self.get_record_layout(game_version)
+        if record_layout is not None:
+            if export != READ_GEN:
+                # the records are discarded, so they are not decoded
+                return record_layout.skip(raw, offset, max(list_len, 0)), False
+
+            # fixed-size substructs are read in one go
+            records, offset = record_layout.read(raw, offset, max(list_len, 0))
+            setattr(obj, var_name, records)
+
+            generated_value_members.append(RecordArrayMember(var_name, records,
+                                                             record_layout))
+
+            return offset, False
+
+        # prepare result storage lists
+        single_type_subdata = isinstance(var_type, SubdataMember)
+        new_data_class = None
+        child_plan = None
+        dynamic = False
+        if single_type_subdata:
+            subdata = list()
+            new_data_class = var_type.class_lookup[None]
+            child_plan, dynamic = self.get_child_plan(new_data_class, game_version)
+
+        else:
+            subdata = {key: [] for key in var_type.class_lookup}
+
+        setattr(obj, var_name, subdata)
+
+        # List for storing the ValueMember instance of each subdata structure
+        subdata_value_members = []
+
+        # check if entries need offset checking
+        offset_lookup = None
+        offset_check = None
+        if var_type.offset_to:
+            offset_lookup = getattr(obj, var_type.offset_to[0])
+            offset_check = var_type.offset_to[1]
+
+        for i in range(list_len):
+            # if datfile offset == 0, entry has to be skipped.
+            if offset_lookup and not offset_check(offset_lookup[i]):
+                continue
+
+            gen_members = []
+
+            if not single_type_subdata:
+                # to determine the subtype class, read the binary
+                # definition of the subtype member first
+                gen_members = []
+                offset = self.get_subtype_plan().read(obj, raw, offset, game_version,
+                                                      target_class, gen_members)
+
+                subtype_name = getattr(obj, var_type.subtype_definition[1])
+                new_data_class = var_type.class_lookup[subtype_name]
+                child_plan, dynamic = self.get_child_plan(new_data_class, game_version)
+
+            # create instance of submember class and read the subdata
+            new_data = new_data_class(**varargs)
+
+            if dynamic:
+                # walk over the substruct and remember where it starts,
+                # its members are decoded on access
+                start_offset = offset
+                offset = child_plan.read(new_data, raw, offset, game_version,
+                                         new_data_class, [])
+
+                submembers = DynamicLoader("", new_data_class, game_version, raw,
+                                           start_offset, varargs, gen_members)
+
+            else:
+                offset = child_plan.read(new_data, raw, offset, game_version,
+                                         new_data_class, gen_members)
+                submembers = gen_members
+
+            if single_type_subdata:
+                subdata.append(new_data)
+
+            else:
+                subdata[subtype_name].append(new_data)
+
+            if export == READ_GEN:
+                subdata_value_members.append(ContainerMember("", submembers))
+
+        if export == READ_GEN:
+            generated_value_members.append(ArrayMember(var_name,
+                                                       StorageType.CONTAINER_MEMBER,
+                                                       subdata_value_members))
+
+        return offset, False
+
+
+class GenericStep:
+    """
+    Reads a member with the generic reader functions of GenieStructure.
+    """
+
+    __slots__ = ('read_func', 'export', 'var_name', 'storage_type', 'var_type', 'can_stop')
+
+    def __init__(
+        self,
+        export: MemberAccess,
+        var_name: str,
+        storage_type: StorageType,
+        var_type: typing.Union[str, ReadMember]
+    ):
+        self.export = export
+        self.var_name = var_name
+        self.storage_type = storage_type
+        self.var_type = var_type
+
+        if isinstance(var_type, GroupMember):
+            self.read_func = self._read_group
+
+        elif isinstance(var_type, MultisubtypeMember):
+            self.read_func = self._read_multisubtype
+
+        else:
+            self.read_func = self._read_primitive
+
+        # only custom members can abort reading the struct
+        self.can_stop = isinstance(var_type, ContinueReadMember)
+
+    def read(
+        self,
+        obj: GenieStructure,
+        raw: bytes,
+        offset: int,
+        game_version: GameVersion,
+        target_class: type,
+        generated_value_members: list[ValueMember]
+    ) -> tuple[int, bool]:
+        return self.read_func(obj, raw, offset, game_version,
+                              target_class, generated_value_members)
+
+    def _read_group(self, obj, raw, offset, game_version, target_class, generated_value_members):
+        offset, gen_members = obj._read_group(
+            raw, offset, game_version, self.export,
+            self.var_name, self.storage_type, self.var_type
+        )
+        generated_value_members.extend(gen_members)
+
+        return offset, False
+
+    def _read_multisubtype(self, obj, raw, offset, game_version, target_class,
+                           generated_value_members):
+        offset, gen_members = obj._read_multisubtye(
+            raw, offset, game_version, self.export, self.var_name,
+            self.storage_type, self.var_type, target_class
+        )
+        generated_value_members.extend(gen_members)
+
+        return offset, False
+
+    def _read_primitive(self, obj, raw, offset, game_version, target_class,
+                        generated_value_members):
+        offset, gen_members, stop_reading_members = obj._read_primitive(
+            raw, offset, self.export, self.var_name,
+            self.storage_type, self.var_type
+        )
+        generated_value_members.extend(gen_members)
+
+        return offset, stop_reading_members
+
+
+class ReadPlan:
+    """
+    Precompiled sequence of read steps for one struct class and game version.
+    """
+
+    __slots__ = ('steps', 'remaining')
+
+    def __init__(self, steps: list, remaining: list[list[tuple[str, typing.Any]]]):
+        self.steps = tuple(steps)
+
+        # members that are replaced with empty values if the step
+        # with the same index aborts reading
+        self.remaining = tuple(remaining)
+
+    def read(
+        self,
+        obj: GenieStructure,
+        raw: bytes,
+        offset: int,
+        game_version: GameVersion,
+        target_class: type,
+        generated_value_members: list[ValueMember]
+    ) -> int:
+        """
+        Read the struct members from raw at the given offset and store them in obj.
+
+        :returns: Offset after the struct.
+        """
+        for step, remaining in zip(self.steps, self.remaining):
+            offset, stop_reading_members = step.read(obj, raw, offset, game_version,
+                                                     target_class, generated_value_members)
+
+            if stop_reading_members:
+                # break out of the current reading loop when members
+                # don't exist in source data file
+                for var_name, var_type in remaining:
+                    if isinstance(var_type, ReadMember):
+                        replacement_value = var_type.get_empty_value()
+
+                    else:
+                        replacement_value = 0
+
+                    setattr(obj, var_name, replacement_value)
+
+                break
+
+        return offset
+
+
+def _get_fused_slot(
+    export: MemberAccess,
+    storage_type: StorageType,
+    var_type: typing.Union[str, ReadMember]
+) -> typing.Union[tuple[str, tuple], None]:
+    """
+    Check if a member is a single fixed-size value that can be read
+    as part of a fused struct.
+
+    :returns: Struct format of the member and its slot definition or None
+              if the member must be read by another step. Skipped members
+              have no slot definition.
+    """
+    # avoid circular import
+    from .genie_structure import INTEGER_MATCH, STRUCT_TYPE_LOOKUP, VARARRAY_MATCH
+
+    if isinstance(var_type, str):
+        is_array = VARARRAY_MATCH.match(var_type)
+
+        if is_array:
+            if is_array.group(1) != "char" or not INTEGER_MATCH.match(is_array.group(2)):
+                return None
+
+            if storage_type not in ARRAY_MEMBER_TYPES and \
+                    storage_type is not StorageType.STRING_MEMBER:
+                return None
+
+            member_format = "%ds" % int(is_array.group(2))
+
+            if export == SKIP:
+                return "%dx" % struct.calcsize(member_format), None
+
+            if export == READ_GEN and storage_type is not StorageType.STRING_MEMBER:
+                return None
+
+            return member_format, (SLOT_STRING, StringMember, False)
+
+        if var_type not in STRUCT_TYPE_LOOKUP:
+            return None
+
+        symbol = STRUCT_TYPE_LOOKUP[var_type]
+
+        if export == SKIP:
+            return "%dx" % struct.calcsize(symbol), None
+
+        member_cls = SCALAR_MEMBER_TYPES.get(storage_type, None)
+        if export == READ_GEN and member_cls is None:
+            return None
+
+        return symbol, (SLOT_SCALAR, member_cls, symbol == "f")
+
+    if isinstance(var_type, (GroupMember, MultisubtypeMember, ContinueReadMember)):
+        return None
+
+    if not isinstance(var_type, ReadMember) or var_type.raw_type not in STRUCT_TYPE_LOOKUP:
+        return None
+
+    if isinstance(var_type, DynLengthMember) and var_type.is_dynamic_length():
+        return None
+
+    if var_type.get_length() != 1:
+        return None
+
+    symbol = STRUCT_TYPE_LOOKUP[var_type.raw_type]
+    if symbol == "s":
+        return None
+
+    if export == SKIP:
+        return "%dx" % struct.calcsize(symbol), None
+
+    member_cls = None
+    if export == READ_GEN:
+        if not isinstance(var_type, EnumLookupMember):
+            return None
+
+        member_cls = ENUM_MEMBER_TYPES.get(storage_type, None)
+        if member_cls is None:
+            return None
+
+    return symbol, (SLOT_ENUM, member_cls, symbol == "f")
+
+
+def _get_array_step(
+    export: MemberAccess,
+    var_name: str,
+    storage_type: StorageType,
+    var_type: typing.Union[str, ReadMember]
+) -> typing.Union[ArrayStep, None]:
+    """
+    Create a step for reading a primitive number array.
+
+    :returns: Array step or None if the member is not a valid number array.
+    """
+    # avoid circular import
+    from .genie_structure import INTEGER_MATCH, STRUCT_TYPE_LOOKUP, VARARRAY_MATCH
+
+    if not isinstance(var_type, str) or storage_type not in ARRAY_MEMBER_TYPES:
+        return None
+
+    is_array = VARARRAY_MATCH.match(var_type)
+    if not is_array:
+        return None
+
+    struct_type = is_array.group(1)
+    if struct_type == "char" or struct_type not in STRUCT_TYPE_LOOKUP:
+        return None
+
+    length = is_array.group(2)
+    if INTEGER_MATCH.match(length):
+        length = int(length)
+
+    return ArrayStep(export, var_name, storage_type, var_type,
+                     length, STRUCT_TYPE_LOOKUP[struct_type])
+
+
+def _can_stop_reading(target_class: type[GenieStructure], game_version: GameVersion) -> bool:
+    """
+    Check if reading a struct class can be aborted by one of its members.
+    """
+    for _, _, _, _, var_type in target_class.get_data_format(game_version,
+                                                             flatten_includes=True):
+        if isinstance(var_type, ContinueReadMember):
+            return True
+
+    return False
+
+
+def _get_plan_members(
+    target_class: type[GenieStructure],
+    game_version: GameVersion,
+    generate: bool
+) -> typing.Generator[tuple[MemberAccess, str, StorageType, typing.Union[str, ReadMember]]]:
+    """
+    Get the members that are read by the plan of a struct class.
+
+    Included members are inlined, so that they can be fused with
+    the surrounding members, unless the included struct can abort reading.
+
+    :param generate: Whether the members generate value members.
+    """
+    for _, export, var_name, storage_type, var_type in \
+            target_class.get_data_format(game_version, flatten_includes=False):
+        if isinstance(var_type, IncludeMembers) and \
+                not _can_stop_reading(var_type.cls, game_version):
+            yield from _get_plan_members(var_type.cls, game_version,
+                                         generate and export == READ_GEN)
+            continue
+
+        if export == READ_GEN and not generate:
+            # Do not create members if dynamic loading is active
+            export = READ
+
+        yield export, var_name, storage_type, var_type
+
+
+@cache
+def get_read_plan(
+    target_class: type[GenieStructure],
+    game_version: GameVersion,
+    dynamic_load: bool = False,
+    lazy: bool = False
+) -> ReadPlan:
+    """
+    Compile the read plan for a struct class.
+
+    :param target_class: Struct class whose data format is read.
+    :param game_version: Game version the data format is created for.
+    :param dynamic_load: Whether members of the struct are loaded dynamically
+                         and therefore not generated.
+    :param lazy: Whether substructs of classes that support dynamic loading
+                 are stored as DynamicLoader views instead of being generated.
+    """
+    members = list(_get_plan_members(target_class, game_version, not dynamic_load))
+
+    return compile_read_plan(members, lazy)
+
+
+def compile_read_plan(
+    members: list[tuple[MemberAccess, str, StorageType, typing.Union[str, ReadMember]]],
+    lazy: bool = False
+) -> ReadPlan:
+    """
+    Compile the read plan for a list of member definitions.
+
+    :param members: Member definitions (export, var_name, storage_type, var_type).
+    :param lazy: Whether substructs of classes that support dynamic loading
+                 are stored as DynamicLoader views instead of being generated.
+    """
+    steps = []
+    remaining = []
+
+    # format and slots of the fused step that is currently built
+    fused_format = []
+    fused_slots = []
+
+    def finish_fused_step():
+        if fused_format:
+            steps.append(FusedPrimitiveStep("<" + "".join(fused_format), fused_slots.copy()))
+            remaining.append(())
+
+        fused_format.clear()
+        fused_slots.clear()
+
+    for idx, (export, var_name, storage_type, var_type) in enumerate(members):
+        fused = _get_fused_slot(export, storage_type, var_type)
+
+        if fused:
+            member_format, slot = fused
+            rel_offset = struct.calcsize("<" + "".join(fused_format))
+            fused_format.append(member_format)
+
+            if slot:
+                kind, member_cls, is_float = slot
+                fused_slots.append((kind, export, var_name, rel_offset,
+                                    member_cls, var_type, is_float))
+
+            continue
+
+        finish_fused_step()
+
+        step = _get_array_step(export, var_name, storage_type, var_type)
+
+        if step is None and isinstance(var_type, MultisubtypeMember) and \
+                (export != READ_GEN or storage_type is StorageType.ARRAY_CONTAINER):
+            step = SubdataStep(export, var_name, storage_type, var_type, lazy)
+
+        if step is None:
+            step = GenericStep(export, var_name, storage_type, var_type)
+
+        steps.append(step)
+
+        if step.can_stop:
+            remaining.append(tuple((member[1], member[3]) for member in members[idx + 1:]))
+
+        else:
+            remaining.append(())
+
+    finish_fused_step()
+
+    return ReadPlan(steps, remaining)
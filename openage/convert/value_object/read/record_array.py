@@ -0,0 +1,248 @@
+# Copyright 2026-2026 the openage authors. See copying.md for legal info.
+
+# TODO pylint: disable=C,R
+
+"""
+Decoding of fixed-size struct arrays into NumPy structured arrays.
+
+Many arrays in the .dat file (graphic deltas, unit commands, effects,
+resource costs, map tables, ...) consist of records with the same fixed
+layout. Instead of reading every record into a GenieStructure and a
+ContainerMember, such arrays are decoded in one go with numpy.frombuffer.
+The ValueMembers of a record are only created when the record is accessed.
+"""
+
+from __future__ import annotations
+import typing
+
+from collections.abc import Sequence
+import re
+
+import numpy
+
+from ....util.strings import decode_until_null
+from .value_members import ArrayMember, ContainerMember, NoDiffMember, StorageType
+
+if typing.TYPE_CHECKING:
+    from openage.convert.value_object.read.read_plan import FusedPrimitiveStep
+    from openage.convert.value_object.read.value_members import ValueMember
+
+
+# struct format symbols -> numpy type
+NUMPY_TYPE_LOOKUP = {
+    "b": "i1",
+    "B": "u1",
+    "h": "<i2",
+    "H": "<u2",
+    "i": "<i4",
+    "I": "<u4",
+    "l": "<i4",
+    "L": "<u4",
+    "q": "<i8",
+    "Q": "<u8",
+    "f": "<f4",
+    "d": "<f8",
+}
+
+# matches one member of a fused struct format
+FORMAT_MATCH = re.compile(r"(\d*)([a-zA-Z?])")
+
+# transformations of record values into member values
+TRANSFORM_NONE = 0
+TRANSFORM_STRING = 1
+TRANSFORM_ENUM = 2
+
+
+class RecordLayout:
+    """
+    NumPy dtype and member definitions for the records of a struct
+    that is read by a single fused primitive step.
+    """
+
+    __slots__ = ('dtype', 'float_fields', 'enum_fields', 'members')
+
+    def __init__(self, step: FusedPrimitiveStep):
+        names = []
+        formats = []
+        offsets = []
+
+        rel_offset = 0
+        for count, symbol in FORMAT_MATCH.findall(step.struct.format.lstrip("<")):
+            count = int(count) if count else 1
+
+            if symbol == "x":
+                rel_offset += count
+                continue
+
+            if symbol == "s":
+                formats.append(f"S{count}")
+
+            else:
+                formats.append(NUMPY_TYPE_LOOKUP[symbol])
+
+            names.append(f"f{len(names)}")
+            offsets.append(rel_offset)
+            rel_offset += numpy.dtype(formats[-1]).itemsize
+
+        self.dtype = numpy.dtype({
+            "names": names,
+            "formats": formats,
+            "offsets": offsets,
+            "itemsize": step.struct.size,
+        })
+
+        self.float_fields = tuple((names[idx], rel_offset, step.names[idx])
+                                  for idx, rel_offset in step.float_slots)
+
+        self.enum_fields = tuple((names[idx], rel_offset, step.names[idx], var_type)
+                                 for idx, rel_offset, var_type in step.enum_slots)
+
+        # (value index, member name, member class, transform, lookup) of generated members
+        enum_types = {idx: var_type for idx, _, var_type in step.enum_slots}
+        members = []
+        for idx, var_name, member_cls, source in step.gen_slots:
+            transform = TRANSFORM_NONE
+            lookup = None
+
+            if source:
+                if idx in enum_types:
+                    transform = TRANSFORM_ENUM
+                    lookup = enum_types[idx].lookup_dict
+
+                elif idx in step.string_slots:
+                    transform = TRANSFORM_STRING
+
+            members.append((idx, var_name, member_cls, transform, lookup))
+
+        self.members = tuple(members)
+
+    def read(self, raw: bytes, offset: int, count: int) -> tuple[numpy.ndarray, int]:
+        """
+        Read count records from raw at the given offset.
+
+        :returns: The records and the offset after the last record.
+        """
+        end_offset = offset + count * self.dtype.itemsize
+        if end_offset > len(raw):
+            raise SyntaxError("%d records of size %d at offset %# 08x exceed "
+                              "the data length" % (count, self.dtype.itemsize, offset))
+
+        records = numpy.frombuffer(raw, dtype=self.dtype, count=count, offset=offset)
+
+        for field, rel_offset, var_name in self.float_fields:
+            invalid = numpy.flatnonzero(~numpy.isfinite(records[field]))
+            if len(invalid) > 0:
+                raise SyntaxError("invalid float when "
+                                  "reading %s at offset %# 08x" % (
+                                      var_name,
+                                      offset + invalid[0] * self.dtype.itemsize + rel_offset))
+
+        for field, rel_offset, var_name, var_type in self.enum_fields:
+            for value in numpy.unique(records[field]).tolist():
+                if not var_type.verify_read_data(None, (value,)):
+                    idx = numpy.flatnonzero(records[field] == value)[0]
+                    raise SyntaxError("invalid data when reading %s "
+                                      "at offset %# 08x" % (
+                                          var_name,
+                                          offset + idx * self.dtype.itemsize + rel_offset))
+
+                # raises an error for values that are not in the lookup dict
+                var_type.entry_hook(value)
+
+        # copy the records, so that raw can be freed
+        return records.copy(), end_offset
+
+    def skip(self, raw: bytes, offset: int, count: int) -> int:
+        """
+        Skip over count records in raw at the given offset.
+
+        :returns: The offset after the last record.
+        """
+        end_offset = offset + count * self.dtype.itemsize
+        if end_offset > len(raw):
+            raise SyntaxError("%d records of size %d at offset %# 08x exceed "
+                              "the data length" % (count, self.dtype.itemsize, offset))
+
+        return end_offset
+
+    def create_container(self, record: tuple) -> ContainerMember:
+        """
+        Create the ContainerMember for the values of a record.
+        """
+        members = []
+        for idx, var_name, member_cls, transform, lookup in self.members:
+            value = record[idx]
+
+            if transform == TRANSFORM_STRING:
+                value = decode_until_null(value)
+
+            elif transform == TRANSFORM_ENUM:
+                value = lookup[value]
+
+            members.append(member_cls(var_name, value))
+
+        return ContainerMember("", members)
+
+
+class RecordList(Sequence):
+    """
+    Read-only list of ContainerMembers that are created from
+    the records of a structured array on access.
+    """
+
+    __slots__ = ('records', 'layout')
+
+    def __init__(self, records: numpy.ndarray, layout: RecordLayout):
+        self.records = records
+        self.layout = layout
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self.layout.create_container(record)
+                    for record in self.records[key].tolist()]
+
+        return self.layout.create_container(self.records[key].item())
+
+    def __iter__(self) -> typing.Iterator[ContainerMember]:
+        create_container = self.layout.create_container
+        for record in self.records.tolist():
+            yield create_container(record)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __repr__(self) -> str:
+        return f"RecordList<{len(self.records)} records>"
+
+
+class RecordArrayMember(ArrayMember):
+    """
+    ArrayMember of ContainerMembers that stores the values of
+    its containers in a NumPy structured array.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, name: str, records: numpy.ndarray, layout: RecordLayout):
+        super().__init__(name, StorageType.CONTAINER_MEMBER, [])
+
+        self._value: Sequence[ValueMember] = RecordList(records, layout)
+
+    @property
+    def records(self) -> numpy.ndarray:
+        """
+        Returns the structured array with the record values.
+        """
+        return self._value.records
+
+    def diff(
+        self,
+        other: ArrayMember
+    ) -> typing.Union[NoDiffMember, ArrayMember]:
+        if isinstance(other, RecordArrayMember):
+            if (self._value.layout is other.value.layout
+                    and self._value.records.tobytes() == other.records.tobytes()):
+                # compare the records without creating containers
+                return NoDiffMember(self.name, self)
+
+        return super().diff(other)
@@ -0,0 +1,226 @@
+# Copyright 2026-2026 the openage authors. See copying.md for legal info.
+
+"""
+Tests for reading .dat file structs into value members.
+
+The structs are read from synthetic .dat files, which contain
+every struct of the data format of a game version.
+"""
+from __future__ import annotations
+import typing
+
+from array import array
+from contextlib import contextmanager
+import zlib
+
+from ....testing.convert_benchmark.synthetic import create_dat, create_game_version
+from ....testing.testing import assert_value
+from ...entity_object.conversion.converter_object import ConverterObject
+from . import genie_structure
+from .media.datfile.empiresdat import EmpiresDatWrapper
+from .member_access import READ, READ_GEN, READ_UNKNOWN, SKIP
+from .record_array import TRANSFORM_NONE, RecordArrayMember
+from .value_members import ArrayMember, ContainerMember, IntMember, NoDiffMember, \
+    StorageType, TypedArrayMember
+
+if typing.TYPE_CHECKING:
+    from openage.convert.value_object.init.game_version import GameVersion
+    from openage.convert.value_object.read.value_members import ValueMember
+
+
+# games whose data formats are tested
+TEST_GAME_IDS = ("ROR", "AOC", "SWGB", "AOE2DE")
+
+
+class _MemberReader:  # pylint: disable=too-few-public-methods
+    """
+    Stand-in for a read plan that reads the members of a struct one by one
+    with the generic reader functions of GenieStructure.
+    """
+
+    def __init__(self, members: tuple):
+        self.members = members
+
+    def read(self, obj, raw, offset, game_version, target_class, generated_value_members):
+        """
+        Read the members like ReadPlan.read().
+        """
+        # pylint: disable=protected-access,too-many-arguments
+        return obj._read_members(raw, offset, game_version, target_class,
+                                 self.members, generated_value_members)
+
+
+def _get_member_reader(target_class, game_version, dynamic_load=False, lazy=False):
+    """
+    Replacement for get_read_plan() that doesn't compile plans.
+    """
+    # pylint: disable=unused-argument
+    return _MemberReader(tuple(target_class.get_data_format(
+        game_version,
+        allowed_modes=(True, READ, READ_GEN, READ_UNKNOWN, SKIP),
+        flatten_includes=False
+    )))
+
+
+@contextmanager
+def generic_member_reading():
+    """
+    Read all structs without read plans while the context is active.
+    """
+    get_read_plan = genie_structure.get_read_plan
+    genie_structure.get_read_plan = _get_member_reader
+
+    try:
+        yield
+
+    finally:
+        genie_structure.get_read_plan = get_read_plan
+
+
+def dump_member(member: ValueMember) -> tuple:
+    """
+    Convert a member and its submembers into comparable tuples.
+
+    Arrays are compared by their members, regardless of how they store them.
+    """
+    if isinstance(member, ContainerMember):
+        return (member.get_type(), member.name,
+                [(key, dump_member(submember)) for key, submember in member.value.items()])
+
+    if isinstance(member, ArrayMember):
+        return (member.get_type(), member.name,
+                [dump_member(submember) for submember in member.value])
+
+    return (member.get_type(), member.name, member.value)
+
+
+def read_dat(game_version: GameVersion, seed: int = 0) -> tuple[bytes, int, list[ValueMember]]:
+    """
+    Read a synthetic .dat file.
+
+    :returns: The decompressed data, the offset after the data and the read members.
+    """
+    raw = zlib.decompress(create_dat(game_version, seed=seed), -15)
+    offset, members = EmpiresDatWrapper().read(raw, 0, game_version)
+
+    return raw, offset, members
+
+
+def read_plan():
+    """
+    Read plans create the same members as reading the members one by one.
+    """
+    for seed, game_id in enumerate(TEST_GAME_IDS):
+        game_version = create_game_version(game_id)
+        raw, offset, members = read_dat(game_version, seed)
+
+        with generic_member_reading():
+            generic_offset, generic_members = EmpiresDatWrapper().read(raw, 0, game_version)
+
+        assert_value(offset, len(raw))
+        assert_value(offset, generic_offset)
+        assert_value([dump_member(member) for member in members],
+                     [dump_member(member) for member in generic_members])
+
+
+def find_members(member: ValueMember, member_type: type) -> typing.Iterator[ValueMember]:
+    """
+    Find all members of a type in a member and its submembers.
+    """
+    if isinstance(member, member_type):
+        yield member
+
+    if isinstance(member, ContainerMember):
+        for submember in member.value.values():
+            yield from find_members(submember, member_type)
+
+    elif isinstance(member, ArrayMember) and member.get_type() is StorageType.ARRAY_CONTAINER:
+        for submember in member.value:
+            yield from find_members(submember, member_type)
+
+
+def record_array():
+    """
+    Record arrays behave like arrays that store their containers in a list.
+    """
+    _, _, members = read_dat(create_game_version("AOC"))
+
+    record_arrays = [member for member in find_members(members[0], RecordArrayMember)
+                     if len(member) > 2]
+    assert_value(len(record_arrays) > 0, True)
+
+    for member in record_arrays[:100]:
+        plain = ArrayMember(member.name, StorageType.CONTAINER_MEMBER, list(member.value))
+
+        assert_value(member.get_type(), StorageType.ARRAY_CONTAINER)
+        assert_value(len(member), len(plain))
+        assert_value(dump_member(member[0]), dump_member(plain[0]))
+        assert_value(dump_member(member[-1]), dump_member(plain[-1]))
+        assert_value([dump_member(container) for container in member.value[1:3]],
+                     [dump_member(container) for container in plain.value[1:3]])
+        assert_value([dump_member(container) for container in member.value[::-1]],
+                     [dump_member(container) for container in plain.value[::-1]])
+        assert_value(dump_member(member), dump_member(plain))
+
+        # arrays with the same records have no diff
+        layout = member.value.layout
+        records = member.records.copy()
+        assert_value(type(member.diff(RecordArrayMember(member.name, records, layout))),
+                     NoDiffMember)
+        assert_value(type(member.diff(plain)), NoDiffMember)
+
+    # changing one value of a record changes exactly one member
+    member = record_arrays[0]
+    layout = member.value.layout
+    idx, var_name = next((idx, var_name) for idx, var_name, _, transform, _ in layout.members
+                         if transform == TRANSFORM_NONE)
+    field = layout.dtype.names[idx]
+
+    records = member.records.copy()
+    records[field][1] = 1 if records[field][1] == 0 else 0
+    changed = RecordArrayMember(member.name, records, layout)
+
+    array_diff = member.diff(changed)
+    assert_value(list(array_diff.value.changes), [1])
+    assert_value(list(array_diff[1].value.changes), [var_name])
+    assert_value(array_diff[1][var_name].value, records[field][1].item())
+    assert_value(type(array_diff[0]), NoDiffMember)
+
+
+def member_diff():
+    """
+    Diffs find changed values, even if the values have the same hash.
+    """
+    # hash(-1) == hash(-2), int diffs store the difference of the values
+    container = ContainerMember("container", [IntMember("value", -1)])
+    other_container = ContainerMember("container", [IntMember("value", -2)])
+    container_diff = container.diff(other_container)
+    assert_value(container_diff["value"].value, -1)
+
+    array_members = [ContainerMember("", [IntMember("value", -1)])]
+    other_array_members = [ContainerMember("", [IntMember("value", -2)])]
+    array_diff = ArrayMember("array", StorageType.CONTAINER_MEMBER, array_members).diff(
+        ArrayMember("array", StorageType.CONTAINER_MEMBER, other_array_members)
+    )
+    assert_value(array_diff[0]["value"].value, -1)
+
+    typed_array = TypedArrayMember("values", StorageType.INT_MEMBER, array("i", [0, -1]))
+    other_typed_array = TypedArrayMember("values", StorageType.INT_MEMBER, array("i", [0, -2]))
+    typed_array_diff = typed_array.diff(other_typed_array)
+    assert_value(type(typed_array_diff[0]), NoDiffMember)
+    assert_value(typed_array_diff[1].value, -1)
+
+    equal_typed_array = TypedArrayMember("values", StorageType.INT_MEMBER, array("i", [0, -1]))
+    assert_value(type(typed_array.diff(equal_typed_array)), NoDiffMember)
+
+    # diffs of converter objects show changes made after the last diff
+    obj = ConverterObject(0, {"container": container})
+    equal_container = ContainerMember("container", [IntMember("value", -1)])
+    other_obj = ConverterObject(1, {"container": equal_container})
+    assert_value(len(obj.short_diff(other_obj).members), 0)
+
+    other_obj.add_member(other_container)
+    assert_value(obj.diff(other_obj)["container"]["value"].value, -1)
+
+    other_obj.add_member(container)
+    assert_value(type(obj.diff(other_obj)["container"]), NoDiffMember)
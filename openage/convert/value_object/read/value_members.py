@@ -1,5 +1,5 @@
-# Copyright 2019-2023 the openage authors. See copying.md for legal info.
-# TODO pylint: disable=C,R,abstract-method
+# Copyright 2019-2026 the openage authors. See copying.md for legal info.
+# TODO pylint: disable=C,R,abstract-method,too-many-lines
 
 """
 Storage format for values from data file entries.
@@ -25,12 +25,12 @@ from __future__ import annotations
 import typing
 
 
+from array import array
+from collections.abc import Mapping, MutableMapping, Sequence
 from enum import Enum
 from math import isclose
 from abc import ABC, abstractmethod
 
-from .dynamic_loader import DynamicLoader
-
 
 class ValueMember(ABC):
     """
@@ -81,6 +81,8 @@ class IntMember(ValueMember):
     Stores numeric integer values.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: typing.Union[int, float]):
         super().__init__(name)
 
@@ -113,6 +115,8 @@ class FloatMember(ValueMember):
     Stores numeric floating point values.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: typing.Union[int, float]):
         super().__init__(name)
 
@@ -145,6 +149,8 @@ class BooleanMember(ValueMember):
     Stores boolean values.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: bool):
         super().__init__(name)
 
@@ -174,6 +180,8 @@ class IDMember(ValueMember):
     Stores references to media/resource IDs.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: int):
         super().__init__(name)
 
@@ -203,6 +211,8 @@ class BitfieldMember(ValueMember):
     Stores bit field members.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: int):
         super().__init__(name)
 
@@ -249,6 +259,8 @@ class StringMember(ValueMember):
     Stores string values.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: StringMember):
         super().__init__(name)
 
@@ -284,6 +296,8 @@ class ContainerMember(ValueMember):
     are the value of the dict.
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         name: str,
@@ -304,8 +318,8 @@ class ContainerMember(ValueMember):
 
         self._value = {}
 
-        if isinstance(submembers, (dict, DynamicLoader)):
-            # submembers is a list or loads dynamically
+        if isinstance(submembers, Mapping):
+            # submembers is a dict or loads dynamically
             self._value = submembers
 
         else:
@@ -319,31 +333,37 @@ class ContainerMember(ValueMember):
         self,
         other: ContainerMember
     ) -> typing.Union[NoDiffMember, ContainerMember]:
+        """
+        The diff only stores the members that are different. Unchanged
+        members are returned as NoDiffMembers on access.
+        """
         if self.get_type() is other.get_type():
-            diff_dict = {}
+            if self is other:
+                return NoDiffMember(self.name, self)
 
+            own_dict = self.value
             other_dict = other.value
+            changes = {}
 
-            for key in self.value.keys():
-                if key in other.value.keys():
-                    diff_value = self.value[key].diff(other_dict[key])
+            for key, member in own_dict.items():
+                if key in other_dict:
+                    diff_value = diff_member(member, other_dict[key])
+                    if diff_value is not None:
+                        changes[key] = diff_value
 
                 else:
                     # Key is missing in other dict
-                    diff_value = RightMissingMember(key, self.value[key])
-
-                diff_dict.update({key: diff_value})
+                    changes[key] = RightMissingMember(key, member)
 
-            for key in other.value.keys():
-                if key not in self.value.keys():
+            for key in other_dict:
+                if key not in own_dict:
                     # Key is missing in this dict
-                    diff_value = LeftMissingMember(key, other_dict[key])
-                    diff_dict.update({key: diff_value})
+                    changes[key] = LeftMissingMember(key, other_dict[key])
 
-            if all(isinstance(member, NoDiffMember) for member in diff_dict.values()):
+            if not changes:
                 return NoDiffMember(self.name, self)
 
-            return ContainerMember(self.name, diff_dict)
+            return ContainerMember(self.name, DiffDict(own_dict, changes))
 
         else:
             raise TypeError(
@@ -359,9 +379,17 @@ class ContainerMember(ValueMember):
                                                           ContainerMember]]) -> None:
         """
         Creates the dict from the member list passed to __init__.
+
+        Containers with the same member names share their name lookup.
         """
-        for member in member_list:
-            self._value.update({member.name: member})
+        schema = get_container_schema(tuple(member.name for member in member_list))
+
+        if schema is None:
+            # member names are not unique
+            self._value = {member.name: member for member in member_list}
+
+        else:
+            self._value = MemberDict(schema, list(member_list))
 
     def __getitem__(self, key):
         """
@@ -378,7 +406,7 @@ class ArrayMember(ValueMember):
     Stores an ordered list of members with the same type.
     """
 
-    __slots__ = ('_allowed_member_type')
+    __slots__ = ('_allowed_member_type',)
 
     def __init__(
         self,
@@ -399,6 +427,10 @@ class ArrayMember(ValueMember):
 
         self._allowed_member_type = allowed_member_type
 
+        if isinstance(members, DiffList):
+            # members of diffs are not type checked
+            return
+
         # Check if members have correct type
         for member in members:
             if not isinstance(member, (NoDiffMember, LeftMissingMember, RightMissingMember)):
@@ -480,37 +512,37 @@ class ArrayMember(ValueMember):
         self,
         other: ArrayMember
     ) -> typing.Union[NoDiffMember, ArrayMember]:
+        """
+        The diff only stores the members that are different. Unchanged
+        members are returned as NoDiffMembers on access.
+        """
         if self.get_type() == other.get_type():
-            diff_list = []
-            other_list = other.value
+            if self is other:
+                return NoDiffMember(self.name, self)
 
-            index = 0
-            if len(self) <= len(other):
-                while index < len(self):
-                    diff_value = self.value[index].diff(other_list[index])
-                    diff_list.append(diff_value)
-                    index += 1
+            own_list = self.value
+            other_list = other.value
+            changes = {}
 
-                while index < len(other):
-                    diff_value = other_list[index]
-                    diff_list.append(LeftMissingMember(diff_value.name, diff_value))
-                    index += 1
+            for index in range(min(len(own_list), len(other_list))):
+                diff_value = diff_member(own_list[index], other_list[index])
+                if diff_value is not None:
+                    changes[index] = diff_value
 
-            else:
-                while index < len(other):
-                    diff_value = self.value[index].diff(other_list[index])
-                    diff_list.append(diff_value)
-                    index += 1
+            for index in range(len(own_list), len(other_list)):
+                member = other_list[index]
+                changes[index] = LeftMissingMember(member.name, member)
 
-                while index < len(self):
-                    diff_value = self.value[index]
-                    diff_list.append(RightMissingMember(diff_value.name, diff_value))
-                    index += 1
+            for index in range(len(other_list), len(own_list)):
+                member = own_list[index]
+                changes[index] = RightMissingMember(member.name, member)
 
-            if all(isinstance(member, NoDiffMember) for member in diff_list):
+            if not changes:
                 return NoDiffMember(self.name, self)
 
-            return ArrayMember(self.name, self._allowed_member_type, diff_list)
+            return ArrayMember(self.name, self._allowed_member_type,
+                               DiffList(own_list, changes,
+                                        max(len(own_list), len(other_list))))
 
         else:
             raise TypeError(
@@ -526,11 +558,167 @@ class ArrayMember(ValueMember):
         return len(self.value)
 
 
+class TypedArrayMember(ArrayMember):
+    """
+    ArrayMember of int, float or ID members that stores the
+    values of its members in a typed array.
+    """
+
+    __slots__ = ()
+
+    def __init__(
+        self,
+        name: str,
+        allowed_member_type: StorageType,
+        values: array
+    ):
+        """
+        :param values: Values of the members. All members have the same name
+                       as the array.
+        :type values: array.array
+        """
+        super().__init__(name, allowed_member_type, [])
+
+        self._value = MemberArray(name, TYPED_ARRAY_MEMBERS[allowed_member_type], values)
+
+    def diff(
+        self,
+        other: ArrayMember
+    ) -> typing.Union[NoDiffMember, ArrayMember]:
+        if isinstance(other, TypedArrayMember) and self.get_type() is other.get_type():
+            if self._value.values == other.value.values:
+                # compare the typed arrays without creating members
+                return NoDiffMember(self.name, self)
+
+        return super().diff(other)
+
+
+class MemberArray(Sequence):
+    """
+    Read-only list of primitive members that are created from
+    the values of a typed array on access.
+    """
+
+    __slots__ = ('name', 'member_cls', 'values')
+
+    def __init__(self, name: str, member_cls: type[ValueMember], values: array):
+        self.name = name
+        self.member_cls = member_cls
+        self.values = values
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self.member_cls(self.name, value) for value in self.values[key]]
+
+        return self.member_cls(self.name, self.values[key])
+
+    def __iter__(self) -> typing.Iterator[ValueMember]:
+        name = self.name
+        member_cls = self.member_cls
+        for value in self.values:
+            yield member_cls(name, value)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __repr__(self) -> str:
+        return f"MemberArray<{self.name}: {len(self.values)} values>"
+
+
+class ContainerSchema:
+    """
+    Member names of containers with the same layout. The schema
+    is shared by all containers that use it.
+    """
+
+    __slots__ = ('names', 'index')
+
+    def __init__(self, names: tuple[str, ...]):
+        self.names = names
+
+        # member name -> position in the member list
+        self.index = {name: idx for idx, name in enumerate(names)}
+
+    def __reduce__(self):
+        # unpickled containers share the schema of the current process
+        return (get_container_schema, (self.names,))
+
+
+# member names -> shared schema
+_CONTAINER_SCHEMAS: dict[tuple[str, ...], ContainerSchema] = {}
+
+
+def get_container_schema(names: tuple[str, ...]) -> typing.Union[ContainerSchema, None]:
+    """
+    Get the shared schema for containers with the given member names.
+
+    :returns: The schema or None if the names are not unique.
+    """
+    schema = _CONTAINER_SCHEMAS.get(names)
+    if schema is None:
+        if len(set(names)) != len(names):
+            return None
+
+        schema = ContainerSchema(names)
+        _CONTAINER_SCHEMAS[names] = schema
+
+    return schema
+
+
+class MemberDict(MutableMapping):
+    """
+    Member dict of a ContainerMember that stores its members in a list
+    and looks up member names in a shared schema.
+    """
+
+    __slots__ = ('schema', 'members')
+
+    def __init__(self, schema: ContainerSchema, members: list[ValueMember]):
+        self.schema = schema
+        self.members = members
+
+    def __getitem__(self, key) -> ValueMember:
+        return self.members[self.schema.index[key]]
+
+    def __setitem__(self, key, member: ValueMember) -> None:
+        idx = self.schema.index.get(key)
+        if idx is None:
+            self.schema = get_container_schema(self.schema.names + (key,))
+            self.members.append(member)
+
+        else:
+            self.members[idx] = member
+
+    def __delitem__(self, key) -> None:
+        idx = self.schema.index[key]
+        names = self.schema.names
+
+        self.schema = get_container_schema(names[:idx] + names[idx + 1:])
+        del self.members[idx]
+
+    def __contains__(self, key) -> bool:
+        return key in self.schema.index
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self.schema.names)
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def keys(self):
+        return self.schema.index.keys()
+
+    def __repr__(self) -> str:
+        return f"MemberDict({dict(zip(self.schema.names, self.members))!r})"
+
+
 class NoDiffMember(ValueMember):
     """
     Is returned when no difference between two members is found.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: ValueMember):
         """
         :param value: Reference to the one of the diffed members.
@@ -580,6 +768,8 @@ class LeftMissingMember(ValueMember):
     side member as value.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: ValueMember):
         """
         :param value: Reference to the right member's object.
@@ -629,6 +819,8 @@ class RightMissingMember(ValueMember):
     side member as value.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: ValueMember):
         """
         :param value: Reference to the left member's object.
@@ -671,6 +863,120 @@ class RightMissingMember(ValueMember):
             f"{type(self)} cannot be diffed")
 
 
+def diff_member(
+    member: ValueMember,
+    other: ValueMember
+) -> typing.Union[ValueMember, None]:
+    """
+    Diff two members and skip creating a NoDiffMember if they are equal.
+
+    :returns: The diff of the members or None if they are equal.
+    """
+    if member is other:
+        return None
+
+    if member.__class__ is other.__class__:
+        if not isinstance(member, (ContainerMember, ArrayMember)):
+            if member.value == other.value:
+                return None
+
+    diff_value = member.diff(other)
+    if isinstance(diff_value, NoDiffMember):
+        return None
+
+    return diff_value
+
+
+class DiffDict(Mapping):
+    """
+    Member dict of a container diff. Only the changed members are
+    stored, unchanged members are returned as NoDiffMembers.
+    """
+
+    __slots__ = ('ref', 'changes')
+
+    def __init__(
+        self,
+        ref: typing.Mapping[typing.Any, ValueMember],
+        changes: dict[typing.Any, ValueMember]
+    ):
+        """
+        :param ref: Members of the left side of the diff.
+        :param changes: Diffs of the members that are different.
+        """
+        self.ref = ref
+        self.changes = changes
+
+    def __getitem__(self, key) -> ValueMember:
+        if key in self.changes:
+            return self.changes[key]
+
+        member = self.ref[key]
+        return NoDiffMember(member.name, member)
+
+    def __contains__(self, key) -> bool:
+        return key in self.changes or key in self.ref
+
+    def __iter__(self) -> typing.Iterator:
+        yield from self.ref
+
+        for key in self.changes:
+            if key not in self.ref:
+                yield key
+
+    def __len__(self) -> int:
+        return len(self.ref) + sum(1 for key in self.changes if key not in self.ref)
+
+    def __repr__(self) -> str:
+        return f"DiffDict<{len(self.changes)} changed>"
+
+
+class DiffList(Sequence):
+    """
+    Member list of an array diff. Only the changed members are
+    stored, unchanged members are returned as NoDiffMembers.
+    """
+
+    __slots__ = ('ref', 'changes', 'length')
+
+    def __init__(
+        self,
+        ref: typing.Sequence[ValueMember],
+        changes: dict[int, ValueMember],
+        length: int
+    ):
+        """
+        :param ref: Members of the left side of the diff.
+        :param changes: Diffs of the members that are different by index.
+        :param length: Length of the longer side of the diff.
+        """
+        self.ref = ref
+        self.changes = changes
+        self.length = length
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self[index] for index in range(*key.indices(self.length))]
+
+        if key < 0:
+            key += self.length
+
+        if not 0 <= key < self.length:
+            raise IndexError("diff index out of range")
+
+        if key in self.changes:
+            return self.changes[key]
+
+        member = self.ref[key]
+        return NoDiffMember(member.name, member)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __repr__(self) -> str:
+        return f"DiffList<{len(self.changes)} of {self.length} changed>"
+
+
 class StorageType(Enum):
     """
     Types for values members.
@@ -692,3 +998,11 @@ class StorageType(Enum):
     ARRAY_BITFIELD   = "bitfieldarray"  # BitfieldMembers
     ARRAY_STRING     = "stringarray"    # StringMembers
     ARRAY_CONTAINER  = "contarray"      # ContainerMembers
+
+
+# allowed member types of typed arrays -> member class
+TYPED_ARRAY_MEMBERS = {
+    StorageType.INT_MEMBER: IntMember,
+    StorageType.FLOAT_MEMBER: FloatMember,
+    StorageType.ID_MEMBER: IDMember,
+}
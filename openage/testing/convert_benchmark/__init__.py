@@ -0,0 +1,5 @@
+# Copyright 2026-2026 the openage authors. See copying.md for legal info.
+
+"""
+Benchmarks for the converter stages with synthetic game data.
+"""
@@ -0,0 +1,240 @@
+# Copyright 2026-2026 the openage authors. See copying.md for legal info.
+
+"""
+Runs the converter stage benchmarks and compares them to a baseline.
+
+Create a baseline, change the converter and compare against it, e.g.
+
+    python3 -m openage test --demo \\
+        openage.testing.convert_benchmark.runner.benchmark_stages \\
+        --scale 4 --output baseline.json
+
+    python3 -m openage test --demo \\
+        openage.testing.convert_benchmark.runner.benchmark_stages \\
+        --scale 4 --compare baseline.json
+"""
+
+from __future__ import annotations
+import typing
+
+import argparse
+import atexit
+import json
+import platform
+import statistics
+import time
+
+from ...log import info, warn, err
+from .stages import STAGES
+from .synthetic import GAME_IDS
+
+if typing.TYPE_CHECKING:
+    from openage.testing.convert_benchmark.stages import BenchmarkStage
+
+
+# version of the baseline file format
+BASELINE_VERSION = 1
+
+# set up stages for the all_stages() benchmark, None for unavailable stages
+_STAGE_CACHE: dict[str, BenchmarkStage | None] = {}
+
+
+def measure_stage(stage: BenchmarkStage, repeat: int) -> dict[str, typing.Any]:
+    """
+    Run a stage several times and measure its execution time.
+
+    :param stage: Stage that is measured.
+    :param repeat: Number of measured runs.
+    """
+    stage.setup()
+
+    try:
+        times = []
+        for _ in range(repeat):
+            stage.prepare()
+
+            start = time.perf_counter()
+            items = stage.run()
+            times.append(time.perf_counter() - start)
+
+    finally:
+        stage.teardown()
+
+    return {
+        "times": times,
+        "min": min(times),
+        "median": statistics.median(times),
+        "items": items,
+        "unit": stage.unit,
+        "items_per_second": items / min(times) if min(times) > 0 else None,
+    }
+
+
+def run_stages(
+    stage_names: list[str],
+    scale: int,
+    repeat: int,
+    seed: int,
+    game_id: str
+) -> dict[str, typing.Any]:
+    """
+    Measure the given stages.
+
+    Stages that need modules which are not available
+    (e.g. Cython modules of a partial build) are skipped.
+
+    :returns: Results that can be stored as baseline.
+    """
+    results = {}
+    for stage_name in stage_names:
+        stage = STAGES[stage_name](scale, seed, game_id)
+
+        try:
+            results[stage_name] = measure_stage(stage, repeat)
+
+        except ImportError as exc:
+            warn("skipping stage %s: %s", stage_name, exc)
+            results[stage_name] = {"skipped": str(exc)}
+            continue
+
+        info("%s: %.4f s (median %.4f s), %d %s",
+             stage_name,
+             results[stage_name]["min"],
+             results[stage_name]["median"],
+             results[stage_name]["items"],
+             stage.unit)
+
+    return {
+        "version": BASELINE_VERSION,
+        "game": game_id,
+        "scale": scale,
+        "seed": seed,
+        "repeat": repeat,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "stages": results,
+    }
+
+
+def compare_results(
+    results: dict[str, typing.Any],
+    baseline: dict[str, typing.Any],
+    tolerance: float
+) -> list[str]:
+    """
+    Print the results next to the baseline results.
+
+    :param tolerance: Relative slowdown of the fastest run that is not a regression.
+    :returns: Names of the stages that regressed.
+    """
+    if baseline.get("version") != BASELINE_VERSION:
+        raise ValueError(f"unsupported baseline version: {baseline.get('version')}")
+
+    for key in ("game", "scale", "seed"):
+        if baseline[key] != results[key]:
+            warn("baseline was created with %s %s, results with %s %s; "
+                 "the times are not comparable",
+                 key, baseline[key], key, results[key])
+
+    row_format = "{:16} {:>12} {:>12} {:>9}  {}"
+    print(row_format.format("Stage", "Baseline", "Current", "Change", ""))
+
+    regressions = []
+    for stage_name, result in results["stages"].items():
+        base_result = baseline["stages"].get(stage_name)
+        if base_result is None or "skipped" in base_result or "skipped" in result:
+            print(row_format.format(stage_name, "-", "-", "-", "not compared"))
+            continue
+
+        change = result["min"] / base_result["min"] - 1
+        status = ""
+        if change > tolerance:
+            status = "REGRESSION"
+            regressions.append(stage_name)
+
+        elif change < -tolerance:
+            status = "improvement"
+
+        print(row_format.format(stage_name,
+                                f"{base_result['min']:.4f} s",
+                                f"{result['min']:.4f} s",
+                                f"{change:+.1%}",
+                                status))
+
+    return regressions
+
+
+def benchmark_stages(args) -> int:
+    """
+    Measures the converter stages with synthetic game data.
+    """
+    cli = argparse.ArgumentParser()
+    cli.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES),
+                     help="stages that are measured (default: all)")
+    cli.add_argument("--scale", type=int, default=1,
+                     help="size of the synthetic game data")
+    cli.add_argument("--repeat", type=int, default=5,
+                     help="number of measured runs per stage")
+    cli.add_argument("--seed", type=int, default=0,
+                     help="seed for the synthetic game data")
+    cli.add_argument("--game", choices=GAME_IDS, default="AOC",
+                     help="game edition the .dat file is created for")
+    cli.add_argument("--output", "-o", default=None, metavar="baseline.json",
+                     help="store the results in a JSON file")
+    cli.add_argument("--compare", "-c", default=None, metavar="baseline.json",
+                     help="compare the results to a stored baseline")
+    cli.add_argument("--tolerance", type=float, default=0.1,
+                     help="relative slowdown that is not reported as regression")
+    args = cli.parse_args(args)
+
+    if args.scale < 1 or args.repeat < 1:
+        err("scale and repeat must be positive")
+        return 1
+
+    results = run_stages(args.stages, args.scale, args.repeat, args.seed, args.game)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as outfile:
+            json.dump(results, outfile, indent=4)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as infile:
+            baseline = json.load(infile)
+
+        try:
+            regressions = compare_results(results, baseline, args.tolerance)
+
+        except ValueError as exc:
+            err("%s", exc)
+            return 1
+
+        if regressions:
+            err("regressions in stages: %s", ", ".join(regressions))
+            return 1
+
+    return 0
+
+
+def all_stages() -> None:
+    """
+    Run every converter stage once with synthetic game data.
+    """
+    for stage_name, stage_cls in STAGES.items():
+        if stage_name in _STAGE_CACHE and _STAGE_CACHE[stage_name] is None:
+            continue
+
+        try:
+            if stage_name not in _STAGE_CACHE:
+                stage = stage_cls()
+                atexit.register(stage.teardown)
+                stage.setup()
+
+                _STAGE_CACHE[stage_name] = stage
+
+            stage = _STAGE_CACHE[stage_name]
+            stage.prepare()
+            stage.run()
+
+        except ImportError as exc:
+            warn("skipping stage %s: %s", stage_name, exc)
+            _STAGE_CACHE[stage_name] = None
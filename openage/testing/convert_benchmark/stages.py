@@ -0,0 +1,517 @@
+# Copyright 2026-2026 the openage authors. See copying.md for legal info.
+#
+# pylint: disable=too-many-locals
+
+"""
+Benchmarks for the individual stages of the converter.
+
+Every stage creates its synthetic input data in setup(), which is not
+measured. Modules that are only available in a full build (Cython
+modules, PIL) are imported in the stage methods, so that the other
+stages can run without them.
+"""
+
+from __future__ import annotations
+import typing
+
+import io
+import os
+import random
+import shutil
+import tempfile
+
+from .synthetic import SLP_PALETTE_ID, SMX_PALETTE_ID, create_dat, create_drs, \
+    create_game_version, create_palette, create_sld, create_slp, create_smx, create_wav
+
+if typing.TYPE_CHECKING:
+    from openage.convert.entity_object.conversion.converter_object import ConverterObjectGroup
+    from openage.nyan.nyan_structs import NyanObject
+
+
+# size of the sprites and number of frames per sprite
+SPRITE_FRAMES = 10
+SPRITE_WIDTH = 64
+SPRITE_HEIGHT = 64
+
+# number of generated files per scale unit
+SPRITES_PER_SCALE = 4
+SOUNDS_PER_SCALE = 2
+GAME_ENTITIES_PER_SCALE = 100
+MODPACK_FILES_PER_SCALE = 50
+
+# size of the generated modpack files
+MODPACK_FILE_SIZE = 64 * 1024
+
+
+class BenchmarkStage:
+    """
+    Benchmark for one stage of the converter.
+    """
+
+    # name of the stage in the results
+    name: str = None
+
+    # what is counted by run()
+    unit: str = None
+
+    def __init__(self, scale: int = 1, seed: int = 0, game_id: str = "AOC"):
+        """
+        :param scale: Scales the size of the input data.
+        :param seed: Seed for the random input data.
+        :param game_id: Game edition the .dat file is created for.
+        """
+        self.scale = scale
+        self.seed = seed
+        self.game_version = create_game_version(game_id)
+
+    def setup(self) -> None:
+        """
+        Create the input data of the stage.
+        """
+
+    def prepare(self) -> None:
+        """
+        Reset the state before every run, e.g. if run() consumes its input.
+        """
+
+    def run(self) -> int:
+        """
+        Execute the stage once.
+
+        :returns: Number of processed items.
+        """
+        raise NotImplementedError
+
+    def teardown(self) -> None:
+        """
+        Remove the input data of the stage.
+        """
+
+    def __repr__(self):
+        return f"{type(self).__name__}<scale={self.scale}>"
+
+
+class DatReadStage(BenchmarkStage):
+    """
+    Decompress and read the .dat file.
+    """
+
+    name = "dat_read"
+    unit = "units"
+
+    def __init__(self, scale: int = 1, seed: int = 0, game_id: str = "AOC"):
+        super().__init__(scale, seed, game_id)
+
+        self.dat_data: bytes = None
+
+    def setup(self) -> None:
+        self.dat_data = create_dat(self.game_version, self.scale, self.seed)
+
+    def run(self) -> int:
+        from ...convert.service.read.gamedata import load_gamespec
+
+        gamespec = load_gamespec(io.BytesIO(self.dat_data), self.game_version)
+
+        return len(gamespec[0]["unit_headers"].value)
+
+
+class PreProcessorStage(DatReadStage):
+    """
+    Extract the Genie objects from the gamespec.
+    """
+
+    name = "pre_processor"
+    unit = "units"
+
+    def __init__(self, scale: int = 1, seed: int = 0, game_id: str = "AOC"):
+        super().__init__(scale, seed, game_id)
+
+        self.gamespec = None
+
+    def prepare(self) -> None:
+        from ...convert.service.read.gamedata import load_gamespec
+
+        self.gamespec = load_gamespec(io.BytesIO(self.dat_data), self.game_version)
+
+    def run(self) -> int:
+        # avoid circular import
+        from ...convert.tool.driver import get_converter
+
+        converter = get_converter(self.game_version)
+        dataset = converter._pre_processor(  # pylint: disable=protected-access
+            self.gamespec,
+            self.game_version,
+            None,
+            []
+        )
+
+        return len(dataset.genie_units)
+
+
+def create_game_entity_groups(
+    api_objects: dict[str, NyanObject],
+    count: int
+) -> list[ConverterObjectGroup]:
+    """
+    Create converter groups with a game entity and some abilities,
+    similar to the unit lines of the converter.
+
+    :param api_objects: Objects of the nyan API.
+    :param count: Number of groups.
+    """
+    # avoid circular import
+    from ...convert.entity_object.conversion.converter_object import ConverterObjectGroup, \
+        RawAPIObject
+    from ...convert.value_object.conversion.forward_ref import ForwardRef
+
+    groups = []
+    for idx in range(count):
+        group = ConverterObjectGroup(idx)
+
+        entity_name = f"Unit{idx}"
+        entity = RawAPIObject(entity_name, entity_name, api_objects,
+                              f"data/game_entity/generic/unit{idx}/")
+        entity.set_filename(f"unit{idx}")
+        entity.add_raw_parent("engine.util.game_entity.GameEntity")
+        group.add_raw_api_object(entity)
+
+        abilities = []
+        for ability_name, members in (
+            ("Idle", ()),
+            ("Turn", (("turn_speed", float(idx)),)),
+            ("Visibility", (("visible_in_fog", bool(idx % 2)),)),
+        ):
+            ability_ref = f"{entity_name}.{ability_name}"
+            api_ref = f"engine.ability.type.{ability_name}"
+
+            ability = RawAPIObject(ability_ref, ability_name, api_objects,
+                                   ForwardRef(group, entity_name))
+            ability.add_raw_parent(api_ref)
+            for member_name, value in members:
+                ability.add_raw_member(member_name, value, api_ref)
+
+            ability.add_raw_member("properties", {}, "engine.ability.Ability")
+
+            group.add_raw_api_object(ability)
+            abilities.append(ForwardRef(group, ability_ref))
+
+        entity.add_raw_member("types", [], "engine.util.game_entity.GameEntity")
+        entity.add_raw_member("abilities", abilities, "engine.util.game_entity.GameEntity")
+        entity.add_raw_member("modifiers", [], "engine.util.game_entity.GameEntity")
+        entity.add_raw_member("variants", [], "engine.util.game_entity.GameEntity")
+
+        groups.append(group)
+
+    return groups
+
+
+class NyanCreateStage(BenchmarkStage):
+    """
+    Create the nyan objects and members of game entities.
+    """
+
+    name = "nyan_create"
+    unit = "objects"
+
+    def __init__(self, scale: int = 1, seed: int = 0, game_id: str = "AOC"):
+        super().__init__(scale, seed, game_id)
+
+        self.api_objects: dict[str, NyanObject] = None
+        self.groups: list[ConverterObjectGroup] = None
+
+    def setup(self) -> None:
+        from ...convert.service.read.nyan_api_loader import load_api
+
+        self.api_objects = load_api()
+
+    def prepare(self) -> None:
+        self.groups = create_game_entity_groups(self.api_objects,
+                                                GAME_ENTITIES_PER_SCALE * self.scale)
+
+    def run(self) -> int:
+        for group in self.groups:
+            group.create_nyan_objects()
+
+        for group in self.groups:
+            group.create_nyan_members()
+
+        return sum(len(group.raw_api_objects) for group in self.groups)
+
+
+class NyanDumpStage(NyanCreateStage):
+    """
+    Dump the nyan files of game entities.
+    """
+
+    name = "nyan_dump"
+    unit = "files"
+
+    def __init__(self, scale: int = 1, seed: int = 0, game_id: str = "AOC"):
+        super().__init__(scale, seed, game_id)
+
+        self.nyan_files = None
+
+    def setup(self) -> None:
+        # avoid circular import
+        from ...convert.entity_object.export.formats.nyan_file import NyanFile
+        from ...convert.value_object.conversion.forward_ref import ForwardRef
+        from ...nyan.import_tree import ImportTree
+
+        super().setup()
+        super().prepare()
+        super().run()
+
+        # put the objects into files like the modpack subprocessor
+        self.nyan_files = []
+        for group in self.groups:
+            for raw_api_object in group.raw_api_objects.values():
+                location = raw_api_object.get_location()
+                if isinstance(location, ForwardRef):
+                    location.resolve().add_nested_object(raw_api_object.get_nyan_object())
+                    continue
+
+                nyan_file = NyanFile(location, raw_api_object.get_filename(), "benchmark")
+                nyan_file.add_nyan_object(raw_api_object.get_nyan_object())
+                self.nyan_files.append(nyan_file)
+
+        import_tree = ImportTree()
+        for nyan_file in self.nyan_files:
+            import_tree.expand_from_file(nyan_file)
+
+        for nyan_object in self.api_objects.values():
+            import_tree.expand_from_object(nyan_object)
+
+        for nyan_file in self.nyan_files:
+            nyan_file.set_import_tree(import_tree)
+
+    def prepare(self) -> None:
+        pass
+
+    def run(self) -> int:
+        for nyan_file in self.nyan_files:
+            nyan_file.dump()
+
+        return len(self.nyan_files)
+
+
+class SpriteDecodeStage(BenchmarkStage):
+    """
+    Decode SLP sprites from a DRS archive and SMX and SLD sprites.
+    """
+
+    name = "sprite_decode"
+    unit = "frames"
+
+    def __init__(self, scale: int = 1, seed: int = 0, game_id: str = "AOC"):
+        super().__init__(scale, seed, game_id)
+
+        self.palettes = None
+        self.drs_data: bytes = None
+        self.smx_files: list[bytes] = None
+        self.sld_files: list[bytes] = None
+
+    def setup(self) -> None:
+        palette = create_palette(self.seed)
+        self.palettes = {SLP_PALETTE_ID: palette, SMX_PALETTE_ID: palette}
+
+        sprite_count = SPRITES_PER_SCALE * self.scale
+        self.drs_data = create_drs([
+            (idx, "slp", create_slp(SPRITE_FRAMES, SPRITE_WIDTH, SPRITE_HEIGHT, self.seed + idx))
+            for idx in range(sprite_count)
+        ])
+        self.smx_files = [
+            create_smx(SPRITE_FRAMES, SPRITE_WIDTH, SPRITE_HEIGHT, self.seed + idx)
+            for idx in range(sprite_count)
+        ]
+        self.sld_files = [
+            create_sld(SPRITE_FRAMES, SPRITE_WIDTH, SPRITE_HEIGHT, self.seed + idx)
+            for idx in range(sprite_count)
+        ]
+
+    def decode_sprites(self) -> list:
+        """
+        Decode all sprites.
+
+        :returns: SLP, SMX and SLD objects.
+        """
+        from ...convert.value_object.read.media.drs import DRS
+        from ...convert.value_object.read.media.sld import SLD
+        from ...convert.value_object.read.media.slp import SLP
+        from ...convert.value_object.read.media.smx import SMX
+
+        sprites = []
+
+        drs = DRS(io.BytesIO(self.drs_data), self.game_version)
+        for slp_file in drs.root.list():
+            with drs.root[slp_file].open("rb") as infile:
+                sprites.append(SLP(infile.read()))
+
+        sprites.extend(SMX(smx_data) for smx_data in self.smx_files)
+        sprites.extend(SLD(sld_data) for sld_data in self.sld_files)
+
+        return sprites
+
+    def run(self) -> int:
+        from ...convert.value_object.read.media.sld import SLD
+
+        frame_count = 0
+        for sprite in self.decode_sprites():
+            if isinstance(sprite, SLD):
+                for frame in sprite.get_frames():
+                    frame.get_picture_data()
+                    frame_count += 1
+
+                continue
+
+            for frame in sprite.get_frames():
+                frame.get_picture_data(self.palettes[frame.get_palette_number()].array)
+                frame_count += 1
+
+        return frame_count
+
+
+class TextureMergeStage(SpriteDecodeStage):
+    """
+    Pack the frames of sprites into texture atlases.
+    """
+
+    name = "texture_merge"
+    unit = "textures"
+
+    def __init__(self, scale: int = 1, seed: int = 0, game_id: str = "AOC"):
+        super().__init__(scale, seed, game_id)
+
+        self.sprites = None
+        self.textures = None
+
+    def setup(self) -> None:
+        super().setup()
+
+        self.sprites = self.decode_sprites()
+
+    def prepare(self) -> None:
+        from ...convert.entity_object.export.texture import Texture
+
+        self.textures = [Texture(sprite, self.palettes) for sprite in self.sprites]
+
+    def run(self) -> int:
+        from ...convert.processor.export.texture_merge import merge_frames
+
+        for texture in self.textures:
+            merge_frames(texture)
+
+        return len(self.textures)
+
+
+class PNGEncodeStage(TextureMergeStage):
+    """
+    Encode texture atlases as PNG.
+    """
+
+    name = "png_encode"
+    unit = "textures"
+
+    def setup(self) -> None:
+        from ...convert.processor.export.texture_merge import merge_frames
+
+        super().setup()
+        super().prepare()
+
+        for texture in self.textures:
+            merge_frames(texture)
+
+    def prepare(self) -> None:
+        pass
+
+    def run(self) -> int:
+        from ...convert.service.export.png import png_create
+
+        for texture in self.textures:
+            png_create.save(texture.image_data.data,
+                            png_create.CompressionMethod.COMPR_DEFAULT)
+
+        return len(self.textures)
+
+
+class OpusEncodeStage(BenchmarkStage):
+    """
+    Encode WAV sounds as opus.
+    """
+
+    name = "opus_encode"
+    unit = "sounds"
+
+    def __init__(self, scale: int = 1, seed: int = 0, game_id: str = "AOC"):
+        super().__init__(scale, seed, game_id)
+
+        self.sounds: list[bytes] = None
+
+    def setup(self) -> None:
+        self.sounds = [create_wav(1.0, seed=self.seed + idx)
+                       for idx in range(SOUNDS_PER_SCALE * self.scale)]
+
+    def run(self) -> int:
+        from ...convert.service.export.opus.opusenc import encode
+
+        for sound in self.sounds:
+            encoded = encode(sound)
+            if isinstance(encoded, (str, int)):
+                raise RuntimeError(f"opusenc failed: {encoded}")
+
+        return len(self.sounds)
+
+
+class ManifestHashStage(BenchmarkStage):
+    """
+    Hash the files of a modpack for its manifest.
+    """
+
+    name = "manifest_hash"
+    unit = "files"
+
+    def __init__(self, scale: int = 1, seed: int = 0, game_id: str = "AOC"):
+        super().__init__(scale, seed, game_id)
+
+        self.tempdir: str = None
+
+    def setup(self) -> None:
+        rng = random.Random(self.seed)
+
+        self.tempdir = tempfile.mkdtemp(prefix="openage-benchmark-")
+        for idx in range(MODPACK_FILES_PER_SCALE * self.scale):
+            subdir = os.path.join(self.tempdir, "data", f"dir{idx % 10}")
+            os.makedirs(subdir, exist_ok=True)
+
+            with open(os.path.join(subdir, f"file{idx}.png"), "wb") as outfile:
+                outfile.write(rng.randbytes(MODPACK_FILE_SIZE))
+
+    def run(self) -> int:
+        from ...convert.entity_object.conversion.modpack import Modpack
+        from ...convert.processor.export.generate_manifest_hashes import generate_hashes
+        from ...util.fslike.directory import Directory
+
+        modpack = Modpack("benchmark")
+        generate_hashes(modpack, Directory(self.tempdir).root)
+
+        return len(modpack.manifest.hash_values)
+
+    def teardown(self) -> None:
+        if self.tempdir:
+            shutil.rmtree(self.tempdir)
+            self.tempdir = None
+
+
+# all stages in the order of a converter run
+STAGES: dict[str, type[BenchmarkStage]] = {
+    stage.name: stage for stage in (
+        DatReadStage,
+        PreProcessorStage,
+        NyanCreateStage,
+        NyanDumpStage,
+        SpriteDecodeStage,
+        TextureMergeStage,
+        PNGEncodeStage,
+        OpusEncodeStage,
+        ManifestHashStage,
+    )
+}
@@ -0,0 +1,552 @@
+# Copyright 2026-2026 the openage authors. See copying.md for legal info.
+#
+# pylint: disable=too-many-locals,too-many-branches,too-few-public-methods
+
+"""
+Generators for synthetic Genie game data.
+
+The generated files are structurally valid, i.e. they can be read by the
+converter, but their content is random. They are used to benchmark the
+converter stages without the original game assets.
+"""
+
+from __future__ import annotations
+import typing
+
+import io
+import random
+import struct
+import wave
+import zlib
+
+import numpy
+
+from ...convert.value_object.init.game_version import GameEdition, GameExpansion, GameVersion
+from ...convert.value_object.read.genie_structure import INTEGER_MATCH, STRUCT_TYPE_LOOKUP, \
+    VARARRAY_MATCH
+from ...convert.value_object.read.media.colortable import ColorTable
+from ...convert.value_object.read.media.datfile.empiresdat import EmpiresDatWrapper
+from ...convert.value_object.read.media.drs import COPYRIGHT_ENSEMBLE, COPYRIGHT_SIZE_ENSEMBLE
+from ...convert.value_object.read.member_access import READ, READ_GEN, READ_UNKNOWN, SKIP
+from ...convert.value_object.read.read_members import ContinueReadMember, EnumLookupMember, \
+    GroupMember, IncludeMembers, MultisubtypeMember, SubdataMember, ZeroMember
+
+if typing.TYPE_CHECKING:
+    from openage.convert.value_object.read.genie_structure import GenieStructure
+
+
+# games for which synthetic .dat files can be generated
+GAME_IDS = ("ROR", "AOC", "HDEDITION", "SWGB", "AOE1DE", "AOE2DE")
+
+# number of array entries in the .dat file per scale unit
+DAT_SCALED_COUNTS = {
+    "unit_count": 30,
+    "graphic_count": 40,
+    "sound_count": 20,
+    "research_count": 20,
+    "effect_bundle_count": 20,
+}
+
+# fixed number of array entries in the .dat file
+DAT_FIXED_COUNTS = {
+    # every civ contains all units, so this is not scaled
+    "civ_count": 3,
+    "terrain_restriction_count": 4,
+}
+
+# members that are unique in their array, their value is derived
+# from the index of their struct in the array
+DAT_INDEX_MEMBERS = frozenset(("id", "id0", "graphic_id", "sound_id", "type_id"))
+
+# arrays of offsets that mark existing array entries
+DAT_POINTER_MEMBERS = frozenset(("unit_offsets", "graphic_ptrs", "terrain_pass_graphics_ptrs"))
+
+# value ranges of small integer types, wider types never overflow
+INTEGER_RANGES = {
+    "b": 0x80,
+    "B": 0x100,
+    "h": 0x8000,
+    "H": 0x10000,
+}
+
+# palette IDs referenced by the synthetic sprites
+SLP_PALETTE_ID = 50500
+SMX_PALETTE_ID = 0
+
+
+class _Values:
+    """
+    Stores the written values of a struct, so that
+    dynamic lengths can be looked up.
+    """
+
+    def __init__(self, **values):
+        self.__dict__.update(values)
+
+
+class DatWriter:
+    """
+    Writes random values for the members of a .dat file struct.
+    """
+
+    def __init__(self, game_version: GameVersion, counts: dict[str, int], seed: int = 0):
+        """
+        :param game_version: Game version that determines the data format.
+        :param counts: Values of count members that are not random.
+        :param seed: Seed for the random values.
+        """
+        self.game_version = game_version
+        self.counts = counts
+        self.rng = random.Random(seed)
+
+        self.data = bytearray()
+
+        # indices of the structs in the arrays that are currently written
+        self._indices: list[int] = []
+
+    def write(self, cls: type[GenieStructure], values: _Values) -> None:
+        """
+        Write all members of a struct.
+
+        :param cls: Struct class.
+        :param values: Written member values of the struct.
+        """
+        members = cls.get_data_format(self.game_version,
+                                      allowed_modes=(True, READ, READ_GEN, READ_UNKNOWN, SKIP))
+
+        for _, _, var_name, _, var_type in members:
+            if isinstance(var_type, IncludeMembers):
+                self.write(var_type.cls, values)
+
+            elif isinstance(var_type, GroupMember):
+                group_values = _Values()
+                self.write(var_type.cls, group_values)
+                setattr(values, var_name, group_values)
+
+            elif isinstance(var_type, MultisubtypeMember):
+                self._write_array(var_type, values)
+                setattr(values, var_name, [])
+
+            else:
+                self._write_primitive(var_name, var_type, values)
+
+    def _write_array(self, var_type: MultisubtypeMember, values: _Values) -> None:
+        """
+        Write the structs of a subdata or multisubtype array.
+        """
+        varargs = {}
+        if var_type.passed_args:
+            for arg in var_type.passed_args:
+                varargs[arg] = getattr(values, arg)
+
+        offsets = None
+        if var_type.offset_to:
+            offsets = getattr(values, var_type.offset_to[0])
+
+        for idx in range(var_type.get_length(values)):
+            if offsets and not var_type.offset_to[1](offsets[idx]):
+                continue
+
+            if isinstance(var_type, SubdataMember):
+                entry_cls = var_type.class_lookup[None]
+
+            else:
+                subtype_type = var_type.subtype_definition[3]
+                subtypes = [key for key, value in subtype_type.lookup_dict.items()
+                            if value in var_type.class_lookup]
+                subtype = self.rng.choice(subtypes)
+
+                self.data += struct.pack("<" + STRUCT_TYPE_LOOKUP[subtype_type.raw_type], subtype)
+                entry_cls = var_type.class_lookup[subtype_type.lookup_dict[subtype]]
+
+            self._indices.append(idx)
+            self.write(entry_cls, _Values(**varargs))
+            self._indices.pop()
+
+    def _write_primitive(self, var_name: str, var_type, values: _Values) -> None:
+        """
+        Write the value(s) of a primitive member.
+        """
+        if isinstance(var_type, str):
+            match = VARARRAY_MATCH.match(var_type)
+            if match:
+                type_name, length = match.group(1), match.group(2)
+                if type_name == "char":
+                    type_name = "char[]"
+
+                if INTEGER_MATCH.match(length):
+                    length = int(length)
+
+                else:
+                    length = getattr(values, length)
+
+            else:
+                type_name, length = var_type, 1
+
+        else:
+            type_name = var_type.raw_type
+            length = var_type.get_length(values)
+
+        symbol = STRUCT_TYPE_LOOKUP[type_name]
+
+        if symbol == "s":
+            raw = bytes(self.rng.choice(b"abcdefgh") for _ in range(length))
+            if length > 2:
+                raw = raw[:-1] + b"\0"
+
+            self.data += raw
+            setattr(values, var_name, raw)
+            return
+
+        if isinstance(var_type, ZeroMember):
+            raw_values = [0] * length
+
+        elif isinstance(var_type, ContinueReadMember):
+            # the processors expect that all structs exist, e.g. a header for every unit
+            raw_values = [1]
+
+        elif isinstance(var_type, EnumLookupMember):
+            keys = tuple(var_type.lookup_dict)
+            if var_name in DAT_INDEX_MEMBERS and self._indices:
+                raw_values = [keys[self._indices[-1] % len(keys)]]
+
+            else:
+                raw_values = [self.rng.choice(keys) for _ in range(length)]
+
+        else:
+            raw_values = [self._get_value(symbol, var_name) for _ in range(length)]
+
+        self.data += struct.pack(f"<{length:d}{symbol}", *raw_values)
+
+        if var_name is None:
+            return
+
+        if isinstance(var_type, str):
+            value = raw_values[0] if length == 1 else tuple(raw_values)
+
+        elif length == 1:
+            value = var_type.entry_hook(raw_values[0])
+
+        else:
+            value = var_type.entry_hook(tuple(raw_values))
+
+        setattr(values, var_name, value)
+
+    def _get_value(self, symbol: str, var_name: str) -> typing.Union[int, float]:
+        """
+        Get the value of a number member.
+        """
+        # 8 bit counts with the same name are local counts, e.g. in tech tree connections
+        if var_name in self.counts and symbol not in "bB":
+            return self.counts[var_name]
+
+        if var_name in DAT_INDEX_MEMBERS and self._indices:
+            return self._indices[-1] % INTEGER_RANGES.get(symbol, 0x80000000)
+
+        if var_name in DAT_POINTER_MEMBERS:
+            return 1
+
+        if symbol in "fd":
+            return self.rng.uniform(-100, 100)
+
+        # small values, so that random array lengths stay small
+        return self.rng.randint(0, 3)
+
+
+def create_game_version(game_id: str) -> GameVersion:
+    """
+    Create a game version for a game without its config files.
+
+    :param game_id: ID of the game edition, e.g. "AOC".
+    """
+    if game_id not in GAME_IDS:
+        raise ValueError(f"no synthetic data for game edition {game_id}")
+
+    expansions = []
+    if game_id == "SWGB":
+        expansions.append(GameExpansion("Clone Campaigns", "SWGB_CC", "yes", [], [], []))
+
+    edition = GameEdition("Synthetic", game_id, "yes", [], [], {}, [],
+                          [expansion.game_id for expansion in expansions])
+
+    return GameVersion(edition, tuple(expansions))
+
+
+def create_dat(game_version: GameVersion, scale: int = 1, seed: int = 0) -> bytes:
+    """
+    Create a compressed .dat file.
+
+    :param game_version: Game version that determines the data format.
+    :param scale: Scales the number of units, graphics, sounds, techs and effects.
+    :param seed: Seed for the random values.
+    """
+    counts = {name: count * scale for name, count in DAT_SCALED_COUNTS.items()}
+    counts.update(DAT_FIXED_COUNTS)
+
+    writer = DatWriter(game_version, counts, seed)
+    writer.write(EmpiresDatWrapper, _Values())
+
+    # -15: no zlib header, like the original .dat files
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+
+    return compressor.compress(writer.data) + compressor.flush()
+
+
+def create_palette(seed: int = 0) -> ColorTable:
+    """
+    Create a palette with 1024 entries (4 sections used by SMX files).
+
+    :param seed: Seed for the random colors.
+    """
+    rng = random.Random(seed)
+
+    return ColorTable([(rng.randrange(256), rng.randrange(256), rng.randrange(256))
+                       for _ in range(1024)])
+
+
+def _get_row_segments(
+    rng: random.Random,
+    width: int
+) -> tuple[int, int, list[tuple[str, int]]]:
+    """
+    Split a sprite row into transparent borders and (kind, length) segments.
+    """
+    left = rng.randrange(width // 4 + 1)
+    right = rng.randrange(width // 4 + 1)
+
+    segments = []
+    remaining = width - left - right
+    while remaining > 0:
+        kind = rng.choice(("color", "color", "color", "skip", "player"))
+        length = min(remaining, rng.randint(1, 15))
+        segments.append((kind, length))
+        remaining -= length
+
+    return left, right, segments
+
+
+def create_slp(frame_count: int, width: int, height: int, seed: int = 0) -> bytes:
+    """
+    Create an AoC SLP (version 2.0N).
+
+    :param frame_count: Number of frames.
+    :param width: Width of every frame.
+    :param height: Height of every frame.
+    :param seed: Seed for the random pixels.
+    """
+    rng = random.Random(seed)
+
+    header = struct.pack("<4s i 24s", b"2.0N", frame_count, b"openage benchmark")
+    offset = len(header) + 32 * frame_count
+
+    frame_infos = bytearray()
+    frame_data = bytearray()
+    for _ in range(frame_count):
+        outline_offset = offset + len(frame_data)
+        cmd_table_offset = outline_offset + 4 * height
+        cmd_offset = cmd_table_offset + 4 * height
+
+        outlines = bytearray()
+        cmd_table = bytearray()
+        cmds = bytearray()
+        for _ in range(height):
+            left, right, segments = _get_row_segments(rng, width)
+            outlines += struct.pack("<H H", left, right)
+            cmd_table += struct.pack("<I", cmd_offset + len(cmds))
+
+            for kind, length in segments:
+                if kind == "color":
+                    cmds.append(length << 2)
+                    cmds += bytes(rng.randrange(256) for _ in range(length))
+
+                elif kind == "skip":
+                    cmds.append((length << 2) | 0x01)
+
+                else:
+                    cmds.append((length << 4) | 0x06)
+                    cmds += bytes(rng.randrange(16) for _ in range(length))
+
+            # end of row
+            cmds.append(0x0F)
+
+        frame_infos += struct.pack("<I I I I i i i i", cmd_table_offset, outline_offset,
+                                   SLP_PALETTE_ID - 50500, 0x10,
+                                   width, height, width // 2, height // 2)
+        frame_data += outlines + cmd_table + cmds
+
+    return bytes(header + frame_infos + frame_data)
+
+
+def create_smx(frame_count: int, width: int, height: int, seed: int = 0) -> bytes:
+    """
+    Create an AoE2:DE SMX with 4plus1 compressed main layers and shadow layers.
+
+    :param frame_count: Number of frames.
+    :param width: Width of every frame.
+    :param height: Height of every frame.
+    :param seed: Seed for the random pixels.
+    """
+    rng = random.Random(seed)
+
+    frames = bytearray()
+    for _ in range(frame_count):
+        # main layer: commands + 4plus1 color chunks, which span across rows
+        outlines = bytearray()
+        cmds = bytearray()
+        colors = bytearray()
+        chunk = []
+        for _ in range(height):
+            left, right, segments = _get_row_segments(rng, width)
+            outlines += struct.pack("<H H", left, right)
+
+            for kind, length in segments:
+                if kind == "skip":
+                    cmds.append((length - 1) << 2)
+                    continue
+
+                cmds.append(((length - 1) << 2) | (0x01 if kind == "color" else 0x02))
+                for _ in range(length):
+                    chunk.append((rng.randrange(256), rng.randrange(4)))
+                    if len(chunk) == 4:
+                        colors += bytes(index for index, _ in chunk)
+                        colors.append(sum(section << (2 * pos)
+                                          for pos, (_, section) in enumerate(chunk)))
+                        chunk.clear()
+
+            # end of row
+            cmds.append(0x03)
+
+        chunk.extend((0, 0) for _ in range(4 - len(chunk)))
+        colors += bytes(index for index, _ in chunk)
+        colors.append(sum(section << (2 * pos) for pos, (_, section) in enumerate(chunk)))
+
+        # the decoder reads one chunk ahead
+        colors += bytes(5)
+
+        main_layer = (struct.pack("<H H h h I i", width, height, width // 2, height // 2, 0, 0) +
+                      outlines + struct.pack("<I I", len(cmds), len(colors)) + cmds + colors)
+
+        # shadow layer: shadow values are stored in the command array
+        outlines = bytearray()
+        cmds = bytearray()
+        for _ in range(height):
+            left, right, segments = _get_row_segments(rng, width)
+            outlines += struct.pack("<H H", left, right)
+
+            for kind, length in segments:
+                if kind == "skip":
+                    cmds.append((length - 1) << 2)
+
+                else:
+                    cmds.append(((length - 1) << 2) | 0x01)
+                    cmds += bytes(rng.randrange(256) for _ in range(length))
+
+            cmds.append(0x03)
+
+        shadow_layer = (struct.pack("<H H h h I i", width, height, width // 2, height // 2, 0, 0) +
+                        outlines + struct.pack("<I", len(cmds)) + cmds)
+
+        frames += struct.pack("<B B I", 0x03, SMX_PALETTE_ID, 0)
+        frames += main_layer + shadow_layer
+
+    header = struct.pack("<4s H H I I 16s", b"SMPX", 2, frame_count,
+                         len(frames), len(frames), b"openage bench")
+
+    return bytes(header + frames)
+
+
+def create_sld(frame_count: int, width: int, height: int, seed: int = 0) -> bytes:
+    """
+    Create an AoE2:DE SLD with BC1 main layers and BC4 shadow layers.
+
+    :param frame_count: Number of frames.
+    :param width: Width of every frame, rounded down to a multiple of 4.
+    :param height: Height of every frame, rounded down to a multiple of 4.
+    :param seed: Seed for the random pixel blocks.
+    """
+    rng = random.Random(seed)
+    width -= width % 4
+    height -= height % 4
+    block_count = (width // 4) * (height // 4)
+
+    data = bytearray(struct.pack("<4s 4H I", b"SLDX", 4, frame_count, 0, 0x10, 0xFF))
+    for frame_index in range(frame_count):
+        data += struct.pack("<4H 2B H", width, height, width // 2, height // 2,
+                            0x03, 0, frame_index)
+
+        for _ in range(2):
+            cmds = bytearray()
+            block_data = bytearray()
+            remaining = block_count
+            while remaining > 0:
+                skip_count = min(remaining, rng.randrange(4))
+                draw_count = min(remaining - skip_count, rng.randint(1, 255))
+                cmds += bytes((skip_count, draw_count))
+                block_data += rng.randbytes(8 * draw_count)
+                remaining -= skip_count + draw_count
+
+            layer = (struct.pack("<4H 2B", 0, 0, width, height, 0, 0) +
+                     struct.pack("<H", len(cmds) // 2) + cmds + block_data)
+
+            data += struct.pack("<I", len(layer) + 4) + layer
+            data += bytes(-len(data) % 4)
+
+    return bytes(data)
+
+
+def create_drs(files: list[tuple[int, str, bytes]]) -> bytes:
+    """
+    Create a DRS archive in the format of AoE1 and AoE2.
+
+    :param files: (file ID, file extension, file data) of the archived files.
+    """
+    tables: dict[str, list[tuple[int, bytes]]] = {}
+    for file_id, file_extension, file_data in files:
+        tables.setdefault(file_extension, []).append((file_id, file_data))
+
+    header_size = COPYRIGHT_SIZE_ENSEMBLE + 4 + 12 + 4 + 4
+    file_info_offset = header_size + 12 * len(tables)
+    file_offset = file_info_offset + 12 * len(files)
+
+    table_infos = bytearray()
+    file_infos = bytearray()
+    file_datas = bytearray()
+    for file_extension, table_files in tables.items():
+        # extensions are stored reversed and padded with spaces
+        table_infos += struct.pack("<4s i i", file_extension.ljust(4)[::-1].encode("latin-1"),
+                                   file_info_offset + len(file_infos), len(table_files))
+
+        for file_id, file_data in table_files:
+            file_infos += struct.pack("<i i i", file_id, file_offset + len(file_datas),
+                                      len(file_data))
+            file_datas += file_data
+
+    header = struct.pack(f"<{COPYRIGHT_SIZE_ENSEMBLE:d}s 4s 12s i i",
+                         COPYRIGHT_ENSEMBLE, b"1.00", b"tribe", len(tables), file_offset)
+
+    return bytes(header + table_infos + file_infos + file_datas)
+
+
+def create_wav(duration: float, sample_rate: int = 22050, seed: int = 0) -> bytes:
+    """
+    Create a mono 16 bit WAV file.
+
+    :param duration: Length of the sound in seconds.
+    :param sample_rate: Sample rate in Hz.
+    :param seed: Seed for the random noise.
+    """
+    rng = numpy.random.default_rng(seed)
+
+    sample_count = int(duration * sample_rate)
+    time_steps = numpy.arange(sample_count) / sample_rate
+    samples = 8000 * numpy.sin(2 * numpy.pi * 440 * time_steps)
+    samples += rng.normal(0, 1000, sample_count)
+
+    wav_file = io.BytesIO()
+    with wave.open(wav_file, "wb") as wav:
+        wav.setnchannels(1)  # pylint: disable=no-member
+        wav.setsampwidth(2)  # pylint: disable=no-member
+        wav.setframerate(sample_rate)  # pylint: disable=no-member
+        wav.writeframes(samples.astype("<i2").tobytes())  # pylint: disable=no-member
+
+    return wav_file.getvalue()
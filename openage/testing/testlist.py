@@ -1,4 +1,4 @@
-# Copyright 2015-2024 the openage authors. See copying.md for legal info.
+# Copyright 2015-2026 the openage authors. See copying.md for legal info.
 
 """ Lists of all possible tests; enter your tests here. """
 
@@ -8,6 +8,7 @@ def doctest_modules():
     Yields the names of all Python modules that shall be tested during doctest.
     """
 
+    yield "openage.util.instrumentation"
     yield "openage.util.math"
     yield "openage.util.strings"
     yield "openage.util.system"
@@ -30,6 +31,40 @@ def tests_py():
     yield "openage.cppinterface.exctranslate_tests.cpp_to_py"
     yield ("openage.cppinterface.exctranslate_tests.cpp_to_py_bounce",
            "translates the exception back and forth a few times")
+    yield ("openage.convert.processor.export.test.compressed_texture",
+           "export the compressed blocks of SLD graphics to a DDS texture")
+    yield ("openage.convert.processor.export.test.duplicate_jobs",
+           "merge media export jobs with the same source file")
+    yield ("openage.convert.processor.export.test.media_cache",
+           "create the media cache from the results of the graphics export")
+    yield ("openage.convert.processor.export.test.unchanged_jobs",
+           "skip media export jobs whose settings are unchanged")
+    yield ("openage.convert.service.export.test.media_source",
+           "locate media source files in the mounted asset directories")
+    yield ("openage.convert.service.export.test.dds_texture",
+           "create DDS textures from compressed pixel blocks")
+    yield ("openage.convert.service.export.test.indexed_png",
+           "save images with up to 256 colors as indexed PNGs")
+    yield ("openage.convert.service.export.test.media_index",
+           "skip media exports whose inputs and outputs are unchanged")
+    yield ("openage.convert.service.export.test.media_journal",
+           "resume or discard the media export of an interrupted conversion")
+    yield ("openage.convert.service.export.test.media_writer",
+           "write and link exported media files in a background thread")
+    yield ("openage.convert.service.read.test.gamespec_cache",
+           "write a gamespec to the cache and load it again")
+    yield ("openage.convert.service.read.test.gamespec_sections",
+           "read the sections of a .dat file in multiple processes")
+    yield ("openage.convert.service.read.test.dynamic_load",
+           "convert dynamically loaded .dat members like members read at once")
+    yield ("openage.convert.service.read.test.dynamic_loader_cache",
+           "keep changes of dynamically loaded members after unloading them")
+    yield ("openage.convert.value_object.read.test.read_plan",
+           "compare the compiled read plans with the generic member reader")
+    yield ("openage.convert.value_object.read.test.record_array",
+           "access and diff arrays of numpy records")
+    yield ("openage.convert.value_object.read.test.member_diff",
+           "diff members whose values have the same hash")
     yield ("openage.testing.misc_cpp.enum",
            "tests the interface for C++'s util::Enum class")
     yield ("openage.util.fslike.test.test",
@@ -48,6 +83,10 @@ def demos_py():
            "demonstrates the translation of Python log messages")
     yield ("openage.convert.service.export.opus.demo.convert",
            "encodes an opus file from a wave file")
+    yield ("openage.convert.value_object.read.memory_benchmark.gamespec_memory",
+           "measures the memory usage of the gamespec of installed games")
+    yield ("openage.testing.convert_benchmark.runner.benchmark_stages",
+           "measures the converter stages and compares them to a baseline")
     yield ("openage.event.demo.curvepong",
            "play pong on steroids through future prediction")
     yield ("openage.gamestate.tests.simulation_demo",
@@ -68,9 +107,8 @@ def benchmark_py():
     methods.
     """
 
-    # TODO Add a real benchmark here, and remove this one
-    yield ("openage.testing.benchmark.benchmark_test_function",
-           "Benchmark yourself")
+    yield ("openage.testing.convert_benchmark.runner.all_stages",
+           "runs all converter stages with synthetic game data")
 
 
 def tests_cpp():
@@ -1,4 +1,4 @@
-# Copyright 2015-2024 the openage authors. See copying.md for legal info.
+# Copyright 2015-2026 the openage authors. See copying.md for legal info.
 
 """
 Provides Filecollection, a utility class for combining multiple file-like
@@ -280,3 +280,12 @@ class FileEntry:
         Returns the modification time of the entry.
         """
         raise UnsupportedOperation("FileEntry.mtime")
+
+    def get_native_location(self) -> tuple[str | bytes, int, int] | None:
+        """
+        Returns the native path of the file that stores the entry data,
+        and the offset and size of the data in that file.
+
+        Returns None if the entry data is not stored in a native file.
+        """
+        return None
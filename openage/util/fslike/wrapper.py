@@ -1,4 +1,4 @@
-# Copyright 2015-2022 the openage authors. See copying.md for legal info.
+# Copyright 2015-2026 the openage authors. See copying.md for legal info.
 
 """
 Provides
@@ -64,7 +64,11 @@ class Wrapper(FSLikeObject):
         return GuardedFile(fileobj, self.contextguard)
 
     def resolve_r(self, parts):
-        return self.obj.joinpath(parts) if self.exists(parts) else None
+        if not self.exists(parts):
+            return None
+
+        # pylint: disable=protected-access
+        return self.obj.joinpath(parts)._resolve_r()
 
     def resolve_w(self, parts):
         return self.obj.joinpath(parts) if self.writable(parts) else None
@@ -1,4 +1,4 @@
-# Copyright 2021-2022 the openage authors. See copying.md for legal info.
+# Copyright 2021-2026 the openage authors. See copying.md for legal info.
 
 """
 Functions for hashing files.
@@ -37,3 +37,19 @@ def hash_file(
             hashfunc.update(data)
 
     return hashfunc.hexdigest()
+
+
+def hash_data(
+    data: bytes,
+    hash_algo: str = "sha3_256"
+) -> str:
+    """
+    Get the hash value of data in memory, e.g. of a file
+    before it is written.
+
+    :param data: Data that is hashed.
+    :type data: bytes
+    :param hash_algo: Hashing algorithm identifier.
+    :type hash_algo: str
+    """
+    return hashlib.new(hash_algo, data).hexdigest()
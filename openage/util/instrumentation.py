@@ -0,0 +1,409 @@
+# Copyright 2026-2026 the openage authors. See copying.md for legal info.
+#
+# pylint: disable=too-many-instance-attributes
+
+"""
+Lightweight instrumentation with nested spans.
+
+A span measures one stage of a program run, e.g. the reading of a file
+or a processing step. Spans can be nested, the full name of a span is
+the dot-joined name of all its parents, e.g. "convert.pre_processor".
+
+Usage:
+    recorder = start_recording()
+
+    with span("read") as cur_span:
+        with span("strings"):
+            ...
+        cur_span.count("files", 3)
+
+    stop_recording()
+    json.dumps(recorder.get_summary())
+
+When no recording is active, span() and count() do nothing, so the
+instrumented code paths don't need to check for it.
+"""
+
+from __future__ import annotations
+import typing
+
+from contextlib import contextmanager
+import functools
+import os
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+
+except ImportError:
+    # not available on Windows
+    resource = None
+
+
+def get_peak_rss(children: bool = False) -> int:
+    """
+    Return the peak resident set size of the current process in bytes.
+
+    Returns 0 if the peak RSS can't be determined on this platform.
+
+    :param children: If True, return the peak RSS of the largest child
+                     process that has finished and was waited for instead.
+    """
+    if resource is None:
+        return 0
+
+    if children:
+        peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+
+    else:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports KiB, macOS reports bytes
+    if sys.platform == "darwin":
+        return peak
+
+    return peak * 1024
+
+
+class Span:
+    """
+    Measurements of one stage of a recording.
+    """
+
+    __slots__ = ('name', 'parent', 'attrs', 'counts', 'children',
+                 'start', 'wall_time', 'cpu_time',
+                 'rss_start', 'rss_peak', 'mem_start', 'mem_delta', 'mem_peak')
+
+    def __init__(self, name: str, parent: Span = None, attrs: dict[str, typing.Any] = None):
+        """
+        :param name: Name of the span.
+        :param parent: Span this span is nested in.
+        :param attrs: Additional info about the span, e.g. the processed file.
+        """
+        self.name = name
+        self.parent = parent
+        self.attrs = attrs or None
+        self.counts: dict[str, int] = {}
+        self.children: list[Span] = []
+
+        # start time relative to the start of the recording in seconds
+        self.start = 0.0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+
+        # peak RSS of the process in bytes
+        self.rss_start = 0
+        self.rss_peak = 0
+
+        # traced Python memory in bytes, only set if tracemalloc is running
+        self.mem_start = None
+        self.mem_delta = None
+        self.mem_peak = None
+
+    def get_full_name(self) -> str:
+        """
+        Return the name of the span prefixed with the names of its parents.
+        """
+        if self.parent is None:
+            return self.name
+
+        return f"{self.parent.get_full_name()}.{self.name}"
+
+    def count(self, key: str, value: int = 1) -> None:
+        """
+        Add to an item count of the span.
+
+        :param key: Name of the counted items.
+        :param value: Number of items that are added.
+        """
+        self.counts[key] = self.counts.get(key, 0) + value
+
+    def get_summary(self) -> dict[str, typing.Any]:
+        """
+        Return the measurements of the span and its children as a dict.
+        """
+        summary = {
+            "name": self.get_full_name(),
+            "start": self.start,
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+            "rss_peak": self.rss_peak,
+            "rss_growth": self.rss_peak - self.rss_start,
+        }
+
+        if self.mem_delta is not None:
+            summary["mem_delta"] = self.mem_delta
+            summary["mem_peak"] = self.mem_peak
+
+        if self.counts:
+            summary["counts"] = dict(self.counts)
+
+        if self.attrs:
+            summary["attrs"] = dict(self.attrs)
+
+        if self.children:
+            summary["children"] = [child.get_summary() for child in self.children]
+
+        return summary
+
+    def __repr__(self):
+        return f"Span<{self.get_full_name()}>"
+
+
+class Recorder:
+    """
+    Records nested spans.
+    """
+
+    __slots__ = ('spans', 'trace_memory', '_stack', '_start', '_peaks')
+
+    def __init__(self, trace_memory: bool = False):
+        """
+        :param trace_memory: Measure the memory allocated by Python in every span
+                             with tracemalloc. This slows down the recorded code.
+        """
+        self.spans: list[Span] = []
+        self.trace_memory = trace_memory
+
+        self._stack: list[Span] = []
+        self._start = time.perf_counter()
+
+        # absolute tracemalloc peaks of the open spans, see _update_peaks()
+        self._peaks: list[int] = []
+
+    def _update_peaks(self) -> int:
+        """
+        Fold the tracemalloc peak since the last update into the peaks of
+        all open spans and reset it, so that nested spans can measure their
+        own peak.
+
+        :returns: Currently traced memory in bytes.
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+
+        peaks = self._peaks
+        for idx, span_peak in enumerate(peaks):
+            if peak > span_peak:
+                peaks[idx] = peak
+
+        return current
+
+    def open_span(self, name: str, attrs: dict[str, typing.Any] = None) -> Span:
+        """
+        Start the measurement of a new span nested in the current span.
+        """
+        parent = self._stack[-1] if self._stack else None
+        new_span = Span(name, parent, attrs)
+
+        if parent is None:
+            self.spans.append(new_span)
+
+        else:
+            parent.children.append(new_span)
+
+        self._stack.append(new_span)
+
+        if self.trace_memory and tracemalloc.is_tracing():
+            new_span.mem_start = self._update_peaks()
+            self._peaks.append(new_span.mem_start)
+
+        new_span.rss_start = get_peak_rss()
+        new_span.cpu_time = time.process_time()
+        new_span.start = time.perf_counter() - self._start
+
+        return new_span
+
+    def close_span(self, cur_span: Span) -> None:
+        """
+        End the measurement of the current span.
+        """
+        cur_span.wall_time = time.perf_counter() - self._start - cur_span.start
+        cur_span.cpu_time = time.process_time() - cur_span.cpu_time
+        cur_span.rss_peak = get_peak_rss()
+
+        if cur_span.mem_start is not None and tracemalloc.is_tracing():
+            current = self._update_peaks()
+            cur_span.mem_delta = current - cur_span.mem_start
+            cur_span.mem_peak = self._peaks.pop() - cur_span.mem_start
+
+        popped = self._stack.pop()
+        if popped is not cur_span:
+            raise RuntimeError(f"{cur_span} closed while {popped} is open")
+
+    def get_current_span(self) -> Span | None:
+        """
+        Return the innermost open span.
+        """
+        if self._stack:
+            return self._stack[-1]
+
+        return None
+
+    def get_summary(self) -> dict[str, typing.Any]:
+        """
+        Return the measurements of all spans as a dict that
+        can be stored as JSON.
+        """
+        return {
+            "trace_memory": self.trace_memory,
+            "spans": [cur_span.get_summary() for cur_span in self.spans],
+        }
+
+    def get_trace_events(self) -> dict[str, typing.Any]:
+        """
+        Return the spans in the Chrome trace event format, which can
+        be viewed in chrome://tracing or https://ui.perfetto.dev.
+        """
+        pid = os.getpid()
+        events = []
+
+        pending = list(reversed(self.spans))
+        while pending:
+            cur_span = pending.pop()
+
+            event_args = {"cpu_time": cur_span.cpu_time, "rss_peak": cur_span.rss_peak}
+            if cur_span.mem_delta is not None:
+                event_args["mem_delta"] = cur_span.mem_delta
+                event_args["mem_peak"] = cur_span.mem_peak
+
+            event_args.update(cur_span.counts)
+            if cur_span.attrs:
+                event_args.update(cur_span.attrs)
+
+            events.append({
+                "name": cur_span.get_full_name(),
+                "cat": cur_span.get_full_name().split(".", 1)[0],
+                "ph": "X",
+                "ts": cur_span.start * 1e6,
+                "dur": cur_span.wall_time * 1e6,
+                "pid": pid,
+                "tid": 0,
+                "args": event_args,
+            })
+
+            pending.extend(reversed(cur_span.children))
+
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+        }
+
+
+# recorder of the current run
+_RECORDER: Recorder = None
+
+
+def start_recording(trace_memory: bool = False) -> Recorder:
+    """
+    Start recording the spans of the current process.
+
+    :param trace_memory: Measure the memory allocated by Python in every span
+                         with tracemalloc. This slows down the recorded code.
+    """
+    global _RECORDER  # pylint: disable=global-statement
+
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+    _RECORDER = Recorder(trace_memory)
+
+    return _RECORDER
+
+
+def stop_recording() -> Recorder | None:
+    """
+    Stop the current recording.
+
+    :returns: The stopped recorder.
+    """
+    global _RECORDER  # pylint: disable=global-statement
+
+    recorder = _RECORDER
+    _RECORDER = None
+
+    if recorder is not None and recorder.trace_memory:
+        tracemalloc.stop()
+
+    return recorder
+
+
+def get_recorder() -> Recorder | None:
+    """
+    Return the active recorder or None if nothing is recorded.
+    """
+    return _RECORDER
+
+
+@contextmanager
+def span(name: str, **attrs) -> typing.Generator[Span | None, None, None]:
+    """
+    Measure the enclosed code as a span nested in the current span.
+
+    :param name: Name of the span.
+    :param attrs: Additional info about the span, e.g. the processed file.
+    :returns: The span or None if nothing is recorded.
+
+    >>> recorder = start_recording()
+    >>> with span("read"):
+    ...     with span("dat", filename="empires2_x1_p1.dat"):
+    ...         count("structs", 2)
+    >>> recorder is stop_recording()
+    True
+    >>> [(child.get_full_name(), child.counts) for child in recorder.spans[0].children]
+    [('read.dat', {'structs': 2})]
+    >>> with span("ignored") as cur_span:
+    ...     cur_span is None
+    True
+    """
+    recorder = _RECORDER
+    if recorder is None:
+        yield None
+        return
+
+    cur_span = recorder.open_span(name, attrs)
+    try:
+        yield cur_span
+
+    finally:
+        recorder.close_span(cur_span)
+
+
+def count(key: str, value: int = 1) -> None:
+    """
+    Add to an item count of the current span.
+
+    :param key: Name of the counted items.
+    :param value: Number of items that are added.
+    """
+    if _RECORDER is None:
+        return
+
+    cur_span = _RECORDER.get_current_span()
+    if cur_span is not None:
+        cur_span.count(key, value)
+
+
+def instrument(name: str = None) -> typing.Callable:
+    """
+    Decorator that measures every call of a function as a span.
+
+    :param name: Name of the span. Defaults to the function
+                 name without leading underscores.
+    """
+    def decorator(func: typing.Callable) -> typing.Callable:
+        span_name = name or func.__name__.lstrip("_")
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _RECORDER is None:
+                return func(*args, **kwargs)
+
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator